@@ -0,0 +1,106 @@
+"""
+Episode Memory Benchmark
+
+Measures the memory used per PodcastEpisode on a synthetic library, for the
+slotted PodcastEpisode and for an otherwise identical class that keeps its
+state in a per-instance __dict__ (the representation used before episodes
+were slotted).
+
+Usage:
+    python benchmarks/episode_memory.py [--count 100000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from zpodcast.core.episode import PodcastEpisode  # noqa: E402
+
+
+def dict_episode_class() -> type:
+    """
+    Build a copy of PodcastEpisode that stores its state in __dict__.
+
+    Returns:
+        type: A class with the same methods and properties as PodcastEpisode
+            but without __slots__.
+    """
+    slots = set(PodcastEpisode.__slots__)
+    namespace = {
+        name: value for name, value in PodcastEpisode.__dict__.items()
+        if name not in slots and name not in ('__slots__', '__dict__', '__weakref__')
+    }
+    return type('DictPodcastEpisode', (), namespace)
+
+
+def synthetic_entries(count: int):
+    """
+    Generate constructor arguments for a synthetic library of episodes.
+
+    Args:
+        count (int): Number of episodes to generate.
+
+    Yields:
+        dict: Keyword arguments for the episode constructor.
+    """
+    start = datetime(2015, 1, 1, tzinfo=timezone.utc)
+    for number in range(count):
+        podcast = number // 500
+        yield {
+            "title": f"Podcast {podcast} Episode {number}",
+            "audio_url": f"https://cdn.example.com/podcast{podcast}/episode{number}.mp3",
+            "description": f"Show notes for episode {number} of podcast {podcast}.",
+            "pub_date": start + timedelta(hours=number),
+            "duration": 1800 + number % 3600,
+            "episode_number": number % 500,
+            "image_url": f"https://cdn.example.com/podcast{podcast}/cover.jpg",
+            "guid": f"podcast{podcast}-episode{number}"
+        }
+
+
+def measure(episode_class: type, entries: list) -> int:
+    """
+    Measure the memory allocated to build one episode per entry.
+
+    The entry values are created before measuring, so only the episode
+    objects themselves (and anything their setters allocate) are counted.
+
+    Args:
+        episode_class (type): The episode class to instantiate.
+        entries (list): Constructor arguments, one dict per episode.
+
+    Returns:
+        int: Bytes allocated for the episodes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    episodes = [episode_class(**entry) for entry in entries]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del episodes
+    return allocated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000,
+                        help='number of synthetic episodes (default: 100000)')
+    args = parser.parse_args()
+
+    entries = list(synthetic_entries(args.count))
+    before = measure(dict_episode_class(), entries)
+    after = measure(PodcastEpisode, entries)
+
+    print(f"episodes:            {args.count}")
+    print(f"__dict__ episodes:   {before / args.count:8.1f} bytes/episode")
+    print(f"__slots__ episodes:  {after / args.count:8.1f} bytes/episode")
+    print(f"saved:               {(before - after) / args.count:8.1f} bytes/episode "
+          f"({(before - after) / before:.0%})")
+
+
+if __name__ == '__main__':
+    main()
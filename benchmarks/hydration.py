@@ -0,0 +1,72 @@
+"""
+Episode Hydration Benchmark
+
+Compares building episodes from their stored dictionaries through the
+validating PodcastEpisode.from_dict path (used for data coming from API
+clients) and the trusted path used by the persistence layer.
+
+Usage:
+    python benchmarks/hydration.py [--count 100000] [--profile]
+"""
+import argparse
+import cProfile
+import os
+import pstats
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from episode_memory import synthetic_entries  # noqa: E402
+from zpodcast.core.episode import PodcastEpisode  # noqa: E402
+
+
+def hydrate(dicts: list, trusted: bool) -> list:
+    return [PodcastEpisode.from_dict(data, trusted=trusted) for data in dicts]
+
+
+def timed(dicts: list, trusted: bool) -> float:
+    start = time.perf_counter()
+    hydrate(dicts, trusted)
+    return time.perf_counter() - start
+
+
+def profile(dicts: list, trusted: bool, limit: int = 8) -> None:
+    """
+    Print the functions with the most cumulative time of one hydration run.
+
+    Args:
+        dicts (list): Stored episode dictionaries.
+        trusted (bool): Use the trusted path.
+        limit (int): Number of functions to print.
+    """
+    profiler = cProfile.Profile()
+    profiler.runcall(hydrate, dicts, trusted)
+    print(f"--- {'trusted' if trusted else 'validated'} path ---")
+    pstats.Stats(profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(limit)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000,
+                        help='number of synthetic episodes (default: 100000)')
+    parser.add_argument('--profile', action='store_true',
+                        help='print a cProfile summary of both paths')
+    args = parser.parse_args()
+
+    dicts = [PodcastEpisode(**entry).to_dict() for entry in synthetic_entries(args.count)]
+    validated = timed(dicts, trusted=False)
+    trusted = timed(dicts, trusted=True)
+
+    print(f"episodes:        {args.count}")
+    print(f"validated path:  {validated:6.2f} s  ({validated / args.count * 1e6:6.1f} us/episode)")
+    print(f"trusted path:    {trusted:6.2f} s  ({trusted / args.count * 1e6:6.1f} us/episode)")
+    print(f"speed up:        {validated / trusted:6.1f}x")
+
+    if args.profile:
+        profile(dicts, trusted=False)
+        profile(dicts, trusted=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Latest Episodes Benchmark
+
+Compares the heap merge of latest_episodes with sorting every episode of a
+synthetic library by publication date, the approach clients used before.
+
+Usage:
+    python benchmarks/latest.py [--count 500000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from search import best_time  # noqa: E402
+from snapshot_load import synthetic_library  # noqa: E402
+from zpodcast.core.columns import pub_date_key  # noqa: E402
+from zpodcast.core.latest import latest_episodes  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=500000,
+                        help='number of synthetic episodes (default: 500000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='runs per measurement, the fastest is reported (default: 5)')
+    args = parser.parse_args()
+
+    library = synthetic_library(args.count)
+
+    def global_sort():
+        episodes = [episode for podcast in library.podcasts
+                    for episodelist in podcast.episodelists for episode in episodelist.episodes]
+        episodes.sort(key=lambda episode: pub_date_key(episode.pub_date), reverse=True)
+        return episodes[:20]
+
+    start = time.perf_counter()
+    latest_episodes(library)
+    first_time = time.perf_counter() - start
+
+    print(f"episodes:          {args.count}")
+    print(f"podcasts:          {len(library.podcasts)}")
+    print(f"global sort:       {best_time(global_sort, args.repeat) * 1000:8.2f} ms")
+    print(f"first merge:       {first_time * 1000:8.2f} ms  (builds the per-list orders)")
+    for offset in (0, 1000):
+        elapsed = best_time(lambda: latest_episodes(library, offset=offset, limit=20), args.repeat)
+        print(f"merge, offset {offset:<5} {elapsed * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Episode Search Benchmark
+
+Builds the EpisodeSearchIndex over a synthetic library and measures the
+initial indexing, queries of different selectivity and the incremental
+update after one podcast changed.
+
+Usage:
+    python benchmarks/search.py [--count 500000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from snapshot_load import synthetic_library  # noqa: E402
+from zpodcast.core.episode import PodcastEpisode  # noqa: E402
+from zpodcast.core.search import EpisodeSearchIndex  # noqa: E402
+
+
+def best_time(function, repeat: int) -> float:
+    """
+    Time a function.
+
+    Args:
+        function (Callable[[], Any]): The function to run.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: The fastest run in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=500000,
+                        help='number of synthetic episodes (default: 500000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='runs per query, the fastest is reported (default: 5)')
+    args = parser.parse_args()
+
+    library = synthetic_library(args.count)
+    index = EpisodeSearchIndex()
+
+    start = time.perf_counter()
+    index.update(library)
+    build_time = time.perf_counter() - start
+
+    print(f"episodes:          {args.count}")
+    print(f"initial index:     {build_time:8.2f} s")
+    queries = {
+        "one episode": f"episode {args.count // 2}",
+        "one podcast": "podcast 7",
+        "every episode": "show notes",
+    }
+    for label, query in queries.items():
+        elapsed = best_time(lambda: index.search(library, query, limit=20), args.repeat)
+        total = index.search(library, query).total
+        print(f"{label + ':':18} {elapsed * 1000:8.2f} ms  ({total} matches, q={query!r})")
+
+    podcast = library.podcasts[0]
+
+    def refresh_one_podcast():
+        podcast.episodelists[0].add_podcastepisode(PodcastEpisode(
+            title="Breaking news", audio_url="https://cdn.example.com/new.mp3"))
+        index.search(library, "breaking news")
+
+    elapsed = best_time(refresh_one_podcast, args.repeat)
+    print(f"update + search:   {elapsed * 1000:8.2f} ms  (one podcast changed)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Snapshot Load Benchmark
+
+Measures how long it takes to load a synthetic library from a PodcastJSON
+file and from a PodcastBinary snapshot holding the same data.
+
+Usage:
+    python benchmarks/snapshot_load.py [--count 100000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from episode_memory import synthetic_entries  # noqa: E402
+from zpodcast.core.episode import PodcastEpisode  # noqa: E402
+from zpodcast.core.playlist import PodcastEpisodeList  # noqa: E402
+from zpodcast.core.podcast import PodcastData  # noqa: E402
+from zpodcast.core.podcasts import PodcastList  # noqa: E402
+from zpodcast.parsers.binary import PodcastBinary  # noqa: E402
+from zpodcast.parsers.json import PodcastJSON  # noqa: E402
+
+
+# Episodes per synthetic podcast, as in synthetic_entries
+EPISODES_PER_PODCAST = 500
+
+
+def synthetic_library(count: int) -> PodcastList:
+    """
+    Build a library of count episodes spread over podcasts of 500 episodes.
+
+    Args:
+        count (int): Number of episodes.
+
+    Returns:
+        PodcastList: The library.
+    """
+    episodes = [PodcastEpisode(**entry) for entry in synthetic_entries(count)]
+    podcasts = []
+    for start in range(0, count, EPISODES_PER_PODCAST):
+        number = start // EPISODES_PER_PODCAST
+        podcasts.append(PodcastData(
+            title=f"Podcast {number}",
+            podcast_url=f"https://example.com/podcast{number}/feed.xml",
+            host="Synthetic Host",
+            description=f"Synthetic podcast {number}",
+            episodelists=[PodcastEpisodeList(name=f"Podcast {number}",
+                                             episodes=episodes[start:start + EPISODES_PER_PODCAST])],
+            podcast_priority=number % 10,
+            image_url=f"https://cdn.example.com/podcast{number}/cover.jpg",
+            fetch=False
+        ))
+    return PodcastList(podcasts)
+
+
+def best_time(load, filename: str, repeat: int) -> float:
+    """
+    Time a loader.
+
+    Args:
+        load (Callable[[str], PodcastList]): The import function.
+        filename (str): The file to load.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: The fastest run in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(filename)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000,
+                        help='number of synthetic episodes (default: 100000)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per format, the fastest is reported (default: 3)')
+    args = parser.parse_args()
+
+    library = synthetic_library(args.count)
+    with tempfile.TemporaryDirectory() as directory:
+        json_file = os.path.join(directory, 'library.json')
+        binary_file = os.path.join(directory, 'library.zpod')
+        PodcastJSON.export_podcast_list(library, json_file, compact=True)
+        PodcastBinary.export_podcast_list(library, binary_file)
+
+        json_time = best_time(PodcastJSON.import_podcast_list, json_file, args.repeat)
+        binary_time = best_time(PodcastBinary.import_podcast_list, binary_file, args.repeat)
+
+        print(f"episodes:       {args.count}")
+        print(f"JSON file:      {os.path.getsize(json_file) / 1e6:8.1f} MB  load {json_time:6.2f} s")
+        print(f"binary file:    {os.path.getsize(binary_file) / 1e6:8.1f} MB  load {binary_time:6.2f} s")
+        print(f"speed up:       {json_time / binary_time:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@ from zpodcast.core.podcasts import PodcastList
 from zpodcast.core.podcast import PodcastData
 from zpodcast.core.episode import PodcastEpisode
 from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.parsers.rss import ParsedFeed
 from datetime import datetime, timedelta
 
 
@@ -38,13 +39,15 @@ def test_episode_data():
 def test_podcast_data(mocker, test_episode_data):
     """Create test podcast data with episodes for testing"""
     # Mock RSSPodcastParser to prevent actual RSS fetching
-    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.get_episodes', return_value=[])
-    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.get_rss_metadata', return_value={
-        "title": "Test Podcast",
-        "description": "This is a test podcast",
-        "author": "Test Author",
-        "image": "http://example.com/image.jpg"
-    })
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed', return_value=ParsedFeed(
+        url="http://example.com/podcast.rss",
+        metadata={
+            "title": "Test Podcast",
+            "description": "This is a test podcast",
+            "author": "Test Author",
+            "image": "http://example.com/image.jpg"
+        }
+    ))
     
     # Create test data with pre-populated episodes
     episode_list = PodcastEpisodeList(
@@ -73,13 +76,15 @@ def test_podcast_data(mocker, test_episode_data):
 def empty_podcast_data(mocker):
     """Create test podcast data with no episodes for testing"""
     # Mock RSSPodcastParser to prevent actual RSS fetching
-    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.get_episodes', return_value=[])
-    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.get_rss_metadata', return_value={
-        "title": "Empty Podcast",
-        "description": "This is a podcast with no episodes",
-        "author": "Test Author",
-        "image": "http://example.com/image.jpg"
-    })
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed', return_value=ParsedFeed(
+        url="http://example.com/podcast.rss",
+        metadata={
+            "title": "Empty Podcast",
+            "description": "This is a podcast with no episodes",
+            "author": "Test Author",
+            "image": "http://example.com/image.jpg"
+        }
+    ))
     
     # Create empty episode list
     empty_episode_list = PodcastEpisodeList(
@@ -235,4 +240,130 @@ def test_comprehensive_episode_fields(client):
     assert data['description'] == "This is test episode 1"
     assert data['duration'] == 1800
     assert data['episode_number'] == 1
-    assert data['image_url'] == "http://example.com/episode1.jpg"
\ No newline at end of file
+    assert data['image_url'] == "http://example.com/episode1.jpg"
+
+
+def test_get_episodes_includes_total(client):
+    """Test that an unpaged listing reports the total and no next cursor"""
+    response = client.get('/api/episodes/0/')
+    data = response.get_json()
+    assert data['total'] == 2
+    assert data['next_cursor'] is None
+
+
+def test_get_episodes_paginated_with_cursor(client):
+    """Test walking the episodes page by page with the next cursor"""
+    response = client.get('/api/episodes/0/?limit=1')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [episode['title'] for episode in data['episodes']] == ["Test Episode 1"]
+    assert data['total'] == 2
+    assert data['limit'] == 1
+
+    response = client.get(f"/api/episodes/0/?limit=1&cursor={data['next_cursor']}")
+    data = response.get_json()
+    assert [episode['title'] for episode in data['episodes']] == ["Test Episode 2"]
+    assert data['next_cursor'] is None
+
+
+def test_get_episodes_offset_past_end(client):
+    """Test that an offset past the last episode returns an empty page"""
+    response = client.get('/api/episodes/0/?offset=5&limit=10')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['episodes'] == []
+    assert data['total'] == 2
+
+
+@pytest.mark.parametrize("query", ["limit=0", "limit=abc", "offset=-1", "offset=1&cursor=1"])
+def test_get_episodes_invalid_pagination(client, query):
+    """Test that invalid pagination parameters are rejected"""
+    response = client.get(f'/api/episodes/0/?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_episodes_by_stable_id(client, test_podcast_data, test_episode_data):
+    """Test addressing podcasts and episodes by their stable identifiers"""
+    podcast_id = test_podcast_data[0].id
+
+    response = client.get(f'/api/episodes/id/{podcast_id}/?limit=1')
+    assert response.status_code == 200
+    page = response.get_json()
+    assert page['total'] == 2
+    episode_id = page['episodes'][0]['id']
+    assert episode_id == test_episode_data[0].id
+
+    response = client.get(f'/api/episodes/id/{podcast_id}/{episode_id}/')
+    assert response.status_code == 200
+    assert response.get_json()['title'] == "Test Episode 1"
+    assert response.get_json()['id'] == episode_id
+    assert client.get('/api/episodes/0/0/').get_json()['id'] == episode_id
+
+
+def test_episodes_by_stable_id_not_found(client, test_podcast_data):
+    """Test addressing unknown stable identifiers"""
+    assert client.get('/api/episodes/id/0123456789abcdef/').status_code == 404
+    assert client.get('/api/episodes/id/0123456789abcdef/0123456789abcdef/').status_code == 404
+    assert client.get(f'/api/episodes/id/{test_podcast_data[0].id}/0123456789abcdef/').status_code == 404
+
+
+def test_get_episodes_sorted(client):
+    """Test sorting episodes with SortParameters query options"""
+    response = client.get('/api/episodes/0/?episode_date=Earliest')
+    assert response.status_code == 200
+    assert [episode['title'] for episode in response.get_json()['episodes']] == ["Test Episode 2", "Test Episode 1"]
+
+    response = client.get('/api/episodes/0/?episode_duration=LongToShort&limit=1')
+    page = response.get_json()
+    assert [episode['title'] for episode in page['episodes']] == ["Test Episode 2"]
+    assert page['total'] == 2
+    assert page['next_cursor'] == "1"
+
+
+def test_get_episodes_filtered(client):
+    """Test filtering episodes by duration"""
+    response = client.get('/api/episodes/0/?max_duration=2000')
+    assert response.status_code == 200
+    page = response.get_json()
+    assert [episode['title'] for episode in page['episodes']] == ["Test Episode 1"]
+    assert page['total'] == 1
+
+    response = client.get('/api/episodes/1/?min_duration=1')
+    assert response.get_json()['episodes'] == []
+
+
+@pytest.mark.parametrize('query', ['episode_date=Sometime', 'episode_rating=highest',
+                                   'min_duration=short', 'published_after=yesterday'])
+def test_get_episodes_invalid_sort_or_filter(client, query):
+    """Test invalid sort and filter parameters"""
+    response = client.get(f'/api/episodes/0/?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_get_latest_episodes(client, test_podcast_data):
+    """Test the latest episodes across all podcasts"""
+    response = client.get('/api/episodes/latest/?limit=1')
+    assert response.status_code == 200
+    page = response.get_json()
+    assert page['total'] == 2
+    assert page['next_cursor'] == "1"
+    latest = page['episodes'][0]
+    assert latest['podcast_id'] == 0
+    assert latest['podcast_stable_id'] == test_podcast_data[0].id
+    assert latest['episode_id'] == 0
+    assert latest['episode']['title'] == "Test Episode 1"
+    assert latest['episode']['id'] == test_podcast_data[0].episodelists[0].episodes[0].id
+
+    page = client.get('/api/episodes/latest/?cursor=1&priority_weight=0').get_json()
+    assert [latest['episode']['title'] for latest in page['episodes']] == ["Test Episode 2"]
+    assert page['next_cursor'] is None
+
+
+@pytest.mark.parametrize('query', ['limit=0', 'offset=-1', 'offset=1&cursor=1', 'priority_weight=high'])
+def test_get_latest_episodes_invalid(client, query):
+    """Test invalid latest episodes parameters"""
+    response = client.get(f'/api/episodes/latest/?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
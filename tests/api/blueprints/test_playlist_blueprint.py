@@ -245,4 +245,16 @@ def test_remove_episode_from_playlist_not_found(client):
     response = client.delete('/api/playlists/0/episodes/999/')
     assert response.status_code == 404
     data = response.get_json()
-    assert 'error' in data
\ No newline at end of file
+    assert 'error' in data
+
+
+def test_remove_episode_from_playlist_by_stable_id(client, test_playlist_data):
+    """Test removing an episode addressed by its stable identifier"""
+    episode_id = test_playlist_data[0].episodes[1].id
+
+    response = client.delete(f'/api/playlists/0/episodes/id/{episode_id}/')
+    assert response.status_code == 200
+    assert [episode['title'] for episode in response.get_json()['episodes']] == ["Test Episode 1"]
+
+    assert client.delete(f'/api/playlists/0/episodes/id/{episode_id}/').status_code == 404
+    assert client.delete(f'/api/playlists/9/episodes/id/{episode_id}/').status_code == 404
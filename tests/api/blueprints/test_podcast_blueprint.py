@@ -14,6 +14,7 @@ from flask import Flask
 from zpodcast.api.blueprints.podcasts import podcasts_bp
 from zpodcast.core.podcasts import PodcastList
 from zpodcast.core.podcast import PodcastData
+from zpodcast.parsers.rss import ParsedFeed
 
 
 @pytest.fixture
@@ -33,31 +34,38 @@ def test_podcast_data(mocker):
         List[PodcastData]: A list containing two test podcast objects
     """
     # Mock RSSPodcastParser to return consistent data matching our test expectations
-    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.get_episodes', return_value=[])
-    
     # Mock different metadata for each podcast to match our test expectations
-    mock_get_rss_metadata = mocker.patch(
-        'zpodcast.parsers.rss.RSSPodcastParser.get_rss_metadata'
+    mock_parse_feed = mocker.patch(
+        'zpodcast.parsers.rss.RSSPodcastParser.parse_feed'
     )
-    mock_get_rss_metadata.side_effect = [
-        {
-            "title": "Test Podcast 1",
-            "description": "This is a test podcast 1",
-            "author": "John Doe",
-            "image": "http://example.com/image1.jpg"
-        },
-        {
-            "title": "Test Podcast 2",
-            "description": "This is a test podcast 2",
-            "author": "Jane Doe",
-            "image": "http://example.com/image2.jpg"
-        },
-        {
-            "title": "New Podcast",
-            "description": "This is a new podcast",
-            "author": "New Host",
-            "image": "http://example.com/new.jpg"
-        }
+    mock_parse_feed.side_effect = [
+        ParsedFeed(
+            url="http://example.com/podcast1.rss",
+            metadata={
+                "title": "Test Podcast 1",
+                "description": "This is a test podcast 1",
+                "author": "John Doe",
+                "image": "http://example.com/image1.jpg"
+            }
+        ),
+        ParsedFeed(
+            url="http://example.com/podcast2.rss",
+            metadata={
+                "title": "Test Podcast 2",
+                "description": "This is a test podcast 2",
+                "author": "Jane Doe",
+                "image": "http://example.com/image2.jpg"
+            }
+        ),
+        ParsedFeed(
+            url="http://example.com/new.rss",
+            metadata={
+                "title": "New Podcast",
+                "description": "This is a new podcast",
+                "author": "New Host",
+                "image": "http://example.com/new.jpg"
+            }
+        )
     ]
     
     return [
@@ -155,6 +163,62 @@ def test_get_podcasts(client):
     assert data['podcasts'][1]['title'] == "Test Podcast 2"
 
 
+def test_get_podcasts_summary(client):
+    """
+    Test that the podcast listing is a summary without episodes.
+    
+    Args:
+        client: The Flask test client fixture
+    """
+    response = client.get('/api/podcasts/')
+    data = response.get_json()
+    podcast = data['podcasts'][0]
+    assert 'episodelists' not in podcast
+    assert podcast['episode_count'] == 0
+    assert podcast['latest_episode_date'] is None
+    assert podcast['host'] == "John Doe"
+
+
+def test_get_podcasts_sparse_fields(client):
+    """
+    Test selecting a sparse fieldset of the podcast summary.
+    
+    Args:
+        client: The Flask test client fixture
+    """
+    response = client.get('/api/podcasts/?fields=title,episode_count')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['podcasts'][1] == {"title": "Test Podcast 2", "episode_count": 0}
+
+
+def test_get_podcasts_full_view(client):
+    """
+    Test that view=full returns the complete podcasts with episodes.
+    
+    Args:
+        client: The Flask test client fixture
+    """
+    response = client.get('/api/podcasts/?view=full')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert 'episodelists' in data['podcasts'][0]
+
+
+@pytest.mark.parametrize("query", ["fields=title,unknown", "view=compact"])
+def test_get_podcasts_invalid_projection(client, query):
+    """
+    Test that unknown fields or views are rejected.
+    
+    Args:
+        client: The Flask test client fixture
+        query: The invalid query string
+    """
+    response = client.get(f'/api/podcasts/?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
 def test_get_podcast_by_id(client):
     """
     Test retrieving a specific podcast by ID.
@@ -645,4 +709,55 @@ def test_update_podcast_partially(client, mocker, test_podcast_data):
     response = client.put('/api/podcasts/0/', json=update_data)
     assert response.status_code == 200
     data = response.get_json()
-    assert 'title' in data
\ No newline at end of file
+    assert 'title' in data
+
+
+def test_podcast_by_stable_id(client, test_podcast_data):
+    """Test addressing a podcast by its stable identifier"""
+    summaries = client.get('/api/podcasts/').get_json()['podcasts']
+    podcast_id = summaries[1]['id']
+    assert podcast_id == test_podcast_data[1].id
+
+    response = client.get(f'/api/podcasts/id/{podcast_id}/')
+    assert response.status_code == 200
+    assert response.get_json()['title'] == "Test Podcast 2"
+    assert response.get_json()['id'] == podcast_id
+
+    response = client.put(f'/api/podcasts/id/{podcast_id}/', json={"title": "Renamed"})
+    assert response.status_code == 200
+    assert response.get_json()['title'] == "Renamed"
+
+    # deleting another podcast does not change the identifier
+    assert client.delete(f"/api/podcasts/id/{summaries[0]['id']}/").status_code == 204
+    response = client.get(f'/api/podcasts/id/{podcast_id}/')
+    assert response.get_json()['title'] == "Renamed"
+
+    assert client.delete(f'/api/podcasts/id/{podcast_id}/').status_code == 204
+    assert client.get(f'/api/podcasts/id/{podcast_id}/').status_code == 404
+
+
+def test_podcast_by_stable_id_not_found(client):
+    """Test addressing an unknown stable identifier"""
+    assert client.get('/api/podcasts/id/0123456789abcdef/').status_code == 404
+    assert client.put('/api/podcasts/id/0123456789abcdef/', json={"title": "New"}).status_code == 404
+    assert client.delete('/api/podcasts/id/0123456789abcdef/').status_code == 404
+
+
+def test_get_podcasts_sorted_and_filtered(client):
+    """Test sorting and filtering the podcast listing"""
+    response = client.get('/api/podcasts/?podcast_author=A-Z&fields=title')
+    assert response.status_code == 200
+    assert response.get_json()['podcasts'] == [{"title": "Test Podcast 2"}, {"title": "Test Podcast 1"}]
+
+    response = client.get('/api/podcasts/?author=john&view=full')
+    assert [podcast['title'] for podcast in response.get_json()['podcasts']] == ["Test Podcast 1"]
+
+    response = client.get('/api/podcasts/?min_priority=6')
+    assert response.get_json()['podcasts'] == []
+
+
+@pytest.mark.parametrize('query', ['podcast_title=up', 'min_priority=high'])
+def test_get_podcasts_invalid_sort_or_filter(client, query):
+    """Test invalid sort and filter parameters"""
+    response = client.get(f'/api/podcasts/?{query}')
+    assert response.status_code == 400
@@ -0,0 +1,82 @@
+import pytest
+from datetime import datetime, timezone
+from flask import Flask
+from zpodcast.api.blueprints.search import search_bp
+from zpodcast.core.episode import PodcastEpisode
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.podcast import PodcastData
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.core.search import EpisodeSearchIndex
+
+
+@pytest.fixture
+def podcast_list():
+    episodes = [
+        PodcastEpisode(
+            title=f"Episode {number}: gardening tips",
+            audio_url=f"http://example.com/episode{number}.mp3",
+            description="Tomatoes" if number % 2 else "Roses",
+            pub_date=datetime(2023, 1, number, tzinfo=timezone.utc)
+        )
+        for number in range(1, 6)
+    ]
+    return PodcastList([PodcastData(
+        title="Garden Podcast",
+        podcast_url="http://example.com/garden.rss",
+        episodelists=[PodcastEpisodeList(name="Garden Podcast", episodes=episodes)],
+        fetch=False
+    )])
+
+
+@pytest.fixture
+def client(mocker, podcast_list):
+    """Set up a Flask app with the search blueprint registered"""
+    app = Flask(__name__)
+    mocker.patch('zpodcast.api.blueprints.search.PodcastList.get_instance', return_value=podcast_list)
+    mocker.patch('zpodcast.api.blueprints.search.EpisodeSearchIndex.get_instance',
+                 return_value=EpisodeSearchIndex())
+    app.register_blueprint(search_bp, url_prefix='/api/search')
+    return app.test_client()
+
+
+def test_search(client):
+    response = client.get('/api/search/?q=tomatoes')
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['total'] == 3
+    assert data['next_cursor'] is None
+    # equally relevant episodes are ordered newest first
+    assert [result['episode_id'] for result in data['results']] == [4, 2, 0]
+    assert data['results'][0]['podcast_id'] == 0
+    assert data['results'][0]['episodelist_id'] == 0
+    assert data['results'][0]['episode']['title'] == "Episode 5: gardening tips"
+
+
+def test_search_pagination(client):
+    first = client.get('/api/search/?q=gardening&limit=2').get_json()
+    second = client.get(f"/api/search/?q=gardening&limit=2&cursor={first['next_cursor']}").get_json()
+    third = client.get('/api/search/?q=gardening&limit=2&offset=4').get_json()
+
+    assert first['total'] == 5
+    assert first['next_cursor'] == "2"
+    assert [result['episode_id'] for result in first['results']] == [4, 3]
+    assert [result['episode_id'] for result in second['results']] == [2, 1]
+    assert second['offset'] == 2
+    assert [result['episode_id'] for result in third['results']] == [0]
+    assert third['next_cursor'] is None
+
+
+def test_search_limit_capped(client):
+    data = client.get('/api/search/?q=gardening&limit=1000').get_json()
+
+    assert data['limit'] == 100
+
+
+@pytest.mark.parametrize('query', ['', 'q=', 'q=the', 'q=gardening&limit=0', 'q=gardening&offset=-1',
+                                   'q=gardening&offset=2&cursor=2'])
+def test_search_bad_request(client, query):
+    response = client.get(f'/api/search/?{query}')
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -229,3 +229,13 @@ def test_file_loading():
         
         # Verify the app was configured
         assert app.config['DATA_DIR'] == 'mock/data/dir'
+
+
+def test_stats_reports_url_validation(test_client):
+    response = test_client.get('/api/stats/')
+
+    assert response.status_code == 200
+    assert set(response.json["url_validation"]) == {"hits", "misses", "rejected", "size", "maxsize"}
+    assert set(response.json["pub_date_parsing"]) == {"hits", "misses", "size", "maxsize"}
+    assert response.json["downloads"]["queued"] == 0
+    assert "throughput" in response.json["downloads"]
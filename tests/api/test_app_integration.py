@@ -4,6 +4,7 @@ import tempfile
 import shutil
 from flask import jsonify
 from zpodcast.api.app import zPodcastApp
+from zpodcast.parsers.rss import ParsedFeed
 from zpodcast.core.podcasts import PodcastList, PodcastData
 from zpodcast.core.playlists import PodcastPlaylist
 from zpodcast.parsers.json import PodcastJSON
@@ -40,8 +41,8 @@ def temp_data_dir():
 def mock_rss_calls():
     """Mock the RSS-related calls to prevent external network requests"""
     # Simple patch of the RSS methods that would try to access external URLs
-    with patch('zpodcast.parsers.rss.RSSPodcastParser.get_episodes', return_value=[]), \
-         patch('zpodcast.parsers.rss.RSSPodcastParser.get_rss_metadata', return_value={}):
+    with patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+               side_effect=lambda url, **kwargs: ParsedFeed(url=url)):
         yield
 
 
@@ -150,4 +150,72 @@ def test_swagger_implementation_consistency(client):
     detail_endpoint = swagger_json['paths']['/api/podcasts/{podcast_id}/']
     assert 'get' in detail_endpoint, "GET method missing for /api/podcasts/{podcast_id}/"
     assert 'put' in detail_endpoint, "PUT method missing for /api/podcasts/{podcast_id}/"
-    assert 'delete' in detail_endpoint, "DELETE method missing for /api/podcasts/{podcast_id}/"
\ No newline at end of file
+    assert 'delete' in detail_endpoint, "DELETE method missing for /api/podcasts/{podcast_id}/"
+
+
+def test_podcast_list_documents_summary_schema(client):
+    """Test that GET /api/podcasts/ documents the summary projection it returns by default"""
+    response = client.get('/apispec_1.json')
+    swagger_json = json.loads(response.data)
+
+    schema = swagger_json['paths']['/api/podcasts/']['get']['responses']['200']['schema']
+    properties = schema['properties']['podcasts']['items']['properties']
+    assert 'episode_count' in properties
+    assert 'latest_episode_date' in properties
+    assert 'episodelists' not in properties
+
+
+def test_latest_episodes_in_swagger(client):
+    """Test that the latest episodes feed and its paging parameters are documented"""
+    response = client.get('/apispec_1.json')
+    swagger_json = json.loads(response.data)
+
+    latest = swagger_json['paths']['/api/episodes/latest/']['get']
+    names = {param['name'] for param in latest['parameters']}
+    assert names == {'limit', 'offset', 'cursor', 'priority_weight'}
+    assert '400' in latest['responses']
+
+
+def test_search_paging_in_swagger(client):
+    """Test that the search takes the paging parameters of the episode listings"""
+    response = client.get('/apispec_1.json')
+    swagger_json = json.loads(response.data)
+
+    search = swagger_json['paths']['/api/search/']['get']
+    names = {param['name'] for param in search['parameters']}
+    assert names == {'q', 'limit', 'offset', 'cursor'}
+
+
+def test_episode_listing_parameters_in_swagger(client):
+    """Test that the paging, filter and sort parameters of the episode listing are documented"""
+    response = client.get('/apispec_1.json')
+    swagger_json = json.loads(response.data)
+
+    listing = swagger_json['paths']['/api/episodes/{podcast_id}/']['get']
+    names = {param['name'] for param in listing['parameters']}
+    assert {'podcast_id', 'limit', 'offset', 'cursor', 'min_duration', 'max_duration',
+            'published_after', 'published_before', 'episode_title', 'episode_date'} <= names
+    assert {'400', '404'} <= set(listing['responses'])
+
+
+def test_stable_id_episode_routes_in_swagger(client):
+    """Test that the episode routes addressed by stable identifiers are documented"""
+    response = client.get('/apispec_1.json')
+    swagger_json = json.loads(response.data)
+    paths = swagger_json['paths']
+
+    listing = paths['/api/episodes/id/{podcast_id}/']['get']
+    assert {'podcast_id', 'limit', 'cursor'} <= {param['name'] for param in listing['parameters']}
+    episode = paths['/api/episodes/id/{podcast_id}/{episode_id}/']['get']
+    assert {param['name'] for param in episode['parameters']} == {'podcast_id', 'episode_id'}
+    assert '404' in episode['responses']
+
+
+def test_stats_in_swagger(client):
+    """Test that the stats endpoint is documented with the counters it reports"""
+    response = client.get('/apispec_1.json')
+    swagger_json = json.loads(response.data)
+
+    stats = swagger_json['paths']['/api/stats/']['get']
+    properties = stats['responses']['200']['schema']['properties']
+    assert set(properties) == {'url_validation', 'pub_date_parsing', 'downloads'}
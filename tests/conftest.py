@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+import pytest
+from zpodcast.core.episode import PodcastEpisode
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.podcast import PodcastData
+from zpodcast.parsers.rss import FeedValidatorStore
+
+
+@pytest.fixture(autouse=True)
+def feed_validator_store():
+    """Give every test its own FeedValidatorStore, never persisted to the data directory"""
+    FeedValidatorStore._instance = None
+    yield
+    FeedValidatorStore._instance = None
+
+
+@pytest.fixture
+def make_episode():
+    """
+    Factory of episodes named after their title.
+
+    The audio URL is derived from the name unless given; day sets a
+    publication date in January 2023 (UTC). Other keyword arguments go to
+    PodcastEpisode.
+    """
+    def make(name, day=None, **fields):
+        fields.setdefault('title', name)
+        fields.setdefault('audio_url', f"https://example.com/{name.replace(' ', '')}.mp3")
+        if day is not None:
+            fields.setdefault('pub_date', datetime(2023, 1, day, tzinfo=timezone.utc))
+        return PodcastEpisode(**fields)
+    return make
+
+
+@pytest.fixture
+def make_podcast():
+    """
+    Factory of podcasts that never fetch their feed.
+
+    The feed URL is derived from the name unless given; episodes, when
+    given, become the podcast's episode list. Other keyword arguments go to
+    PodcastData.
+    """
+    def make(name, episodes=None, **fields):
+        fields.setdefault('title', name)
+        fields.setdefault('podcast_url', f"https://example.com/{name.replace(' ', '')}.xml")
+        if episodes is not None:
+            fields.setdefault('episodelists', [PodcastEpisodeList(name=fields['title'], episodes=episodes)])
+        return PodcastData(fetch=False, **fields)
+    return make
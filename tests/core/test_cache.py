@@ -0,0 +1,237 @@
+import errno
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+from zpodcast.core.cache import INDEX_FILE, EpisodeCache, _playlist_episodes
+from zpodcast.core.download import DOWNLOAD_COMPLETED, DownloadManager
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.playlists import PodcastPlaylist
+from zpodcast.core.podcasts import PodcastList
+from tests.core.test_download import AUDIO, AudioHandler
+
+
+def write_file(directory, name, data):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+@pytest.fixture
+def downloads(tmp_path):
+    directory = tmp_path / "downloads"
+    directory.mkdir()
+    return str(directory)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EpisodeCache(str(tmp_path / "cache"), max_size=100)
+
+
+def test_put_and_get(cache, downloads, make_episode):
+    episode = make_episode("one")
+    assert cache.get(episode) is None
+
+    path = cache.put(episode, write_file(downloads, "one.mp3", b"a" * 10))
+    assert cache.get(episode) == path
+    assert path.endswith(".mp3")
+    with open(path, 'rb') as f:
+        assert f.read() == b"a" * 10
+    assert not os.path.exists(os.path.join(downloads, "one.mp3"))
+    assert episode in cache
+    assert (len(cache), cache.size) == (1, 10)
+
+
+def test_same_content_stored_once(cache, downloads, make_episode):
+    first = make_episode("first")
+    second = make_episode("second")
+    path = cache.put(first, write_file(downloads, "first.mp3", b"same audio"))
+    assert cache.put(second, write_file(downloads, "second.mp3", b"same audio")) == path
+    assert (len(cache), cache.size) == (1, 10)
+    assert cache.get(second) == path
+
+
+def test_found_by_guid_or_url(cache, downloads, make_episode):
+    feed = "https://example.com/feed.xml"
+    original = make_episode("episode", guid="guid-1")
+    path = cache.put(original, write_file(downloads, "episode.mp3", b"audio"), feed)
+
+    # the same episode after the feed moved its audio file
+    moved = make_episode("episode", audio_url="https://mirror.example.com/e.mp3", guid="guid-1")
+    assert cache.get(moved, feed) == path
+    # the same enclosure in a feed without GUIDs
+    assert cache.get(make_episode("episode")) == path
+
+
+def test_guid_only_matches_within_its_feed(cache, downloads, make_episode):
+    first = make_episode("a", audio_url="https://a.example.com/1.mp3", guid="1")
+    cache.put(first, write_file(downloads, "a.mp3", b"audio a"), "https://a.example.com/feed.xml")
+
+    # another feed numbering its episodes the same way
+    other = make_episode("b", audio_url="https://b.example.com/1.mp3", guid="1")
+    assert cache.get(other, "https://b.example.com/feed.xml") is None
+    assert cache.get(other) is None
+
+
+def test_lru_eviction(cache, downloads, make_episode):
+    episodes = [make_episode(f"e{number}") for number in range(3)]
+    for number, episode in enumerate(episodes):
+        cache.put(episode, write_file(downloads, f"e{number}.mp3", bytes([number]) * 40))
+    # e0 was the least recently used
+    assert [episode in cache for episode in episodes] == [False, True, True]
+
+    cache.get(episodes[1])
+    cache.put(make_episode("e3"), write_file(downloads, "e3.mp3", b"x" * 40))
+    assert [episode in cache for episode in episodes] == [False, True, False]
+    assert cache.size == 80
+
+
+def test_pinned_episodes_not_evicted(tmp_path, downloads, make_episode):
+    playlist = PodcastEpisodeList(name="Queue", episodes=[])
+    cache = EpisodeCache(str(tmp_path / "cache"), max_size=100, pinned=lambda: ((episode, None) for episode in playlist.episodes))
+    pinned = make_episode("pinned")
+    cache.put(pinned, write_file(downloads, "pinned.mp3", b"p" * 60))
+    playlist.add_podcastepisode(pinned)
+
+    cache.put(make_episode("other"), write_file(downloads, "other.mp3", b"o" * 60))
+    assert pinned in cache
+    assert make_episode("other") in cache
+
+    cache.put(make_episode("third"), write_file(downloads, "third.mp3", b"t" * 30))
+    assert pinned in cache
+    assert make_episode("other") not in cache
+    assert cache.size == 90
+
+    # nothing else to evict: the pinned file stays, over the limit
+    cache.max_size = 10
+    assert len(cache.evict()) == 1
+    assert pinned in cache
+
+
+def test_playlist_pins_found_through_their_feed(tmp_path, downloads, make_episode, make_podcast, monkeypatch):
+    downloaded = make_episode("episode", guid="guid-1")
+    podcast = make_podcast("Podcast", [downloaded])
+    # the playlist copy points to an enclosure the feed has since moved
+    queued = make_episode("episode", audio_url="https://mirror.example.com/e.mp3", guid="guid-1")
+    monkeypatch.setattr(PodcastList, '_instance', PodcastList([podcast]))
+    monkeypatch.setattr(PodcastPlaylist, '_instance',
+                        PodcastPlaylist([PodcastEpisodeList(name="Queue", episodes=[queued])]))
+    cache = EpisodeCache(str(tmp_path / "cache"), max_size=100, pinned=_playlist_episodes)
+    pinned = cache.put(downloaded, write_file(downloads, "pinned.mp3", b"p" * 60), podcast.podcast_url)
+
+    cache.put(make_episode("other"), write_file(downloads, "other.mp3", b"o" * 60))
+    assert os.path.exists(pinned)
+    assert cache.size == 120
+
+
+def test_put_from_another_file_system(cache, downloads, make_episode, mocker):
+    replace = os.replace
+    source = write_file(downloads, "one.mp3", b"data")
+
+    def cross_device(src, dst):
+        if src == source:
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        replace(src, dst)
+    mocker.patch('zpodcast.core.cache.os.replace', side_effect=cross_device)
+
+    path = cache.put(make_episode("one"), source)
+    with open(path, 'rb') as f:
+        assert f.read() == b"data"
+    assert not os.path.exists(source)
+    assert not os.path.exists(path + ".partial")
+
+
+def test_index_survives_restart(tmp_path, cache, downloads, make_episode):
+    episodes = [make_episode(f"e{number}", guid=f"g{number}") for number in range(2)]
+    paths = [cache.put(episode, write_file(downloads, f"e{number}.mp3", bytes([number]) * 40))
+             for number, episode in enumerate(episodes)]
+    cache.get(episodes[0])
+    cache.flush()
+
+    reopened = EpisodeCache(cache.directory, max_size=100)
+    assert (len(reopened), reopened.size) == (2, 80)
+    # the access order was kept: e0 was used last before the restart
+    reopened.put(make_episode("e2"), write_file(downloads, "e2.mp3", b"x" * 40))
+    assert reopened.get(episodes[0]) == paths[0]
+    assert episodes[1] not in reopened
+    assert not os.path.exists(paths[1])
+
+
+def test_shared_cache_flushed_at_exit(tmp_path, monkeypatch, mocker):
+    monkeypatch.setenv('ZPODCAST_CACHE_DIR', str(tmp_path / "cache"))
+    monkeypatch.setattr(EpisodeCache, '_instance', None)
+    register = mocker.patch('zpodcast.core.cache.atexit.register')
+
+    cache = EpisodeCache.get_instance()
+    assert EpisodeCache.get_instance() is cache
+    register.assert_called_once_with(cache.flush)
+
+
+def test_restart_reads_index_without_scanning(cache, downloads, mocker, make_episode):
+    cache.put(make_episode("one"), write_file(downloads, "one.mp3", b"data"))
+    listdir = mocker.patch('os.listdir')
+    walk = mocker.patch('os.walk')
+    scandir = mocker.patch('os.scandir')
+    assert len(EpisodeCache(cache.directory)) == 1
+    assert not listdir.called and not walk.called and not scandir.called
+
+
+def test_unreadable_index(cache, downloads, make_episode):
+    cache.put(make_episode("one"), write_file(downloads, "one.mp3", b"data"))
+    with open(os.path.join(cache.directory, INDEX_FILE), 'w') as f:
+        f.write("{not json")
+    assert len(EpisodeCache(cache.directory)) == 0
+
+
+def test_file_deleted_behind_cache(cache, downloads, make_episode):
+    episode = make_episode("one")
+    os.unlink(cache.put(episode, write_file(downloads, "one.mp3", b"data")))
+    assert cache.get(episode) is None
+    assert cache.size == 0
+    with open(os.path.join(cache.directory, INDEX_FILE)) as f:
+        assert json.load(f)["entries"] == []
+
+
+def test_remove(cache, downloads, make_episode):
+    episode = make_episode("one")
+    path = cache.put(episode, write_file(downloads, "one.mp3", b"data"))
+    assert cache.remove(episode)
+    assert not os.path.exists(path)
+    assert not cache.remove(episode)
+
+
+def test_download_manager_uses_cache(tmp_path, downloads, make_episode):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), AudioHandler)
+    server.requests = []
+    server.ranges = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cache = EpisodeCache(str(tmp_path / "cache"), max_size=10 * len(AUDIO))
+    manager = DownloadManager(downloads, timeout=5, cache=cache)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/episode.mp3"
+        episode = make_episode("episode", audio_url=url, guid="guid-1")
+        manager.download(episode)
+        assert manager.wait(episode, timeout=5) == DOWNLOAD_COMPLETED
+        path = manager.get_state(episode).path
+        assert path == cache.get(episode)
+        assert os.listdir(downloads) == []
+
+        # the same enclosure listed by another feed is not downloaded again
+        other = make_episode("copy", audio_url=url, guid="other-feed-guid")
+        assert manager.download(other)
+        assert manager.get_status(other) == DOWNLOAD_COMPLETED
+        assert manager.get_state(other).path == path
+        assert len(server.requests) == 1
+    finally:
+        manager.shutdown()
+        server.shutdown()
+        server.server_close()
+
+
+def test_invalid_max_size(tmp_path):
+    with pytest.raises(ValueError):
+        EpisodeCache(str(tmp_path), max_size=0)
@@ -0,0 +1,106 @@
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from zpodcast.core.columns import (EpisodeColumns, StringPool, MISSING, decode_pub_date, encode_pub_date,
+                                   pub_date_key)
+from zpodcast.core.episode import PodcastEpisode
+
+
+@pytest.fixture
+def episodes():
+    return [
+        PodcastEpisode(title="Episode 1", audio_url="https://example.com/episode1.mp3",
+                       description="Description 1", pub_date="Mon, 11 Apr 2016 15:00:00 +0100",
+                       duration=1800, episode_number=1, image_url="https://example.com/cover.jpg",
+                       guid="episode-1"),
+        PodcastEpisode(title="Episode 2", audio_url="https://example.com/episode2.mp3",
+                       pub_date=datetime(2016, 4, 13, 8, 30), duration=None,
+                       image_url="https://example.com/cover.jpg"),
+        PodcastEpisode(title="Episode 3", audio_url="https://example.com/episode3.mp3",
+                       pub_date=date(2016, 4, 12), duration=3600, episode_number=3)
+    ]
+
+
+"""
+Tests for the string pool
+"""
+
+
+def test_string_pool_interns_strings():
+    pool = StringPool()
+    first = pool.add("https://example.com/cover.jpg")
+    second = pool.add("https://example.com/cover.jpg")
+    assert first == second
+    assert len(pool) == 1
+    assert pool.get(first) == "https://example.com/cover.jpg"
+
+
+def test_string_pool_none():
+    pool = StringPool()
+    assert pool.add(None) == MISSING
+    assert pool.get(MISSING) is None
+
+
+"""
+Tests for the episode columns
+"""
+
+
+def test_columns_round_trip(episodes):
+    columns = EpisodeColumns.from_episodes(episodes)
+    assert len(columns) == 3
+    for row, episode in enumerate(episodes):
+        materialized = columns.episode(row)
+        assert materialized == episode
+        assert materialized.guid == episode.guid
+        assert materialized.pub_date == episode.pub_date
+        assert type(materialized.pub_date) is type(episode.pub_date)
+        assert columns.to_dict(row) == episode.to_dict()
+
+
+def test_columns_share_repeated_strings(episodes):
+    columns = EpisodeColumns.from_episodes(episodes)
+    assert columns.text['image_url'][0] == columns.text['image_url'][1]
+
+
+def test_columns_total_duration_skips_missing(episodes):
+    columns = EpisodeColumns.from_episodes(episodes)
+    assert columns.total_duration() == 5400
+    assert columns.total_duration([0, 1]) == 1800
+
+
+def test_columns_filter_rows(episodes):
+    columns = EpisodeColumns.from_episodes(episodes)
+    assert columns.filter_rows(min_duration=2000) == [2]
+    assert columns.filter_rows(max_duration=3600) == [0, 2]
+    assert columns.filter_rows(published_after=date(2016, 4, 12)) == [1, 2]
+    assert columns.filter_rows(published_before=date(2016, 4, 12)) == [0, 2]
+
+
+def test_columns_sorted_rows(episodes):
+    columns = EpisodeColumns.from_episodes(episodes)
+    assert columns.sorted_rows('pub_date') == [0, 2, 1]
+    assert columns.sorted_rows('duration', reverse=True) == [2, 0, 1]
+    assert columns.sorted_rows('guid') == [1, 2, 0]
+    with pytest.raises(ValueError):
+        columns.sorted_rows('unknown')
+
+
+def test_columns_set_row(episodes):
+    columns = EpisodeColumns.from_episodes(episodes)
+    episodes[1].duration = 60
+    columns.set_row(1, episodes[1])
+    assert columns.duration(1) == 60
+
+
+def test_pub_date_key_compares_in_utc():
+    earlier = datetime(2016, 4, 11, 15, 0, tzinfo=timezone(timedelta(hours=1)))
+    later = datetime(2016, 4, 11, 14, 30, tzinfo=timezone.utc)
+    assert pub_date_key(earlier) < pub_date_key(later)
+    assert pub_date_key(earlier) == pub_date_key(earlier.astimezone(timezone.utc))
+
+
+def test_pub_date_round_trips_in_utc():
+    value = datetime(2016, 4, 11, 15, 0, 30, 250, tzinfo=timezone(timedelta(hours=1)))
+    decoded = decode_pub_date(*encode_pub_date(value))
+    assert decoded == value
+    assert decoded.utcoffset() == timedelta(0)
@@ -0,0 +1,268 @@
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from zpodcast.core.download import (DOWNLOAD_CANCELLED, DOWNLOAD_COMPLETED, DOWNLOAD_DOWNLOADING, DOWNLOAD_ERROR,
+                                    DOWNLOAD_NOT_STARTED, PARTIAL_SUFFIX, DownloadManager,
+                                    download_key)
+
+
+AUDIO = bytes(range(256)) * 1024  # 256 KiB fixture audio file
+
+
+class AudioHandler(BaseHTTPRequestHandler):
+    """Serves the fixture audio file, honouring Range requests."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get('Range')))
+        if self.path == '/missing.mp3':
+            self.send_error(404)
+            return
+
+        start = 0
+        match = re.fullmatch(r"bytes=(\d+)-", self.headers.get('Range') or "")
+        if match and server.ranges:
+            start = int(match.group(1))
+            if self.path == '/shifted.mp3':
+                # answer with a range other than the one requested
+                start += 100
+            if start >= len(AUDIO):
+                self.send_response(416)
+                self.send_header('Content-Range', f"bytes */{len(AUDIO)}")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{len(AUDIO) - 1}/{len(AUDIO)}")
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(AUDIO) - start))
+        self.end_headers()
+
+        body = AUDIO[start:]
+        if self.path == '/slow.mp3':
+            # send a first part, then hold the rest back until released
+            self.wfile.write(body[:4096])
+            self.wfile.flush()
+            server.started.set()
+            server.release.wait(5)
+            body = body[4096:]
+        try:
+            self.wfile.write(body)
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), AudioHandler)
+    server.requests = []
+    server.ranges = True
+    server.started = threading.Event()
+    server.release = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = DownloadManager(str(tmp_path), max_workers=2, chunk_size=1024, timeout=5)
+    yield manager
+    manager.shutdown(cancel=True)
+
+
+@pytest.fixture
+def served_episode(server, make_episode):
+    """Factory of episodes whose audio is served by the test server"""
+    def make(name):
+        return make_episode(name, audio_url=f"http://127.0.0.1:{server.server_port}/{name}.mp3")
+    return make
+
+
+def wait_for_progress(manager, episode, timeout=5):
+    """Wait until the first bytes of a download were received"""
+    deadline = time.monotonic() + timeout
+    while manager.get_state(episode).downloaded == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_download(server, manager, served_episode):
+    episode = served_episode("episode")
+    assert episode.get_download_status(manager) == DOWNLOAD_NOT_STARTED
+    assert episode.get_download_progress(manager) == 0
+
+    assert episode.download(manager)
+    assert manager.wait(episode, timeout=5) == DOWNLOAD_COMPLETED
+    assert episode.get_download_status(manager) == DOWNLOAD_COMPLETED
+    assert episode.get_download_progress(manager) == 100
+
+    path = manager.path_for(episode)
+    assert path == os.path.join(manager.directory, f"{download_key(episode)}.mp3")
+    with open(path, 'rb') as file:
+        assert file.read() == AUDIO
+    assert not os.path.exists(path + PARTIAL_SUFFIX)
+    assert manager.get_state(episode).total == len(AUDIO)
+
+
+def test_download_completed_file_not_fetched_again(server, manager, served_episode):
+    episode = served_episode("episode")
+    episode.download(manager)
+    manager.wait(episode, timeout=5)
+
+    other = DownloadManager(manager.directory)
+    assert episode.download(other)
+    assert episode.get_download_status(other) == DOWNLOAD_COMPLETED
+    assert len(server.requests) == 1
+    other.shutdown()
+
+
+def test_download_resumes_partial_file(server, manager, served_episode):
+    episode = served_episode("episode")
+    with open(manager.path_for(episode) + PARTIAL_SUFFIX, 'wb') as file:
+        file.write(AUDIO[:10000])
+
+    episode.download(manager)
+    assert manager.wait(episode, timeout=5) == DOWNLOAD_COMPLETED
+    assert server.requests == [("/episode.mp3", "bytes=10000-")]
+    with open(manager.path_for(episode), 'rb') as file:
+        assert file.read() == AUDIO
+
+
+def test_download_restarts_when_range_ignored(server, manager, served_episode):
+    server.ranges = False
+    episode = served_episode("episode")
+    with open(manager.path_for(episode) + PARTIAL_SUFFIX, 'wb') as file:
+        file.write(b"stale data")
+
+    episode.download(manager)
+    assert manager.wait(episode, timeout=5) == DOWNLOAD_COMPLETED
+    with open(manager.path_for(episode), 'rb') as file:
+        assert file.read() == AUDIO
+
+
+def test_download_restarts_when_other_range_sent(server, manager, served_episode):
+    episode = served_episode("shifted")
+    with open(manager.path_for(episode) + PARTIAL_SUFFIX, 'wb') as file:
+        file.write(AUDIO[:10000])
+
+    episode.download(manager)
+    assert manager.wait(episode, timeout=5) == DOWNLOAD_COMPLETED
+    assert server.requests == [("/shifted.mp3", "bytes=10000-"), ("/shifted.mp3", None)]
+    with open(manager.path_for(episode), 'rb') as file:
+        assert file.read() == AUDIO
+
+
+def test_download_partial_file_already_complete(server, manager, served_episode):
+    episode = served_episode("episode")
+    with open(manager.path_for(episode) + PARTIAL_SUFFIX, 'wb') as file:
+        file.write(AUDIO)
+
+    episode.download(manager)
+    assert manager.wait(episode, timeout=5) == DOWNLOAD_COMPLETED
+    assert os.path.getsize(manager.path_for(episode)) == len(AUDIO)
+
+
+def test_download_error(server, manager, served_episode):
+    episode = served_episode("missing")
+    episode.download(manager)
+    assert manager.wait(episode, timeout=5) == DOWNLOAD_ERROR
+    assert "404" in manager.get_state(episode).error
+    assert not os.path.exists(manager.path_for(episode))
+
+
+def test_cancel_and_resume(server, manager, served_episode):
+    episode = served_episode("slow")
+    episode.download(manager)
+    assert server.started.wait(5)
+    # the server sends the first part before the client has read it
+    wait_for_progress(manager, episode)
+    assert manager.get_state(episode).total == len(AUDIO)
+
+    assert manager.wait(episode, timeout=0.1) == DOWNLOAD_DOWNLOADING
+    assert manager.cancel(episode)
+    server.release.set()
+    assert manager.wait(episode, timeout=5) == DOWNLOAD_CANCELLED
+    assert not manager.cancel(episode)
+    partial = os.path.getsize(manager.path_for(episode) + PARTIAL_SUFFIX)
+    assert 0 < partial < len(AUDIO)
+
+    episode.download(manager)
+    assert manager.wait(episode, timeout=5) == DOWNLOAD_COMPLETED
+    assert server.requests[-1] == ("/slow.mp3", f"bytes={partial}-")
+    with open(manager.path_for(episode), 'rb') as file:
+        assert file.read() == AUDIO
+
+
+def test_cancel_queued_download(server, tmp_path, served_episode):
+    manager = DownloadManager(str(tmp_path), max_workers=1, timeout=5)
+    slow = served_episode("slow")
+    queued = served_episode("episode")
+    slow.download(manager)
+    queued.download(manager)
+    assert server.started.wait(5)
+
+    assert manager.cancel(queued)
+    assert queued.get_download_status(manager) == DOWNLOAD_CANCELLED
+    server.release.set()
+    assert manager.wait(slow, timeout=5) == DOWNLOAD_COMPLETED
+    assert [path for path, _ in server.requests] == ["/slow.mp3"]
+    manager.shutdown()
+
+
+def test_download_same_episode_once(server, manager, served_episode):
+    episode = served_episode("slow")
+    assert episode.download(manager)
+    assert server.started.wait(5)
+    assert episode.download(manager)
+    server.release.set()
+    manager.wait(episode, timeout=5)
+    assert len(server.requests) == 1
+
+
+def test_download_same_guid_in_two_feeds(server, manager, make_episode):
+    url = f"http://127.0.0.1:{server.server_port}"
+    first = make_episode("first", audio_url=f"{url}/a/1.mp3", guid="1")
+    second = make_episode("second", audio_url=f"{url}/b/1.mp3", guid="1")
+    manager.download(first)
+    manager.download(second)
+    assert manager.wait(first, timeout=5) == manager.wait(second, timeout=5) == DOWNLOAD_COMPLETED
+    assert manager.get_state(first).path != manager.get_state(second).path
+    assert sorted(path for path, _ in server.requests) == ["/a/1.mp3", "/b/1.mp3"]
+
+
+@pytest.mark.parametrize('options', [{'max_workers': 0}, {'chunk_size': 0}, {'timeout': 0}])
+def test_download_manager_invalid_options(tmp_path, options):
+    with pytest.raises(ValueError):
+        DownloadManager(str(tmp_path), **options)
+
+
+def test_download_callback(server, manager, served_episode):
+    finished = []
+    episode = served_episode("episode")
+    episode.download(manager)
+    manager.wait(episode, timeout=5)
+
+    # already on disk: called right away
+    assert manager.download(episode, callback=finished.append)
+    assert [state.status for state in finished] == [DOWNLOAD_COMPLETED]
+
+    single = DownloadManager(manager.directory, max_workers=1, timeout=5)
+    slow, queued = served_episode("slow"), served_episode("other")
+    single.download(slow, callback=finished.append)
+    single.download(queued, callback=finished.append)
+    assert server.started.wait(5)
+    single.cancel(queued)
+    server.release.set()
+    single.wait(slow, timeout=5)
+    single.shutdown()
+    assert [state.status for state in finished] == [DOWNLOAD_COMPLETED, DOWNLOAD_CANCELLED, DOWNLOAD_COMPLETED]
@@ -1,16 +1,33 @@
 import pytest
 import dataclasses
 from email.utils import parsedate_to_datetime
-from datetime import date, datetime
+from datetime import date, datetime, timezone
 from zpodcast.core.episode import PodcastEpisode
+from zpodcast.utils.urls import URLValidator
 from unittest.mock import patch
 
 
+@pytest.fixture(autouse=True)
+def clear_url_cache():
+    """URL validation results are cached across episodes, start every test cold"""
+    URLValidator.get_instance().clear()
+    yield
+    URLValidator.get_instance().clear()
+
+
 # Validate that PodcastEpisode is a dataclass
 def test_podcastepisode_is_dataclass():
     assert dataclasses.is_dataclass(PodcastEpisode)
 
 
+# Validate that PodcastEpisode keeps its state in slots
+def test_podcastepisode_is_slotted():
+    episode = PodcastEpisode(title="Episode 1", audio_url="https://example.com/episode1.mp3")
+    assert not hasattr(episode, "__dict__")
+    with pytest.raises(AttributeError):
+        episode.unknown_attribute = 1
+
+
 # Test the title attribute
 def test_podcastepisode_title():
     # Create a podcast episode object
@@ -161,7 +178,8 @@ def test_podcastepisode_pub_date_datetime():
                              pub_date=dt)
 
     # Test the publication date attribute of the podcast episode
-    assert episode.pub_date == dt
+    # naive datetimes are taken to be UTC
+    assert episode.pub_date == dt.replace(tzinfo=timezone.utc)
 
 
 def test_podcastepisode_pub_date_date():
@@ -173,7 +191,7 @@ def test_podcastepisode_pub_date_date():
                              pub_date=date.today())
 
     # Test the publication date attribute of the podcast episode
-    assert episode.pub_date == date.today()
+    assert episode.pub_date == datetime.combine(date.today(), datetime.min.time(), timezone.utc)
 
 
 def test_podcastepisode_pub_date_none():
@@ -181,7 +199,7 @@ def test_podcastepisode_pub_date_none():
     episode = PodcastEpisode(title="Episode 1",
                              description="Episode 1 description",
                              audio_url="https://example.com/episode1.mp3")
-    assert episode.pub_date == date.today()
+    assert episode.pub_date == datetime.combine(date.today(), datetime.min.time(), timezone.utc)
 
 
 def test_podcastepisode_pub_date_invalid_number():
@@ -190,7 +208,7 @@ def test_podcastepisode_pub_date_invalid_number():
                              audio_url="https://example.com/episode1.mp3",
                              duration=1800,
                              pub_date=1234)
-    assert episode.pub_date == date.today()
+    assert episode.pub_date == datetime.combine(date.today(), datetime.min.time(), timezone.utc)
 
 
 def test_podcastepisode_pub_date_invalid_str():
@@ -199,7 +217,7 @@ def test_podcastepisode_pub_date_invalid_str():
                              audio_url="https://example.com/episode1.mp3",
                              duration=1800,
                              pub_date="1234")
-    assert episode.pub_date == date.today()
+    assert episode.pub_date == datetime.combine(date.today(), datetime.min.time(), timezone.utc)
 
 
 def test_podcastepisode_pub_date_incompletedatetime():
@@ -208,7 +226,7 @@ def test_podcastepisode_pub_date_incompletedatetime():
                              audio_url="https://example.com/episode1.mp3",
                              duration=1800,
                              pub_date="12/01/2001")
-    assert episode.pub_date == date.today()
+    assert episode.pub_date == datetime.combine(date.today(), datetime.min.time(), timezone.utc)
 
 
 """
@@ -216,18 +234,35 @@ Tests to verify the image url is actually valid and set correctly
 """
 
 
-@patch("zpodcast.core.episode.validators.url", return_value=True)
+@patch("zpodcast.utils.urls.validators.url", return_value=True)
 def test_podcastepisode_audio_url(mock_validators):
     episode = PodcastEpisode(title="Episode 1", audio_url="https://example.com/episode1.mp3")
     assert episode.audio_url == "https://example.com/episode1.mp3"
     mock_validators.assert_called_once_with("https://example.com/episode1.mp3")
 
 
-@patch("zpodcast.core.episode.validators.url", return_value=False)
+@patch("zpodcast.utils.urls.validators.url", return_value=False)
 def test_podcastepisode_audio_url_invalid(mock_validators):
+    with pytest.raises(ValueError, match="^Invalid audio URL$"):
+        PodcastEpisode(title="Episode 1", audio_url="https://invalid_url")
+    mock_validators.assert_called_once_with("https://invalid_url")
+
+
+@patch("zpodcast.utils.urls.validators.url")
+def test_podcastepisode_audio_url_rejected_by_precheck(mock_validators):
     with pytest.raises(ValueError, match="^Invalid audio URL$"):
         PodcastEpisode(title="Episode 1", audio_url="invalid_url")
-    mock_validators.assert_called_once_with("invalid_url")
+    mock_validators.assert_not_called()
+
+
+@patch("zpodcast.utils.urls.validators.url", return_value=True)
+def test_podcastepisode_repeated_urls_validated_once(mock_validators):
+    for number in range(3):
+        PodcastEpisode(title=f"Episode {number}", audio_url=f"https://example.com/episode{number}.mp3",
+                       image_url="https://example.com/cover.jpg")
+    validated = [call.args[0] for call in mock_validators.call_args_list]
+    assert validated.count("https://example.com/cover.jpg") == 1
+    assert URLValidator.get_instance().stats()["hits"] == 2
 
 
 def test_podcastepisode_audio_url_badscheme():
@@ -362,7 +397,7 @@ Test the podcastepisode image url is actually valid and set correctly
 """
 
 
-@patch("zpodcast.core.episode.validators.url")
+@patch("zpodcast.utils.urls.validators.url")
 def test_podcastepisode_image_url_with_validator(mock_validators):
     # Configure the mock to return True only for the image URL
     mock_validators.side_effect = lambda url: True
@@ -371,7 +406,7 @@ def test_podcastepisode_image_url_with_validator(mock_validators):
     assert episode.image_url == "https://example.com/episode1.jpg"
 
 
-@patch("zpodcast.core.episode.validators.url")
+@patch("zpodcast.utils.urls.validators.url")
 def test_podcastepisode_image_url_with_invalid_validator(mock_validators):
     # Configure the mock to return True for audio URLs but False for image URLs
     mock_validators.side_effect = lambda url: url == "https://example.com/episode1.mp3"
@@ -435,10 +470,11 @@ def test_podcastepisode_to_dict():
         "title": "Episode 1",
         "audio_url": "https://example.com/episode1.mp3",
         "description": "Episode 1 description",
-        "pub_date": "2016-04-11T15:00:00+01:00",
+        "pub_date": "2016-04-11T14:00:00+00:00",
         "duration": 1800,
         "episode_number": 1,
-        "image_url": "https://example.com/episode1.jpg"
+        "image_url": "https://example.com/episode1.jpg",
+        "guid": None
     }
 
 
@@ -460,3 +496,99 @@ def test_podcastepisode_from_dict():
     assert episode.duration == 1800
     assert episode.episode_number == 1
     assert episode.image_url == "https://example.com/episode1.jpg"
+
+
+def test_from_normalized_assigns_values_without_setters(mocker):
+    url = mocker.patch('zpodcast.utils.urls.validators.url')
+    pub_date = datetime(2023, 1, 1, 12, 0)
+
+    episode = PodcastEpisode.from_normalized(
+        title="Episode", audio_url="https://example.com/episode.mp3", description="",
+        pub_date=pub_date, duration=60, episode_number=3,
+        image_url=None, guid="guid-1"
+    )
+
+    url.assert_not_called()
+    assert episode.audio_url == "https://example.com/episode.mp3"
+    assert episode.pub_date is pub_date
+    assert episode.duration == 60
+    assert episode.episode_number == 3
+    assert episode.guid == "guid-1"
+
+
+def test_from_dict_trusted_skips_url_validation(mocker):
+    episode_dict = PodcastEpisode(
+        title="Episode 1",
+        audio_url="https://example.com/episode1.mp3",
+        pub_date=datetime(2023, 1, 1, 12, 0),
+        duration=1800,
+        image_url="https://example.com/episode1.jpg",
+        guid="guid-1"
+    ).to_dict()
+    url = mocker.patch('zpodcast.utils.urls.validators.url')
+
+    episode = PodcastEpisode.from_dict(episode_dict, trusted=True)
+
+    url.assert_not_called()
+    assert episode.to_dict() == episode_dict
+
+
+def test_from_dict_trusted_uses_from_normalized(mocker):
+    episode_dict = PodcastEpisode(
+        title="Episode 1",
+        audio_url="https://example.com/episode1.mp3",
+        pub_date=datetime(2023, 1, 1, 12, 0),
+        duration=1800,
+        episode_number=4
+    ).to_dict()
+    from_normalized = mocker.spy(PodcastEpisode, 'from_normalized')
+    normalize = mocker.patch('zpodcast.core.episode.normalize_pub_date')
+
+    episode = PodcastEpisode.from_dict(episode_dict, trusted=True)
+
+    from_normalized.assert_called_once()
+    normalize.assert_not_called()
+    assert episode.to_dict() == episode_dict
+
+
+def test_from_dict_trusted_normalizes_bare_dates():
+    episode = PodcastEpisode.from_dict({"title": "Episode", "audio_url": "https://example.com/episode.mp3",
+                                        "pub_date": "2025-03-10", "description": None}, trusted=True)
+
+    assert episode.pub_date == datetime(2025, 3, 10, tzinfo=timezone.utc)
+    assert episode.description == ""
+
+
+def test_from_dict_untrusted_validates_urls():
+    with pytest.raises(ValueError):
+        PodcastEpisode.from_dict({"title": "Episode", "audio_url": "not a url"})
+
+
+def test_from_dict_trusted_requires_audio_url():
+    with pytest.raises(ValueError):
+        PodcastEpisode.from_dict({"title": "Episode"}, trusted=True)
+
+
+def test_from_dict_normalizes_stored_pub_dates():
+    plain = PodcastEpisode.from_dict({"title": "Episode", "audio_url": "https://example.com/episode.mp3",
+                                      "pub_date": "2023-01-15"}, trusted=True)
+    rfc822 = PodcastEpisode.from_dict({"title": "Episode", "audio_url": "https://example.com/episode.mp3",
+                                       "pub_date": "Sun, 15 Jan 2023 10:00:00 +0100"})
+
+    assert plain.pub_date == datetime(2023, 1, 15, tzinfo=timezone.utc)
+    assert rfc822.pub_date == datetime(2023, 1, 15, 9, 0, tzinfo=timezone.utc)
+    assert rfc822.pub_date.tzinfo is timezone.utc
+
+
+def test_podcastepisode_pub_date_struct_time():
+    episode = PodcastEpisode(title="Episode", audio_url="https://example.com/episode.mp3",
+                             pub_date=datetime(2023, 1, 15, 10, 30).timetuple())
+
+    assert episode.pub_date == datetime(2023, 1, 15, 10, 30, tzinfo=timezone.utc)
+
+
+def test_podcastepisode_pub_date_aware_converted_to_utc():
+    episode = PodcastEpisode(title="Episode", audio_url="https://example.com/episode.mp3",
+                             pub_date="2023-01-15T10:30:00-05:00")
+
+    assert episode.pub_date.isoformat() == "2023-01-15T15:30:00+00:00"
@@ -0,0 +1,77 @@
+import pytest
+from datetime import timedelta
+from zpodcast.core.latest import LatestEpisode, MAX_PAGE_SIZE, latest_episodes
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.podcasts import PodcastList
+
+
+@pytest.fixture
+def podcast_list(make_episode, make_podcast):
+    return PodcastList([
+        make_podcast(name, [make_episode(f"{name}{day}", day=day) for day in days])
+        for name, days in (("a", [1, 5, 3]), ("b", [4, 2]), ("c", []), ("d", [6, 1]))
+    ])
+
+
+def titles(podcast_list, page):
+    return [podcast_list.podcasts[latest.podcast_id].episodelists[latest.episodelist_id]
+            .get_episode(latest.episode_id).title for latest in page]
+
+
+def test_latest_episodes_merges_all_podcasts(podcast_list):
+    page = latest_episodes(podcast_list, limit=10)
+    assert titles(podcast_list, page) == ["d6", "a5", "b4", "a3", "b2", "a1", "d1"]
+    assert page[0] == LatestEpisode(3, 0, 0)
+
+
+def test_latest_episodes_paging(podcast_list):
+    everything = latest_episodes(podcast_list, limit=10)
+    assert latest_episodes(podcast_list, offset=0, limit=3) == everything[:3]
+    assert latest_episodes(podcast_list, offset=3, limit=3) == everything[3:6]
+    assert latest_episodes(podcast_list, offset=6, limit=3) == everything[6:]
+    assert latest_episodes(podcast_list, offset=20, limit=3) == []
+
+
+def test_latest_episodes_priority_weight(podcast_list):
+    podcast_list.podcasts[1].podcast_priority = 2
+    page = latest_episodes(podcast_list, limit=3, priority_weight=timedelta(days=1))
+    # b4 counts as published on the 6th like d6, b comes first in the list
+    assert titles(podcast_list, page) == ["b4", "d6", "a5"]
+    page = latest_episodes(podcast_list, limit=3, priority_weight=timedelta(0))
+    assert titles(podcast_list, page) == ["d6", "a5", "b4"]
+
+    podcast_list.podcasts[3].podcast_priority = -10
+    page = latest_episodes(podcast_list, limit=2, priority_weight=timedelta(days=1))
+    assert titles(podcast_list, page) == ["b4", "a5"]
+
+
+def test_latest_episodes_follows_changes(podcast_list, make_episode):
+    assert titles(podcast_list, latest_episodes(podcast_list, limit=1)) == ["d6"]
+    podcast_list.podcasts[2].episodelists[0].add_podcastepisode(make_episode("c7", day=7))
+    assert titles(podcast_list, latest_episodes(podcast_list, limit=1)) == ["c7"]
+
+
+def test_latest_episodes_invalid(podcast_list):
+    with pytest.raises(ValueError):
+        latest_episodes(podcast_list, offset=-1)
+    with pytest.raises(ValueError):
+        latest_episodes(podcast_list, limit=0)
+    with pytest.raises(ValueError):
+        latest_episodes(podcast_list, limit=MAX_PAGE_SIZE + 1)
+    with pytest.raises(ValueError):
+        latest_episodes(podcast_list, priority_weight=timedelta(hours=-1))
+
+
+def test_newest_first_cached_until_mutation(make_episode):
+    episodelist = PodcastEpisodeList(name="List", episodes=[
+        make_episode("x", day=2), make_episode("y", day=3), make_episode("z", day=2)
+    ])
+    order = episodelist.newest_first()
+    assert order == [1, 0, 2]
+    assert episodelist.newest_first() is order
+
+    episodelist.add_podcastepisode(make_episode("w", day=9))
+    assert episodelist.newest_first() == [3, 1, 0, 2]
+
+    episodelist.to_columnar()
+    assert episodelist.newest_first() == [3, 1, 0, 2]
@@ -1,6 +1,7 @@
 import pytest
 from datetime import date
-from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.columns import EpisodeColumns
+from zpodcast.core.playlist import CHANGE_LOG_SIZE, PodcastEpisodeList
 from zpodcast.core.episode import PodcastEpisode
 
 
@@ -245,19 +246,21 @@ def test_to_dict():
                 "title": "Episode 1",
                 "audio_url": "https://example.com/episode1.mp3",
                 "description": "",
-                "pub_date": date.today().isoformat(),
+                "pub_date": date.today().isoformat() + "T00:00:00+00:00",
                 "duration": 1800,
                 "episode_number": None,
-                "image_url": None
+                "image_url": None,
+                "guid": None
             },
             {
                 "title": "Episode 2",
                 "audio_url": "https://example.com/episode2.mp3",
                 "description": "",
-                "pub_date": date.today().isoformat(),
+                "pub_date": date.today().isoformat() + "T00:00:00+00:00",
                 "duration": 3600,
                 "episode_number": None,
-                "image_url": None
+                "image_url": None,
+                "guid": None
             }
         ]
     }
@@ -288,3 +291,321 @@ def test_retrieve_episodes_from_rss(mocker):
     assert len(playlist.episodes) == 2
     assert playlist.episodes[0].title == 'Episode 1'
     assert playlist.episodes[1].title == 'Episode 2'
+
+
+def make_entry(number, **overrides):
+    entry = {
+        "title": f"Episode {number}",
+        "audio_url": f"https://example.com/episode{number}.mp3",
+        "description": f"Description {number}",
+        "pub_date": "Mon, 11 Apr 2024 15:00:00 +0100",
+        "duration": 1800,
+        "episode_number": number,
+        "image_url": None,
+        "guid": f"episode-{number}"
+    }
+    entry.update(overrides)
+    return entry
+
+
+def test_merge_entries_into_empty_list():
+    playlist = PodcastEpisodeList(name="Test Playlist", episodes=[])
+    result = playlist.merge_entries([make_entry(1), make_entry(2)])
+
+    assert [episode.title for episode in playlist.episodes] == ["Episode 1", "Episode 2"]
+    assert result.added == playlist.episodes
+    assert result.to_dict() == {"added": 2, "updated": 0, "unchanged": 0, "skipped": 0}
+
+
+def test_merge_entries_keeps_existing_episode_objects():
+    playlist = PodcastEpisodeList(name="Test Playlist", episodes=[])
+    playlist.merge_entries([make_entry(1), make_entry(2)])
+    episode1, episode2 = playlist.episodes
+
+    result = playlist.merge_entries([make_entry(3), make_entry(1), make_entry(2)])
+
+    assert playlist.episodes[0] is episode1
+    assert playlist.episodes[1] is episode2
+    assert playlist.episodes[2].title == "Episode 3"
+    assert result.to_dict() == {"added": 1, "updated": 0, "unchanged": 2, "skipped": 0}
+    assert result.changed
+
+
+def test_merge_entries_updates_changed_episode_in_place():
+    playlist = PodcastEpisodeList(name="Test Playlist", episodes=[])
+    playlist.merge_entries([make_entry(1)])
+    episode = playlist.episodes[0]
+
+    result = playlist.merge_entries([make_entry(1, title="Episode 1 (corrected)")])
+
+    assert playlist.episodes == [episode]
+    assert episode.title == "Episode 1 (corrected)"
+    assert result.updated == [episode]
+
+
+def test_merge_entries_unchanged_feed():
+    playlist = PodcastEpisodeList(name="Test Playlist", episodes=[])
+    playlist.merge_entries([make_entry(1), make_entry(2)])
+
+    result = playlist.merge_entries([make_entry(1), make_entry(2)])
+
+    assert len(playlist.episodes) == 2
+    assert not result.changed
+    assert result.unchanged == 2
+
+
+def test_merge_entries_keeps_episodes_missing_from_feed():
+    playlist = PodcastEpisodeList(name="Test Playlist", episodes=[])
+    playlist.merge_entries([make_entry(1), make_entry(2)])
+
+    playlist.merge_entries([make_entry(2)])
+
+    assert [episode.title for episode in playlist.episodes] == ["Episode 1", "Episode 2"]
+
+
+def test_merge_entries_matches_by_audio_url_without_guid():
+    existing = PodcastEpisode(title="Episode 1", audio_url="https://example.com/episode1.mp3")
+    playlist = PodcastEpisodeList(name="Test Playlist", episodes=[existing])
+
+    result = playlist.merge_entries([make_entry(1)])
+
+    assert playlist.episodes == [existing]
+    assert existing.guid == "episode-1"
+    assert result.updated == [existing]
+
+
+def test_merge_entries_distinct_guids_sharing_audio_url():
+    playlist = PodcastEpisodeList(name="Test Playlist", episodes=[])
+    playlist.merge_entries([make_entry(1)])
+
+    result = playlist.merge_entries([make_entry(2, audio_url="https://example.com/episode1.mp3")])
+
+    assert len(playlist.episodes) == 2
+    assert len(result.added) == 1
+
+
+def test_merge_entries_skips_invalid_entries():
+    playlist = PodcastEpisodeList(name="Test Playlist", episodes=[])
+
+    result = playlist.merge_entries([make_entry(1, audio_url="not a url"),
+                                     make_entry(2, guid=None, audio_url=None)])
+
+    assert playlist.episodes == []
+    assert result.skipped == 2
+
+
+def test_merge_entries_after_episodes_replaced():
+    playlist = PodcastEpisodeList(name="Test Playlist", episodes=[])
+    playlist.merge_entries([make_entry(1)])
+    playlist.episodes = []
+
+    result = playlist.merge_entries([make_entry(1)])
+
+    assert len(playlist.episodes) == 1
+    assert len(result.added) == 1
+
+
+def test_changes_since_merges():
+    playlist = PodcastEpisodeList(name="Test Playlist", episodes=[])
+    playlist.merge_entries([make_entry(1), make_entry(2)])
+    revision = playlist.revision
+
+    playlist.name = "Renamed"
+    assert playlist.changes_since(revision) == []
+    playlist.merge_entries([make_entry(3), make_entry(2, title="Episode 2 (corrected)")])
+    playlist.merge_entries([make_entry(4)])
+
+    assert playlist.changes_since(revision) == [1, 2, 3]
+    assert playlist.changes_since(playlist.revision) == []
+
+
+def test_changes_since_unknown_changes():
+    playlist = PodcastEpisodeList(name="Test Playlist", episodes=[])
+    playlist.merge_entries([make_entry(1), make_entry(2)])
+    revision = playlist.revision
+
+    playlist.move_episode_down(0)
+    assert playlist.changes_since(revision) is None
+
+    revision = playlist.revision
+    playlist.episodes.append(PodcastEpisode(title="Direct", audio_url="https://example.com/direct.mp3"))
+    assert playlist.changes_since(revision) is None
+
+    revision = playlist.revision
+    for _ in range(CHANGE_LOG_SIZE + 1):
+        playlist.name = "Renamed"
+    assert playlist.changes_since(revision) is None
+
+
+"""
+Tests for the columnar backing store
+"""
+
+
+@pytest.fixture
+def columnar_playlist():
+    episodes = [
+        PodcastEpisode(title="Episode 1", audio_url="https://example.com/episode1.mp3", duration=1800,
+                       pub_date="Mon, 11 Apr 2016 15:00:00 +0100"),
+        PodcastEpisode(title="Episode 2", audio_url="https://example.com/episode2.mp3", duration=3600,
+                       pub_date="Wed, 13 Apr 2016 15:00:00 +0100"),
+        PodcastEpisode(title="Episode 3", audio_url="https://example.com/episode3.mp3", duration=600,
+                       pub_date="Tue, 12 Apr 2016 15:00:00 +0100")
+    ]
+    return PodcastEpisodeList(name="Test Playlist", episodes=episodes, columnar=True)
+
+
+def test_columnar_aggregates_without_materializing(columnar_playlist):
+    assert columnar_playlist.is_columnar
+    assert columnar_playlist.get_num_items() == 3
+    assert columnar_playlist.calculate_duration() == 6000
+    assert columnar_playlist.get_episode_details(1) == {
+        "title": "Episode 2", "duration": 3600, "audio_url": "https://example.com/episode2.mp3"
+    }
+    assert [details["title"] for details in columnar_playlist.get_all_episode_details()] == [
+        "Episode 1", "Episode 2", "Episode 3"
+    ]
+    assert columnar_playlist.latest_pub_date().isoformat() == "2016-04-13T14:00:00+00:00"
+    assert columnar_playlist.is_columnar
+
+
+def test_columnar_filter_and_sort(columnar_playlist):
+    assert columnar_playlist.filter_episode_indices(min_duration=1000) == [0, 1]
+    assert columnar_playlist.sorted_episode_indices('pub_date', reverse=True) == [1, 2, 0]
+    assert columnar_playlist.is_columnar
+
+
+@pytest.mark.parametrize("key", ["pub_date", "duration", "episode_number", "title", "guid"])
+def test_row_store_sort_matches_columnar(columnar_playlist, mocker, key):
+    row_playlist = PodcastEpisodeList(name="Test Playlist", episodes=list(columnar_playlist.episodes))
+    row_playlist.episodes[1].episode_number = 4
+    row_playlist.episodes[2].guid = "guid-3"
+    columnar = PodcastEpisodeList(name="Test Playlist", episodes=list(row_playlist.episodes), columnar=True)
+    from_episodes = mocker.spy(EpisodeColumns, 'from_episodes')
+
+    for reverse in (False, True):
+        assert row_playlist.sorted_episode_indices(key, reverse) == columnar.sorted_episode_indices(key, reverse)
+    for bounds in ({"min_duration": 1000}, {"max_duration": 1800},
+                   {"published_after": date(2016, 4, 12), "published_before": date(2016, 4, 12)}):
+        assert row_playlist.filter_episode_indices(**bounds) == columnar.filter_episode_indices(**bounds)
+    # the row store never builds a throwaway columnar copy
+    assert from_episodes.call_count == 0
+
+
+def test_row_store_sort_unknown_key():
+    with pytest.raises(ValueError):
+        PodcastEpisodeList(name="Test Playlist", episodes=[]).sorted_episode_indices('unknown')
+
+
+def test_columnar_views_are_lazy_and_stable(columnar_playlist):
+    episode = columnar_playlist.get_episode(1)
+    assert episode.title == "Episode 2"
+    assert columnar_playlist.get_episodes([1])[0] is episode
+
+    episode.duration = 60
+    assert columnar_playlist.calculate_duration() == 2460
+    assert columnar_playlist.get_episode_dicts(1, 2)[0]["duration"] == 60
+    assert columnar_playlist.is_columnar
+
+
+def test_columnar_to_dict_matches_row_store(columnar_playlist):
+    columnar_dict = columnar_playlist.to_dict()
+    row_playlist = PodcastEpisodeList(name="Test Playlist", episodes=list(columnar_playlist.episodes))
+    assert row_playlist.to_dict() == columnar_dict
+
+
+def test_columnar_episodes_property_materializes(columnar_playlist):
+    episode = columnar_playlist.get_episode(0)
+    episodes = columnar_playlist.episodes
+    assert not columnar_playlist.is_columnar
+    assert episodes[0] is episode
+    assert len(episodes) == 3
+
+
+def test_columnar_add_podcastepisode(columnar_playlist):
+    episode = PodcastEpisode(title="Episode 4", audio_url="https://example.com/episode4.mp3", duration=100)
+    columnar_playlist.add_podcastepisode(episode)
+    assert columnar_playlist.is_columnar
+    assert columnar_playlist.get_num_items() == 4
+    assert columnar_playlist.get_episode(-1) is episode
+    assert columnar_playlist.calculate_duration() == 6100
+
+
+def test_from_dict_restores_pub_dates():
+    data = {
+        "name": "Test Playlist",
+        "episodes": [{"title": "Episode 1", "audio_url": "https://example.com/episode1.mp3",
+                      "pub_date": "2023-01-01T12:00:00+00:00"}]
+    }
+
+    for trusted in (False, True):
+        playlist = PodcastEpisodeList.from_dict(data, trusted=trusted)
+        assert playlist.episodes[0].pub_date.isoformat() == "2023-01-01T12:00:00+00:00"
+
+
+def test_from_dict_trusted_skips_url_validation(mocker):
+    data = {
+        "name": "Test Playlist",
+        "episodes": [{"title": "Episode 1", "audio_url": "https://example.com/episode1.mp3",
+                      "image_url": "https://example.com/episode1.jpg"}]
+    }
+    url = mocker.patch('zpodcast.utils.urls.validators.url')
+
+    playlist = PodcastEpisodeList.from_dict(data, trusted=True)
+
+    url.assert_not_called()
+    assert playlist.episodes[0].image_url == "https://example.com/episode1.jpg"
+
+
+def test_find_episode_index_by_id():
+    episodes = [PodcastEpisode(title=f"Episode {number}", audio_url=f"https://example.com/{number}.mp3",
+                               guid=f"guid-{number}" if number % 2 else None)
+                for number in range(4)]
+    playlist = PodcastEpisodeList(name="Ids", episodes=list(episodes))
+
+    assert [playlist.find_episode_index(episode.id) for episode in episodes] == [0, 1, 2, 3]
+    assert playlist.find_episode_index("0123456789abcdef") is None
+
+    playlist.remove_podcastepisode(0)
+    assert playlist.find_episode_index(episodes[3].id) == 2
+    assert playlist.find_episode_index(episodes[0].id) is None
+
+    added = PodcastEpisode(title="Episode 4", audio_url="https://example.com/4.mp3", guid="guid-4")
+    playlist.add_podcastepisode(added)
+    assert playlist.find_episode_index(added.id) == 3
+
+    playlist.move_episode_to_position(3, 0)
+    assert playlist.find_episode_index(added.id) == 0
+
+
+def test_find_episode_index_columnar():
+    episodes = [PodcastEpisode(title=f"Episode {number}", audio_url=f"https://example.com/{number}.mp3",
+                               guid=f"guid-{number}")
+                for number in range(3)]
+    playlist = PodcastEpisodeList(name="Ids", episodes=list(episodes), columnar=True)
+
+    assert playlist.find_episode_index(episodes[2].id) == 2
+    assert playlist.is_columnar
+
+    added = PodcastEpisode(title="Episode 3", audio_url="https://example.com/3.mp3", guid="guid-3")
+    playlist.add_podcastepisode(added)
+    assert playlist.find_episode_index(added.id) == 3
+    assert playlist.is_columnar
+
+
+def test_find_episode_index_after_merge():
+    playlist = PodcastEpisodeList(name="Ids", episodes=[
+        PodcastEpisode(title="Episode 1", audio_url="https://example.com/1.mp3")
+    ])
+    old_id = playlist.get_episode(0).id
+    assert playlist.find_episode_index(old_id) == 0
+
+    # the feed now publishes a GUID for the episode, and a new episode
+    playlist.merge_entries([
+        {"title": "Episode 1", "audio_url": "https://example.com/1.mp3", "guid": "guid-1"},
+        {"title": "Episode 2", "audio_url": "https://example.com/2.mp3", "guid": "guid-2"}
+    ])
+
+    assert playlist.find_episode_index(playlist.get_episode(0).id) == 0
+    assert playlist.find_episode_index(playlist.get_episode(1).id) == 1
+    assert playlist.find_episode_index(old_id) is None
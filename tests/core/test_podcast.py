@@ -3,6 +3,7 @@ import dataclasses
 from zpodcast.core.podcast import PodcastData
 from zpodcast.core.playlist import PodcastEpisodeList
 from zpodcast.core.episode import PodcastEpisode
+from zpodcast.parsers.rss import ParsedFeed
 
 
 # Use snake_case for constants and variables as per PEP 8
@@ -23,14 +24,16 @@ def mocked_rssepisodemethods(mocker):
     """
     Fixture for mocking RSS episode methods.
     
-    Creates mocks for get_episodes and get_rss_metadata methods.
+    Creates a mock for the single-pass parse_feed method.
     """
-    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.get_episodes', return_value=[episode1, episode2])
-    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.get_rss_metadata',
-                 return_value={"title": f"{L_TITLE}",
-                               "description": f"{L_DESCRIPTION}",
-                               "author": f"{L_HOST}",
-                               "image": f"{L_IMAGE_URL}"})
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                 return_value=ParsedFeed(url=L_PODCAST_URL,
+                                         entries=[{"title": "Episode 1", "audio_url": "https://example.com/episode1.mp3"},
+                                                  {"title": "Episode 2", "audio_url": "https://example.com/episode2.mp3"}],
+                                         metadata={"title": f"{L_TITLE}",
+                                                   "description": f"{L_DESCRIPTION}",
+                                                   "author": f"{L_HOST}",
+                                                   "image": f"{L_IMAGE_URL}"}))
 
 
 """
@@ -517,8 +520,10 @@ def test_populate_episodelists_from_rss(mocked_rssepisodemethods):
     assert podcast_data.episodelists[0].episodes == [episode1, episode2]
 
 
-def test_name_set_manually():
+def test_name_set_manually(mocker):
     """Test that name_set_manually is always set to False."""
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                 return_value=ParsedFeed(url=L_PODCAST_URL))
     podcast_data = PodcastData(
         title=L_TITLE,
         podcast_url=L_PODCAST_URL,
@@ -532,8 +537,10 @@ def test_name_set_manually():
     assert podcast_data.name_set_manually is False
 
 
-def test_update_podcast_list_name_if_empty():
+def test_update_podcast_list_name_if_empty(mocker):
     """Test that podcast list name is updated if empty."""
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                 return_value=ParsedFeed(url=L_PODCAST_URL))
     podcast_data = PodcastData(
         title=L_TITLE,
         podcast_url=L_PODCAST_URL,
@@ -549,8 +556,10 @@ def test_update_podcast_list_name_if_empty():
     assert podcast_data.name_set_manually is False
 
 
-def test_update_podcast_list_name_if_set_manually():
+def test_update_podcast_list_name_if_set_manually(mocker):
     """Test that podcast list name is updated even if name_set_manually is True."""
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                 return_value=ParsedFeed(url=L_PODCAST_URL))
     podcast_data = PodcastData(
         title=L_TITLE,
         podcast_url=L_PODCAST_URL,
@@ -564,3 +573,235 @@ def test_update_podcast_list_name_if_set_manually():
     podcast_data.populate_episodes_from_feed()
     assert podcast_data.episodelists[0].name == f"{L_TITLE} episode list"
     assert podcast_data.name_set_manually is False
+
+
+def test_populate_episodes_not_modified_keeps_episodes(mocker):
+    """Test that a 304 Not Modified feed leaves the episode lists untouched."""
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                 return_value=ParsedFeed(url=L_PODCAST_URL,
+                                         entries=[{"title": "Episode 1", "audio_url": "https://example.com/episode1.mp3"},
+                                                  {"title": "Episode 2", "audio_url": "https://example.com/episode2.mp3"}],
+                                         metadata={"description": L_DESCRIPTION, "author": L_HOST}))
+    podcast_data = PodcastData(
+        title=L_TITLE,
+        podcast_url=L_PODCAST_URL,
+        host=L_HOST,
+        description=L_DESCRIPTION,
+        episodelists=episodelists,
+        podcast_priority=5,
+        image_url=L_IMAGE_URL
+    )
+    existing_lists = podcast_data.episodelists
+
+    mock_parse_feed = mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                                   return_value=ParsedFeed(url=L_PODCAST_URL, not_modified=True))
+    podcast_data.populate_episodes_from_feed()
+
+    mock_parse_feed.assert_called_once_with(L_PODCAST_URL, conditional=True, timeout=None)
+    assert podcast_data.episodelists is existing_lists
+    assert podcast_data.episodelists[0].episodes == [episode1, episode2]
+
+
+def test_populate_episodes_failed_fetch_keeps_podcast(mocker):
+    """Test that a failed feed fetch leaves the podcast untouched and pending."""
+    podcast_data = PodcastData(
+        title=L_TITLE,
+        podcast_url=L_PODCAST_URL,
+        host=L_HOST,
+        description=L_DESCRIPTION,
+        episodelists=[PodcastEpisodeList(name="Custom Name", episodes=[episode1])],
+        name_set_manually=True,
+        fetch=False
+    )
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                 return_value=ParsedFeed(url=L_PODCAST_URL, error="HTTP error 500"))
+
+    parsed = podcast_data.populate_episodes_from_feed()
+
+    assert parsed.error == "HTTP error 500"
+    assert (podcast_data.host, podcast_data.description) == (L_HOST, L_DESCRIPTION)
+    assert podcast_data.name_set_manually is True
+    assert podcast_data.episodelists[0].name == "Custom Name"
+    assert podcast_data.episodelists[0].episodes == [episode1]
+    assert podcast_data.refresh_pending
+
+
+def test_populate_episodes_parses_feed_once(mocker):
+    """Test that episodes and metadata come from a single feed parse."""
+    mock_parse = mocker.patch('feedparser.parse')
+    mock_parse.return_value = mocker.MagicMock(
+        bozo=False,
+        status=200,
+        entries=[{
+            'title': 'Episode 1',
+            'enclosures': [{'href': 'https://example.com/episode1.mp3'}],
+            'description': 'Description 1',
+            'published': 'Mon, 11 Apr 2024 15:00:00 +0100'
+        }],
+        feed={'title': L_TITLE, 'description': 'Feed description', 'author': 'Feed Author'}
+    )
+    podcast_data = PodcastData(
+        title=L_TITLE,
+        podcast_url=L_PODCAST_URL,
+        episodelists=[],
+    )
+
+    assert mock_parse.call_count == 1
+    assert podcast_data.episodelists[0].episodes[0].title == 'Episode 1'
+    assert podcast_data.host == 'Feed Author'
+    assert podcast_data.description == 'Feed description'
+
+
+"""
+Tests for hydrate-only construction and deferred refresh
+"""
+
+
+def test_from_dict_hydrates_without_fetching(mocker):
+    """Test that from_dict keeps the stored episodes and does no network access."""
+    mock_parse_feed = mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed')
+    podcast_dict = {
+        "title": L_TITLE,
+        "podcast_url": L_PODCAST_URL,
+        "host": L_HOST,
+        "description": L_DESCRIPTION,
+        "episodelists": [episodelist1.to_dict()],
+        "podcast_priority": 5,
+        "image_url": L_IMAGE_URL,
+        "name_set_manually": True
+    }
+
+    podcast_data = PodcastData.from_dict(podcast_dict)
+
+    mock_parse_feed.assert_not_called()
+    assert podcast_data.to_dict() == podcast_dict
+    assert podcast_data.refresh_pending is True
+
+
+def test_from_dict_with_fetch(mocked_rssepisodemethods):
+    """Test that from_dict can still fetch the feed when asked to."""
+    podcast_dict = {
+        "title": L_TITLE,
+        "podcast_url": L_PODCAST_URL,
+        "episodelists": [],
+    }
+
+    podcast_data = PodcastData.from_dict(podcast_dict, fetch=True)
+
+    assert podcast_data.refresh_pending is False
+    assert podcast_data.episodelists[0].episodes == [episode1, episode2]
+
+
+def test_refresh_pending_cleared_by_populate(mocked_rssepisodemethods):
+    """Test that a hydrated podcast stops being pending once refreshed."""
+    podcast_data = PodcastData(
+        title=L_TITLE,
+        podcast_url=L_PODCAST_URL,
+        episodelists=episodelists,
+        fetch=False
+    )
+    assert podcast_data.refresh_pending is True
+    assert podcast_data.episodelists == episodelists
+
+    podcast_data.populate_episodes_from_feed()
+
+    assert podcast_data.refresh_pending is False
+
+
+def test_populate_episodes_merges_into_existing_list(mocker):
+    """Test that a refresh merges new entries instead of rebuilding the episode list."""
+    entries = [{"title": "Episode 1", "audio_url": "https://example.com/episode1.mp3", "guid": "episode-1"}]
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                 return_value=ParsedFeed(url=L_PODCAST_URL, entries=entries))
+    podcast_data = PodcastData(title=L_TITLE, podcast_url=L_PODCAST_URL)
+    episode_list = podcast_data.episodelists[0]
+    existing_episode = episode_list.episodes[0]
+
+    new_entry = {"title": "Episode 2", "audio_url": "https://example.com/episode2.mp3", "guid": "episode-2"}
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                 return_value=ParsedFeed(url=L_PODCAST_URL, entries=[new_entry] + entries))
+    parsed = podcast_data.populate_episodes_from_feed()
+
+    assert podcast_data.episodelists[0] is episode_list
+    assert episode_list.episodes[0] is existing_episode
+    assert [episode.title for episode in episode_list.episodes] == ["Episode 1", "Episode 2"]
+    assert parsed.merge_result.to_dict() == {"added": 1, "updated": 0, "unchanged": 1, "skipped": 0}
+
+
+def test_get_episodes_window(mocked_rssepisodemethods):
+    """Test that get_episodes only serializes the requested window."""
+    podcast_data = PodcastData(
+        title=L_TITLE,
+        podcast_url=L_PODCAST_URL,
+        episodelists=[PodcastEpisodeList(name="Window", episodes=[episode1, episode2])],
+        fetch=False
+    )
+
+    page = podcast_data.get_episodes(offset=0, limit=1)
+    assert page["episodes"] == [{**episode1.to_dict(), "id": episode1.id}]
+    assert page["total"] == 2
+    assert page["next_cursor"] == "1"
+
+    page = podcast_data.get_episodes(offset=1, limit=1)
+    assert page["episodes"] == [{**episode2.to_dict(), "id": episode2.id}]
+    assert page["next_cursor"] is None
+
+
+def test_get_episodes_invalid_window():
+    """Test that a negative offset or non-positive limit is rejected."""
+    podcast_data = PodcastData(title=L_TITLE, podcast_url=L_PODCAST_URL, fetch=False)
+    assert podcast_data.get_episodes()["episodes"] == []
+    with pytest.raises(ValueError):
+        podcast_data.get_episodes(offset=-1)
+    with pytest.raises(ValueError):
+        podcast_data.get_episodes(limit=0)
+
+
+def test_to_summary_dict(mocked_rssepisodemethods):
+    """Test the summary projection of a podcast."""
+    newer = PodcastEpisode(title="Episode 3", audio_url="https://example.com/episode3.mp3",
+                           pub_date="Tue, 12 Apr 2016 15:00:00 +0100")
+    older = PodcastEpisode(title="Episode 4", audio_url="https://example.com/episode4.mp3",
+                           pub_date="Mon, 11 Apr 2016 15:00:00 +0100")
+    podcast_data = PodcastData(
+        title=L_TITLE,
+        podcast_url=L_PODCAST_URL,
+        host=L_HOST,
+        episodelists=[PodcastEpisodeList(name="Summary", episodes=[older, newer])],
+        fetch=False
+    )
+
+    summary = podcast_data.to_summary_dict()
+    assert "episodelists" not in summary
+    assert summary["episode_count"] == 2
+    assert summary["latest_episode_date"] == "2016-04-12T14:00:00+00:00"
+    assert summary["host"] == L_HOST
+
+    assert podcast_data.to_summary_dict(["title", "episode_count"]) == {"title": L_TITLE, "episode_count": 2}
+    with pytest.raises(ValueError):
+        podcast_data.to_summary_dict(["episodelists"])
+
+
+def test_podcast_id():
+    podcast_data = PodcastData(title=L_TITLE, podcast_url=L_PODCAST_URL, fetch=False)
+    podcast_id = podcast_data.id
+
+    assert podcast_id == PodcastData(title="Other", podcast_url=L_PODCAST_URL, fetch=False).id
+    assert podcast_data.to_summary_dict(["id"]) == {"id": podcast_id}
+
+    podcast_data.podcast_url = "http://example.com/moved.rss"
+    assert podcast_data.id != podcast_id
+
+
+def test_find_episode_by_id():
+    podcast_data = PodcastData(
+        title=L_TITLE,
+        podcast_url=L_PODCAST_URL,
+        episodelists=[PodcastEpisodeList(name="Ids", episodes=[episode1, episode2])],
+        fetch=False
+    )
+
+    assert podcast_data.find_episode(episode2.id) is episode2
+    assert podcast_data.find_episode_index(episode1.id) == 0
+    assert podcast_data.find_episode("0123456789abcdef") is None
+    assert PodcastData(title=L_TITLE, podcast_url=L_PODCAST_URL, fetch=False).find_episode(episode1.id) is None
@@ -55,10 +55,11 @@ def test_to_dict():
                         "title": "Episode 1",
                         "audio_url": "https://example.com/episode1.mp3",
                         "description": "",
-                        "pub_date": date.today().isoformat(),
+                        "pub_date": date.today().isoformat() + "T00:00:00+00:00",
                         "duration": None,
                         "episode_number": None,
-                        "image_url": None
+                        "image_url": None,
+                        "guid": None
                     }
                 ]
             },
@@ -69,10 +70,11 @@ def test_to_dict():
                         "title": "Episode 2",
                         "audio_url": "https://example.com/episode2.mp3",
                         "description": "",
-                        "pub_date": date.today().isoformat(),
+                        "pub_date": date.today().isoformat() + "T00:00:00+00:00",
                         "duration": None,
                         "episode_number": None,
-                        "image_url": None
+                        "image_url": None,
+                        "guid": None
                     }
                 ]
             }
@@ -93,7 +95,8 @@ def test_from_dict():
                         "pub_date": date.today().isoformat(),
                         "duration": None,
                         "episode_number": None,
-                        "image_url": None
+                        "image_url": None,
+                        "guid": None
                     }
                 ]
             },
@@ -107,7 +110,8 @@ def test_from_dict():
                         "pub_date": date.today().isoformat(),
                         "duration": None,
                         "episode_number": None,
-                        "image_url": None
+                        "image_url": None,
+                        "guid": None
                     }
                 ]
             }
@@ -117,3 +121,16 @@ def test_from_dict():
     assert len(podcast_playlist.playlists) == 2
     assert podcast_playlist.playlists[0].name == "Test Playlist 1"
     assert podcast_playlist.playlists[1].name == "Test Playlist 2"
+
+
+def test_playlist_episode_changes_by_index():
+    podcast_playlist = PodcastPlaylist(playlists=[PodcastEpisodeList(name="Queue", episodes=[])])
+    episode = PodcastEpisode(title="Episode", audio_url="https://example.com/episode.mp3")
+
+    podcast_playlist.add_playlist_episode(0, episode)
+    podcast_playlist.rename_playlist(0, "Later")
+    assert podcast_playlist.playlists[0].name == "Later"
+    assert podcast_playlist.playlists[0].episodes == [episode]
+
+    podcast_playlist.remove_playlist_episode(0, 0)
+    assert podcast_playlist.playlists[0].episodes == []
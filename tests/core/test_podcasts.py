@@ -1,6 +1,7 @@
 import pytest
 from zpodcast.core.podcast import PodcastData
 from zpodcast.core.podcasts import PodcastList
+from zpodcast.parsers.rss import ParsedFeed
 
 
 def test_add_podcast():
@@ -248,13 +249,15 @@ def test_delete_podcast():
 def test_update_podcast(mocker):
     """Test updating a podcast with new data"""
     # Setup mocks to prevent actual RSS fetching - not directly used but needed for test
-    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.get_episodes', return_value=[])
-    mock_get_metadata = mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.get_rss_metadata')
+    mock_parse_feed = mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed')
     # Return proper metadata to maintain field values
-    mock_get_metadata.side_effect = [
-        {"author": "John Doe", "description": "This is a test podcast 1"},
-        {"author": "Jane Doe", "description": "This is a test podcast 2"},
-        {"author": "Jane Doe", "description": "This is a test podcast 2"}  # For the second podcast when it gets updated
+    mock_parse_feed.side_effect = [
+        ParsedFeed(url="http://example.com/podcast1.rss",
+                   metadata={"author": "John Doe", "description": "This is a test podcast 1"}),
+        ParsedFeed(url="http://example.com/podcast2.rss",
+                   metadata={"author": "Jane Doe", "description": "This is a test podcast 2"}),
+        ParsedFeed(url="http://example.com/podcast2.rss",
+                   metadata={"author": "Jane Doe", "description": "This is a test podcast 2"})  # For the second podcast when it gets updated
     ]
     
     # Setup test podcast
@@ -338,14 +341,11 @@ def test_update_podcast_invalid_index():
 
 def test_update_podcast_with_url_change(mocker):
     """Test updating a podcast's URL which should trigger episode refresh"""
-    # Mock both RSS methods to prevent actual network calls
-    # These mocks are necessary for the test setup but not directly used in assertions
-    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.get_episodes', return_value=[])
-    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.get_rss_metadata',
-                 return_value={"author": "John Doe", "description": "Test description"})
-    
-    # Create a separate mock specifically for testing the populate method call
-    mock_populate = mocker.patch('zpodcast.core.podcast.PodcastData.populate_episodes_from_feed')
+    # Mock the RSS parser to prevent actual network calls
+    mock_parse_feed = mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                                   return_value=ParsedFeed(url="http://example.com/new_feed.rss",
+                                                           metadata={"author": "John Doe",
+                                                                     "description": "Test description"}))
     
     # Create a podcast with mocked init that doesn't call populate_episodes_from_feed
     mocker.patch('zpodcast.core.podcast.PodcastData.__init__', return_value=None)
@@ -359,9 +359,6 @@ def test_update_podcast_with_url_change(mocker):
     podcast._image_url = "http://example.com/image.jpg"
     podcast._name_set_manually = False
     
-    # Reset the mock to clear the call from initialization
-    mock_populate.reset_mock()
-    
     podcast_list = PodcastList([podcast])
     
     # Update with a new URL
@@ -372,5 +369,142 @@ def test_update_podcast_with_url_change(mocker):
     # Verify the URL was updated
     assert podcast_list.podcasts[0]._podcast_url == "http://example.com/new_feed.rss"
     
-    # Verify populate_episodes_from_feed was called exactly once
-    mock_populate.assert_called_once()
+    # Verify the new feed was fetched exactly once, unconditionally
+    mock_parse_feed.assert_called_once_with("http://example.com/new_feed.rss", conditional=False)
+
+
+def test_update_podcast_url_change_replaces_episodes(mocker):
+    """Test that a new feed URL does not keep the old feed's episodes"""
+    def entries(prefix):
+        return [{"title": f"{prefix}{number}", "audio_url": f"http://example.com/{prefix}{number}.mp3",
+                 "guid": f"{prefix}{number}"} for number in range(3)]
+
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                 side_effect=[ParsedFeed(url="http://example.com/a.rss", entries=entries("a")),
+                              ParsedFeed(url="http://example.com/b.rss", entries=entries("b"))])
+    podcast = PodcastData(title="Podcast", podcast_url="http://example.com/a.rss")
+    podcast_list = PodcastList([podcast])
+
+    podcast_list.update_podcast(0, {"podcast_url": "http://example.com/b.rss"})
+
+    assert [episode.title for episode in podcast.episodelists[0].episodes] == ["b0", "b1", "b2"]
+
+
+def test_update_podcast_url_change_drops_old_episodes_when_fetch_fails(mocker):
+    """Test that a new feed URL that cannot be fetched never mixes in the old feed's episodes"""
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                 side_effect=[ParsedFeed(url="http://example.com/a.rss",
+                                         entries=[{"title": "a0", "audio_url": "http://example.com/a0.mp3",
+                                                   "guid": "a0"}]),
+                              ParsedFeed(url="http://example.com/b.rss", error="HTTP error 404"),
+                              ParsedFeed(url="http://example.com/b.rss",
+                                         entries=[{"title": "b0", "audio_url": "http://example.com/b0.mp3",
+                                                   "guid": "b0"}])])
+    podcast = PodcastData(title="Podcast", podcast_url="http://example.com/a.rss")
+    podcast_list = PodcastList([podcast])
+
+    podcast_list.update_podcast(0, {"podcast_url": "http://example.com/b.rss"})
+
+    assert podcast.podcast_url == "http://example.com/b.rss"
+    assert podcast.episodelists == []
+    assert podcast_list.get_pending_refresh() == [podcast]
+
+    podcast_list.refresh_podcasts(pending_only=True)
+
+    assert [episode.title for episode in podcast.episodelists[0].episodes] == ["b0"]
+    assert podcast_list.get_pending_refresh() == []
+
+
+def test_update_podcast_rejects_invalid_url_before_fetching(mocker):
+    """Test that an invalid feed URL, such as a local path, is never fetched"""
+    mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                 side_effect=lambda url, **kwargs: ParsedFeed(url=url))
+    podcast = PodcastData(title="Podcast", podcast_url="http://example.com/a.rss")
+    podcast_list = PodcastList([podcast])
+    mock_parse_feed = mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed')
+
+    with pytest.raises(ValueError, match="Invalid podcast URL"):
+        podcast_list.update_podcast(0, {"podcast_url": "/etc/passwd"})
+
+    mock_parse_feed.assert_not_called()
+    assert podcast.podcast_url == "http://example.com/a.rss"
+
+
+def test_from_dict_defers_refresh(mocker):
+    """Test that loading a podcast list fetches nothing until refreshed"""
+    mock_parse_feed = mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed',
+                                   side_effect=lambda url, **kwargs: ParsedFeed(url=url))
+    podcast_list = PodcastList.from_dict({
+        "podcasts": [
+            {"title": "Test Podcast 1", "podcast_url": "http://example.com/podcast1.rss"},
+            {"title": "Test Podcast 2", "podcast_url": "http://example.com/podcast2.rss"}
+        ]
+    })
+
+    mock_parse_feed.assert_not_called()
+    assert len(podcast_list.get_pending_refresh()) == 2
+
+    podcast_list.podcasts[0].populate_episodes_from_feed()
+    assert podcast_list.get_pending_refresh() == [podcast_list.podcasts[1]]
+
+    refreshed = podcast_list.refresh_podcasts(pending_only=True)
+    assert refreshed == [podcast_list.podcasts[1]]
+    assert mock_parse_feed.call_count == 2
+    assert podcast_list.get_pending_refresh() == []
+
+
+def test_find_podcast_by_id(make_podcast):
+    podcasts = [make_podcast(f"Podcast {number}") for number in range(3)]
+    podcast_list = PodcastList(list(podcasts))
+
+    assert podcast_list.find_podcast(podcasts[2].id) is podcasts[2]
+    assert podcast_list.find_podcast_index(podcasts[1].id) == 1
+    assert podcast_list.find_podcast("0123456789abcdef") is None
+
+
+def test_podcast_id_survives_deletes(make_podcast):
+    podcasts = [make_podcast(f"Podcast {number}") for number in range(3)]
+    podcast_list = PodcastList(list(podcasts))
+    podcast_id = podcasts[2].id
+    assert podcast_list.find_podcast_index(podcast_id) == 2
+
+    podcast_list.delete_podcast(0)
+
+    assert podcasts[2].id == podcast_id
+    assert podcast_list.find_podcast_index(podcast_id) == 1
+    assert podcast_list.find_podcast(podcasts[0].id) is None
+
+
+def test_find_podcast_follows_list_changes(make_podcast):
+    podcasts = [make_podcast(f"Podcast {number}") for number in range(3)]
+    podcast_list = PodcastList(list(podcasts))
+    podcast_list.find_podcast_index(podcasts[0].id)
+
+    added = podcast_list.add_podcast(make_podcast("Podcast 3"))
+    assert podcast_list.find_podcast_index(added.id) == 3
+
+    podcast_list.remove_podcast(podcasts[1])
+    assert podcast_list.find_podcast_index(added.id) == 2
+
+    # changed behind the list's back
+    podcast_list.podcasts.reverse()
+    assert podcast_list.find_podcast_index(added.id) == 0
+    podcast_list.podcasts.append(make_podcast("Podcast 4"))
+    assert podcast_list.find_podcast_index(podcast_list.podcasts[-1].id) == 3
+
+    old_id = added.id
+    added.podcast_url = "http://example.com/moved.rss"
+    assert podcast_list.find_podcast_index(old_id) is None
+    assert podcast_list.find_podcast(added.id) is added
+
+
+def test_remove_podcast_uses_id_index(mocker, make_podcast):
+    podcasts = [make_podcast(f"Podcast {number}") for number in range(3)]
+    podcast_list = PodcastList(podcasts)
+    podcast_list.find_podcast_index(podcasts[0].id)
+    equality = mocker.spy(PodcastData, '__eq__')
+
+    podcast_list.remove_podcast(podcasts[2])
+
+    assert equality.call_count == 0
+    assert len(podcast_list.podcasts) == 2
@@ -0,0 +1,249 @@
+import os
+import threading
+import time
+import hashlib
+import pytest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.core.refresh import (FeedRefresher, REFRESH_UPDATED, REFRESH_UNCHANGED,
+                                   REFRESH_FAILED)
+from zpodcast.parsers.rss import FeedValidatorStore
+
+FEEDS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'feeds')
+
+
+class FixtureFeedHandler(BaseHTTPRequestHandler):
+    """Serves the fixture feeds with ETag support and a configurable delay"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.requests.append(self.path)
+        time.sleep(server.delay)
+        # no longer in flight once answered: the response lets the client
+        # send its next request before this handler returns
+        with server.lock:
+            server.in_flight -= 1
+
+        if self.path == '/slow.xml':
+            time.sleep(2)
+            self.send_response(200)
+            self.end_headers()
+            return
+
+        path = os.path.join(FEEDS_DIR, os.path.basename(self.path))
+        if not os.path.isfile(path):
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        with open(path, 'rb') as f:
+            body = f.read()
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_feed_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureFeedHandler)
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.requests = []
+    server.delay = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def stop_feed_server(server):
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def feed_server():
+    """Local HTTP stand-in serving the fixture feeds"""
+    FeedValidatorStore.get_instance().clear()
+    server = start_feed_server()
+    yield server
+    stop_feed_server(server)
+    FeedValidatorStore.get_instance().clear()
+
+
+@pytest.fixture
+def second_feed_server():
+    """A second stand-in, seen by the refresher as a different host"""
+    server = start_feed_server()
+    yield server
+    stop_feed_server(server)
+
+
+@pytest.fixture
+def served_podcast(make_podcast):
+    """Factory of podcasts whose feed is served by a test server"""
+    def make(server, name):
+        return make_podcast(name.split('.')[0], podcast_url=f"http://127.0.0.1:{server.server_address[1]}/{name}")
+    return make
+
+
+def test_refresh_all_reports_per_feed_status(feed_server, served_podcast):
+    podcast_list = PodcastList([
+        served_podcast(feed_server, 'feed1.xml'),
+        served_podcast(feed_server, 'feed2.xml'),
+        served_podcast(feed_server, 'missing.xml')
+    ])
+
+    report = podcast_list.refresh_all(max_workers=4, timeout=5)
+
+    assert [result.status for result in report.results] == [REFRESH_UPDATED, REFRESH_UPDATED, REFRESH_FAILED]
+    assert report.results[2].error
+    assert all(result.elapsed >= 0 for result in report.results)
+    assert podcast_list.podcasts[0].host == "Fixture Host 1"
+    assert [episode.title for episode in podcast_list.podcasts[1].episodelists[0].episodes] == [
+        "Podcast 2 Episode 1", "Podcast 2 Episode 2"
+    ]
+    assert report.to_dict()["updated"] == 2
+
+
+def test_refresh_all_unchanged_on_second_pass(feed_server, served_podcast):
+    podcast_list = PodcastList([
+        served_podcast(feed_server, 'feed1.xml'),
+        served_podcast(feed_server, 'feed2.xml')
+    ])
+    podcast_list.refresh_all(timeout=5)
+
+    report = podcast_list.refresh_all(timeout=5)
+
+    assert [result.status for result in report.results] == [REFRESH_UNCHANGED, REFRESH_UNCHANGED]
+    assert len(podcast_list.podcasts[0].episodelists[0].episodes) == 2
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_refresh_all_unchanged_without_validators(feed_server, pipelined, served_podcast):
+    podcast_list = PodcastList([served_podcast(feed_server, 'feed1.xml')])
+    podcast_list.refresh_all(timeout=5, pipelined=pipelined)
+    # the full feed is sent again, with nothing new in it
+    FeedValidatorStore.get_instance().clear()
+
+    report = podcast_list.refresh_all(timeout=5, pipelined=pipelined)
+
+    assert [result.status for result in report.results] == [REFRESH_UNCHANGED]
+
+
+def test_refresh_all_persists_validators(feed_server, tmp_path, served_podcast):
+    store = FeedValidatorStore.get_instance()
+    store.attach(str(tmp_path / "feed_validators.json"))
+    podcast = served_podcast(feed_server, 'feed1.xml')
+    PodcastList([podcast]).refresh_all(timeout=5)
+
+    restarted = FeedValidatorStore()
+    restarted.attach(store.path)
+    assert restarted.get(podcast.podcast_url)[0] is not None
+
+
+def test_refresh_all_per_feed_timeout(feed_server, served_podcast):
+    podcast_list = PodcastList([
+        served_podcast(feed_server, 'slow.xml'),
+        served_podcast(feed_server, 'feed1.xml')
+    ])
+
+    report = podcast_list.refresh_all(timeout=0.5)
+
+    assert report.results[0].status == REFRESH_FAILED
+    assert report.results[1].status == REFRESH_UPDATED
+
+
+def test_refresh_respects_per_host_limit(feed_server, served_podcast):
+    feed_server.delay = 0.1
+    podcasts = [served_podcast(feed_server, 'feed1.xml') for _ in range(4)]
+
+    FeedRefresher(max_workers=4, per_host_limit=1, timeout=5).refresh(podcasts)
+
+    assert feed_server.max_in_flight == 1
+    assert len(feed_server.requests) == 4
+
+
+def test_refresh_runs_hosts_concurrently(feed_server, second_feed_server, served_podcast):
+    feed_server.delay = 0.3
+    second_feed_server.delay = 0.3
+    podcasts = [served_podcast(feed_server, 'feed1.xml'),
+                served_podcast(feed_server, 'feed2.xml'),
+                served_podcast(second_feed_server, 'feed1.xml'),
+                served_podcast(second_feed_server, 'feed2.xml')]
+
+    start = time.perf_counter()
+    report = FeedRefresher(max_workers=4, per_host_limit=1, timeout=5).refresh(podcasts)
+    elapsed = time.perf_counter() - start
+
+    # two hosts at one request each: two rounds instead of four
+    assert feed_server.max_in_flight == 1
+    assert second_feed_server.max_in_flight == 1
+    assert elapsed < 1.2
+    assert all(result.status == REFRESH_UPDATED for result in report.results)
+
+
+def test_refresh_pending_only(feed_server, served_podcast):
+    podcast1 = served_podcast(feed_server, 'feed1.xml')
+    podcast2 = served_podcast(feed_server, 'feed2.xml')
+    podcast1.populate_episodes_from_feed(timeout=5)
+    podcast_list = PodcastList([podcast1, podcast2])
+
+    report = podcast_list.refresh_all(timeout=5, pending_only=True)
+
+    assert [result.podcast_url for result in report.results] == [podcast2.podcast_url]
+
+
+def test_refresher_invalid_arguments():
+    with pytest.raises(ValueError):
+        FeedRefresher(max_workers=0)
+    with pytest.raises(ValueError):
+        FeedRefresher(per_host_limit=0)
+    with pytest.raises(ValueError):
+        FeedRefresher(timeout=0)
+
+
+def test_refresh_pipelined(feed_server, served_podcast):
+    podcast_list = PodcastList([
+        served_podcast(feed_server, 'feed1.xml'),
+        served_podcast(feed_server, 'feed2.xml'),
+        served_podcast(feed_server, 'missing.xml')
+    ])
+
+    report = podcast_list.refresh_all(timeout=5, pipelined=True)
+
+    assert [result.status for result in report.results] == [REFRESH_UPDATED, REFRESH_UPDATED, REFRESH_FAILED]
+    assert all(0 <= result.elapsed <= report.elapsed for result in report.results)
+    assert podcast_list.podcasts[0].host == "Fixture Host 1"
+    assert [episode.title for episode in podcast_list.podcasts[1].episodelists[0].episodes] == [
+        "Podcast 2 Episode 1", "Podcast 2 Episode 2"
+    ]
+
+    report = podcast_list.refresh_all(timeout=5, pipelined=True)
+    assert [result.status for result in report.results] == [REFRESH_UNCHANGED, REFRESH_UNCHANGED, REFRESH_FAILED]
+    assert len(podcast_list.podcasts[0].episodelists[0].episodes) == 2
+
+
+def test_refresh_pipelined_per_host_limit(feed_server, served_podcast):
+    feed_server.delay = 0.1
+    podcasts = [served_podcast(feed_server, 'feed1.xml') for _ in range(4)]
+
+    report = FeedRefresher(per_host_limit=1, timeout=5).refresh_pipelined(podcasts)
+
+    assert feed_server.max_in_flight == 1
+    assert all(result.status == REFRESH_UPDATED for result in report.results)
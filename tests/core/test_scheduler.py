@@ -0,0 +1,186 @@
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+from zpodcast.core.download import (DOWNLOAD_CANCELLED, DOWNLOAD_COMPLETED, DOWNLOAD_ERROR,
+                                    DownloadManager, DownloadState)
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.scheduler import DownloadScheduler, TokenBucket
+from tests.core.test_download import AUDIO, AudioHandler
+
+
+class FakeManager:
+    """Records the downloads started, which the test then finishes."""
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.throttle = None
+        self.started = []
+        self.callbacks = {}
+        self.podcast_urls = {}
+
+    def download(self, episode, callback=None, podcast_url=None):
+        self.started.append(episode.title)
+        self.callbacks[episode.title] = callback
+        self.podcast_urls[episode.title] = podcast_url
+        return True
+
+    def finish(self, title, status=DOWNLOAD_COMPLETED):
+        self.callbacks.pop(title)(DownloadState(title, title, status))
+
+    def cancel(self, episode):
+        self.finish(episode.title, DOWNLOAD_CANCELLED)
+        return True
+
+
+def test_scheduler_orders_by_priority_and_position(make_episode):
+    manager = FakeManager(max_workers=1)
+    scheduler = DownloadScheduler(manager)
+    scheduler.enqueue(make_episode("blocker"))
+    scheduler.enqueue(make_episode("low"), priority=-1)
+    scheduler.enqueue(make_episode("second"), priority=5, position=2)
+    scheduler.enqueue(make_episode("first"), priority=5, position=1)
+    scheduler.enqueue(make_episode("default"))
+
+    for title in ["blocker", "first", "second", "default"]:
+        assert manager.started[-1] == title
+        manager.finish(title)
+    assert manager.started == ["blocker", "first", "second", "default", "low"]
+    manager.finish("low")
+    assert scheduler.wait(timeout=1)
+    assert scheduler.metrics().completed == 5
+
+
+def test_scheduler_per_host_limit(make_episode):
+    manager = FakeManager(max_workers=4)
+    scheduler = DownloadScheduler(manager, per_host_limit=2)
+    for number in range(4):
+        scheduler.enqueue(make_episode(f"a{number}", audio_url=f"https://a.example.com/a{number}.mp3"), priority=9)
+    scheduler.enqueue(make_episode("b0", audio_url="https://b.example.com/b0.mp3"))
+
+    # a host at its limit does not hold back the other hosts
+    assert manager.started == ["a0", "a1", "b0"]
+    metrics = scheduler.metrics()
+    assert metrics.queued == 2
+    assert metrics.active == 3
+    assert metrics.queued_by_host == {"a.example.com": 2}
+    assert metrics.active_by_host == {"a.example.com": 2, "b.example.com": 1}
+
+    manager.finish("a0", DOWNLOAD_ERROR)
+    assert manager.started[-1] == "a2"
+    assert scheduler.metrics().failed == 1
+
+
+def test_scheduler_enqueue_podcast_and_playlist(make_episode, make_podcast):
+    manager = FakeManager(max_workers=1)
+    scheduler = DownloadScheduler(manager)
+    podcast = make_podcast("Podcast", [make_episode("p0"), make_episode("p1")], podcast_priority=3)
+    playlist = PodcastEpisodeList(name="Playlist", episodes=[make_episode("q0"), make_episode("q1")])
+    scheduler.enqueue(make_episode("blocker"))
+    assert scheduler.enqueue_episodelist(playlist) == 2
+    assert scheduler.enqueue_podcast(podcast) == 2
+    assert scheduler.enqueue_podcast(podcast) == 0
+
+    for title in ["blocker", "p0", "p1", "q0"]:
+        manager.finish(title)
+    assert manager.started == ["blocker", "p0", "p1", "q0", "q1"]
+    assert manager.podcast_urls == {"blocker": None, "p0": podcast.podcast_url, "p1": podcast.podcast_url,
+                                    "q0": None, "q1": None}
+
+
+def test_scheduler_same_guid_in_two_feeds(make_episode):
+    manager = FakeManager()
+    scheduler = DownloadScheduler(manager)
+    assert scheduler.enqueue(make_episode("a", audio_url="https://a.example.com/1.mp3", guid="1"))
+    assert scheduler.enqueue(make_episode("b", audio_url="https://b.example.com/1.mp3", guid="1"))
+    assert manager.started == ["a", "b"]
+
+
+def test_scheduler_survives_a_download_that_cannot_start(make_episode, mocker):
+    manager = FakeManager(max_workers=1)
+    download = manager.download
+
+    def failing_download(episode, **kwargs):
+        if episode.title == "broken":
+            raise OSError("cache unavailable")
+        return download(episode, **kwargs)
+    mocker.patch.object(manager, 'download', side_effect=failing_download)
+    scheduler = DownloadScheduler(manager)
+
+    scheduler.enqueue(make_episode("broken"))
+    scheduler.enqueue(make_episode("next"))
+    assert manager.started == ["next"]
+    assert scheduler.metrics().failed == 1
+
+    manager.finish("next")
+    assert scheduler.wait(timeout=1)
+    scheduler.enqueue(make_episode("later"))
+    assert manager.started == ["next", "later"]
+
+
+def test_scheduler_cancel(make_episode):
+    manager = FakeManager(max_workers=1)
+    scheduler = DownloadScheduler(manager)
+    running, queued = make_episode("running"), make_episode("queued")
+    scheduler.enqueue(running)
+    scheduler.enqueue(queued)
+
+    assert scheduler.cancel(queued)
+    assert not scheduler.cancel(queued)
+    assert scheduler.cancel(running)
+    assert manager.started == ["running"]
+    metrics = scheduler.metrics()
+    assert (metrics.queued, metrics.active, metrics.cancelled) == (0, 0, 2)
+
+
+def test_scheduler_invalid_options():
+    with pytest.raises(ValueError):
+        DownloadScheduler(FakeManager(), per_host_limit=0)
+    with pytest.raises(ValueError):
+        DownloadScheduler(FakeManager(), max_active=0)
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_token_bucket(mocker):
+    clock = mocker.patch('zpodcast.core.scheduler.time')
+    clock.monotonic.return_value = 100.0
+    bucket = TokenBucket(1000, capacity=500)
+
+    assert bucket.consume(500) == 0
+    assert bucket.consume(250) == 0.25
+    clock.sleep.assert_called_once_with(0.25)
+
+    # a second later the debt is paid back and 750 tokens were added
+    clock.monotonic.return_value = 101.0
+    assert bucket.consume(500) == 0
+
+
+def test_scheduler_downloads_with_bandwidth_cap(tmp_path, make_episode):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), AudioHandler)
+    server.requests = []
+    server.ranges = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    manager = DownloadManager(str(tmp_path), max_workers=2, chunk_size=16 * 1024, timeout=5)
+    try:
+        # two files of 256 KiB at 1 MiB/s with a 128 KiB burst take ~0.375 s
+        scheduler = DownloadScheduler(manager, bandwidth=1024 * 1024, burst=128 * 1024)
+        episodes = [make_episode(name, audio_url=f"http://127.0.0.1:{server.server_port}/{name}.mp3")
+                    for name in ("one", "two")]
+        start = time.monotonic()
+        for episode in episodes:
+            scheduler.enqueue(episode)
+        assert scheduler.wait(timeout=10)
+        elapsed = time.monotonic() - start
+
+        assert elapsed >= 0.3
+        assert all(manager.get_status(episode) == DOWNLOAD_COMPLETED for episode in episodes)
+        metrics = scheduler.metrics()
+        assert metrics.completed == 2
+        assert metrics.bytes_downloaded == 2 * len(AUDIO)
+        assert metrics.throughput > 0
+    finally:
+        manager.shutdown(cancel=True)
+        server.shutdown()
+        server.server_close()
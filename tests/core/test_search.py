@@ -0,0 +1,182 @@
+import pytest
+from datetime import datetime, timezone
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.parsers.rss import ParsedFeed
+from zpodcast.core.search import EpisodeSearchIndex, tokenize, MAX_PAGE_SIZE
+
+
+@pytest.fixture
+def podcast_list(make_episode, make_podcast):
+    return PodcastList([
+        make_podcast("Science", [
+            make_episode("episode1", title="Black holes explained", description="Gravity and light",
+                         day=1, guid="guid-1"),
+            make_episode("episode2", title="Quantum gravity", description="Strings and loops", day=2, guid="guid-2"),
+        ]),
+        make_podcast("Cooking", [
+            make_episode("episode3", title="Bread basics", description="Flour, water and gravity defying loaves",
+                         day=3, guid="guid-3"),
+            make_episode("episode4", title="Pasta", day=4, guid="guid-4"),
+        ])
+    ])
+
+
+@pytest.fixture
+def index():
+    return EpisodeSearchIndex()
+
+
+def test_tokenize():
+    assert tokenize("The Rise of AI, and ROBOTS!") == ["rise", "ai", "robots"]
+    assert tokenize(None) == []
+
+
+def test_search_ranks_title_matches_first(index, podcast_list):
+    results = index.search(podcast_list, "gravity")
+
+    assert results.total == 3
+    assert (results.hits[0].podcast_id, results.hits[0].episode_id) == (0, 1)
+    assert {(hit.podcast_id, hit.episode_id) for hit in results.hits[1:]} == {(0, 0), (1, 0)}
+    assert results.hits[0].score > results.hits[1].score
+
+
+def test_search_requires_every_term(index, podcast_list):
+    results = index.search(podcast_list, "gravity light")
+
+    assert [(hit.podcast_id, hit.episode_id) for hit in results.hits] == [(0, 0)]
+
+
+def test_search_no_match(index, podcast_list):
+    results = index.search(podcast_list, "volcano")
+
+    assert results.total == 0
+    assert results.hits == []
+    assert results.next_cursor is None
+
+
+def test_search_pagination(index, podcast_list):
+    everything = index.search(podcast_list, "gravity")
+    first = index.search(podcast_list, "gravity", limit=2)
+    second = index.search(podcast_list, "gravity", offset=2, limit=2)
+
+    assert first.next_cursor == "2"
+    assert second.next_cursor is None
+    assert first.hits + second.hits == everything.hits
+
+
+def test_search_ties_prefer_recent_episodes(index, make_episode, make_podcast):
+    podcast_list = PodcastList([make_podcast("News", [
+        make_episode("episode1", title="Daily update", day=1),
+        make_episode("episode2", title="Daily update", day=5),
+    ])])
+
+    results = index.search(podcast_list, "daily")
+
+    assert [hit.episode_id for hit in results.hits] == [1, 0]
+
+
+def test_search_invalid_arguments(index, podcast_list):
+    with pytest.raises(ValueError):
+        index.search(podcast_list, "the and of")
+    with pytest.raises(ValueError):
+        index.search(podcast_list, "gravity", offset=-1)
+    with pytest.raises(ValueError):
+        index.search(podcast_list, "gravity", limit=0)
+    with pytest.raises(ValueError):
+        index.search(podcast_list, "gravity", limit=MAX_PAGE_SIZE + 1)
+
+
+def test_index_updates_changed_podcasts_only(index, podcast_list, mocker, make_episode):
+    index.update(podcast_list)
+    assert len(index) == 4
+    add_podcast = mocker.spy(index, '_add_podcast')
+
+    podcast_list.podcasts[1].episodelists[0].add_podcastepisode(make_episode("Gravity cake"))
+    results = index.search(podcast_list, "cake")
+
+    assert add_podcast.call_count == 1
+    assert add_podcast.call_args.args[1] is podcast_list.podcasts[1]
+    assert [(hit.podcast_id, hit.episode_id) for hit in results.hits] == [(1, 2)]
+    assert len(index) == 5
+
+
+def test_index_follows_feed_refresh_merge(index, podcast_list):
+    index.update(podcast_list)
+    episodelist = podcast_list.podcasts[0].episodelists[0]
+
+    episodelist.merge_entries([{
+        "title": "Dark matter mysteries",
+        "audio_url": "https://example.com/episode1.mp3",
+        "guid": "guid-1",
+        "pub_date": datetime(2023, 1, 1, tzinfo=timezone.utc)
+    }])
+
+    assert index.search(podcast_list, "holes").total == 0
+    assert index.search(podcast_list, "dark matter").total == 1
+
+
+def test_index_applies_merge_diff(index, podcast_list, mocker):
+    index.update(podcast_list)
+    add_podcast = mocker.spy(index, '_add_podcast')
+    add_document = mocker.spy(index, '_add_document')
+    podcast = podcast_list.podcasts[0]
+
+    podcast.apply_feed(ParsedFeed(url=podcast.podcast_url, entries=[
+        {"title": "Dark matter mysteries", "audio_url": "https://example.com/episode1.mp3", "guid": "guid-1",
+         "pub_date": datetime(2023, 1, 1, tzinfo=timezone.utc)},
+        {"title": "Quantum gravity", "description": "Strings and loops",
+         "audio_url": "https://example.com/episode2.mp3", "guid": "guid-2",
+         "pub_date": datetime(2023, 1, 2, tzinfo=timezone.utc)},
+        {"title": "Dark energy", "audio_url": "https://example.com/episode5.mp3", "guid": "guid-5",
+         "pub_date": datetime(2023, 1, 5, tzinfo=timezone.utc)}
+    ], metadata={"title": "Science"}))
+    results = index.search(podcast_list, "dark")
+
+    # only the updated and the added episode are tokenized again
+    assert add_podcast.call_count == 0
+    assert add_document.call_count == 2
+    assert [(hit.podcast_id, hit.episode_id) for hit in results.hits] == [(0, 2), (0, 0)]
+    assert index.search(podcast_list, "holes").total == 0
+    assert index.search(podcast_list, "quantum").total == 1
+    assert len(index) == 5
+
+
+def test_search_hits_carry_their_episode(index, podcast_list):
+    results = index.search(podcast_list, "pasta")
+
+    hit = results.hits[0]
+    assert hit.podcast_stable_id == podcast_list.podcasts[1].id
+    assert hit.episode["title"] == "Pasta"
+    assert hit.episode["id"] == podcast_list.podcasts[1].episodelists[0].episodes[1].id
+
+
+def test_index_drops_removed_podcasts(index, podcast_list):
+    index.update(podcast_list)
+
+    podcast_list.delete_podcast(0)
+    results = index.search(podcast_list, "gravity")
+
+    assert [(hit.podcast_id, hit.episode_id) for hit in results.hits] == [(0, 0)]
+    assert len(index) == 2
+
+
+def test_index_columnar_episode_lists(index, podcast_list):
+    podcast_list.podcasts[0].episodelists[0].to_columnar()
+
+    results = index.search(podcast_list, "quantum")
+
+    assert [(hit.podcast_id, hit.episode_id) for hit in results.hits] == [(0, 1)]
+    assert podcast_list.podcasts[0].episodelists[0].is_columnar
+
+
+def test_clear(index, podcast_list):
+    index.update(podcast_list)
+
+    index.clear()
+
+    assert len(index) == 0
+    assert index.search(podcast_list, "pasta").total == 1
+
+
+def test_get_instance():
+    assert EpisodeSearchIndex.get_instance() is EpisodeSearchIndex.get_instance()
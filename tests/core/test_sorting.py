@@ -0,0 +1,128 @@
+import pytest
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.core.sorting import (EPISODE_SORT_OPTIONS, filter_podcasts, sort_episodes,
+                                   sort_parameters_from_query, sort_podcasts)
+from zpodcast.utils.sort import SortParameters
+
+
+@pytest.fixture
+def episodelist(make_episode):
+    return PodcastEpisodeList(name="Sorting", episodes=[
+        make_episode("banana", duration=600, day=3),
+        make_episode("Apple", duration=1200, day=1),
+        make_episode("cherry", duration=600, day=2),
+        make_episode("apple", duration=None, day=4),
+    ])
+
+
+@pytest.fixture
+def podcast_list(make_podcast):
+    return PodcastList([
+        make_podcast("zeta", host="Ann Lee", podcast_priority=5),
+        make_podcast("Alpha", host="bob", podcast_priority=None),
+        make_podcast("beta", host="ann smith", podcast_priority=8),
+    ])
+
+
+def test_sort_episodes_single_key(episodelist):
+    assert sort_episodes(episodelist, SortParameters.from_options(episode_date="Latest")) == [3, 0, 2, 1]
+    assert sort_episodes(episodelist, SortParameters.from_options(episode_date="Earliest")) == [1, 2, 0, 3]
+    # titles are compared casefolded, equal titles keep their list order
+    assert sort_episodes(episodelist, SortParameters.from_options(episode_title="A-Z")) == [1, 3, 0, 2]
+    # missing durations sort first
+    assert sort_episodes(episodelist, SortParameters.from_options(episode_duration="ShortToLong")) == [3, 0, 2, 1]
+
+
+def test_sort_episodes_multiple_keys(episodelist):
+    params = SortParameters.from_options(episode_duration="LongToShort", episode_date="Latest")
+
+    # duration first by default, then date with its own direction
+    assert sort_episodes(episodelist, params) == [1, 0, 2, 3]
+    # the order argument changes the precedence
+    assert sort_episodes(episodelist, params, order=["episode_date", "episode_duration"]) == [3, 0, 2, 1]
+
+
+def test_sort_episodes_subset(episodelist):
+    params = SortParameters.from_options(episode_title="Z-A")
+
+    assert sort_episodes(episodelist, params, indices=[0, 1, 2]) == [2, 0, 1]
+    assert sort_episodes(episodelist, SortParameters.from_options(), indices=[2, 0]) == [2, 0]
+
+
+def test_sort_episodes_invalid(episodelist):
+    with pytest.raises(ValueError):
+        sort_episodes(episodelist, SortParameters.from_options(episode_rating="highest"))
+    with pytest.raises(ValueError):
+        sort_episodes(episodelist, SortParameters.from_options(), order=["podcast_title"])
+
+
+def test_episode_sort_keys_cached_until_mutation(episodelist, make_episode):
+    titles = episodelist.sort_keys('title')
+    assert titles == ["banana", "apple", "cherry", "apple"]
+    assert episodelist.sort_keys('title') is titles
+
+    episodelist.add_podcastepisode(make_episode("Date", duration=60, day=5))
+    assert episodelist.sort_keys('title') == ["banana", "apple", "cherry", "apple", "date"]
+
+    episodelist.move_episode_to_position(4, 0)
+    assert episodelist.sort_keys('title')[0] == "date"
+
+    episodelist.get_episode(0).title = "Elderberry"
+    episodelist.mark_dirty()
+    assert episodelist.sort_keys('title')[0] == "elderberry"
+
+    with pytest.raises(ValueError):
+        episodelist.sort_keys('description')
+
+
+def test_episode_sort_keys_columnar(episodelist):
+    expected = {key: list(episodelist.sort_keys(key)) for key in ('title', 'duration', 'pub_date')}
+    episodelist.to_columnar()
+
+    assert {key: list(episodelist.sort_keys(key)) for key in expected} == expected
+    assert sort_episodes(episodelist, SortParameters.from_options(episode_date="Latest")) == [3, 0, 2, 1]
+    assert episodelist.is_columnar
+
+
+def test_sort_podcasts(podcast_list):
+    assert sort_podcasts(podcast_list, SortParameters.from_options(podcast_title="A-Z")) == [1, 2, 0]
+    assert sort_podcasts(podcast_list, SortParameters.from_options(podcast_author="Z-A")) == [1, 2, 0]
+    assert sort_podcasts(podcast_list, SortParameters.from_options()) == [0, 1, 2]
+
+
+def test_podcast_sort_keys_cached_until_mutation(podcast_list):
+    titles = podcast_list.sort_keys('title')
+    assert podcast_list.sort_keys('title') is titles
+
+    podcast_list.podcasts[0].title = "Aardvark"
+    assert podcast_list.sort_keys('title')[0] == "aardvark"
+
+    podcast_list.delete_podcast(0)
+    assert podcast_list.sort_keys('title') == ["alpha", "beta"]
+
+    with pytest.raises(ValueError):
+        podcast_list.sort_keys('description')
+
+
+def test_filter_podcasts(podcast_list):
+    assert filter_podcasts(podcast_list) == [0, 1, 2]
+    assert filter_podcasts(podcast_list, author="ANN") == [0, 2]
+    assert filter_podcasts(podcast_list, min_priority=6) == [2]
+    assert filter_podcasts(podcast_list, author="ann", min_priority=6) == [2]
+
+    indices = filter_podcasts(podcast_list, author="ann")
+    assert sort_podcasts(podcast_list, SortParameters.from_options(podcast_title="A-Z"), indices=indices) == [2, 0]
+
+
+def test_sort_parameters_from_query():
+    params, order = sort_parameters_from_query(
+        {"limit": "5", "episode_date": "Latest", "episode_title": "A-Z"}, EPISODE_SORT_OPTIONS)
+
+    assert order == ["episode_date", "episode_title"]
+    assert params.episode_date == "Latest"
+    assert params.episode_title == "A-Z"
+    assert params.episode_duration is None
+
+    with pytest.raises(ValueError):
+        sort_parameters_from_query({"episode_date": "Sometime"}, EPISODE_SORT_OPTIONS)
@@ -0,0 +1,161 @@
+import struct
+
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from zpodcast.core.episode import PodcastEpisode
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.playlists import PodcastPlaylist
+from zpodcast.core.podcast import PodcastData
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.parsers.binary import PodcastBinary
+
+
+@pytest.fixture
+def episodes():
+    return [
+        PodcastEpisode(
+            title="Épisode 1",
+            audio_url="https://example.com/episode1.mp3",
+            description="Première partie ✓",
+            pub_date=datetime(2023, 1, 1, 12, 30, 15, 250, tzinfo=timezone(timedelta(hours=-5))),
+            duration=1800,
+            episode_number=1,
+            image_url="https://example.com/cover.jpg",
+            guid="guid-1"
+        ),
+        PodcastEpisode(
+            title="Episode 2",
+            audio_url="https://example.com/episode2.mp3",
+            pub_date=datetime(2023, 1, 8, 9, 0),
+            image_url="https://example.com/cover.jpg"
+        ),
+        PodcastEpisode(
+            title="Episode 3",
+            audio_url="https://example.com/episode3.mp3",
+            pub_date=date(2023, 1, 15)
+        )
+    ]
+
+
+@pytest.fixture
+def podcast_list(episodes):
+    return PodcastList([
+        PodcastData(
+            title="Podcast 1",
+            podcast_url="https://example.com/feed1.xml",
+            host="Host",
+            description="Description",
+            episodelists=[PodcastEpisodeList(name="Podcast 1", episodes=episodes)],
+            podcast_priority=-3,
+            image_url="https://example.com/cover.jpg",
+            name_set_manually=True,
+            fetch=False
+        ),
+        PodcastData(title="Podcast 2", podcast_url="https://example.com/feed2.xml", fetch=False)
+    ])
+
+
+def test_podcast_list_round_trip(tmp_path, podcast_list):
+    filename = str(tmp_path / "library.zpod")
+
+    PodcastBinary.export_podcast_list(podcast_list, filename)
+    loaded = PodcastBinary.import_podcast_list(filename)
+
+    assert loaded.to_dict() == podcast_list.to_dict()
+    loaded_episodes = loaded.podcasts[0].episodelists[0].episodes
+    original_episodes = podcast_list.podcasts[0].episodelists[0].episodes
+    assert [episode.pub_date for episode in loaded_episodes] == [episode.pub_date for episode in original_episodes]
+    assert all(episode.pub_date.tzinfo is not None for episode in loaded_episodes)
+    assert loaded.podcasts[1].podcast_priority is None
+    assert loaded.podcasts[0].refresh_pending
+
+
+def test_podcast_playlist_round_trip(tmp_path, episodes):
+    filename = str(tmp_path / "playlists.zpod")
+    podcast_playlist = PodcastPlaylist([PodcastEpisodeList(name="Queue", episodes=episodes),
+                                        PodcastEpisodeList(name="Empty", episodes=[])])
+
+    PodcastBinary.export_podcast_playlist(podcast_playlist, filename)
+    loaded = PodcastBinary.import_podcast_playlist(filename)
+
+    assert loaded.to_dict() == podcast_playlist.to_dict()
+
+
+def test_export_rejects_values_too_large(tmp_path, make_episode):
+    playlists = PodcastPlaylist([PodcastEpisodeList(name="Queue", episodes=[make_episode("Episode 1", duration=2 ** 63)])])
+
+    with pytest.raises(ValueError, match="duration"):
+        PodcastBinary.export_podcast_playlist(playlists, str(tmp_path / "playlists.zpod"))
+    assert not (tmp_path / "playlists.zpod").exists()
+
+
+def test_import_skips_validation(tmp_path, podcast_list, mocker):
+    filename = str(tmp_path / "library.zpod")
+    PodcastBinary.export_podcast_list(podcast_list, filename)
+    url = mocker.patch('zpodcast.utils.urls.validators.url')
+
+    PodcastBinary.import_podcast_list(filename)
+
+    # only the podcasts' feed URLs may be validated, not the episodes' URLs
+    validated = {call.args[0] for call in url.call_args_list}
+    assert validated <= {podcast.podcast_url for podcast in podcast_list.podcasts}
+
+
+def test_repeated_strings_stored_once(tmp_path, episodes):
+    filename = str(tmp_path / "playlists.zpod")
+    image_url = "https://example.com/" + "cover" * 100 + ".jpg"
+    for episode in episodes:
+        episode.image_url = image_url
+    PodcastBinary.export_podcast_playlist(PodcastPlaylist([PodcastEpisodeList(name="Queue", episodes=episodes)]),
+                                          filename)
+
+    with open(filename, 'rb') as f:
+        assert f.read().count(image_url.encode()) == 1
+
+
+def test_import_wrong_kind(tmp_path, podcast_list):
+    filename = str(tmp_path / "library.zpod")
+    PodcastBinary.export_podcast_list(podcast_list, filename)
+
+    with pytest.raises(ValueError):
+        PodcastBinary.import_podcast_playlist(filename)
+
+
+def test_import_invalid_files(tmp_path, podcast_list):
+    not_snapshot = tmp_path / "library.json"
+    not_snapshot.write_text('{"version": "0.1"}')
+    with pytest.raises(ValueError):
+        PodcastBinary.import_podcast_list(str(not_snapshot))
+
+    filename = str(tmp_path / "library.zpod")
+    PodcastBinary.export_podcast_list(podcast_list, filename)
+    with open(filename, 'rb') as f:
+        data = f.read()
+    with open(filename, 'wb') as f:
+        f.write(data[:-10])
+    with pytest.raises(ValueError):
+        PodcastBinary.import_podcast_list(filename)
+
+
+def test_import_corrupt_string_reference(tmp_path, podcast_list):
+    filename = str(tmp_path / "library.zpod")
+    PodcastBinary.export_podcast_list(podcast_list, filename)
+    with open(filename, 'rb') as f:
+        data = bytearray(f.read())
+    # the first podcast record follows the string table and the podcast count
+    (count,) = struct.unpack_from('<I', data, 7)
+    (size,) = struct.unpack_from('<I', data, 11 + 4 * count)
+    struct.pack_into('<I', data, 15 + 4 * count + size + 4, count + 5)
+    with open(filename, 'wb') as f:
+        f.write(data)
+
+    with pytest.raises(ValueError, match="Corrupt snapshot"):
+        PodcastBinary.import_podcast_list(filename)
+
+
+def test_export_default_filename(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    PodcastBinary.export_podcast_list(PodcastList([]))
+
+    assert (tmp_path / f"PodcastList-{PodcastBinary.VERSION}.zpod").exists()
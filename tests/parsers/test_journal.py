@@ -0,0 +1,242 @@
+import json
+import os
+import threading
+import pytest
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.parsers.rss import ParsedFeed
+from zpodcast.parsers.journal import PodcastJournal, JOURNAL_FILE, CHECKPOINT_FILE
+from zpodcast.parsers.json import PodcastJSON, _atomic_write
+
+
+def read_journal(directory):
+    with open(os.path.join(directory, JOURNAL_FILE)) as f:
+        return [json.loads(line) for line in f]
+
+
+def reload(directory):
+    journal = PodcastJournal(str(directory), compact_threshold=None)
+    podcast_list, podcast_playlist = journal.load()
+    journal.close()
+    return podcast_list, podcast_playlist
+
+
+def test_load_empty_directory(tmp_path):
+    with PodcastJournal(str(tmp_path)) as journal:
+        podcast_list, podcast_playlist = journal.load()
+
+    assert podcast_list.podcasts == []
+    assert podcast_playlist.playlists == []
+
+
+def test_changes_are_appended_and_replayed(tmp_path, make_podcast, make_episode):
+    with PodcastJournal(str(tmp_path), compact_threshold=None) as journal:
+        podcast_list, podcast_playlist = journal.load()
+        podcast_list.add_podcast(make_podcast("Podcast 1"))
+        podcast_list.add_podcast(make_podcast("Podcast 2"))
+        podcast_list.add_podcast(make_podcast("Podcast 3"))
+        podcast_list.update_podcast(0, {"title": "Renamed"})
+        podcast_list.delete_podcast(1)
+        podcast_playlist.add_playlist(PodcastEpisodeList(name="Queue", episodes=[]))
+        podcast_playlist.add_playlist_episode(0, make_episode("Episode 1"))
+        podcast_playlist.add_playlist_episode(0, make_episode("Episode 2"))
+        podcast_playlist.remove_playlist_episode(0, 0)
+        podcast_playlist.rename_playlist(0, "Later")
+
+    records = read_journal(tmp_path)
+    assert [record["seq"] for record in records] == list(range(1, 11))
+    assert records[3] == {"seq": 4, "op": "update_podcast", "index": 0, "fields": {"title": "Renamed"}}
+    assert records[4] == {"seq": 5, "op": "delete_podcast", "index": 1}
+
+    podcast_list, podcast_playlist = reload(tmp_path)
+    assert [podcast.title for podcast in podcast_list.podcasts] == ["Renamed", "Podcast 3"]
+    assert podcast_playlist.playlists[0].name == "Later"
+    assert [episode.title for episode in podcast_playlist.playlists[0].episodes] == ["Episode 2"]
+
+
+def test_failed_change_is_not_recorded(tmp_path, make_episode):
+    with PodcastJournal(str(tmp_path), compact_threshold=None) as journal:
+        podcast_list, podcast_playlist = journal.load()
+        with pytest.raises(ValueError):
+            podcast_list.delete_podcast(0)
+        with pytest.raises(IndexError):
+            podcast_playlist.add_playlist_episode(3, make_episode("Episode 1"))
+
+    assert read_journal(tmp_path) == []
+
+
+def test_compact_writes_snapshots_and_empties_journal(tmp_path, make_podcast, make_episode):
+    with PodcastJournal(str(tmp_path), compact_threshold=None) as journal:
+        podcast_list, podcast_playlist = journal.load()
+        podcast_list.add_podcast(make_podcast("Podcast 1"))
+        podcast_playlist.add_playlist(PodcastEpisodeList(name="Queue", episodes=[make_episode("Episode 1")]))
+
+        journal.compact()
+
+        assert journal.record_count == 0
+        assert read_journal(tmp_path) == []
+        podcast_list.add_podcast(make_podcast("Podcast 2"))
+
+    snapshot = PodcastJSON.import_podcast_list(os.path.join(tmp_path, "podcast_list.json"))
+    assert [podcast.title for podcast in snapshot.podcasts] == ["Podcast 1"]
+    assert [record["seq"] for record in read_journal(tmp_path)] == [3]
+
+    podcast_list, podcast_playlist = reload(tmp_path)
+    assert [podcast.title for podcast in podcast_list.podcasts] == ["Podcast 1", "Podcast 2"]
+    assert podcast_playlist.playlists[0].episodes[0].title == "Episode 1"
+
+
+def test_replay_skips_records_contained_in_snapshot(tmp_path, make_podcast):
+    """A crash after the snapshots were written but before the journal was cut"""
+    with PodcastJournal(str(tmp_path), compact_threshold=None) as journal:
+        podcast_list, _ = journal.load()
+        podcast_list.add_podcast(make_podcast("Podcast 1"))
+        podcast_list.add_podcast(make_podcast("Podcast 2"))
+    with open(os.path.join(tmp_path, JOURNAL_FILE)) as f:
+        journal_lines = f.read()
+
+    with PodcastJournal(str(tmp_path), compact_threshold=None) as journal:
+        journal.load()
+        journal.compact()
+    with open(os.path.join(tmp_path, JOURNAL_FILE), 'w') as f:
+        f.write(journal_lines)
+
+    podcast_list, _ = reload(tmp_path)
+    assert [podcast.title for podcast in podcast_list.podcasts] == ["Podcast 1", "Podcast 2"]
+
+
+def test_replay_after_partial_compaction(tmp_path, make_podcast):
+    """A crash after the podcast list snapshot but before the playlist snapshot"""
+    with PodcastJournal(str(tmp_path), compact_threshold=None) as journal:
+        podcast_list, podcast_playlist = journal.load()
+        podcast_list.add_podcast(make_podcast("Podcast 1"))
+        podcast_playlist.add_playlist(PodcastEpisodeList(name="Queue", episodes=[]))
+
+    PodcastJSON.export_podcast_list(podcast_list, os.path.join(tmp_path, "podcast_list.json"))
+    with open(os.path.join(tmp_path, CHECKPOINT_FILE), 'w') as f:
+        json.dump({"podcast_list": 2, "podcast_playlist": 0}, f)
+
+    podcast_list, podcast_playlist = reload(tmp_path)
+    assert len(podcast_list.podcasts) == 1
+    assert [playlist.name for playlist in podcast_playlist.playlists] == ["Queue"]
+
+
+def test_crash_between_snapshot_writes_applies_nothing_twice(tmp_path, make_podcast, mocker):
+    """A crash after the podcast list snapshot was replaced, before anything else was written"""
+    with PodcastJournal(str(tmp_path), compact_threshold=None) as journal:
+        podcast_list, _ = journal.load()
+        podcast_list.add_podcast(make_podcast("A"))
+        podcast_list.add_podcast(make_podcast("B"))
+        podcast_list.delete_podcast(0)
+
+        writes = []
+
+        def crash_after_first(filename, text):
+            if writes:
+                raise OSError("crash")
+            writes.append(filename)
+            _atomic_write(filename, text)
+        mocker.patch('zpodcast.parsers.journal._atomic_write', side_effect=crash_after_first)
+        with pytest.raises(OSError):
+            journal.compact()
+
+    assert writes == [os.path.join(str(tmp_path), "podcast_list.json")]
+    podcast_list, _ = reload(tmp_path)
+    assert [podcast.title for podcast in podcast_list.podcasts] == ["B"]
+
+
+def test_compacted_snapshots_store_their_sequence(tmp_path, make_podcast):
+    with PodcastJournal(str(tmp_path), compact_threshold=None) as journal:
+        podcast_list, _ = journal.load()
+        podcast_list.add_podcast(make_podcast("Podcast 1"))
+        journal.compact()
+
+    with open(os.path.join(tmp_path, "podcast_list.json")) as f:
+        assert json.load(f)["journal_sequence"] == 1
+    assert not os.path.exists(os.path.join(tmp_path, CHECKPOINT_FILE))
+    snapshot = PodcastJSON.import_podcast_list(os.path.join(tmp_path, "podcast_list.json"))
+    assert [podcast.title for podcast in snapshot.podcasts] == ["Podcast 1"]
+
+
+def test_incomplete_last_record_is_dropped(tmp_path, make_podcast):
+    with PodcastJournal(str(tmp_path), compact_threshold=None) as journal:
+        podcast_list, _ = journal.load()
+        podcast_list.add_podcast(make_podcast("Podcast 1"))
+    with open(os.path.join(tmp_path, JOURNAL_FILE), 'a') as f:
+        f.write('{"seq":2,"op":"add_pod')
+
+    with PodcastJournal(str(tmp_path), compact_threshold=None) as journal:
+        podcast_list, _ = journal.load()
+        assert len(podcast_list.podcasts) == 1
+        podcast_list.add_podcast(make_podcast("Podcast 2"))
+
+    assert [record["seq"] for record in read_journal(tmp_path)] == [1, 2]
+
+
+def test_corrupt_record_raises(tmp_path):
+    with open(os.path.join(tmp_path, JOURNAL_FILE), 'w') as f:
+        f.write('not json\n')
+
+    with pytest.raises(ValueError):
+        PodcastJournal(str(tmp_path)).load()
+
+
+def test_threshold_starts_background_compaction(tmp_path, make_podcast):
+    journal = PodcastJournal(str(tmp_path), compact_threshold=3)
+    podcast_list, _ = journal.load()
+    for number in range(3):
+        podcast_list.add_podcast(make_podcast(f"Podcast {number}"))
+    journal.close()
+
+    assert os.path.exists(os.path.join(tmp_path, "podcast_list.json"))
+    assert read_journal(tmp_path) == []
+    podcast_list, _ = reload(tmp_path)
+    assert len(podcast_list.podcasts) == 3
+
+
+def test_close_detaches_journal(tmp_path, make_podcast):
+    journal = PodcastJournal(str(tmp_path), compact_threshold=None)
+    podcast_list, _ = journal.load()
+    journal.close()
+
+    podcast_list.add_podcast(make_podcast("Podcast 1"))
+
+    assert read_journal(tmp_path) == []
+
+
+def test_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        PodcastJournal(str(tmp_path), compact_threshold=0)
+    journal = PodcastJournal(str(tmp_path))
+    with pytest.raises(ValueError):
+        journal.compact()
+    journal.load()
+    with pytest.raises(ValueError):
+        journal.load()
+    journal.close()
+
+
+def test_url_change_fetched_outside_the_journal(tmp_path, make_podcast, mocker):
+    with PodcastJournal(str(tmp_path), compact_threshold=None) as journal:
+        podcast_list, _ = journal.load()
+        podcast_list.add_podcast(make_podcast("Podcast 1"))
+        lock_free = []
+
+        def parse_feed(url, **kwargs):
+            # another thread can journal changes while the feed is fetched
+            def probe():
+                if journal._lock.acquire(blocking=False):
+                    journal._lock.release()
+                    lock_free.append(True)
+            thread = threading.Thread(target=probe)
+            thread.start()
+            thread.join()
+            entries = [{"title": "New", "audio_url": "https://example.com/new.mp3", "guid": "new"}]
+            return ParsedFeed(url=url, entries=entries)
+        mocker.patch('zpodcast.parsers.rss.RSSPodcastParser.parse_feed', side_effect=parse_feed)
+
+        podcast_list.update_podcast(0, {"podcast_url": "https://example.com/moved.xml"})
+
+    assert lock_free == [True]
+    assert read_journal(tmp_path)[-1]["podcast"]["podcast_url"] == "https://example.com/moved.xml"
+    podcast_list, _ = reload(tmp_path)
+    assert [episode.title for episode in podcast_list.podcasts[0].episodelists[0].episodes] == ["New"]
@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import patch, mock_open
 from zpodcast.parsers.json import PodcastJSON
@@ -50,27 +51,23 @@ def sample_playlist():
     return PodcastPlaylist([episodes1, episodes2])
 
 
-@patch('zpodcast.parsers.json.open', new_callable=mock_open)
-@patch('json.dump')
-def test_export_podcast_list_mock(mock_json_dump, mock_file, sample_podcast_list):
-    filename = "test_podcast_list.json"
+@patch('zpodcast.parsers.json._atomic_write')
+def test_export_podcast_list_mock(mock_atomic_write, tmp_path, sample_podcast_list):
+    filename = str(tmp_path / "test_podcast_list.json")
     
     PodcastJSON.export_podcast_list(sample_podcast_list, filename)
     
-    # Check that the file was opened for writing
-    mock_file.assert_called_once_with(filename, 'w')
-    
-    # Check that json.dump was called with the correct arguments
-    mock_json_dump.assert_called_once()
-    args, _ = mock_json_dump.call_args
-    assert args[0]["version"] == "0.1"
-    assert "podcastlist" in args[0]
-    assert args[0]["podcastlist"] == sample_podcast_list.to_dict()
+    # Check that the file was written once with the correct document
+    mock_atomic_write.assert_called_once()
+    args, _ = mock_atomic_write.call_args
+    assert args[0] == filename
+    data = json.loads(args[1])
+    assert data["version"] == "0.1"
+    assert "podcastlist" in data
+    assert data["podcastlist"] == sample_podcast_list.to_dict()
 
 
-@patch('zpodcast.parsers.json.open', new_callable=mock_open)
-@patch('json.load')
-def test_import_podcast_list_mock(mock_json_load, mock_file, sample_podcast_list):
+def test_import_podcast_list_mock(sample_podcast_list):
     filename = "test_podcast_list.json"
     
     # Configure mock to return sample podcast list data
@@ -78,10 +75,10 @@ def test_import_podcast_list_mock(mock_json_load, mock_file, sample_podcast_list
         "version": "0.1",
         "podcastlist": sample_podcast_list.to_dict()
     }
-    mock_json_load.return_value = mock_data
     
     # Call the function under test
-    imported_podcast_list = PodcastJSON.import_podcast_list(filename)
+    with patch('zpodcast.parsers.json.open', mock_open(read_data=json.dumps(mock_data, indent=4))) as mock_file:
+        imported_podcast_list = PodcastJSON.import_podcast_list(filename)
     
     # Verify the file was opened for reading
     mock_file.assert_called_once_with(filename, 'r')
@@ -90,22 +87,20 @@ def test_import_podcast_list_mock(mock_json_load, mock_file, sample_podcast_list
     assert imported_podcast_list.to_dict() == sample_podcast_list.to_dict()
 
 
-@patch('zpodcast.parsers.json.open', new_callable=mock_open)
-@patch('json.dump')
-def test_export_podcast_playlist_mock(mock_json_dump, mock_file, sample_playlist):
-    filename = "test_podcast_playlist.json"
+@patch('zpodcast.parsers.json._atomic_write')
+def test_export_podcast_playlist_mock(mock_atomic_write, tmp_path, sample_playlist):
+    filename = str(tmp_path / "test_podcast_playlist.json")
     
     PodcastJSON.export_podcast_playlist(sample_playlist, filename)
     
-    # Check that the file was opened for writing
-    mock_file.assert_called_once_with(filename, 'w')
-    
-    # Check that json.dump was called with the correct arguments
-    mock_json_dump.assert_called_once()
-    args, _ = mock_json_dump.call_args
-    assert args[0]["version"] == "0.1"
-    assert "podcastplaylist" in args[0]
-    assert args[0]["podcastplaylist"] == sample_playlist.to_dict()
+    # Check that the file was written once with the correct document
+    mock_atomic_write.assert_called_once()
+    args, _ = mock_atomic_write.call_args
+    assert args[0] == filename
+    data = json.loads(args[1])
+    assert data["version"] == "0.1"
+    assert "podcastplaylist" in data
+    assert data["podcastplaylist"] == sample_playlist.to_dict()
 
 
 @patch('zpodcast.parsers.json.open', new_callable=mock_open)
@@ -131,12 +126,49 @@ def test_import_podcast_playlist_mock(mock_json_load, mock_file, sample_playlist
 
 
 def test_unsupported_version_podcast_list():
-    with patch('zpodcast.parsers.json.open', new_callable=mock_open), \
-         patch('json.load', return_value={"version": "0.2", "podcastlist": {}}):
+    read_data = json.dumps({"version": "0.2", "podcastlist": {}})
+    with patch('zpodcast.parsers.json.open', mock_open(read_data=read_data)):
+        with pytest.raises(ValueError, match="Unsupported version"):
+            PodcastJSON.import_podcast_list("test.json")
+
+
+def test_unsupported_version_after_podcasts():
+    read_data = json.dumps({"podcastlist": {"podcasts": []}, "version": "0.2"})
+    with patch('zpodcast.parsers.json.open', mock_open(read_data=read_data)):
         with pytest.raises(ValueError, match="Unsupported version"):
             PodcastJSON.import_podcast_list("test.json")
 
 
+def test_import_podcast_list_streams_in_small_chunks(mocker, sample_podcast_list):
+    mocker.patch('zpodcast.parsers.json.STREAM_CHUNK_SIZE', 7)
+    read_data = json.dumps({"version": "0.1", "podcastlist": sample_podcast_list.to_dict()}, indent=4)
+    with patch('zpodcast.parsers.json.open', mock_open(read_data=read_data)):
+        imported_podcast_list = PodcastJSON.import_podcast_list("test.json")
+    assert imported_podcast_list.to_dict() == sample_podcast_list.to_dict()
+
+
+def test_iter_podcasts_yields_one_podcast_at_a_time(sample_podcast_list):
+    read_data = json.dumps({"version": "0.1", "podcastlist": sample_podcast_list.to_dict()})
+    with patch('zpodcast.parsers.json.open', mock_open(read_data=read_data)):
+        podcasts = PodcastJSON.iter_podcasts("test.json")
+        first = next(podcasts)
+        assert first.title == "Test Podcast 1"
+        assert [podcast.title for podcast in podcasts] == ["Test Podcast 2"]
+
+
+def test_import_podcast_list_does_not_print(capsys, sample_podcast_list):
+    read_data = json.dumps({"version": "0.1", "podcastlist": sample_podcast_list.to_dict()})
+    with patch('zpodcast.parsers.json.open', mock_open(read_data=read_data)):
+        PodcastJSON.import_podcast_list("test.json")
+    assert capsys.readouterr().out == ""
+
+
+def test_import_podcast_list_invalid_document():
+    with patch('zpodcast.parsers.json.open', mock_open(read_data='{"version": "0.1", "podcastlist": {"podcasts": [{')):
+        with pytest.raises(ValueError):
+            PodcastJSON.import_podcast_list("test.json")
+
+
 def test_unsupported_version_podcast_playlist():
     with patch('zpodcast.parsers.json.open', new_callable=mock_open), \
          patch('json.load', return_value={"version": "0.2", "podcastplaylist": {}}):
@@ -144,17 +176,93 @@ def test_unsupported_version_podcast_playlist():
             PodcastJSON.import_podcast_playlist("test.json")
 
 
-def test_default_filename_podcast_list(sample_podcast_list):
-    with patch('zpodcast.parsers.json.open', new_callable=mock_open) as mock_file:
+def test_default_filename_podcast_list(tmp_path, monkeypatch, sample_podcast_list):
+    monkeypatch.chdir(tmp_path)
+    with patch('zpodcast.parsers.json._atomic_write') as mock_atomic_write:
         PodcastJSON.export_podcast_list(sample_podcast_list)
         
         # Check that the default filename was used
-        mock_file.assert_called_once_with(f"PodcastList-{PodcastJSON.VERSION}.json", 'w')
+        assert mock_atomic_write.call_args[0][0] == f"PodcastList-{PodcastJSON.VERSION}.json"
 
 
-def test_default_filename_podcast_playlist(sample_playlist):
-    with patch('zpodcast.parsers.json.open', new_callable=mock_open) as mock_file:
+def test_default_filename_podcast_playlist(tmp_path, monkeypatch, sample_playlist):
+    monkeypatch.chdir(tmp_path)
+    with patch('zpodcast.parsers.json._atomic_write') as mock_atomic_write:
         PodcastJSON.export_podcast_playlist(sample_playlist)
         
         # Check that the default filename was used
-        mock_file.assert_called_once_with(f"PodcastPlaylist-{PodcastJSON.VERSION}.json", 'w')
+        assert mock_atomic_write.call_args[0][0] == f"PodcastPlaylist-{PodcastJSON.VERSION}.json"
+
+
+"""
+Tests for compact, atomic and incremental export
+"""
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_export_matches_json_dumps(tmp_path, sample_podcast_list, sample_playlist, compact):
+    options = {"separators": (',', ':')} if compact else {"indent": 4}
+    list_file = tmp_path / "podcast_list.json"
+    playlist_file = tmp_path / "podcast_playlist.json"
+
+    PodcastJSON.export_podcast_list(sample_podcast_list, str(list_file), compact=compact)
+    PodcastJSON.export_podcast_playlist(sample_playlist, str(playlist_file), compact=compact)
+
+    assert list_file.read_text() == json.dumps(
+        {"version": "0.1", "podcastlist": sample_podcast_list.to_dict()}, **options)
+    assert playlist_file.read_text() == json.dumps(
+        {"version": "0.1", "podcastplaylist": sample_playlist.to_dict()}, **options)
+
+
+def test_export_empty_podcast_list(tmp_path):
+    filename = tmp_path / "podcast_list.json"
+    PodcastJSON.export_podcast_list(PodcastList([]), str(filename))
+    assert filename.read_text() == json.dumps({"version": "0.1", "podcastlist": {"podcasts": []}}, indent=4)
+
+
+def test_export_compact_is_smaller(tmp_path, sample_podcast_list):
+    readable = tmp_path / "readable.json"
+    compact = tmp_path / "compact.json"
+    PodcastJSON.export_podcast_list(sample_podcast_list, str(readable))
+    PodcastJSON.export_podcast_list(sample_podcast_list, str(compact), compact=True)
+    assert compact.stat().st_size < readable.stat().st_size
+
+
+def test_export_reencodes_only_changed_podcasts(tmp_path, sample_podcast_list):
+    filename = str(tmp_path / "podcast_list.json")
+    cache = PodcastJSON.fragment_cache
+    cache.clear()
+
+    PodcastJSON.export_podcast_list(sample_podcast_list, filename)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    sample_podcast_list.podcasts[1].host = "Someone Else"
+    PodcastJSON.export_podcast_list(sample_podcast_list, filename)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    imported = PodcastJSON.import_podcast_list(filename)
+    assert imported.podcasts[1].host == "Someone Else"
+
+
+def test_export_detects_episode_list_changes(tmp_path, sample_podcast_list):
+    filename = str(tmp_path / "podcast_list.json")
+    PodcastJSON.export_podcast_list(sample_podcast_list, filename)
+
+    sample_podcast_list.podcasts[0].episodelists[0].add_podcastepisode(
+        PodcastEpisode(title="Episode 3", audio_url="https://example.com/episode3.mp3"))
+    PodcastJSON.export_podcast_list(sample_podcast_list, filename)
+
+    imported = PodcastJSON.import_podcast_list(filename)
+    assert len(imported.podcasts[0].episodelists[0].episodes) == 3
+
+
+def test_export_is_atomic(tmp_path, mocker, sample_podcast_list):
+    filename = tmp_path / "podcast_list.json"
+    filename.write_text("previous contents")
+    mocker.patch('zpodcast.parsers.json.os.replace', side_effect=OSError("disk full"))
+
+    with pytest.raises(OSError):
+        PodcastJSON.export_podcast_list(sample_podcast_list, str(filename))
+
+    assert filename.read_text() == "previous contents"
+    assert [path.name for path in tmp_path.iterdir()] == ["podcast_list.json"]
@@ -1,6 +1,8 @@
 import pytest
+import time
+from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
-from zpodcast.parsers.rss import RSSPodcastParser
+from zpodcast.parsers.rss import RSSPodcastParser, FeedValidatorStore, FeedTimeoutHandler
 from zpodcast.core.podcast import PodcastData
 from zpodcast.core.episode import PodcastEpisode
 
@@ -168,4 +170,271 @@ def test_get_rss_metadata_with_feed_error(mock_feedparser):
     mock_feedparser.return_value = mock_feed
 
     metadata = RSSPodcastParser.get_rss_metadata('https://example.com/invalid-feed.rss')
-    assert metadata == {}
\ No newline at end of file
+    assert metadata == {}
+
+
+"""
+Tests for conditional fetching with ETag / Last-Modified validators
+"""
+
+
+@pytest.fixture
+def validator_store():
+    store = FeedValidatorStore.get_instance()
+    store.clear()
+    yield store
+    store.clear()
+
+
+def test_get_episodes_records_validators(mock_feedparser, validator_store):
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.status = 200
+    mock_feed.etag = '"abc123"'
+    mock_feed.modified = 'Mon, 11 Apr 2024 15:00:00 GMT'
+    mock_feed.entries = []
+    mock_feedparser.return_value = mock_feed
+
+    RSSPodcastParser.get_episodes('https://example.com/feed.rss')
+
+    assert validator_store.get('https://example.com/feed.rss') == ('"abc123"', 'Mon, 11 Apr 2024 15:00:00 GMT')
+
+
+def test_error_response_validators_not_recorded(mock_feedparser, validator_store):
+    validator_store.update('https://example.com/feed.rss', '"abc123"', None)
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.status = 503
+    mock_feed.etag = '"error-page"'
+    mock_feed.modified = 'Mon, 11 Apr 2024 15:00:00 GMT'
+    mock_feed.entries = []
+    mock_feedparser.return_value = mock_feed
+
+    parsed = RSSPodcastParser.parse_feed('https://example.com/feed.rss')
+
+    assert parsed.error is not None
+    assert validator_store.get('https://example.com/feed.rss') == ('"abc123"', None)
+
+
+def test_get_episodes_conditional_sends_validators(mock_feedparser, validator_store):
+    validator_store.update('https://example.com/feed.rss', '"abc123"', 'Mon, 11 Apr 2024 15:00:00 GMT')
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.status = 304
+    mock_feedparser.return_value = mock_feed
+
+    episodes = RSSPodcastParser.get_episodes('https://example.com/feed.rss', conditional=True)
+
+    assert episodes is None
+    mock_feedparser.assert_called_once_with('https://example.com/feed.rss',
+                                            etag='"abc123"',
+                                            modified='Mon, 11 Apr 2024 15:00:00 GMT')
+    # a 304 keeps the validators we already had
+    assert validator_store.get('https://example.com/feed.rss') == ('"abc123"', 'Mon, 11 Apr 2024 15:00:00 GMT')
+
+
+def test_get_episodes_unconditional_ignores_validators(mock_feedparser, validator_store):
+    validator_store.update('https://example.com/feed.rss', '"abc123"', None)
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.status = 200
+    mock_feed.entries = []
+    mock_feedparser.return_value = mock_feed
+
+    episodes = RSSPodcastParser.get_episodes('https://example.com/feed.rss')
+
+    assert episodes == []
+    mock_feedparser.assert_called_once_with('https://example.com/feed.rss')
+
+
+def test_validator_store_ignores_non_string_values(validator_store):
+    validator_store.update('https://example.com/feed.rss', None, 5)
+    assert validator_store.get('https://example.com/feed.rss') == (None, None)
+    assert validator_store.to_dict() == {}
+
+
+def test_validator_store_persisted(tmp_path):
+    path = str(tmp_path / "feed_validators.json")
+    store = FeedValidatorStore()
+    store.attach(path)
+    store.update('https://example.com/feed.rss', '"abc123"', 'Mon, 11 Apr 2024 15:00:00 GMT')
+    store.flush()
+
+    restarted = FeedValidatorStore()
+    restarted.update('https://example.com/other.rss', '"def456"', None)
+    restarted.attach(path)
+    assert restarted.get('https://example.com/feed.rss') == ('"abc123"', 'Mon, 11 Apr 2024 15:00:00 GMT')
+    assert restarted.get('https://example.com/other.rss') == ('"def456"', None)
+
+
+def test_validator_store_flush_only_when_changed(tmp_path, mocker):
+    store = FeedValidatorStore()
+    store.flush()  # not attached
+    store.attach(str(tmp_path / "feed_validators.json"))
+    write = mocker.patch('zpodcast.parsers.json._atomic_write')
+    store.flush()
+    store.update('https://example.com/feed.rss', None, None)
+    store.flush()
+    assert not write.called
+
+    store.update('https://example.com/feed.rss', '"abc123"', None)
+    store.flush()
+    store.update('https://example.com/feed.rss', '"abc123"', None)
+    store.flush()
+    assert write.call_count == 1
+
+
+def test_validator_store_reattached_keeps_files_apart(tmp_path):
+    first = str(tmp_path / "first.json")
+    second = str(tmp_path / "second.json")
+    store = FeedValidatorStore()
+    store.attach(first)
+    store.update('https://example.com/first.rss', '"abc123"', None)
+
+    store.attach(second)
+    assert store.to_dict() == {}
+    store.update('https://example.com/second.rss', '"def456"', None)
+    store.flush()
+
+    first_store = FeedValidatorStore()
+    first_store.attach(first)
+    assert first_store.to_dict() == {'https://example.com/first.rss': {'etag': '"abc123"'}}
+    second_store = FeedValidatorStore()
+    second_store.attach(second)
+    assert second_store.to_dict() == {'https://example.com/second.rss': {'etag': '"def456"'}}
+
+
+def test_validator_store_registers_exit_flush_once(tmp_path, mocker):
+    mocker.patch.object(FeedValidatorStore, '_exit_flush_registered', False)
+    register = mocker.patch('zpodcast.parsers.rss.atexit.register')
+    FeedValidatorStore.get_instance().attach(str(tmp_path / "first.json"))
+    FeedValidatorStore.get_instance().attach(str(tmp_path / "second.json"))
+    FeedValidatorStore().attach(str(tmp_path / "third.json"))
+    register.assert_called_once_with(FeedValidatorStore._flush_shared)
+
+
+def test_validator_store_unreadable_file(tmp_path):
+    path = tmp_path / "feed_validators.json"
+    path.write_text("{not json")
+    store = FeedValidatorStore()
+    store.attach(str(path))
+    assert store.to_dict() == {}
+
+
+def test_validator_store_shared_instance():
+    assert FeedValidatorStore.get_instance() is FeedValidatorStore.get_instance()
+
+
+"""
+Tests for the single-pass parse_feed API
+"""
+
+
+def test_parse_feed_returns_episodes_and_metadata(mock_feedparser, validator_store):
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.status = 200
+    mock_feed.entries = [
+        {
+            'title': 'Test Episode 1',
+            'enclosures': [{'href': 'https://example.com/episode1.mp3'}],
+            'description': 'Test Description 1',
+            'published': 'Mon, 11 Apr 2024 15:00:00 +0100',
+            'itunes_duration': '1800',
+            'guid': 'episode1-guid'
+        }
+    ]
+    mock_feed.feed = {
+        'title': 'Test Podcast',
+        'description': 'Test Description',
+        'author': 'Test Author',
+        'image': {'href': 'https://example.com/podcast.jpg'}
+    }
+    mock_feedparser.return_value = mock_feed
+
+    parsed = RSSPodcastParser.parse_feed('https://example.com/feed.rss')
+
+    mock_feedparser.assert_called_once()
+    assert parsed.ok
+    assert not parsed.not_modified
+    assert len(parsed.episodes) == 1
+    assert parsed.episodes[0].title == 'Test Episode 1'
+    assert parsed.metadata['author'] == 'Test Author'
+    assert parsed.metadata['image'] == 'https://example.com/podcast.jpg'
+
+
+def test_parse_feed_with_feed_error(mock_feedparser, validator_store):
+    mock_feed = MagicMock()
+    mock_feed.bozo = True
+    mock_feed.bozo_exception = "Invalid XML"
+    mock_feedparser.return_value = mock_feed
+
+    parsed = RSSPodcastParser.parse_feed('https://example.com/invalid-feed.rss')
+
+    assert not parsed.ok
+    assert parsed.error == "Invalid XML"
+    assert parsed.episodes == []
+    assert parsed.metadata == {}
+
+
+def test_parse_feed_not_modified(mock_feedparser, validator_store):
+    validator_store.update('https://example.com/feed.rss', '"abc123"', None)
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.status = 304
+    mock_feedparser.return_value = mock_feed
+
+    parsed = RSSPodcastParser.parse_feed('https://example.com/feed.rss', conditional=True)
+
+    assert parsed.ok
+    assert parsed.not_modified
+    assert parsed.episodes == []
+
+
+def test_parse_feed_http_error_status(mock_feedparser, validator_store):
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.status = 404
+    mock_feed.entries = []
+    mock_feedparser.return_value = mock_feed
+
+    parsed = RSSPodcastParser.parse_feed('https://example.com/missing.rss')
+
+    assert not parsed.ok
+    assert parsed.error == "HTTP error 404"
+
+
+def test_parse_feed_timeout_handler(mock_feedparser, validator_store):
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.status = 200
+    mock_feed.entries = []
+    mock_feed.feed = {}
+    mock_feedparser.return_value = mock_feed
+
+    RSSPodcastParser.parse_feed('https://example.com/feed.rss', timeout=5)
+
+    handlers = mock_feedparser.call_args.kwargs['handlers']
+    assert isinstance(handlers[0], FeedTimeoutHandler)
+    assert handlers[0].timeout == 5
+
+
+def test_get_episodes_uses_published_parsed(mock_feedparser, mocker):
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.entries = [
+        {
+            'title': 'Test Episode 1',
+            'enclosures': [{'href': 'https://example.com/episode1.mp3'}],
+            'description': 'Test Description 1',
+            'published': 'Mon, 11 Apr 2024 15:00:00 +0100',
+            'published_parsed': time.struct_time((2024, 4, 11, 14, 0, 0, 3, 102, 0)),
+        }
+    ]
+    mock_feedparser.return_value = mock_feed
+    parse = mocker.patch('zpodcast.utils.dates.parsedate_to_datetime')
+
+    episodes = RSSPodcastParser.get_episodes('https://example.com/feed.rss')
+
+    parse.assert_not_called()
+    assert episodes[0].pub_date == datetime(2024, 4, 11, 14, 0, tzinfo=timezone.utc)
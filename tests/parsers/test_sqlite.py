@@ -0,0 +1,244 @@
+import os
+import sqlite3
+import pytest
+from zpodcast.parsers.sqlite import PodcastSQLite, migrate_json_to_sqlite
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.core.playlists import PodcastPlaylist
+from zpodcast.core.playlist import PodcastEpisodeList
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+@pytest.fixture
+def sample_podcast(make_podcast):
+    """Factory of fully described podcasts numbered like the sample list"""
+    def make(number, episodes):
+        return make_podcast(
+            f"Test Podcast {number}",
+            podcast_url=f"http://example.com/podcast{number}.rss",
+            host="John Doe",
+            description=f"This is a test podcast {number}",
+            episodelists=[PodcastEpisodeList(name=f"Test Podcast {number} episode list", episodes=episodes)],
+            podcast_priority=5,
+            image_url=f"http://example.com/image{number}.jpg"
+        )
+    return make
+
+
+@pytest.fixture
+def sample_podcast_list(sample_podcast, make_episode):
+    return PodcastList([
+        sample_podcast(1, [
+            make_episode("episode1", title="Episode 1",
+                         pub_date="Mon, 11 Apr 2016 15:00:00 +0100", duration=1800, guid="episode-1"),
+            make_episode("episode2", title="Episode 2", guid="episode-2")
+        ]),
+        sample_podcast(2, [
+            make_episode("episode3", title="Episode 3", episode_number=3)
+        ])
+    ])
+
+
+@pytest.fixture
+def sample_playlist(make_episode):
+    return PodcastPlaylist([
+        PodcastEpisodeList(name="Test playList 1", episodes=[
+            make_episode("episode2", title="Episode 2", guid="episode-2"),
+            make_episode("episode9", title="Episode 9")
+        ])
+    ])
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PodcastSQLite(str(tmp_path / "zpodcast.db"))
+    yield store
+    store.close()
+
+
+def count_rows(store, table):
+    return store._connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_podcast_list_round_trip(store, sample_podcast_list):
+    store.export_podcast_list(sample_podcast_list)
+    loaded = store.import_podcast_list()
+    assert loaded.to_dict() == sample_podcast_list.to_dict()
+    assert all(podcast.refresh_pending for podcast in loaded.podcasts)
+
+
+def test_podcast_playlist_round_trip(store, sample_podcast_list, sample_playlist):
+    store.export_podcast_list(sample_podcast_list)
+    store.export_podcast_playlist(sample_playlist)
+    assert store.import_podcast_playlist().to_dict() == sample_playlist.to_dict()
+    # the playlist shares the stored episode of podcast 1
+    assert count_rows(store, "episodes") == 4
+
+
+def test_save_podcast_updates_single_podcast(store, sample_podcast_list, make_episode):
+    store.export_podcast_list(sample_podcast_list)
+    podcast = sample_podcast_list.podcasts[0]
+    podcast.host = "Jane Doe"
+    podcast.episodelists[0].episodes[0].title = "Episode 1 (corrected)"
+    podcast.episodelists[0].add_podcastepisode(
+        make_episode("episode4", title="Episode 4", guid="episode-4"))
+
+    changes_before = store._connection.total_changes
+    store.save_podcast(podcast)
+    # podcast row, one updated and one new episode, plus the list name
+    assert store._connection.total_changes - changes_before == 4
+
+    loaded = store.import_podcast_list()
+    assert loaded.podcasts[0].host == "Jane Doe"
+    assert [episode.title for episode in loaded.podcasts[0].episodelists[0].episodes] == [
+        "Episode 1 (corrected)", "Episode 2", "Episode 4"
+    ]
+
+
+def test_save_new_podcast_is_appended(store, sample_podcast_list, sample_podcast):
+    store.export_podcast_list(sample_podcast_list)
+    store.save_podcast(sample_podcast(3, []))
+    assert [podcast.title for podcast in store.import_podcast_list().podcasts] == [
+        "Test Podcast 1", "Test Podcast 2", "Test Podcast 3"
+    ]
+
+
+def test_save_podcast_after_url_change(store, sample_podcast_list):
+    store.export_podcast_list(sample_podcast_list)
+    podcast = sample_podcast_list.podcasts[0]
+    podcast.podcast_url = "http://example.com/moved.rss"
+
+    store.save_podcast(podcast)
+
+    loaded = store.import_podcast_list()
+    assert [podcast.podcast_url for podcast in loaded.podcasts] == [
+        "http://example.com/moved.rss", "http://example.com/podcast2.rss"
+    ]
+    assert count_rows(store, "podcasts") == 2
+    assert count_rows(store, "episodes") == 3
+
+
+def test_podcasts_sharing_a_feed_url(store, sample_podcast_list, sample_podcast):
+    duplicate = sample_podcast(1, [])
+    duplicate.title = "Test Podcast 1 (copy)"
+    sample_podcast_list.add_podcast(duplicate)
+
+    store.export_podcast_list(sample_podcast_list)
+    assert store.import_podcast_list().to_dict() == sample_podcast_list.to_dict()
+
+    duplicate.podcast_priority = 1
+    store.save_podcast(duplicate)
+    loaded = store.import_podcast_list()
+    assert [podcast.podcast_priority for podcast in loaded.podcasts] == [5, 5, 1]
+    assert [podcast.title for podcast in loaded.podcasts] == [
+        "Test Podcast 1", "Test Podcast 2", "Test Podcast 1 (copy)"
+    ]
+
+    # loaded podcasts map back to their own rows
+    store.export_podcast_list(loaded)
+    assert store.import_podcast_list().to_dict() == loaded.to_dict()
+    assert count_rows(store, "podcasts") == 3
+
+
+def test_save_episode(store, sample_podcast_list, make_episode):
+    store.export_podcast_list(sample_podcast_list)
+    store.save_episode("http://example.com/podcast2.rss",
+                       make_episode("episode3", title="Episode 3 (updated)"))
+    store.save_episode("http://example.com/podcast2.rss",
+                       make_episode("episode5", title="Episode 5"))
+
+    episodes = store.import_podcast_list().podcasts[1].episodelists[0].episodes
+    assert [episode.title for episode in episodes] == ["Episode 3 (updated)", "Episode 5"]
+    with pytest.raises(ValueError):
+        store.save_episode("http://example.com/missing.rss", episodes[0])
+
+
+def test_playlist_episodes_of_feeds_sharing_guids(store, make_podcast, make_episode):
+    podcast_a = make_podcast("A", episodes=[make_episode("A one", audio_url="https://a.example.com/1.mp3", guid="1")])
+    podcast_b = make_podcast("B", episodes=[make_episode("B one", audio_url="https://b.example.com/1.mp3", guid="1")])
+    store.export_podcast_list(PodcastList([podcast_a, podcast_b]))
+    playlist = PodcastPlaylist([PodcastEpisodeList(name="Queue", episodes=[
+        make_episode("B one", audio_url="https://b.example.com/1.mp3", guid="1"),
+        make_episode("Moved", audio_url="https://a.example.com/1.mp3", guid="other")
+    ])])
+
+    store.export_podcast_playlist(playlist)
+
+    episodes = store.import_podcast_playlist().playlists[0].episodes
+    assert [(episode.title, episode.audio_url) for episode in episodes] == [
+        ("B one", "https://b.example.com/1.mp3"), ("Moved", "https://a.example.com/1.mp3")]
+    # B's episode is shared with the podcast, the other one has its own row
+    assert count_rows(store, "episodes") == 3
+
+
+def test_delete_podcast_keeps_playlist_episodes(store, sample_podcast_list, sample_playlist):
+    store.export_podcast_list(sample_podcast_list)
+    store.export_podcast_playlist(sample_playlist)
+
+    assert store.delete_podcast("http://example.com/podcast1.rss")
+    assert not store.delete_podcast("http://example.com/podcast1.rss")
+
+    assert [podcast.title for podcast in store.import_podcast_list().podcasts] == ["Test Podcast 2"]
+    assert store.import_podcast_playlist().to_dict() == sample_playlist.to_dict()
+    # episode 1 was only in the podcast and is gone
+    assert count_rows(store, "episodes") == 3
+
+
+def test_export_podcast_list_removes_missing_podcasts(store, sample_podcast_list):
+    store.export_podcast_list(sample_podcast_list)
+    store.export_podcast_list(PodcastList([sample_podcast_list.podcasts[1]]))
+    assert [podcast.title for podcast in store.import_podcast_list().podcasts] == ["Test Podcast 2"]
+    assert count_rows(store, "episodes") == 1
+
+
+def test_save_playlist(store, sample_playlist):
+    store.export_podcast_playlist(sample_playlist)
+    store.save_playlist(1, PodcastEpisodeList(name="Test playList 2", episodes=[]))
+    playlists = store.import_podcast_playlist().playlists
+    assert [playlist.name for playlist in playlists] == ["Test playList 1", "Test playList 2"]
+
+
+def test_save_playlist_writes_changed_members_only(store, sample_playlist, make_episode):
+    store.export_podcast_playlist(sample_playlist)
+    playlist = sample_playlist.playlists[0]
+    playlist.add_podcastepisode(
+        make_episode("episode10", title="Episode 10"))
+
+    changes_before = store._connection.total_changes
+    store.save_playlist(0, playlist)
+    # the playlist name, the new episode and its membership
+    assert store._connection.total_changes - changes_before == 3
+
+    playlist.remove_podcastepisode(0)
+    store.save_playlist(0, playlist)
+    assert store.import_podcast_playlist().to_dict() == sample_playlist.to_dict()
+
+
+def test_data_persists_across_connections(tmp_path, sample_podcast_list):
+    filename = str(tmp_path / "zpodcast.db")
+    with PodcastSQLite(filename) as store:
+        store.export_podcast_list(sample_podcast_list)
+    with PodcastSQLite(filename) as store:
+        assert store.import_podcast_list().to_dict() == sample_podcast_list.to_dict()
+
+
+def test_newer_schema_version_rejected(tmp_path):
+    filename = str(tmp_path / "zpodcast.db")
+    connection = sqlite3.connect(filename)
+    connection.execute("PRAGMA user_version = 99")
+    connection.close()
+    with pytest.raises(ValueError):
+        PodcastSQLite(filename)
+
+
+def test_migrate_json_to_sqlite(tmp_path):
+    podcast_list_file = os.path.join(DATA_DIR, 'podcast_list.json')
+    podcast_playlist_file = os.path.join(DATA_DIR, 'podcast_playlist.json')
+
+    with migrate_json_to_sqlite(podcast_list_file, podcast_playlist_file, str(tmp_path / "zpodcast.db")) as store:
+        podcast_list = store.import_podcast_list()
+        podcast_playlist = store.import_podcast_playlist()
+
+    assert [podcast.title for podcast in podcast_list.podcasts] == ["Test Podcast 1", "Test Podcast 2"]
+    assert [playlist.name for playlist in podcast_playlist.playlists] == ["Test playList 1", "Test playList 2"]
+    assert len(podcast_playlist.playlists[0].episodes) == 2
@@ -0,0 +1,55 @@
+import time
+from datetime import date, datetime, timedelta, timezone
+from zpodcast.utils.dates import normalize_pub_date, parse_pub_date, pub_date_cache_stats
+
+
+def today_utc():
+    return datetime.combine(date.today(), datetime.min.time(), timezone.utc)
+
+
+def test_normalize_datetimes():
+    aware = datetime(2023, 1, 15, 10, 30, tzinfo=timezone(timedelta(hours=2)))
+
+    assert normalize_pub_date(aware) == datetime(2023, 1, 15, 8, 30, tzinfo=timezone.utc)
+    assert normalize_pub_date(aware).tzinfo is timezone.utc
+    assert normalize_pub_date(datetime(2023, 1, 15, 10, 30)) == datetime(2023, 1, 15, 10, 30, tzinfo=timezone.utc)
+    assert normalize_pub_date(date(2023, 1, 15)) == datetime(2023, 1, 15, tzinfo=timezone.utc)
+
+
+def test_normalize_struct_time():
+    parsed = time.struct_time((2023, 1, 15, 10, 30, 0, 6, 15, 0))
+
+    assert normalize_pub_date(parsed) == datetime(2023, 1, 15, 10, 30, tzinfo=timezone.utc)
+
+
+def test_normalize_strings():
+    assert normalize_pub_date("Sun, 15 Jan 2023 10:30:00 +0100") == datetime(2023, 1, 15, 9, 30, tzinfo=timezone.utc)
+    assert normalize_pub_date("2023-01-15T10:30:00+00:00") == datetime(2023, 1, 15, 10, 30, tzinfo=timezone.utc)
+    assert normalize_pub_date("2023-01-15") == datetime(2023, 1, 15, tzinfo=timezone.utc)
+
+
+def test_normalize_utc_designator():
+    expected = datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc)
+    assert normalize_pub_date("2024-01-01T10:00:00Z") == expected
+    assert normalize_pub_date("2024-01-01T10:00:00.000z") == expected
+
+
+def test_normalize_invalid_values_give_today():
+    assert normalize_pub_date(None) == today_utc()
+    assert normalize_pub_date("not a date") == today_utc()
+    assert normalize_pub_date(1234) == today_utc()
+    assert normalize_pub_date((2023, 13, 45, 0, 0, 0)) == today_utc()
+
+
+def test_parse_is_cached():
+    parse_pub_date.cache_clear()
+
+    normalize_pub_date("Sun, 15 Jan 2023 10:30:00 +0100")
+    normalize_pub_date("Sun, 15 Jan 2023 10:30:00 +0100")
+    normalize_pub_date("not a date")
+    normalize_pub_date("not a date")
+
+    stats = pub_date_cache_stats()
+    assert stats["misses"] == 2
+    assert stats["hits"] == 2
+    assert stats["size"] == 2
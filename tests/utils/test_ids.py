@@ -0,0 +1,25 @@
+from zpodcast.utils.ids import make_episode_id, make_podcast_id, ID_LENGTH
+
+
+def test_make_podcast_id():
+    podcast_id = make_podcast_id("https://example.com/feed.xml")
+
+    assert len(podcast_id) == ID_LENGTH
+    assert podcast_id == make_podcast_id("https://example.com/feed.xml")
+    assert podcast_id != make_podcast_id("https://example.com/other.xml")
+
+
+def test_make_episode_id_prefers_guid():
+    episode_id = make_episode_id("tag:example.com,2023:/episodes/1", "https://example.com/1.mp3")
+
+    assert len(episode_id) == ID_LENGTH
+    assert episode_id.isalnum()
+    assert episode_id == make_episode_id("tag:example.com,2023:/episodes/1", "https://cdn.example.com/moved.mp3")
+
+
+def test_make_episode_id_falls_back_to_audio_url():
+    assert make_episode_id(None, "https://example.com/1.mp3") == make_episode_id("", "https://example.com/1.mp3")
+    assert make_episode_id(None, "https://example.com/1.mp3") != make_episode_id(None, "https://example.com/2.mp3")
+    # an audio URL never collides with a GUID of the same text
+    assert make_episode_id(None, "https://example.com/1.mp3") != make_episode_id("https://example.com/1.mp3", None)
+    assert make_episode_id(None, None) is None
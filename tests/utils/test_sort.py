@@ -154,4 +154,17 @@ def test_podcast_author_setter():
     
     # Test invalid value
     with pytest.raises(ValueError):
-        params.podcast_author = "invalid"
\ No newline at end of file
+        params.podcast_author = "invalid"
+
+
+def test_from_options():
+    params = SortParameters.from_options(episode_date="Latest", podcast_author="Z-A")
+
+    assert params.episode_date == "Latest"
+    assert params.podcast_author == "Z-A"
+    assert params.episode_title is None
+
+    with pytest.raises(ValueError):
+        SortParameters.from_options(episode_date="Yesterday")
+    with pytest.raises(ValueError):
+        SortParameters.from_options(episode_colour="A-Z")
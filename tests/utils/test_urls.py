@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import pytest
+from zpodcast.utils.urls import URLValidator, is_url
+
+
+def test_is_valid_matches_validators():
+    validator = URLValidator()
+
+    assert validator.is_valid("https://example.com/episode.mp3")
+    assert validator.is_valid("HTTP://EXAMPLE.COM")
+    assert not validator.is_valid("https://exa mple.com")
+    assert not validator.is_valid("http://localhost/feed.xml")
+
+
+def test_non_urls_rejected_by_precheck(mocker):
+    url = mocker.patch('zpodcast.utils.urls.validators.url')
+    validator = URLValidator()
+
+    assert not validator.is_valid("example.com")
+    assert not validator.is_valid(" https://example.com")
+    assert not validator.is_valid("")
+    assert not validator.is_valid(None)
+    assert not validator.is_valid(42)
+
+    url.assert_not_called()
+    assert validator.rejected == 5
+
+
+def test_results_are_cached(mocker):
+    url = mocker.patch('zpodcast.utils.urls.validators.url', return_value=True)
+    validator = URLValidator()
+
+    assert validator.is_valid("https://example.com/cover.jpg")
+    assert validator.is_valid("https://example.com/cover.jpg")
+
+    url.assert_called_once_with("https://example.com/cover.jpg")
+    assert validator.stats() == {"hits": 1, "misses": 1, "rejected": 0, "size": 1, "maxsize": 4096}
+
+
+def test_invalid_results_are_cached(mocker):
+    url = mocker.patch('zpodcast.utils.urls.validators.url', return_value=False)
+    validator = URLValidator()
+
+    assert not validator.is_valid("https://example.com/cover.jpg")
+    assert not validator.is_valid("https://example.com/cover.jpg")
+
+    assert url.call_count == 1
+
+
+def test_least_recently_used_url_is_evicted(mocker):
+    url = mocker.patch('zpodcast.utils.urls.validators.url', return_value=True)
+    validator = URLValidator(maxsize=2)
+
+    validator.is_valid("https://example.com/1")
+    validator.is_valid("https://example.com/2")
+    validator.is_valid("https://example.com/1")
+    validator.is_valid("https://example.com/3")
+    validator.is_valid("https://example.com/1")
+    validator.is_valid("https://example.com/2")
+
+    assert [call.args[0] for call in url.call_args_list] == [
+        "https://example.com/1", "https://example.com/2", "https://example.com/3", "https://example.com/2"
+    ]
+    assert validator.stats()["size"] == 2
+
+
+def test_clear_resets_counters():
+    validator = URLValidator()
+    validator.is_valid("https://example.com")
+    validator.is_valid("https://example.com")
+
+    validator.clear()
+
+    assert validator.stats() == {"hits": 0, "misses": 0, "rejected": 0, "size": 0, "maxsize": 4096}
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        URLValidator(maxsize=0)
+
+
+def test_is_url_uses_shared_instance():
+    shared = URLValidator.get_instance()
+    misses = shared.misses
+
+    is_url("https://example.com/shared-instance-test")
+
+    assert shared.misses == misses + 1
+
+
+def test_shared_instance_created_once_across_threads(monkeypatch):
+    monkeypatch.setattr(URLValidator, '_instance', None)
+    created = []
+    original_init = URLValidator.__init__
+
+    def slow_init(self, *args, **kwargs):
+        created.append(self)
+        # widen the window in which a second thread could also create one
+        time.sleep(0.05)
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(URLValidator, '__init__', slow_init)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        instances = list(executor.map(lambda _: URLValidator.get_instance(), range(8)))
+
+    assert len(created) == 1
+    assert all(instance is created[0] for instance in instances)
@@ -1,7 +1,11 @@
 from flask import Flask, jsonify
 from flasgger import Swagger
-from zpodcast.api.blueprints import podcasts_bp, playlists_bp, episodes_bp
+from zpodcast.api.blueprints import podcasts_bp, playlists_bp, episodes_bp, search_bp, stats_bp
+from zpodcast.core.playlists import PodcastPlaylist
+from zpodcast.core.podcasts import PodcastList
 from zpodcast.parsers.json import PodcastJSON
+from zpodcast.parsers.journal import PodcastJournal
+from zpodcast.parsers.rss import FeedValidatorStore, VALIDATORS_FILE
 import os
 
 
@@ -28,6 +32,10 @@ swagger_template = {
         {
             'name': 'episodes',
             'description': 'Episode management operations'
+        },
+        {
+            'name': 'stats',
+            'description': 'Cache and download monitoring'
         }
     ]
 }
@@ -44,6 +52,8 @@ class zPodcastApp:
         self.app.register_blueprint(podcasts_bp, url_prefix='/api/podcasts')
         self.app.register_blueprint(playlists_bp, url_prefix='/api/playlists')
         self.app.register_blueprint(episodes_bp, url_prefix='/api/episodes')
+        self.app.register_blueprint(search_bp, url_prefix='/api/search')
+        self.app.register_blueprint(stats_bp, url_prefix='/api/stats')
 
     def _setup_error_handlers(self):
         """Setup error handlers for common HTTP errors"""
@@ -59,18 +69,46 @@ class zPodcastApp:
         def internal_server_error(error):
             return jsonify({"error": "Internal server error"}), 500
 
-    def create_app(self, data_dir):
-        """Create and configure the Flask application"""
-        self.app.config['DATA_DIR'] = data_dir
+    def create_app(self, data_dir, refresh_feeds: bool = False, journal: bool = False):
+        """
+        Create and configure the Flask application
 
-        # Load podcast_list
-        podcast_list_path = os.path.join(data_dir, 'podcast_list.json')
-        self.app.config['podcast_list'] = PodcastJSON.import_podcast_list(podcast_list_path)
+        Loading the persisted library is pure local I/O; podcast feeds are
+        only fetched during start up when refresh_feeds is True; otherwise
+        they stay refresh_pending until PodcastList.refresh_podcasts is
+        scheduled.
+
+        With journal set, the library is loaded through a PodcastJournal:
+        the journal is replayed over the snapshots in data_dir and every
+        change made through the API is appended to it.
+
+        The feeds' ETag / Last-Modified validators are kept in data_dir as
+        well, so refreshes after a restart can still be conditional.
+        """
+        self.app.config['DATA_DIR'] = data_dir
+        FeedValidatorStore.get_instance().attach(os.path.join(data_dir, VALIDATORS_FILE))
+
+        if journal:
+            podcast_journal = PodcastJournal(data_dir)
+            podcast_list, podcast_playlist = podcast_journal.load()
+            self.app.config['journal'] = podcast_journal
+            # the blueprints work on the singletons
+            PodcastList._instance = podcast_list
+            PodcastPlaylist._instance = podcast_playlist
+        else:
+            # Load podcast_list
+            podcast_list_path = os.path.join(data_dir, 'podcast_list.json')
+            podcast_list = PodcastJSON.import_podcast_list(podcast_list_path)
+
+            # Load podcast_playlist
+            podcast_playlist_path = os.path.join(data_dir, 'podcast_playlist.json')
+            podcast_playlist = PodcastJSON.import_podcast_playlist(podcast_playlist_path)
+
+        if refresh_feeds:
+            podcast_list.refresh_podcasts(pending_only=True)
+        self.app.config['podcast_list'] = podcast_list
+        self.app.config['podcast_playlist'] = podcast_playlist
 
-        # Load podcast_playlist
-        podcast_playlist_path = os.path.join(data_dir, 'podcast_playlist.json')
-        self.app.config['podcast_playlist'] = PodcastJSON.import_podcast_playlist(podcast_playlist_path)
-        
         # Initialize Swagger documentation
         Swagger(self.app, template=swagger_template)
 
@@ -84,7 +122,8 @@ class zPodcastApp:
 
 
 # Create the application instance
-app = zPodcastApp().create_app(os.getenv('ZPODCAST_DATA_DIR', 'data'))
+app = zPodcastApp().create_app(os.getenv('ZPODCAST_DATA_DIR', 'data'),
+                               journal=os.getenv('ZPODCAST_JOURNAL') == '1')
 
 
 @app.route('/')
@@ -96,7 +135,9 @@ def index():
         "endpoints": {
             "podcasts": "/api/podcasts/",
             "playlists": "/api/playlists/",
-            "episodes": "/api/episodes/"
+            "episodes": "/api/episodes/",
+            "search": "/api/search/",
+            "stats": "/api/stats/"
         },
         "documentation": "/apidocs/"  # Swagger UI endpoint
     })
@@ -1,5 +1,7 @@
 from .podcasts import podcasts_bp
 from .playlists import playlists_bp
 from .episodes import episodes_bp
+from .search import search_bp
+from .stats import stats_bp
 
-__all__ = ['podcasts_bp', 'playlists_bp', 'episodes_bp']
\ No newline at end of file
+__all__ = ['podcasts_bp', 'playlists_bp', 'episodes_bp', 'search_bp', 'stats_bp']
\ No newline at end of file
@@ -1,22 +1,179 @@
-from flask import Blueprint, jsonify
+from datetime import date, timedelta
+from typing import List, Optional
+
+from flask import Blueprint, jsonify, request
+from flasgger import swag_from
+from zpodcast.api.blueprints.paging import CURSOR_PARAMETER, OFFSET_PARAMETER, parse_non_negative_int, parse_paging
+from zpodcast.core.podcast import PodcastData
+from zpodcast.core.latest import DEFAULT_PAGE_SIZE, DEFAULT_PRIORITY_WEIGHT, MAX_PAGE_SIZE, latest_episodes
 from zpodcast.core.podcasts import PodcastList
+from zpodcast.core.sorting import EPISODE_SORT_OPTIONS, sort_episodes, sort_parameters_from_query
+from zpodcast.utils.ids import make_episode_id
+
 
+# Largest page of episodes returned by a single request
+MAX_EPISODE_PAGE_SIZE = 500
 
 episodes_bp = Blueprint('episodes', __name__)
 
+# Swagger descriptions of the paging, filter and sort query parameters of a
+# podcast's episode listing
+EPISODE_LIST_PARAMETERS = [
+    {
+        'name': 'limit',
+        'in': 'query',
+        'type': 'integer',
+        'required': False,
+        'description': f'Page size, at most {MAX_EPISODE_PAGE_SIZE}; every episode is returned without it'
+    },
+    OFFSET_PARAMETER,
+    CURSOR_PARAMETER,
+    {
+        'name': 'min_duration',
+        'in': 'query',
+        'type': 'integer',
+        'required': False,
+        'description': 'Only episodes lasting at least this many seconds'
+    },
+    {
+        'name': 'max_duration',
+        'in': 'query',
+        'type': 'integer',
+        'required': False,
+        'description': 'Only episodes lasting at most this many seconds'
+    },
+    {
+        'name': 'published_after',
+        'in': 'query',
+        'type': 'string',
+        'format': 'date',
+        'required': False,
+        'description': 'Only episodes published on or after this date (YYYY-MM-DD)'
+    },
+    {
+        'name': 'published_before',
+        'in': 'query',
+        'type': 'string',
+        'format': 'date',
+        'required': False,
+        'description': 'Only episodes published on or before this date (YYYY-MM-DD)'
+    }
+] + [
+    {
+        'name': name,
+        'in': 'query',
+        'type': 'string',
+        'enum': list(values),
+        'required': False,
+        'description': f'Sort by {field}; the order of the sort parameters sets their precedence'
+    }
+    for name, (field, values) in EPISODE_SORT_OPTIONS.items()
+]
+
+
+def _parse_date(value: Optional[str], name: str) -> Optional[date]:
+    """
+    Parse an optional ISO 8601 date query parameter.
+
+    Raises:
+        ValueError: If the value is not a YYYY-MM-DD date.
+    """
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a date (YYYY-MM-DD)")
+
+
+def _selected_episodes(podcast: PodcastData) -> Optional[List[int]]:
+    """
+    Apply the filter and sort query parameters to a podcast's episodes.
+
+    Returns:
+        Optional[List[int]]: The positions of the selected episodes in
+            sorted order, None when the request neither filters nor sorts.
+
+    Raises:
+        ValueError: If a filter or sort parameter is invalid.
+    """
+    params, order = sort_parameters_from_query(request.args, EPISODE_SORT_OPTIONS)
+    bounds = {
+        'min_duration': parse_non_negative_int(request.args.get('min_duration'), 'min_duration'),
+        'max_duration': parse_non_negative_int(request.args.get('max_duration'), 'max_duration'),
+        'published_after': _parse_date(request.args.get('published_after'), 'published_after'),
+        'published_before': _parse_date(request.args.get('published_before'), 'published_before')
+    }
+    filtered = any(value is not None for value in bounds.values())
+    if not order and not filtered:
+        return None
+    if not podcast.episodelists:
+        return []
+
+    episodelist = podcast.episodelists[0]
+    indices = episodelist.filter_episode_indices(**bounds) if filtered else None
+    return sort_episodes(episodelist, params, order, indices)
+
 
 @episodes_bp.route('/<podcast_id>/', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {
+            'name': 'podcast_id',
+            'in': 'path',
+            'type': 'integer',
+            'required': True,
+            'description': 'Position of the podcast in the podcast list'
+        }
+    ] + EPISODE_LIST_PARAMETERS,
+    'responses': {
+        200: {
+            'description': 'The selected episodes with total, offset, limit and next_cursor'
+        },
+        400: {
+            'description': 'Invalid paging, filter or sort parameters'
+        },
+        404: {
+            'description': 'Podcast not found'
+        }
+    },
+    'summary': 'Retrieves the episodes of a podcast',
+    'tags': ['episodes']
+})
 def get_episodes(podcast_id):
-    """Get all episodes for a podcast"""
+    """
+    Get the episodes for a podcast
+
+    The listing can be paged with the optional query parameters limit
+    (page size, at most MAX_EPISODE_PAGE_SIZE) and either offset or cursor
+    (the next_cursor value of the previous page). Without them every
+    episode is returned.
+
+    The episodes can be filtered with min_duration / max_duration (seconds)
+    and published_after / published_before (YYYY-MM-DD), and sorted with
+    the SortParameters options episode_title (A-Z, Z-A), episode_duration
+    (ShortToLong, LongToShort) and episode_date (Earliest, Latest); the
+    order of the sort parameters in the query sets their precedence. Paging
+    then applies to the selection.
+    """
     podcast_list = PodcastList.get_instance()
     try:
         podcast = podcast_list.get_podcast(int(podcast_id))
         if not podcast:
             return jsonify({"error": "Podcast not found"}), 404
-        return jsonify(podcast.get_episodes())
     except ValueError:
         return jsonify({"error": "Podcast not found"}), 404
 
+    try:
+        start, limit = parse_paging(request.args)
+        indices = _selected_episodes(podcast)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if limit is not None:
+        limit = min(limit, MAX_EPISODE_PAGE_SIZE)
+    return jsonify(podcast.get_episodes(offset=start, limit=limit, indices=indices))
+
 
 @episodes_bp.route('/<podcast_id>/<episode_id>/', methods=['GET'])
 def get_episode(podcast_id, episode_id):
@@ -48,4 +205,164 @@ def get_episode(podcast_id, episode_id):
     if not episode:
         return jsonify({"error": "Episode not found"}), 404
     
-    return jsonify(episode.to_dict())
\ No newline at end of file
+    return jsonify({"id": episode.id, **episode.to_dict()})
+
+
+@episodes_bp.route('/id/<podcast_id>/', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {
+            'name': 'podcast_id',
+            'in': 'path',
+            'type': 'string',
+            'required': True,
+            'description': 'Stable identifier of the podcast (the id field)'
+        }
+    ] + EPISODE_LIST_PARAMETERS,
+    'responses': {
+        200: {
+            'description': 'The selected episodes with total, offset, limit and next_cursor'
+        },
+        400: {
+            'description': 'Invalid paging, filter or sort parameters'
+        },
+        404: {
+            'description': 'Podcast not found'
+        }
+    },
+    'summary': 'Retrieves the episodes of a podcast by its stable identifier',
+    'tags': ['episodes']
+})
+def get_episodes_by_id(podcast_id):
+    """
+    Get the episodes for a podcast addressed by its stable identifier
+
+    Takes the same paging parameters as get_episodes.
+    """
+    index = PodcastList.get_instance().find_podcast_index(podcast_id)
+    if index is None:
+        return jsonify({"error": "Podcast not found"}), 404
+    return get_episodes(str(index))
+
+
+@episodes_bp.route('/id/<podcast_id>/<episode_id>/', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {
+            'name': 'podcast_id',
+            'in': 'path',
+            'type': 'string',
+            'required': True,
+            'description': 'Stable identifier of the podcast (the id field)'
+        },
+        {
+            'name': 'episode_id',
+            'in': 'path',
+            'type': 'string',
+            'required': True,
+            'description': 'Stable identifier of the episode (the id field)'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'The episode with its stable id'
+        },
+        404: {
+            'description': 'Podcast or episode not found'
+        }
+    },
+    'summary': 'Retrieves an episode by its stable identifier',
+    'tags': ['episodes']
+})
+def get_episode_by_id(podcast_id, episode_id):
+    """Get a specific episode, both addressed by their stable identifiers"""
+    podcast = PodcastList.get_instance().find_podcast(podcast_id)
+    if podcast is None:
+        return jsonify({"error": "Podcast not found"}), 404
+
+    episode = podcast.find_episode(episode_id)
+    if episode is None:
+        return jsonify({"error": "Episode not found"}), 404
+
+    return jsonify({"id": episode.id, **episode.to_dict()})
+
+
+@episodes_bp.route('/latest/', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {
+            'name': 'limit',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': f'Page size (default {DEFAULT_PAGE_SIZE}, at most {MAX_PAGE_SIZE})'
+        },
+        OFFSET_PARAMETER,
+        CURSOR_PARAMETER,
+        {
+            'name': 'priority_weight',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': ('Hours one point of podcast_priority moves a podcast\'s episodes up the feed '
+                            f'(default {int(DEFAULT_PRIORITY_WEIGHT.total_seconds() // 3600)}); '
+                            '0 orders by publication date alone')
+        }
+    ],
+    'responses': {
+        200: {
+            'description': ('Page of the most recent episodes: episodes (podcast_id, podcast_stable_id, '
+                            'episodelist_id, episode_id and the episode), total, offset, limit and next_cursor')
+        },
+        400: {
+            'description': 'Invalid paging parameters'
+        }
+    },
+    'summary': 'Retrieves the most recent episodes of all podcasts',
+    'tags': ['episodes']
+})
+def get_latest_episodes():
+    """
+    Get the most recent episodes across all podcasts
+
+    The page is chosen with the optional query parameters limit (default
+    DEFAULT_PAGE_SIZE, at most MAX_PAGE_SIZE) and either offset or cursor
+    (the next_cursor value of the previous page). priority_weight is the
+    number of hours one point of podcast_priority moves a podcast's
+    episodes up the feed; 0 orders by publication date alone.
+    """
+    try:
+        start, limit = parse_paging(request.args)
+        hours = parse_non_negative_int(request.args.get('priority_weight'), 'priority_weight')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    limit = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    weight = DEFAULT_PRIORITY_WEIGHT if hours is None else timedelta(hours=hours)
+
+    podcast_list = PodcastList.get_instance()
+    page = latest_episodes(podcast_list, offset=start, limit=limit, priority_weight=weight)
+    total = sum(episodelist.get_num_items()
+                for podcast in podcast_list.podcasts for episodelist in podcast.episodelists)
+
+    episodes = []
+    for latest in page:
+        podcast = podcast_list.podcasts[latest.podcast_id]
+        episodelist = podcast.episodelists[latest.episodelist_id]
+        episode = episodelist.get_episode_dicts(latest.episode_id, latest.episode_id + 1)[0]
+        episode["id"] = make_episode_id(episode["guid"], episode["audio_url"])
+        episodes.append({
+            "podcast_id": latest.podcast_id,
+            "podcast_stable_id": podcast.id,
+            "episodelist_id": latest.episodelist_id,
+            "episode_id": latest.episode_id,
+            "episode": episode
+        })
+    end = start + len(episodes)
+    return jsonify({
+        "episodes": episodes,
+        "total": total,
+        "offset": start,
+        "limit": limit,
+        "next_cursor": str(end) if end < total else None
+    })
@@ -0,0 +1,77 @@
+"""
+API Paging Module
+
+This module holds the query parameter parsing shared by the paged listings
+of the API. Every paged listing takes the same parameters, limit and either
+offset or cursor (the next_cursor value of the previous page), and answers
+with total, offset, limit and next_cursor.
+
+Functions:
+    parse_non_negative_int: Parse an optional non-negative integer parameter
+    parse_paging: Parse the limit, offset and cursor parameters
+"""
+from typing import Mapping, Optional, Tuple
+
+# Swagger descriptions of the paging query parameters, with the limit
+# documented by each route
+OFFSET_PARAMETER = {
+    'name': 'offset',
+    'in': 'query',
+    'type': 'integer',
+    'required': False,
+    'description': 'Position of the first item of the page'
+}
+CURSOR_PARAMETER = {
+    'name': 'cursor',
+    'in': 'query',
+    'type': 'string',
+    'required': False,
+    'description': 'The next_cursor of the previous page; cannot be combined with offset'
+}
+
+
+def parse_non_negative_int(value: Optional[str], name: str) -> Optional[int]:
+    """
+    Parse an optional non-negative integer query parameter.
+
+    Args:
+        value (Optional[str]): The raw query parameter value.
+        name (str): The parameter name, used in the error message.
+
+    Returns:
+        Optional[int]: The parsed value, None when the parameter is absent.
+
+    Raises:
+        ValueError: If the value is not a non-negative integer.
+    """
+    if value is None:
+        return None
+    if not value.isdigit():
+        raise ValueError(f"{name} must be a non-negative integer")
+    return int(value)
+
+
+def parse_paging(args: Mapping[str, str]) -> Tuple[int, Optional[int]]:
+    """
+    Parse the limit, offset and cursor query parameters of a paged listing.
+
+    Args:
+        args (Mapping[str, str]): The query parameters of the request.
+
+    Returns:
+        Tuple[int, Optional[int]]: The position of the first item of the
+            page, and the limit, None when the parameter is absent.
+
+    Raises:
+        ValueError: If a parameter is not a non-negative integer, the limit
+            is 0, or offset and cursor are combined.
+    """
+    offset = parse_non_negative_int(args.get('offset'), 'offset')
+    cursor = parse_non_negative_int(args.get('cursor'), 'cursor')
+    limit = parse_non_negative_int(args.get('limit'), 'limit')
+    if offset is not None and cursor is not None:
+        raise ValueError("offset and cursor cannot be combined")
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be a positive integer")
+    start = cursor if cursor is not None else (offset or 0)
+    return start, limit
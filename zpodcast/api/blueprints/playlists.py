@@ -63,7 +63,7 @@ def update_playlist(playlist_id):
             
         # Update the playlist's name
         if 'name' in data:
-            playlist.playlists[index].name = data['name']
+            playlist.rename_playlist(index, data['name'])
             
         return jsonify(playlist.playlists[index].to_dict())
     except ValueError as e:
@@ -103,7 +103,7 @@ def add_episode_to_playlist(playlist_id):
             
         # Add episode to the playlist
         episode = PodcastEpisode(**data)
-        playlist.playlists[index].add_podcastepisode(episode)
+        playlist.add_playlist_episode(index, episode)
         
         return jsonify(playlist.playlists[index].to_dict())
     except ValueError as e:
@@ -123,8 +123,27 @@ def remove_episode_from_playlist(playlist_id, episode_id):
             return jsonify({"error": "Playlist not found"}), 404
             
         # Remove episode from the playlist
-        playlist.playlists[playlist_index].remove_podcastepisode(episode_index)
+        playlist.remove_playlist_episode(playlist_index, episode_index)
         
         return jsonify(playlist.playlists[playlist_index].to_dict())
     except (ValueError, IndexError):
-        return jsonify({"error": "Episode not found"}), 404
\ No newline at end of file
+        return jsonify({"error": "Episode not found"}), 404
+
+
+@playlists_bp.route('/<playlist_id>/episodes/id/<episode_id>/', methods=['DELETE'])
+def remove_episode_from_playlist_by_id(playlist_id, episode_id):
+    """Remove an episode, addressed by its stable identifier, from a playlist"""
+    playlist = PodcastPlaylist.get_instance()
+    try:
+        playlist_index = int(playlist_id)
+    except ValueError:
+        return jsonify({"error": "Playlist not found"}), 404
+    if playlist_index < 0 or playlist_index >= len(playlist.playlists):
+        return jsonify({"error": "Playlist not found"}), 404
+
+    episode_index = playlist.playlists[playlist_index].find_episode_index(episode_id)
+    if episode_index is None:
+        return jsonify({"error": "Episode not found"}), 404
+
+    playlist.remove_playlist_episode(playlist_index, episode_index)
+    return jsonify(playlist.playlists[playlist_index].to_dict())
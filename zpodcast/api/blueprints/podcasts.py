@@ -9,26 +9,29 @@ The blueprint follows RESTful design principles with appropriate HTTP methods
 for each operation and consistent URL patterns.
 
 Routes:
-    GET /: List all podcasts
+    GET /: List all podcasts (summary projection unless view=full)
     GET /<int:podcast_id>/: Get a specific podcast by ID
     POST /: Create a new podcast
     PUT /<int:podcast_id>/: Update an existing podcast
     DELETE /<int:podcast_id>/: Delete a podcast
+    GET, PUT, DELETE /id/<podcast_id>/: The same, addressing the podcast by
+        its stable identifier
 """
-from typing import Dict, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional
 
 from flask import Blueprint, jsonify, request, Response
 from flasgger import swag_from
-import validators
 
 from zpodcast.core.podcasts import PodcastList
-from zpodcast.core.podcast import PodcastData
+from zpodcast.core.podcast import PodcastData, SUMMARY_FIELDS
+from zpodcast.core.sorting import PODCAST_SORT_OPTIONS, filter_podcasts, sort_parameters_from_query, sort_podcasts
+from zpodcast.utils.urls import is_url
 
 # Define Swagger schemas for podcast objects
 PodcastSchema = {
     'type': 'object',
     'properties': {
-        'id': {'type': 'integer', 'description': 'Unique podcast identifier'},
+        'id': {'type': 'string', 'description': 'Stable podcast identifier'},
         'title': {'type': 'string', 'description': 'Podcast title'},
         'podcast_url': {'type': 'string', 'description': 'RSS feed URL'},
         'host': {'type': 'string', 'description': 'Podcast host/author'},
@@ -47,6 +50,34 @@ PodcastSchema = {
     'required': ['title', 'podcast_url']
 }
 
+PodcastSummarySchema = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string', 'description': 'Stable podcast identifier'},
+        'title': {'type': 'string', 'description': 'Podcast title'},
+        'podcast_url': {'type': 'string', 'description': 'RSS feed URL'},
+        'host': {'type': 'string', 'description': 'Podcast host/author'},
+        'description': {'type': 'string', 'description': 'Podcast description'},
+        'podcast_priority': {
+            'type': 'integer',
+            'description': 'User priority (0-10)'
+        },
+        'image_url': {'type': 'string', 'description': 'Podcast cover art URL'},
+        'name_set_manually': {
+            'type': 'boolean',
+            'description': 'Whether the episode list name was set by the user'
+        },
+        'episode_count': {
+            'type': 'integer',
+            'description': 'Number of episodes of the podcast'
+        },
+        'latest_episode_date': {
+            'type': 'string',
+            'description': 'Publication date of the most recent episode'
+        }
+    }
+}
+
 PodcastListSchema = {
     'type': 'object',
     'properties': {
@@ -57,6 +88,17 @@ PodcastListSchema = {
     }
 }
 
+PodcastSummaryListSchema = {
+    'type': 'object',
+    'properties': {
+        'podcasts': {
+            'type': 'array',
+            'items': PodcastSummarySchema,
+            'description': 'Podcast summaries, or complete podcasts (PodcastSchema) with view=full'
+        }
+    }
+}
+
 # Constants for validation
 MAX_TITLE_LENGTH = 200
 MAX_DESCRIPTION_LENGTH = 5000
@@ -66,6 +108,19 @@ MIN_PRIORITY = 0
 podcasts_bp = Blueprint('podcasts', __name__)
 
 
+def podcast_response(podcast: PodcastData) -> Dict[str, Any]:
+    """
+    Serialize a podcast for an API response.
+
+    Args:
+        podcast (PodcastData): The podcast.
+
+    Returns:
+        Dict[str, Any]: The podcast's dictionary with its stable id added.
+    """
+    return {"id": podcast.id, **podcast.to_dict()}
+
+
 def validate_podcast_data(
     data: Dict[str, Any], required_fields: bool = True
 ) -> Optional[str]:
@@ -106,7 +161,7 @@ def validate_podcast_data(
     if 'podcast_url' in data and data['podcast_url']:
         if not isinstance(data['podcast_url'], str):
             return "Podcast URL must be a string"
-        if not validators.url(data['podcast_url']):
+        if not is_url(data['podcast_url']):
             return "Invalid podcast URL format"
     
     # Validate description if present
@@ -135,18 +190,97 @@ def validate_podcast_data(
     if 'image_url' in data and data['image_url']:
         if not isinstance(data['image_url'], str):
             return "Image URL must be a string"
-        if not validators.url(data['image_url']):
+        if not is_url(data['image_url']):
             return "Invalid image URL format"
     
     return None
 
 
+def _selected_podcasts(podcast_list: PodcastList) -> Optional[List[int]]:
+    """
+    Apply the filter and sort query parameters to the podcasts.
+
+    Args:
+        podcast_list (PodcastList): The podcasts.
+
+    Returns:
+        Optional[List[int]]: The positions of the selected podcasts in
+            sorted order, None when the request neither filters nor sorts.
+
+    Raises:
+        ValueError: If a filter or sort parameter is invalid.
+    """
+    params, order = sort_parameters_from_query(request.args, PODCAST_SORT_OPTIONS)
+    author = request.args.get('author')
+    min_priority = request.args.get('min_priority')
+    if min_priority is not None:
+        try:
+            min_priority = int(min_priority)
+        except ValueError:
+            raise ValueError("min_priority must be an integer")
+
+    if author is None and min_priority is None:
+        return sort_podcasts(podcast_list, params, order) if order else None
+    indices = filter_podcasts(podcast_list, author=author, min_priority=min_priority)
+    return sort_podcasts(podcast_list, params, order, indices)
+
+
 @podcasts_bp.route('/', methods=['GET'])
 @swag_from({
+    'parameters': [
+        {
+            'name': 'view',
+            'in': 'query',
+            'type': 'string',
+            'enum': ['summary', 'full'],
+            'required': False,
+            'description': 'summary (default) omits the episodes, full embeds them'
+        },
+        {
+            'name': 'fields',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Comma separated summary fields to include'
+        },
+        {
+            'name': 'podcast_title',
+            'in': 'query',
+            'type': 'string',
+            'enum': ['A-Z', 'Z-A'],
+            'required': False,
+            'description': 'Sort by title'
+        },
+        {
+            'name': 'podcast_author',
+            'in': 'query',
+            'type': 'string',
+            'enum': ['A-Z', 'Z-A'],
+            'required': False,
+            'description': 'Sort by author; the order of the sort parameters sets their precedence'
+        },
+        {
+            'name': 'author',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Only podcasts whose author contains this text, ignoring case'
+        },
+        {
+            'name': 'min_priority',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': 'Only podcasts with at least this priority'
+        }
+    ],
     'responses': {
         200: {
             'description': 'List of all podcasts',
-            'schema': PodcastListSchema
+            'schema': PodcastSummaryListSchema
+        },
+        400: {
+            'description': 'Invalid view, fields, sort or filter parameters'
         },
         500: {
             'description': 'Server error'
@@ -161,18 +295,48 @@ def get_podcasts() -> Response:
     
     This endpoint returns all podcasts stored in the system with their
     metadata. It does not include the full episode lists to keep the
-    response size manageable.
+    response size manageable: each podcast is serialized as a summary with
+    its episode count and latest episode date. The fields query parameter
+    selects a sparse fieldset of the summary, and view=full returns the
+    complete podcasts including their episodes.
+
+    The podcasts can be filtered by author and min_priority and sorted with
+    the SortParameters options podcast_title and podcast_author (A-Z or
+    Z-A).
     
     Returns:
         Response: A Flask response object with JSON containing:
             - podcasts (List[Dict]): A list of podcast objects with their metadata
     
     Example:
-        >>> response = requests.get('/api/podcasts/')
+        >>> response = requests.get('/api/podcasts/?fields=title,episode_count')
         >>> podcasts = response.json()['podcasts']
     """
     podcast_list = PodcastList.get_instance()
-    return jsonify(podcast_list.to_dict())
+
+    try:
+        indices = _selected_podcasts(podcast_list)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    view = request.args.get('view', 'summary')
+    if view == 'full':
+        if indices is None:
+            return jsonify(podcast_list.to_dict())
+        return jsonify({"podcasts": [podcast_list.podcasts[index].to_dict() for index in indices]})
+    if view != 'summary':
+        return jsonify({"error": "view must be 'summary' or 'full'"}), 400
+
+    fields = request.args.get('fields')
+    if fields is not None:
+        fields = [name.strip() for name in fields.split(',') if name.strip()]
+    try:
+        return jsonify(podcast_list.to_summary_dict(fields, indices))
+    except ValueError as e:
+        return jsonify({
+            "error": str(e),
+            "available_fields": list(SUMMARY_FIELDS)
+        }), 400
 
 
 @podcasts_bp.route('/<int:podcast_id>/', methods=['GET'])
@@ -225,7 +389,7 @@ def get_podcast(podcast_id: int) -> Tuple[Response, int]:
     podcast_list = PodcastList.get_instance()
     try:
         podcast = podcast_list.get_podcast(podcast_id)
-        return jsonify(podcast.to_dict()), 200
+        return jsonify(podcast_response(podcast)), 200
     except ValueError:
         return jsonify({"error": "Podcast not found"}), 404
 
@@ -305,7 +469,7 @@ def add_podcast() -> Tuple[Response, int]:
     try:
         podcast = PodcastData(**data)  # Ensure PodcastData object is created
         podcast_list.add_podcast(podcast)
-        return jsonify(podcast.to_dict()), 201
+        return jsonify(podcast_response(podcast)), 201
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
@@ -383,7 +547,7 @@ def update_podcast(podcast_id: int) -> Tuple[Response, int]:
     podcast_list = PodcastList.get_instance()
     try:
         podcast = podcast_list.update_podcast(podcast_id, data)
-        return jsonify(podcast.to_dict()), 200
+        return jsonify(podcast_response(podcast)), 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
@@ -440,4 +604,59 @@ def delete_podcast(podcast_id: int) -> Tuple[str, int]:
         podcast_list.delete_podcast(podcast_id)
         return "", 204
     except ValueError:
-        return jsonify({"error": "Podcast not found"}), 404
\ No newline at end of file
+        return jsonify({"error": "Podcast not found"}), 404
+
+
+@podcasts_bp.route('/id/<podcast_id>/', methods=['GET', 'PUT', 'DELETE'])
+@swag_from({
+    'parameters': [
+        {
+            'name': 'podcast_id',
+            'in': 'path',
+            'type': 'string',
+            'required': True,
+            'description': 'Stable identifier of the podcast (the id field)'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Podcast details (GET) or the updated podcast (PUT)',
+            'schema': PodcastSchema
+        },
+        204: {
+            'description': 'Podcast deleted successfully (DELETE)'
+        },
+        400: {
+            'description': 'Invalid input data (PUT)'
+        },
+        404: {
+            'description': 'Podcast not found'
+        }
+    },
+    'summary': 'Get, update or delete a podcast by its stable identifier',
+    'tags': ['podcasts']
+})
+def podcast_by_id(podcast_id: str) -> Tuple[Response, int]:
+    """
+    Address a podcast by its stable identifier.
+
+    The identifier does not change when other podcasts are added or
+    deleted, so clients can keep it across requests. The request is
+    handled like the same request on the podcast's current position.
+
+    Args:
+        podcast_id (str): The stable identifier of the podcast
+
+    Returns:
+        Tuple[Response, int]: The response of get_podcast, update_podcast
+            or delete_podcast, or 404 if no podcast has the identifier.
+
+    Example:
+        >>> podcast_id = requests.get('/api/podcasts/').json()['podcasts'][0]['id']
+        >>> response = requests.get(f'/api/podcasts/id/{podcast_id}/')
+    """
+    index = PodcastList.get_instance().find_podcast_index(podcast_id)
+    if index is None:
+        return jsonify({"error": "Podcast not found"}), 404
+    handlers = {'GET': get_podcast, 'PUT': update_podcast, 'DELETE': delete_podcast}
+    return handlers[request.method](index)
@@ -0,0 +1,99 @@
+"""
+Search API Blueprint Module
+
+This module provides the REST API endpoint searching the titles and
+descriptions of the episodes of every podcast, so clients no longer have to
+download each podcast's episodes and filter them locally.
+
+Routes:
+    GET /: Ranked, paginated episode search
+"""
+from flask import Blueprint, jsonify, request, Response
+from flasgger import swag_from
+
+from zpodcast.api.blueprints.paging import CURSOR_PARAMETER, OFFSET_PARAMETER, parse_paging
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.core.search import EpisodeSearchIndex, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+search_bp = Blueprint('search', __name__)
+
+
+@search_bp.route('/', methods=['GET'])
+@swag_from({
+    'parameters': [
+        {
+            'name': 'q',
+            'in': 'query',
+            'type': 'string',
+            'required': True,
+            'description': 'Words to search for in episode titles and descriptions'
+        },
+        {
+            'name': 'limit',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': f'Page size (default {DEFAULT_PAGE_SIZE}, at most {MAX_PAGE_SIZE})'
+        },
+        OFFSET_PARAMETER,
+        CURSOR_PARAMETER
+    ],
+    'responses': {
+        200: {
+            'description': 'Matching episodes, best first'
+        },
+        400: {
+            'description': 'Missing query or invalid paging parameters'
+        }
+    },
+    'summary': 'Searches episodes of all podcasts',
+    'tags': ['episodes']
+})
+def search_episodes() -> Response:
+    """
+    Search the episodes of every podcast.
+
+    Every word of the query must appear in the episode's title or
+    description; results are ranked by relevance. The page is chosen with
+    limit (default DEFAULT_PAGE_SIZE, at most MAX_PAGE_SIZE) and either
+    offset or cursor (the next_cursor value of the previous page), like the
+    episode listings.
+
+    Returns:
+        Response: A Flask response object with JSON containing:
+            - results (List[Dict]): podcast_id, podcast_stable_id,
+              episodelist_id, episode_id, score and the episode itself (with
+              its stable id) for each result
+            - total (int): Number of matching episodes
+            - offset, limit, next_cursor: Paging of the results
+
+    Example:
+        >>> response = requests.get('/api/search/?q=machine+learning&limit=10')
+        >>> episodes = [result['episode'] for result in response.json()['results']]
+    """
+    query = request.args.get('q', '')
+    try:
+        offset, limit = parse_paging(request.args)
+        limit = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+
+        podcast_list = PodcastList.get_instance()
+        results = EpisodeSearchIndex.get_instance().search(podcast_list, query, offset=offset, limit=limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    hits = [{
+        "podcast_id": hit.podcast_id,
+        "podcast_stable_id": hit.podcast_stable_id,
+        "episodelist_id": hit.episodelist_id,
+        "episode_id": hit.episode_id,
+        "score": hit.score,
+        "episode": hit.episode
+    } for hit in results.hits]
+    return jsonify({
+        "query": query,
+        "results": hits,
+        "total": results.total,
+        "offset": results.offset,
+        "limit": results.limit,
+        "next_cursor": results.next_cursor
+    })
@@ -0,0 +1,65 @@
+"""
+Stats API Blueprint Module
+
+This module provides the REST API endpoint reporting the application's
+cache and download counters, for monitoring a running server.
+
+Routes:
+    GET /: URL validation and date parsing cache counters and download metrics
+"""
+from flask import Blueprint, jsonify, Response
+from flasgger import swag_from
+
+from zpodcast.core.scheduler import DownloadScheduler
+from zpodcast.utils.dates import pub_date_cache_stats
+from zpodcast.utils.urls import URLValidator
+
+stats_bp = Blueprint('stats', __name__)
+
+
+@stats_bp.route('/', methods=['GET'])
+@swag_from({
+    'responses': {
+        200: {
+            'description': 'Cache and download counters',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'url_validation': {
+                        'type': 'object',
+                        'description': 'URL validation cache: hits, misses, rejected, size and maxsize'
+                    },
+                    'pub_date_parsing': {
+                        'type': 'object',
+                        'description': 'Publication date parsing cache: hits, misses, size and maxsize'
+                    },
+                    'downloads': {
+                        'type': 'object',
+                        'description': 'Download scheduler metrics: queue and transfer counters and throughput'
+                    }
+                }
+            }
+        }
+    },
+    'summary': 'Reports cache and download counters',
+    'tags': ['stats']
+})
+def get_stats() -> Response:
+    """
+    Report the application's cache and download counters.
+
+    Returns:
+        Response: A Flask response object with JSON containing:
+            - url_validation (Dict): URLValidator cache counters
+            - pub_date_parsing (Dict): Publication date cache counters
+            - downloads (Dict): DownloadScheduler metrics
+
+    Example:
+        >>> response = requests.get('/api/stats/')
+        >>> print(response.json()['downloads']['throughput'])
+    """
+    return jsonify({
+        "url_validation": URLValidator.get_instance().stats(),
+        "pub_date_parsing": pub_date_cache_stats(),
+        "downloads": DownloadScheduler.get_instance().metrics().to_dict()
+    })
@@ -0,0 +1,371 @@
+"""
+Episode Cache Module
+
+This module keeps downloaded audio files in a size-bounded directory. Files
+are content addressed: each is stored under the SHA-256 digest of its data,
+and episodes are mapped to a digest by the stable id of their audio URL and,
+when the feed they come from is known, by their GUID within that feed. The
+same enclosure listed by several feeds or playlists is therefore stored
+once, even when the copies reached the cache through different URLs.
+
+When the cache grows beyond its size limit the least recently used files
+are evicted, except for pinned files: by default every episode queued in a
+playlist of the PodcastPlaylist is pinned, so playlists never lose their
+audio to eviction.
+
+The cache state (the digests, their sizes and the access order) is kept in
+an index file, so opening the cache after a restart reads one file instead
+of scanning and hashing the whole directory.
+
+Classes:
+    EpisodeCache: Content-addressed, LRU-evicted store of episode audio
+"""
+from collections import OrderedDict
+import atexit
+import errno
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from zpodcast.core.episode import PodcastEpisode
+from zpodcast.core.playlists import PodcastPlaylist
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.parsers.json import _atomic_write
+from zpodcast.utils.ids import make_episode_id, make_podcast_id
+
+
+# Name of the index file inside the cache directory
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+# Default size limit of the cache in bytes
+DEFAULT_MAX_SIZE = 10 * 1024 ** 3
+
+# Bytes read at a time while hashing a file
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _episode_keys(episode: PodcastEpisode, podcast_url: Optional[str] = None) -> List[str]:
+    """Get the ids an episode's file is found under: its audio URL's and its GUID's within its feed."""
+    keys = [make_episode_id(None, episode.audio_url)]
+    # GUIDs are only unique within a feed, many feeds number theirs "1", "2"...
+    if episode.guid and podcast_url:
+        keys.append(make_episode_id(f"{make_podcast_id(podcast_url)}/{episode.guid}", None))
+    return [key for key in keys if key is not None]
+
+
+def _playlist_episodes() -> Iterable[Tuple[PodcastEpisode, Optional[str]]]:
+    """Yield the playlist episodes, with every feed of the PodcastList that lists them."""
+    podcasts = PodcastList.get_instance().podcasts
+    for playlist in PodcastPlaylist.get_instance().playlists:
+        for episode in playlist.episodes:
+            yield episode, None
+            # a file downloaded from a feed may only be known by its GUID there
+            if episode.guid:
+                for podcast in podcasts:
+                    if any(episodelist.find_episode_index(episode.id) is not None
+                           for episodelist in podcast.episodelists):
+                        yield episode, podcast.podcast_url
+
+
+class EpisodeCache:
+    """
+    Content-addressed store of episode audio with LRU eviction.
+
+    Attributes:
+        directory (str): Where the files and the index are stored
+        max_size (int): Size limit of the stored files in bytes
+        pinned (Optional[Callable[[], Iterable[Tuple[PodcastEpisode, Optional[str]]]]]):
+            Returns the episodes whose files must not be evicted, each with
+            the feed it comes from or None, as they would be passed to get;
+            called when an eviction is needed
+
+    Example:
+        >>> cache = EpisodeCache("data/cache", max_size=5 * 1024 ** 3)
+        >>> path = cache.put(episode, "/tmp/episode.mp3")
+        >>> cache.get(other_feed_episode_with_same_enclosure) == path
+        True
+    """
+
+    _instance = None
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE,
+                 pinned: Optional[Callable[[], Iterable[Tuple[PodcastEpisode, Optional[str]]]]] = None):
+        if not isinstance(max_size, int) or max_size < 1:
+            raise ValueError("max_size must be a positive integer")
+        self.directory = directory
+        self.max_size = max_size
+        self.pinned = pinned
+        # digest -> {"file": name relative to directory, "size": bytes,
+        # "keys": episode keys}, least recently used first
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        # episode key -> digest
+        self._keys: Dict[str, str] = {}
+        self._size = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._load()
+
+    @classmethod
+    def get_instance(cls) -> 'EpisodeCache':
+        """
+        Get the cache shared by the whole application.
+
+        Files go to the ZPODCAST_CACHE_DIR directory, by default the "cache"
+        directory of ZPODCAST_DATA_DIR; ZPODCAST_CACHE_SIZE sets the size
+        limit in bytes. The episodes of the PodcastPlaylist playlists are
+        pinned, and the index is flushed when the interpreter exits so the
+        access order recorded by get survives a restart.
+
+        Returns:
+            EpisodeCache: The shared instance.
+        """
+        if cls._instance is None:
+            data_dir = os.getenv('ZPODCAST_DATA_DIR', 'data')
+            cls._instance = cls(os.getenv('ZPODCAST_CACHE_DIR', os.path.join(data_dir, 'cache')),
+                                int(os.getenv('ZPODCAST_CACHE_SIZE', DEFAULT_MAX_SIZE)),
+                                pinned=_playlist_episodes)
+            atexit.register(cls._instance.flush)
+        return cls._instance
+
+    @property
+    def index_file(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    @property
+    def size(self) -> int:
+        """
+        Get the total size of the stored files.
+
+        Returns:
+            int: Size in bytes.
+        """
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """Read the index file; a missing or unreadable index starts an empty cache."""
+        try:
+            with open(self.index_file) as f:
+                index = json.load(f)
+            if index.get("version") != INDEX_VERSION:
+                raise ValueError(f"Unsupported cache index version {index.get('version')}")
+            entries = OrderedDict(
+                (digest, {"file": entry["file"], "size": entry["size"], "keys": list(entry["keys"])})
+                for digest, entry in index["entries"])
+            keys = {key: digest for digest, entry in entries.items() for key in entry["keys"]}
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.error(f"Ignoring unreadable cache index {self.index_file}: {e}")
+            return
+        self._entries = entries
+        self._keys = keys
+        self._size = sum(entry["size"] for entry in entries.values())
+
+    def flush(self) -> None:
+        """
+        Write the index file if the cache changed since it was last written.
+
+        Adding and evicting files write the index right away; the access
+        order updated by get is only written by flush, which the shared
+        instance calls at exit.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            _atomic_write(self.index_file, json.dumps({
+                "version": INDEX_VERSION,
+                # a list keeps the LRU order
+                "entries": [[digest, entry] for digest, entry in self._entries.items()]
+            }, separators=(',', ':')))
+            self._dirty = False
+
+    def _lookup(self, episode: PodcastEpisode, podcast_url: Optional[str] = None) -> Optional[str]:
+        for key in _episode_keys(episode, podcast_url):
+            digest = self._keys.get(key)
+            if digest is not None:
+                return digest
+        return None
+
+    def _link(self, digest: str, episode: PodcastEpisode, podcast_url: Optional[str] = None) -> None:
+        """Make the episode's keys point to a digest."""
+        for key in _episode_keys(episode, podcast_url):
+            previous = self._keys.get(key)
+            if previous == digest:
+                continue
+            if previous is not None:
+                self._entries[previous]["keys"].remove(key)
+            self._keys[key] = digest
+            self._entries[digest]["keys"].append(key)
+            self._dirty = True
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, self._entries[digest]["file"])
+
+    def get(self, episode: PodcastEpisode, podcast_url: Optional[str] = None) -> Optional[str]:
+        """
+        Get the cached file of an episode, marking it as recently used.
+
+        Args:
+            episode (PodcastEpisode): The episode.
+            podcast_url (Optional[str]): The feed the episode comes from;
+                without it the episode is only found by its audio URL.
+
+        Returns:
+            Optional[str]: The path of the file, None if it is not cached.
+        """
+        with self._lock:
+            digest = self._lookup(episode, podcast_url)
+            if digest is None:
+                return None
+            path = self._path(digest)
+            if not os.path.exists(path):
+                # deleted behind the cache's back
+                self._remove(digest)
+                self.flush()
+                return None
+            self._entries.move_to_end(digest)
+            # remember the GUID or URL the file was found under as well
+            self._link(digest, episode, podcast_url)
+            self._dirty = True
+            return path
+
+    def __contains__(self, episode: PodcastEpisode) -> bool:
+        return self._lookup(episode) is not None
+
+    @staticmethod
+    def _digest_of(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def put(self, episode: PodcastEpisode, source: str, podcast_url: Optional[str] = None) -> str:
+        """
+        Move a downloaded file into the cache.
+
+        The file is stored under the digest of its data; when the cache
+        already holds the same data the source is deleted and the stored
+        copy is reused. Least recently used files are then evicted until
+        the cache fits in max_size.
+
+        Args:
+            episode (PodcastEpisode): The episode the file belongs to.
+            source (str): The downloaded file; it is moved into the cache,
+                or copied and deleted when it is on another file system.
+            podcast_url (Optional[str]): The feed the episode comes from,
+                so that the file is found by the episode's GUID as well.
+
+        Returns:
+            str: The path of the cached file.
+        """
+        digest = self._digest_of(source)
+        extension = os.path.splitext(source)[1].lower()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and os.path.exists(self._path(digest)):
+                os.unlink(source)
+            else:
+                name = os.path.join(digest[:2], digest + extension)
+                os.makedirs(os.path.join(self.directory, digest[:2]), exist_ok=True)
+                self._move(source, os.path.join(self.directory, name))
+                size = os.path.getsize(os.path.join(self.directory, name))
+                if entry is None:
+                    entry = self._entries[digest] = {"file": name, "size": size, "keys": []}
+                else:
+                    self._size -= entry["size"]
+                    entry.update(file=name, size=size)
+                self._size += size
+            self._entries.move_to_end(digest)
+            self._link(digest, episode, podcast_url)
+            self._dirty = True
+            self._evict(keep=digest)
+            self.flush()
+            return self._path(digest)
+
+    @staticmethod
+    def _move(source: str, target: str) -> None:
+        """Move a file, copying it when the target is on another file system."""
+        try:
+            os.replace(source, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # copied next to the target first, so the file appears whole
+            partial = target + ".partial"
+            shutil.copyfile(source, partial)
+            os.replace(partial, target)
+            os.unlink(source)
+
+    def _remove(self, digest: str) -> None:
+        entry = self._entries.pop(digest)
+        self._size -= entry["size"]
+        for key in entry["keys"]:
+            del self._keys[key]
+        try:
+            os.unlink(os.path.join(self.directory, entry["file"]))
+        except FileNotFoundError:
+            pass
+        self._dirty = True
+
+    def _evict(self, keep: Optional[str] = None) -> List[str]:
+        """Evict least recently used, unpinned files until the cache fits."""
+        if self._size <= self.max_size:
+            return []
+        protected = {keep}
+        if self.pinned is not None:
+            for episode, podcast_url in self.pinned():
+                protected.add(self._lookup(episode, podcast_url))
+
+        evicted = []
+        for digest in list(self._entries):
+            if self._size <= self.max_size:
+                break
+            if digest not in protected:
+                self._remove(digest)
+                evicted.append(digest)
+        return evicted
+
+    def evict(self) -> List[str]:
+        """
+        Evict least recently used files until the cache fits in max_size.
+
+        Pinned files are kept even if the cache stays over its limit.
+
+        Returns:
+            List[str]: Digests of the evicted files.
+        """
+        with self._lock:
+            evicted = self._evict()
+            self.flush()
+            return evicted
+
+    def remove(self, episode: PodcastEpisode, podcast_url: Optional[str] = None) -> bool:
+        """
+        Delete the cached file of an episode.
+
+        Other episodes sharing the file lose it as well.
+
+        Args:
+            episode (PodcastEpisode): The episode.
+            podcast_url (Optional[str]): The feed the episode comes from.
+
+        Returns:
+            bool: True if a file was deleted.
+        """
+        with self._lock:
+            digest = self._lookup(episode, podcast_url)
+            if digest is None:
+                return False
+            self._remove(digest)
+            self.flush()
+            return True
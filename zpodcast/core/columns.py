@@ -0,0 +1,392 @@
+"""
+Columnar Episode Storage Module
+
+This module provides a compact, column oriented representation of a list of
+podcast episodes. Numeric fields are kept in typed arrays and text fields
+are interned in a shared string pool and referenced by offset, so a long
+back catalogue costs a handful of machine words per episode instead of one
+Python object graph per episode. Aggregates, filters and sorts run as tight
+loops over the arrays; PodcastEpisode objects are only built when a caller
+asks for a specific row.
+
+Classes:
+    StringPool: Interned strings referenced by integer offset
+    EpisodeColumns: Array backed storage of episode fields
+
+Functions:
+    pub_date_key: Sortable key for a publication date
+    encode_pub_date: Publication date as integers
+    decode_pub_date: Publication date from integers
+"""
+from array import array
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from zpodcast.core.episode import PodcastEpisode
+
+
+# Marker stored in the integer columns for a missing value
+MISSING = -1
+
+MICROSECONDS_PER_DAY = 86400 * 1000000
+
+# Text fields of an episode, each stored as a column of string pool offsets
+STRING_FIELDS = ('title', 'audio_url', 'description', 'image_url', 'guid')
+
+
+def pub_date_key(value: datetime) -> int:
+    """
+    Make publication dates comparable with each other.
+
+    Episodes hold timezone-aware datetimes in UTC (see normalize_pub_date),
+    so the key is the UTC instant; any other aware value is compared in UTC
+    too.
+
+    Args:
+        value (datetime): A publication date.
+
+    Returns:
+        int: Microseconds since the start of the proleptic calendar, in UTC.
+    """
+    if value.utcoffset():
+        value = value.astimezone(timezone.utc)
+    micros = ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+    return value.toordinal() * MICROSECONDS_PER_DAY + micros
+
+
+def encode_pub_date(value: datetime) -> Tuple[int, int]:
+    """
+    Split a publication date into integers that rebuild it.
+
+    Args:
+        value (datetime): A timezone-aware datetime.
+
+    Returns:
+        Tuple[int, int]: The day ordinal and the microseconds into the day,
+            both in UTC.
+    """
+    if value.utcoffset():
+        value = value.astimezone(timezone.utc)
+    micros = ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+    return value.toordinal(), micros
+
+
+def decode_pub_date(ordinal: int, micros: int) -> datetime:
+    """
+    Rebuild a publication date split by encode_pub_date.
+
+    Returns:
+        datetime: The publication date as an aware datetime in UTC.
+    """
+    return datetime.combine(date.fromordinal(ordinal), time(), timezone.utc) + timedelta(microseconds=micros)
+
+
+class StringPool:
+    """
+    Interned strings referenced by integer offset.
+
+    Each distinct string is stored once; repeated values such as a
+    podcast's cover image URL or empty descriptions share one entry.
+    """
+
+    def __init__(self):
+        self._strings: List[str] = []
+        self._offsets: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._strings)
+
+    def add(self, value: Optional[str]) -> int:
+        """
+        Intern a string.
+
+        Args:
+            value (Optional[str]): The string to intern.
+
+        Returns:
+            int: The offset of the string, MISSING for None.
+        """
+        if value is None:
+            return MISSING
+        offset = self._offsets.get(value)
+        if offset is None:
+            offset = len(self._strings)
+            self._strings.append(value)
+            self._offsets[value] = offset
+        return offset
+
+    def get(self, offset: int) -> Optional[str]:
+        """
+        Get the string stored at an offset.
+
+        Args:
+            offset (int): The offset returned by add.
+
+        Returns:
+            Optional[str]: The string, None for MISSING.
+        """
+        if offset == MISSING:
+            return None
+        return self._strings[offset]
+
+
+class EpisodeColumns:
+    """
+    Array backed storage of episode fields.
+
+    Durations, episode numbers and publication dates are kept in typed
+    arrays (publication dates as a UTC day ordinal plus microseconds into
+    that day), and text fields as offsets into a StringPool. Values
+    are taken from PodcastEpisode objects, so they have already been through
+    the episode's validation and can be turned back into identical episodes
+    without validating again.
+
+    Example:
+        >>> columns = EpisodeColumns.from_episodes(episodes)
+        >>> columns.total_duration()
+        >>> columns.episode(0)
+    """
+
+    def __init__(self):
+        self.strings = StringPool()
+        self.text: Dict[str, array] = {name: array('l') for name in STRING_FIELDS}
+        self.durations = array('q')
+        self.episode_numbers = array('q')
+        self.pub_date_ordinals = array('l')
+        self.pub_date_micros = array('q')
+
+    @classmethod
+    def from_episodes(cls, episodes: Iterable[PodcastEpisode]) -> 'EpisodeColumns':
+        """
+        Build the columns for a sequence of episodes.
+
+        Args:
+            episodes (Iterable[PodcastEpisode]): The episodes, in order.
+
+        Returns:
+            EpisodeColumns: The columnar copy of the episodes.
+        """
+        columns = cls()
+        for episode in episodes:
+            columns.append(episode)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.durations)
+
+    @staticmethod
+    def _encode(episode: PodcastEpisode) -> tuple:
+        """
+        Encode the numeric fields of an episode for the array columns.
+
+        Returns:
+            tuple: duration, episode number, and the publication date's
+                ordinal and microseconds into the day.
+        """
+        return (MISSING if episode.duration is None else episode.duration,
+                MISSING if episode.episode_number is None else episode.episode_number,
+                *encode_pub_date(episode.pub_date))
+
+    def _numeric_columns(self) -> tuple:
+        return (self.durations, self.episode_numbers, self.pub_date_ordinals, self.pub_date_micros)
+
+    def append(self, episode: PodcastEpisode) -> None:
+        """
+        Append the fields of an episode as a new row.
+
+        Args:
+            episode (PodcastEpisode): The episode to store.
+        """
+        for name in STRING_FIELDS:
+            self.text[name].append(self.strings.add(getattr(episode, name)))
+        for column, value in zip(self._numeric_columns(), self._encode(episode)):
+            column.append(value)
+
+    def set_row(self, row: int, episode: PodcastEpisode) -> None:
+        """
+        Overwrite a row with the current fields of an episode.
+
+        Args:
+            row (int): The row index.
+            episode (PodcastEpisode): The episode to store.
+        """
+        for name in STRING_FIELDS:
+            self.text[name][row] = self.strings.add(getattr(episode, name))
+        for column, value in zip(self._numeric_columns(), self._encode(episode)):
+            column[row] = value
+
+    def string(self, name: str, row: int) -> Optional[str]:
+        """
+        Get a text field of a row.
+
+        Args:
+            name (str): One of STRING_FIELDS.
+            row (int): The row index.
+
+        Returns:
+            Optional[str]: The stored value.
+        """
+        return self.strings.get(self.text[name][row])
+
+    def duration(self, row: int) -> Optional[int]:
+        value = self.durations[row]
+        return None if value == MISSING else value
+
+    def episode_number(self, row: int) -> Optional[int]:
+        value = self.episode_numbers[row]
+        return None if value == MISSING else value
+
+    def pub_date(self, row: int) -> datetime:
+        """
+        Rebuild the publication date of a row.
+
+        Args:
+            row (int): The row index.
+
+        Returns:
+            datetime: An aware datetime in UTC, equal to the value of the
+                stored episode.
+        """
+        return decode_pub_date(self.pub_date_ordinals[row], self.pub_date_micros[row])
+
+    def pub_date_key(self, row: int) -> int:
+        """
+        Get the sortable key of the publication date of a row.
+
+        Args:
+            row (int): The row index.
+
+        Returns:
+            int: The key, as computed by pub_date_key for the episode.
+        """
+        return self.pub_date_ordinals[row] * MICROSECONDS_PER_DAY + self.pub_date_micros[row]
+
+    def episode(self, row: int) -> PodcastEpisode:
+        """
+        Materialize a row as a PodcastEpisode.
+
+        The stored values were validated when the row was appended, so the
+        episode is filled in directly instead of through its setters.
+
+        Args:
+            row (int): The row index.
+
+        Returns:
+            PodcastEpisode: A new episode equal to the stored one.
+        """
+        return PodcastEpisode.from_normalized(
+            title=self.string('title', row),
+            audio_url=self.string('audio_url', row),
+            description=self.string('description', row),
+            pub_date=self.pub_date(row),
+            duration=self.duration(row),
+            episode_number=self.episode_number(row),
+            image_url=self.string('image_url', row),
+            guid=self.string('guid', row)
+        )
+
+    def to_dict(self, row: int) -> Dict:
+        """
+        Serialize a row like PodcastEpisode.to_dict, without an episode.
+
+        Args:
+            row (int): The row index.
+
+        Returns:
+            Dict: The dictionary representation of the episode.
+        """
+        return {
+            "title": self.string('title', row),
+            "audio_url": self.string('audio_url', row),
+            "description": self.string('description', row),
+            "pub_date": self.pub_date(row).isoformat(),
+            "duration": self.duration(row),
+            "episode_number": self.episode_number(row),
+            "image_url": self.string('image_url', row),
+            "guid": self.string('guid', row)
+        }
+
+    def total_duration(self, rows: Optional[Iterable[int]] = None) -> int:
+        """
+        Sum the known durations.
+
+        Args:
+            rows (Optional[Iterable[int]]): Rows to include, all when None.
+
+        Returns:
+            int: The total duration in seconds, ignoring missing values.
+        """
+        durations = self.durations
+        if rows is None:
+            return sum(value for value in durations if value != MISSING)
+        return sum(durations[row] for row in rows if durations[row] != MISSING)
+
+    def filter_rows(self,
+                    min_duration: Optional[int] = None,
+                    max_duration: Optional[int] = None,
+                    published_after: Optional[date] = None,
+                    published_before: Optional[date] = None) -> List[int]:
+        """
+        Find the rows matching duration and publication date bounds.
+
+        Publication bounds are compared by calendar day, inclusively.
+        Rows without a duration never match a duration bound.
+
+        Args:
+            min_duration (Optional[int]): Minimum duration in seconds.
+            max_duration (Optional[int]): Maximum duration in seconds.
+            published_after (Optional[date]): Earliest publication day.
+            published_before (Optional[date]): Latest publication day.
+
+        Returns:
+            List[int]: The matching row indices, in row order.
+        """
+        low = published_after.toordinal() if published_after is not None else None
+        high = published_before.toordinal() if published_before is not None else None
+        durations = self.durations
+        ordinals = self.pub_date_ordinals
+
+        rows = []
+        for row in range(len(durations)):
+            duration = durations[row]
+            if min_duration is not None and (duration == MISSING or duration < min_duration):
+                continue
+            if max_duration is not None and (duration == MISSING or duration > max_duration):
+                continue
+            if low is not None and ordinals[row] < low:
+                continue
+            if high is not None and ordinals[row] > high:
+                continue
+            rows.append(row)
+        return rows
+
+    def sorted_rows(self, key: str, reverse: bool = False) -> List[int]:
+        """
+        Order the rows by a column.
+
+        Args:
+            key (str): "pub_date", "duration", "episode_number" or one of
+                STRING_FIELDS. Missing values sort first.
+            reverse (bool): Sort in descending order.
+
+        Returns:
+            List[int]: The row indices in sorted order; the sort is stable.
+
+        Raises:
+            ValueError: If key is not a sortable column.
+        """
+        if key == 'pub_date':
+            keys = [self.pub_date_key(row) for row in range(len(self))]
+        elif key == 'duration':
+            keys = self.durations
+        elif key == 'episode_number':
+            keys = self.episode_numbers
+        elif key in STRING_FIELDS:
+            strings = self.strings
+            keys = [(offset != MISSING, strings.get(offset) or "") for offset in self.text[key]]
+        else:
+            raise ValueError(f"Cannot sort episodes by {key}")
+        return sorted(range(len(self)), key=keys.__getitem__, reverse=reverse)
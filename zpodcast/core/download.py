@@ -0,0 +1,508 @@
+"""
+Episode Download Module
+
+This module downloads episode audio files in the background. Downloads run
+on a bounded thread pool and stream the response to disk in chunks, so an
+episode never has to fit in memory. The data goes to a ".part" file next to
+the final path, which is only renamed once the download is complete; when a
+download is interrupted (cancelled, failed, or the process stopped) the
+next attempt asks the server for the remaining bytes with an HTTP Range
+request instead of starting over. With an EpisodeCache, completed files
+are moved into the cache and episodes it already holds are not fetched.
+
+Every download has a DownloadState whose status and progress are what
+PodcastEpisode.download, get_download_progress and get_download_status
+report.
+
+Classes:
+    DownloadState: Status and progress of one episode download
+    DownloadManager: The background download engine
+
+Functions:
+    download_key: The key a download is tracked and named by
+"""
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+import logging
+import os
+import re
+import threading
+from typing import Callable, Dict, Optional, Tuple, TYPE_CHECKING
+from urllib.error import HTTPError
+from urllib.parse import urlparse
+import urllib.request
+
+from zpodcast.utils.ids import make_episode_id
+
+if TYPE_CHECKING:
+    from zpodcast.core.cache import EpisodeCache
+    from zpodcast.core.episode import PodcastEpisode
+
+
+# Download statuses
+DOWNLOAD_NOT_STARTED = "not_started"
+DOWNLOAD_QUEUED = "queued"
+DOWNLOAD_DOWNLOADING = "downloading"
+DOWNLOAD_COMPLETED = "completed"
+DOWNLOAD_ERROR = "error"
+DOWNLOAD_CANCELLED = "cancelled"
+
+# Default number of episodes downloaded at the same time
+DEFAULT_MAX_WORKERS = 4
+
+# Default number of bytes read from the response and written at once
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Default socket timeout for a download request in seconds
+DEFAULT_DOWNLOAD_TIMEOUT = 30
+
+# Suffix of the file a download writes to until it is complete
+PARTIAL_SUFFIX = ".part"
+
+CONTENT_RANGE_PATTERN = re.compile(r"bytes\s+(?:(\d+)-\d+|\*)/(\d+)")
+EXTENSION_PATTERN = re.compile(r"\.[A-Za-z0-9]{1,8}")
+
+
+def download_key(episode: 'PodcastEpisode') -> Optional[str]:
+    """
+    Get the key a download is tracked and named by.
+
+    Downloads are keyed by the audio URL rather than by the episode id:
+    the id hashes the GUID, and GUIDs such as "1" are only unique within
+    one feed, so two feeds could otherwise share each other's files.
+
+    Args:
+        episode (PodcastEpisode): The episode.
+
+    Returns:
+        Optional[str]: The key, None when the episode has no audio URL.
+    """
+    return make_episode_id(None, episode.audio_url)
+
+
+class DownloadCancelled(Exception):
+    """Raised inside a worker when its download was cancelled."""
+
+
+@dataclass
+class DownloadState:
+    """
+    Status and progress of one episode download.
+
+    Attributes:
+        url (str): The audio URL being downloaded
+        path (str): Where the completed file is stored
+        status (str): One of the DOWNLOAD_* statuses
+        downloaded (int): Bytes on disk, including a resumed partial file
+        total (Optional[int]): Size of the file, None while unknown
+        error (Optional[str]): Description of the failure, None otherwise
+    """
+
+    url: str
+    path: str
+    status: str = DOWNLOAD_QUEUED
+    downloaded: int = 0
+    total: Optional[int] = None
+    error: Optional[str] = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False, compare=False)
+
+    @property
+    def progress(self) -> int:
+        """
+        Get the download progress.
+
+        Returns:
+            int: Percentage of the file on disk (0-100); 0 while the size
+                is unknown.
+        """
+        if self.status == DOWNLOAD_COMPLETED:
+            return 100
+        if not self.total:
+            return 0
+        return min(100, self.downloaded * 100 // self.total)
+
+    def to_dict(self) -> Dict:
+        return {
+            "url": self.url,
+            "path": self.path,
+            "status": self.status,
+            "progress": self.progress,
+            "downloaded": self.downloaded,
+            "total": self.total,
+            "error": self.error
+        }
+
+
+class DownloadManager:
+    """
+    Downloads episode audio files on a bounded thread pool.
+
+    Downloads are keyed by the audio URL (see download_key), so asking
+    for an episode that is already queued or downloading does not start a
+    second download, and an episode whose file is complete on disk or in
+    the cache is not downloaded again.
+
+    Attributes:
+        directory (str): Where the audio files are stored
+        max_workers (int): Maximum number of downloads running at once
+        chunk_size (int): Bytes read and written at a time
+        timeout (Optional[float]): Socket timeout for each request
+        cache (Optional[EpisodeCache]): Where completed downloads are
+            moved; episodes found in it are not downloaded again. Without a
+            cache the files stay in directory
+        throttle (Optional[Callable[[int], None]]): Called by the workers
+            with the size of every chunk written; it may block to limit the
+            bandwidth (see DownloadScheduler)
+
+    Example:
+        >>> manager = DownloadManager("data/downloads", max_workers=2)
+        >>> manager.download(episode)
+        >>> manager.wait(episode)
+        'completed'
+    """
+
+    _instance = None
+
+    def __init__(self, directory: str,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 timeout: Optional[float] = DEFAULT_DOWNLOAD_TIMEOUT,
+                 cache: Optional['EpisodeCache'] = None):
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+        self.directory = directory
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.cache = cache
+        self.throttle: Optional[Callable[[int], None]] = None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="download")
+        self._states: Dict[str, DownloadState] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'DownloadManager':
+        """
+        Get the download manager shared by the whole application.
+
+        Files are downloaded to the ZPODCAST_DOWNLOAD_DIR directory, by
+        default the "downloads" directory of ZPODCAST_DATA_DIR, and then
+        moved to the shared EpisodeCache.
+
+        Returns:
+            DownloadManager: The shared instance.
+        """
+        if cls._instance is None:
+            # imported here: the cache module depends on the episode module,
+            # which depends on this one
+            from zpodcast.core.cache import EpisodeCache
+            data_dir = os.getenv('ZPODCAST_DATA_DIR', 'data')
+            cls._instance = cls(os.getenv('ZPODCAST_DOWNLOAD_DIR', os.path.join(data_dir, 'downloads')),
+                                cache=EpisodeCache.get_instance())
+        return cls._instance
+
+    @staticmethod
+    def _key(episode: 'PodcastEpisode') -> str:
+        key = download_key(episode)
+        if key is None:
+            raise ValueError("Episode has no audio URL to download")
+        return key
+
+    def path_for(self, episode: 'PodcastEpisode') -> str:
+        """
+        Get the path an episode is downloaded to.
+
+        The file is named after the download key, keeping the extension
+        of the audio URL.
+
+        Args:
+            episode (PodcastEpisode): The episode.
+
+        Returns:
+            str: The path of the completed download.
+
+        Raises:
+            ValueError: If the episode has no audio URL.
+        """
+        extension = os.path.splitext(urlparse(episode.audio_url or "").path)[1]
+        if not EXTENSION_PATTERN.fullmatch(extension):
+            extension = ""
+        return os.path.join(self.directory, self._key(episode) + extension.lower())
+
+    def download(self, episode: 'PodcastEpisode',
+                 callback: Optional[Callable[[DownloadState], None]] = None,
+                 podcast_url: Optional[str] = None) -> bool:
+        """
+        Start downloading an episode in the background.
+
+        Args:
+            episode (PodcastEpisode): The episode to download.
+            callback (Optional[Callable[[DownloadState], None]]): Called
+                with the state once the download has ended, whether it
+                completed, failed or was cancelled. It runs on the worker
+                thread, or right away when the episode is already on disk.
+            podcast_url (Optional[str]): The feed the episode comes from,
+                so that the cache finds the episode by its GUID as well as
+                by its audio URL.
+
+        Returns:
+            bool: True; the episode is downloading, queued or already
+                downloaded.
+
+        Raises:
+            ValueError: If the episode has no audio URL.
+        """
+        key = self._key(episode)
+        path = self.path_for(episode)
+        with self._lock:
+            state = self._states.get(key)
+            running = state is not None and state.status in (DOWNLOAD_QUEUED, DOWNLOAD_DOWNLOADING)
+        # the cache and the file system are looked at without the lock
+        found = None if running else self._find_downloaded(episode, path, podcast_url)
+        with self._lock:
+            state = self._states.get(key)
+            active = state is not None and state.status in (DOWNLOAD_QUEUED, DOWNLOAD_DOWNLOADING)
+            # a download that completed since the first look is kept as well
+            completed_meanwhile = running and state is not None and state.status == DOWNLOAD_COMPLETED
+            if not active and not completed_meanwhile:
+                if found is not None:
+                    found_path, size = found
+                    state = self._states[key] = DownloadState(episode.audio_url, found_path, DOWNLOAD_COMPLETED,
+                                                              size, size)
+                else:
+                    state = self._states[key] = DownloadState(episode.audio_url, path)
+                    self._futures[key] = self._pool.submit(self._run, state, episode, podcast_url)
+            future = self._futures.get(key) if state.status != DOWNLOAD_COMPLETED else None
+
+        # callbacks run outside the lock, they may start other downloads
+        if callback is not None:
+            if future is None:
+                callback(state)
+            else:
+                future.add_done_callback(lambda done: self._finished(state, done, callback))
+        return True
+
+    def _find_downloaded(self, episode: 'PodcastEpisode', path: str,
+                         podcast_url: Optional[str] = None) -> Optional[Tuple[str, int]]:
+        """Get the path and size of an episode's file in the cache or the download directory."""
+        cached = self.cache.get(episode, podcast_url) if self.cache is not None else None
+        if cached is not None:
+            return cached, os.path.getsize(cached)
+        if os.path.exists(path):
+            return path, os.path.getsize(path)
+        return None
+
+    @staticmethod
+    def _finished(state: DownloadState, future: Future, callback: Callable[[DownloadState], None]) -> None:
+        # a future cancelled before it ran runs its callbacks before cancel()
+        # returns, so the status is set here as well
+        if future.cancelled():
+            state.status = DOWNLOAD_CANCELLED
+        callback(state)
+
+    def get_state(self, episode: 'PodcastEpisode') -> Optional[DownloadState]:
+        """
+        Get the download state of an episode.
+
+        Args:
+            episode (PodcastEpisode): The episode.
+
+        Returns:
+            Optional[DownloadState]: The state, None if the episode was
+                never downloaded by this manager.
+        """
+        key = download_key(episode)
+        return None if key is None else self._states.get(key)
+
+    def get_status(self, episode: 'PodcastEpisode') -> str:
+        """
+        Get the download status of an episode.
+
+        Args:
+            episode (PodcastEpisode): The episode.
+
+        Returns:
+            str: One of the DOWNLOAD_* statuses.
+        """
+        state = self.get_state(episode)
+        return DOWNLOAD_NOT_STARTED if state is None else state.status
+
+    def get_progress(self, episode: 'PodcastEpisode') -> int:
+        """
+        Get the download progress of an episode.
+
+        Args:
+            episode (PodcastEpisode): The episode.
+
+        Returns:
+            int: Download progress percentage (0-100).
+        """
+        state = self.get_state(episode)
+        return 0 if state is None else state.progress
+
+    def cancel(self, episode: 'PodcastEpisode') -> bool:
+        """
+        Cancel the download of an episode.
+
+        A queued download never starts; a running one stops after the
+        chunk it is writing and keeps its partial file, so downloading
+        the episode again resumes where it stopped.
+
+        Args:
+            episode (PodcastEpisode): The episode.
+
+        Returns:
+            bool: True if a queued or running download was cancelled.
+        """
+        key = download_key(episode)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or state.status not in (DOWNLOAD_QUEUED, DOWNLOAD_DOWNLOADING):
+                return False
+            state._cancel.set()
+            future = self._futures[key]
+        self._cancel_future(state, future)
+        return True
+
+    @staticmethod
+    def _cancel_future(state: DownloadState, future: Future) -> None:
+        # cancelling runs the done callbacks, so this must not hold the lock
+        if future.cancel():
+            state.status = DOWNLOAD_CANCELLED
+
+    def wait(self, episode: 'PodcastEpisode', timeout: Optional[float] = None) -> str:
+        """
+        Wait for the download of an episode to finish.
+
+        Args:
+            episode (PodcastEpisode): The episode.
+            timeout (Optional[float]): Longest wait in seconds, None to
+                wait until the download ends.
+
+        Returns:
+            str: The status after waiting.
+        """
+        future = self._futures.get(download_key(episode))
+        if future is not None and not future.cancelled():
+            try:
+                future.result(timeout)
+            # not the builtin TimeoutError before Python 3.11
+            except FutureTimeoutError:
+                pass
+        return self.get_status(episode)
+
+    def shutdown(self, cancel: bool = False) -> None:
+        """
+        Stop the worker pool.
+
+        Args:
+            cancel (bool): Cancel the queued and running downloads instead
+                of waiting for them.
+        """
+        if cancel:
+            with self._lock:
+                running = [(state, self._futures[key]) for key, state in self._states.items()
+                           if state.status in (DOWNLOAD_QUEUED, DOWNLOAD_DOWNLOADING)]
+                for state, _ in running:
+                    state._cancel.set()
+            for state, future in running:
+                self._cancel_future(state, future)
+        self._pool.shutdown(wait=True)
+
+    def _run(self, state: DownloadState, episode: 'PodcastEpisode', podcast_url: Optional[str] = None) -> None:
+        """Download one episode on a worker thread, recording the outcome in its state."""
+        if state._cancel.is_set():
+            state.status = DOWNLOAD_CANCELLED
+            return
+        state.status = DOWNLOAD_DOWNLOADING
+        try:
+            self._fetch(state)
+            if self.cache is not None:
+                state.path = self.cache.put(episode, state.path, podcast_url)
+        except DownloadCancelled:
+            state.status = DOWNLOAD_CANCELLED
+        except Exception as e:
+            logging.error(f"Error downloading {state.url}: {e}")
+            state.error = str(e)
+            state.status = DOWNLOAD_ERROR
+        else:
+            state.status = DOWNLOAD_COMPLETED
+
+    def _fetch(self, state: DownloadState) -> None:
+        """
+        Stream the audio file to disk, resuming a partial file if there is one.
+
+        Raises:
+            DownloadCancelled: If the download was cancelled.
+            OSError: If the request or writing the file failed.
+        """
+        os.makedirs(os.path.dirname(state.path) or ".", exist_ok=True)
+        partial = state.path + PARTIAL_SUFFIX
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+
+        request = urllib.request.Request(state.url)
+        if offset:
+            request.add_header('Range', f"bytes={offset}-")
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except HTTPError as e:
+            # the partial file already holds the whole episode
+            match = CONTENT_RANGE_PATTERN.fullmatch(e.headers.get('Content-Range', ""))
+            if e.code == 416 and offset and match and int(match.group(2)) == offset:
+                state.downloaded = state.total = offset
+                os.replace(partial, state.path)
+                return
+            raise
+
+        with response:
+            if offset and response.status != 206:
+                # the server ignored the range, start over
+                offset = 0
+            match = CONTENT_RANGE_PATTERN.fullmatch(response.headers.get('Content-Range', ""))
+            if response.status == 206 and self._range_start(match) != offset:
+                if not offset:
+                    raise OSError("Server sent part of an episode that was requested whole")
+                # the bytes would not continue the partial file
+                restart = True
+            else:
+                restart = False
+                length = response.headers.get('Content-Length')
+                if match:
+                    state.total = int(match.group(2))
+                elif length is not None and length.isdigit():
+                    state.total = offset + int(length)
+                state.downloaded = offset
+
+                with open(partial, 'ab' if offset else 'wb') as file:
+                    while True:
+                        if state._cancel.is_set():
+                            raise DownloadCancelled()
+                        chunk = response.read(self.chunk_size)
+                        if not chunk:
+                            break
+                        file.write(chunk)
+                        state.downloaded += len(chunk)
+                        if self.throttle is not None:
+                            self.throttle(len(chunk))
+
+        if restart:
+            logging.warning(f"Server answered a different range than bytes={offset}- for {state.url}, starting over")
+            os.unlink(partial)
+            self._fetch(state)
+            return
+        if state.total is not None and state.downloaded < state.total:
+            raise OSError(f"Connection closed after {state.downloaded} of {state.total} bytes")
+        os.replace(partial, state.path)
+
+    @staticmethod
+    def _range_start(match: Optional[re.Match]) -> Optional[int]:
+        """Return the first byte of a Content-Range match, or None if unknown."""
+        if match is None or match.group(1) is None:
+            return None
+        return int(match.group(1))
@@ -1,8 +1,11 @@
 from dataclasses import dataclass
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import Optional, Union
-from email.utils import parsedate_to_datetime
-import validators
+from time import struct_time
+from zpodcast.core.download import DownloadManager
+from zpodcast.utils.dates import normalize_pub_date
+from zpodcast.utils.ids import make_episode_id
+from zpodcast.utils.urls import is_url
 
 
 @dataclass
@@ -15,6 +18,11 @@ class PodcastEpisode:
     _image_url: Optional[str]
     _episode_number: Optional[int]
     # podcast_url: Optional[str] = None
+
+    # Episodes are by far the most numerous objects in a library, so they
+    # keep their state in slots instead of a per-instance __dict__
+    __slots__ = ('title', '_audio_url', '_pub_date', '_description', '_duration',
+                 '_image_url', '_episode_number', '_guid')
     
     """
     initializes a podcast episode object with the following attributes:
@@ -46,6 +54,47 @@ class PodcastEpisode:
         self.image_url = image_url
         self.guid = guid
 
+    @classmethod
+    def from_normalized(cls, title: str,
+                        audio_url: str,
+                        description: str,
+                        pub_date: date,
+                        duration: Optional[int],
+                        episode_number: Optional[int],
+                        image_url: Optional[str],
+                        guid: Optional[str]) -> 'PodcastEpisode':
+        """
+        Create an episode from values that already passed validation.
+
+        The values are assigned as they are, without running the setters,
+        so this is only for values taken from an existing episode, such as
+        the ones stored by the persistence layer. Everything else must go
+        through the constructor.
+
+        Args:
+            title (str): The title of the episode.
+            audio_url (str): A valid audio URL.
+            description (str): The description, "" when there is none.
+            pub_date (date): The publication date or datetime.
+            duration (Optional[int]): The duration in seconds.
+            episode_number (Optional[int]): A non-negative episode number.
+            image_url (Optional[str]): A valid image URL.
+            guid (Optional[str]): The feed's episode identifier.
+
+        Returns:
+            PodcastEpisode: The episode.
+        """
+        episode = cls.__new__(cls)
+        episode.title = title
+        episode._audio_url = audio_url
+        episode._description = description
+        episode._pub_date = pub_date
+        episode._duration = duration
+        episode._episode_number = episode_number
+        episode._image_url = image_url
+        episode._guid = guid
+        return episode
+
     @property
     def audio_url(self) -> Optional[str]:
         return self._audio_url
@@ -53,7 +102,7 @@ class PodcastEpisode:
     @audio_url.setter
     def audio_url(self, value: Optional[str]) -> None:
         if value is not None:
-            if validators.url(value):
+            if is_url(value):
                 self._audio_url = value
             else:
                 raise ValueError("Invalid audio URL")
@@ -71,6 +120,19 @@ class PodcastEpisode:
         else:
             self._guid = None
 
+    @property
+    def id(self) -> Optional[str]:
+        """
+        Get the stable identifier of the episode.
+
+        It is derived from the GUID (or the audio URL when there is no
+        GUID), so it survives feed refreshes and changes of position.
+
+        Returns:
+            Optional[str]: The identifier, see make_episode_id.
+        """
+        return make_episode_id(self._guid, self._audio_url)
+
     """
     Get the description of the episode.
 
@@ -106,31 +168,16 @@ class PodcastEpisode:
     
     """
     Set the publication date of the episode.
-    Defaults to today's date if a pubdate is not set or not set correctly - swallows all errors
+    Every value is stored as a timezone-aware datetime in UTC (see
+    normalize_pub_date); missing or unparsable values give midnight UTC of
+    the current day.
 
     Args:
-        value (Optional datetime or str): The publication date of the episode.
+        value (Optional datetime, date, time.struct_time or str): The publication date of the episode.
     """
     @pub_date.setter
-    def pub_date(self, value: Union[datetime, str]) -> None:
-        # Validate that the value is a date object or string
-        if value is not None:
-            if isinstance(value, datetime):
-                # if the value is a date object, set the publication date to the value
-                self._pub_date = value
-            elif isinstance(value, date):
-                # if the value is a date object, set the publication date to the value
-                self._pub_date = value
-            elif isinstance(value, str):
-                try:
-                    # try parsing the string using the email.utils module
-                    self._pub_date = parsedate_to_datetime(value)
-                except Exception:
-                    self._pub_date = date.today()
-            else:
-                self._pub_date = date.today()
-        else:  # if the value is None, set the publication date to today's date
-            self._pub_date = date.today()
+    def pub_date(self, value: Union[datetime, date, struct_time, str, None]) -> None:
+        self._pub_date = normalize_pub_date(value)
 
     """
     Get the duration of the episode in seconds.
@@ -215,7 +262,7 @@ class PodcastEpisode:
     @image_url.setter
     def image_url(self, value: Optional[str]) -> None:
         if value is not None:
-            if validators.url(value):
+            if is_url(value):
                 self._image_url = value
             else:
                 self._image_url = None
@@ -230,57 +277,114 @@ class PodcastEpisode:
             "pub_date": self.pub_date.isoformat() if self.pub_date else None,
             "duration": self.duration,
             "episode_number": self.episode_number,
-            "image_url": self.image_url
+            "image_url": self.image_url,
+            "guid": self.guid
         }
 
+    @staticmethod
+    def _stored_pub_date(value: Optional[str]) -> Optional[Union[datetime, str]]:
+        """
+        Parse a publication date as written by to_dict.
+
+        Stored dates are ISO 8601 and are parsed directly instead of being
+        tried as RFC 822 first by the pub_date setter. Other strings are
+        returned unchanged for the setter to parse.
+        """
+        if not isinstance(value, str) or not value:
+            return value
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+
     @classmethod
-    def from_dict(cls, data):
-        pub_date = data.get("pub_date")
-        if pub_date:
-            pub_date = datetime.fromisoformat(pub_date)
-            
-        return cls(
+    def from_dict(cls, data, trusted: bool = False):
+        """
+        Create an episode from its dictionary representation.
+
+        Args:
+            data (Dict): Dictionary as produced by to_dict.
+            trusted (bool): The dictionary was written by the persistence
+                layer from a validated episode, so the episode is built by
+                from_normalized without running the setters; only a
+                publication date that is not a UTC ISO 8601 datetime is
+                normalized. Data from clients must never be loaded as
+                trusted.
+
+        Returns:
+            PodcastEpisode: The episode.
+
+        Raises:
+            ValueError: If the audio URL is missing, or invalid when not
+                trusted.
+        """
+        pub_date = cls._stored_pub_date(data.get("pub_date"))
+        if not trusted:
+            return cls(
+                title=data.get("title"),
+                audio_url=data.get("audio_url"),
+                description=data.get("description"),
+                pub_date=pub_date,
+                duration=data.get("duration"),
+                episode_number=data.get("episode_number"),
+                image_url=data.get("image_url"),
+                guid=data.get("guid")
+            )
+
+        audio_url = data.get("audio_url")
+        if audio_url is None:
+            raise ValueError("Invalid audio URL")
+        if not isinstance(pub_date, datetime) or pub_date.utcoffset() != timedelta(0):
+            # e.g. a bare date in a hand-written file
+            pub_date = normalize_pub_date(pub_date)
+        return cls.from_normalized(
             title=data.get("title"),
-            audio_url=data.get("audio_url"),
-            description=data.get("description"),
+            audio_url=audio_url,
+            description=data.get("description") or "",
             pub_date=pub_date,
             duration=data.get("duration"),
             episode_number=data.get("episode_number"),
-            image_url=data.get("image_url")
+            image_url=data.get("image_url"),
+            guid=data.get("guid")
         )
-    
-    def download(self):
+
+    def download(self, manager: Optional['DownloadManager'] = None) -> bool:
         """
-        Start downloading the episode.
-        For now, this is a stub method that would be implemented with actual download logic.
-        
+        Start downloading the episode in the background.
+
+        Args:
+            manager (Optional[DownloadManager]): The manager running the
+                download, by default the shared DownloadManager.
+
         Returns:
-            bool: True if download started successfully
+            bool: True if the download was started, is already running or
+                the episode is already downloaded.
         """
-        # In a real implementation, this would initiate a download
-        # For testing purposes, we just return True
-        return True
-    
-    def get_download_progress(self):
+        return (manager or DownloadManager.get_instance()).download(self)
+
+    def get_download_progress(self, manager: Optional['DownloadManager'] = None) -> int:
         """
         Get the current download progress percentage.
-        For now, this is a stub method that would be implemented with actual progress tracking.
-        
+
+        Args:
+            manager (Optional[DownloadManager]): The manager running the
+                download, by default the shared DownloadManager.
+
         Returns:
             int: Download progress percentage (0-100)
         """
-        # In a real implementation, this would return the actual download progress
-        # For testing purposes, we return a default value
-        return 0
-    
-    def get_download_status(self):
+        return (manager or DownloadManager.get_instance()).get_progress(self)
+
+    def get_download_status(self, manager: Optional['DownloadManager'] = None) -> str:
         """
         Get the current download status.
-        For now, this is a stub method that would be implemented with actual status tracking.
-        
+
+        Args:
+            manager (Optional[DownloadManager]): The manager running the
+                download, by default the shared DownloadManager.
+
         Returns:
-            str: Download status ('not_started', 'downloading', 'completed', 'error')
+            str: Download status ('not_started', 'queued', 'downloading',
+                'completed', 'error' or 'cancelled')
         """
-        # In a real implementation, this would return the actual download status
-        # For testing purposes, we return a default value
-        return "not_started"
+        return (manager or DownloadManager.get_instance()).get_status(self)
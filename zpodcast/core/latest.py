@@ -0,0 +1,116 @@
+"""
+Latest Episodes Module
+
+This module finds the most recent episodes across every podcast of a
+PodcastList. Each episode list keeps its episodes ordered from the newest to
+the oldest (PodcastEpisodeList.newest_first, cached until the list changes),
+so the overall order is a k-way merge of those lists: a heap holds the next
+episode of every list and a page of k episodes costs O(k log n) heap
+operations for n episode lists, instead of a sort of the whole library.
+
+A podcast's priority can move its episodes up or down the feed: every
+priority point counts as if the episodes were published priority_weight
+later. The shift is the same for all episodes of a podcast, so every list
+stays in order and the merge still applies.
+
+Classes:
+    LatestEpisode: One episode of the latest episodes feed
+
+Functions:
+    latest_episodes: The most recent episodes of a podcast list
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+import heapq
+from typing import List
+
+from zpodcast.core.podcasts import PodcastList
+
+
+# Default and largest number of episodes per page
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# How much later one point of podcast_priority makes episodes count as
+# published
+DEFAULT_PRIORITY_WEIGHT = timedelta(hours=12)
+
+
+@dataclass
+class LatestEpisode:
+    """
+    One episode of the latest episodes feed.
+
+    Attributes:
+        podcast_id (int): Position of the podcast in the PodcastList
+        episodelist_id (int): Position of the episode list in the podcast
+        episode_id (int): Position of the episode in the episode list
+    """
+
+    podcast_id: int
+    episodelist_id: int
+    episode_id: int
+
+
+def latest_episodes(podcast_list: PodcastList, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                    priority_weight: timedelta = DEFAULT_PRIORITY_WEIGHT) -> List[LatestEpisode]:
+    """
+    Get the most recent episodes of every podcast of a list.
+
+    Episodes are ordered by publication date, shifted by podcast_priority
+    times priority_weight; podcasts without a priority are not shifted.
+    Episodes ranking equal keep the order of their podcasts in the list and
+    of their positions in the episode lists.
+
+    Args:
+        podcast_list (PodcastList): The podcasts.
+        offset (int): Rank of the first episode to return.
+        limit (int): Maximum number of episodes, at most MAX_PAGE_SIZE.
+        priority_weight (timedelta): Shift per priority point; zero orders
+            by publication date alone.
+
+    Returns:
+        List[LatestEpisode]: The requested page, most recent first.
+
+    Raises:
+        ValueError: If offset is negative, limit is not between 1 and
+            MAX_PAGE_SIZE or priority_weight is negative.
+    """
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("offset must be a non-negative integer")
+    if not isinstance(limit, int) or not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    if priority_weight < timedelta(0):
+        raise ValueError("priority_weight must not be negative")
+    # pub_date keys count microseconds
+    weight = priority_weight // timedelta(microseconds=1)
+
+    # heap entries: (negated shifted key of the list's next episode, podcast
+    # position, episode list position, rank of the episode in the list)
+    heap = []
+    streams = {}
+    for podcast_position, podcast in enumerate(podcast_list.podcasts):
+        shift = (podcast.podcast_priority or 0) * weight
+        for list_position, episodelist in enumerate(podcast.episodelists):
+            order = episodelist.newest_first()
+            if not order:
+                continue
+            keys = episodelist.sort_keys('pub_date')
+            streams[podcast_position, list_position] = (order, keys, shift)
+            heap.append((-(keys[order[0]] + shift), podcast_position, list_position, 0))
+    heapq.heapify(heap)
+
+    page = []
+    for rank in range(offset + limit):
+        if not heap:
+            break
+        _, podcast_position, list_position, index = heap[0]
+        order, keys, shift = streams[podcast_position, list_position]
+        if rank >= offset:
+            page.append(LatestEpisode(podcast_position, list_position, order[index]))
+        index += 1
+        if index < len(order):
+            heapq.heapreplace(heap, (-(keys[order[index]] + shift), podcast_position, list_position, index))
+        else:
+            heapq.heappop(heap)
+    return page
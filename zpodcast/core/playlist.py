@@ -1,20 +1,85 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import date
+import logging
 import re
-from typing import List, Dict
+from typing import List, Dict, Any, Optional, Tuple
 from zpodcast.core.episode import PodcastEpisode
+from zpodcast.core.columns import EpisodeColumns, MISSING, STRING_FIELDS, pub_date_key
 from zpodcast.parsers.rss import RSSPodcastParser
+from zpodcast.utils.ids import make_episode_id
+
+
+# Episode fields compared when merging feed entries into an episode list
+MERGE_FIELDS = ('title', 'audio_url', 'description', 'pub_date',
+                'duration', 'episode_number', 'image_url', 'guid')
+
+# Episode fields with cached sort keys, see PodcastEpisodeList.sort_keys
+SORT_KEY_FIELDS = ('title', 'duration', 'pub_date')
+
+# Number of recent revisions whose changed episodes are remembered, see
+# PodcastEpisodeList.changes_since
+CHANGE_LOG_SIZE = 32
+
+
+@dataclass
+class EpisodeMergeResult:
+    """
+    The diff produced by merging feed entries into a PodcastEpisodeList.
+
+    Attributes:
+        added (List[PodcastEpisode]): Episodes created for new entries
+        updated (List[PodcastEpisode]): Existing episodes changed in place
+        unchanged (int): Number of entries that matched an existing episode
+            without any change
+        skipped (int): Number of entries that could not be turned into an
+            episode
+    """
+
+    added: List[PodcastEpisode] = field(default_factory=list)
+    updated: List[PodcastEpisode] = field(default_factory=list)
+    unchanged: int = 0
+    skipped: int = 0
+
+    @property
+    def changed(self) -> bool:
+        """
+        Whether the merge added or updated any episode.
+
+        Returns:
+            bool: True when the episode list was modified.
+        """
+        return bool(self.added or self.updated)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "added": len(self.added),
+            "updated": len(self.updated),
+            "unchanged": self.unchanged,
+            "skipped": self.skipped
+        }
 
 
 @dataclass
 class PodcastEpisodeList:
     _name: str
     _episodes: List[PodcastEpisode]
+    # modification counter behind the revision property
+    _revision = 0
     
     def __init__(self,
                  name: str,
-                 episodes: List[PodcastEpisode]):
+                 episodes: List[PodcastEpisode],
+                 columnar: bool = False):
+        self._columns = None
+        self._views = {}
+        self._sort_keys = {}
+        self._sort_keys_revision = None
+        # revision counter -> positions of the episodes that revision changed
+        self._change_log: Dict[int, Tuple[int, ...]] = {}
         self.name = name
         self.episodes = episodes
+        if columnar:
+            self.to_columnar()
     
     @property
     def name(self):
@@ -24,6 +89,8 @@ class PodcastEpisodeList:
     def name(self, name: str) -> None:
         self._validate_name(name)
         self._name = name
+        self._revision += 1
+        self._log_change(())
     
     def _validate_name(self, name: str) -> None:
         if not isinstance(name, str):
@@ -37,22 +104,358 @@ class PodcastEpisodeList:
     
     @property
     def episodes(self):
+        if self._columns is not None:
+            # handing out the whole list means callers may change any episode
+            self._materialize()
         return self._episodes
     
     @episodes.setter
     def episodes(self, episodes: List[PodcastEpisode]):
+        self._columns = None
+        self._views = {}
         self._episodes = episodes
+        self._invalidate_index()
+        self._revision += 1
     
     def add_podcastepisode(self, episode: PodcastEpisode) -> None:
+        self._revision += 1
+        if self._columns is not None:
+            self._columns.append(episode)
+            self._views[len(self._columns) - 1] = episode
+            if self._id_positions is not None:
+                self._id_positions.setdefault(episode.id, len(self._columns) - 1)
+                self._id_count += 1
+            return
         self._episodes.append(episode)
+        if self._index is not None:
+            self._index_episode(self._index, episode)
+            self._indexed_count = len(self._episodes)
+        if self._id_positions is not None:
+            self._id_positions.setdefault(episode.id, len(self._episodes) - 1)
+            self._id_count += 1
 
     def remove_podcastepisode(self, index: int) -> None:
-        del self._episodes[index]
+        del self.episodes[index]
+        self._invalidate_index()
+        self._revision += 1
+
+    @property
+    def revision(self) -> Tuple[int, int]:
+        """
+        Get a value that changes whenever the list is modified.
+
+        Renaming, replacing, adding, removing, reordering and merging
+        episodes all change the revision. Episodes changed directly, outside
+        of the list's methods, are not seen; call mark_dirty after changing
+        them.
+
+        Returns:
+            Tuple[int, int]: The modification counter and the episode count.
+        """
+        return (self._revision, self.get_num_items())
+
+    def mark_dirty(self) -> None:
+        """Record a change made to one of the episodes directly."""
+        self._revision += 1
+
+    def _log_change(self, positions: Tuple[int, ...]) -> None:
+        """Remember the episodes changed by the current revision."""
+        self._change_log[self._revision] = positions
+        self._change_log.pop(self._revision - CHANGE_LOG_SIZE, None)
+
+    def changes_since(self, revision: Tuple[int, int]) -> Optional[List[int]]:
+        """
+        Get the episodes added or changed since an earlier revision.
+
+        Only renames and merge_entries are recorded, for the last
+        CHANGE_LOG_SIZE revisions; any other change since the revision
+        (reordering, removing or replacing episodes...) makes the answer
+        unknown.
+
+        Args:
+            revision (Tuple[int, int]): A value returned by revision.
+
+        Returns:
+            Optional[List[int]]: The positions of the added or changed
+                episodes in ascending order, None when they are unknown and
+                every episode must be considered changed.
+        """
+        counter, count = revision
+        if counter > self._revision:
+            return None
+        changed = set()
+        for step in range(counter + 1, self._revision + 1):
+            positions = self._change_log.get(step)
+            if positions is None:
+                return None
+            changed.update(positions)
+        # merges only append, anything else resized the list behind its back
+        if self.get_num_items() - count != sum(1 for position in changed if position >= count):
+            return None
+        return sorted(changed)
+
+    """
+    Optional columnar backing store
+    """
+    @property
+    def is_columnar(self) -> bool:
+        return self._columns is not None
+
+    def to_columnar(self) -> None:
+        """
+        Switch the list to the columnar backing store.
+
+        The episodes are copied into an EpisodeColumns store and the episode
+        objects are released. Counts, durations, details, filters, sorts
+        and serialization then run over the columns; an episode object is
+        only built when a caller asks for that episode (see get_episode and
+        get_episodes with indices), and is kept so later calls return the
+        same object. Anything that needs the full list of objects (the
+        episodes property, reordering, removing or merging feed entries)
+        switches the list back to plain episode objects.
+        """
+        if self._columns is not None:
+            return
+        self._columns = EpisodeColumns.from_episodes(self._episodes)
+        self._views = {}
+        self._episodes = None
+        self._invalidate_index()
+
+    def _materialize(self) -> None:
+        columns = self._columns
+        self._episodes = [self._views.get(row) or columns.episode(row) for row in range(len(columns))]
+        self._columns = None
+        self._views = {}
+        self._invalidate_index()
+
+    def _synced_columns(self) -> EpisodeColumns:
+        # episodes handed out may have been changed since they were built
+        for row, episode in self._views.items():
+            self._columns.set_row(row, episode)
+        return self._columns
+
+    def _view(self, row: int) -> PodcastEpisode:
+        episode = self._views.get(row)
+        if episode is None:
+            episode = self._columns.episode(row)
+            self._views[row] = episode
+        return episode
+
+    """
+    GUID index used to merge feed entries incrementally
+    """
+    def _invalidate_index(self) -> None:
+        self._index = None
+        self._indexed_count = 0
+        self._fingerprints = {}
+        self._id_positions = None
+
+    @staticmethod
+    def _guid_key(guid: Optional[str]) -> Optional[str]:
+        return f"guid:{guid}" if guid else None
+
+    @staticmethod
+    def _url_key(audio_url: Optional[str]) -> Optional[str]:
+        return f"url:{audio_url}" if audio_url else None
+
+    def _index_episode(self, index: Dict[str, PodcastEpisode], episode: PodcastEpisode) -> None:
+        # every episode is reachable by its GUID and by its audio URL so
+        # entries still match episodes persisted before GUIDs were stored
+        for key in (self._guid_key(episode.guid), self._url_key(episode.audio_url)):
+            if key is not None:
+                index.setdefault(key, episode)
+
+    def _episode_index(self) -> Dict[str, PodcastEpisode]:
+        """
+        Get the GUID / audio URL index of the episodes, building it lazily.
+
+        The index is rebuilt when the episode list was resized behind the
+        list's back (for example by mutating the episodes property).
+
+        Returns:
+            Dict[str, PodcastEpisode]: Mapping of index key to episode.
+        """
+        episodes = self.episodes
+        if self._index is None or self._indexed_count != len(episodes):
+            index = {}
+            for episode in episodes:
+                self._index_episode(index, episode)
+            self._index = index
+            self._indexed_count = len(self._episodes)
+            self._fingerprints = {}
+        return self._index
+
+    def find_episode(self, guid: Optional[str] = None, audio_url: Optional[str] = None) -> Optional[PodcastEpisode]:
+        """
+        Find an episode by GUID, falling back to its audio URL.
+
+        The audio URL fallback only matches an episode that has no GUID of
+        its own (or when no GUID is given), so two distinct episodes that
+        share an enclosure are not confused.
+
+        Args:
+            guid (Optional[str]): The GUID of the episode.
+            audio_url (Optional[str]): The audio URL of the episode.
+
+        Returns:
+            Optional[PodcastEpisode]: The matching episode, None otherwise.
+        """
+        index = self._episode_index()
+        guid_key = self._guid_key(guid)
+        if guid_key is not None and guid_key in index:
+            return index[guid_key]
+
+        url_key = self._url_key(audio_url)
+        if url_key is not None and url_key in index:
+            episode = index[url_key]
+            if guid is None or episode.guid is None:
+                return episode
+        return None
+
+    """
+    Stable episode identifier index
+    """
+    def _episode_id_at(self, position: int) -> Optional[str]:
+        if self._columns is None:
+            return self._episodes[position].id
+        episode = self._views.get(position)
+        if episode is not None:
+            return episode.id
+        return make_episode_id(self._columns.string('guid', position), self._columns.string('audio_url', position))
+
+    def _has_id_at(self, position: int, episode_id: str) -> bool:
+        return position < self.get_num_items() and self._episode_id_at(position) == episode_id
+
+    def _build_id_positions(self) -> Dict[str, int]:
+        positions = {}
+        count = self.get_num_items()
+        for position in range(count):
+            positions.setdefault(self._episode_id_at(position), position)
+        self._id_positions = positions
+        self._id_count = count
+        return positions
+
+    def find_episode_index(self, episode_id: str) -> Optional[int]:
+        """
+        Find the position of an episode by its stable identifier.
+
+        The identifier index is built on first use and kept up to date by
+        the list's methods; a hit is checked against the episode it points
+        to, so episodes changed or moved directly trigger a rebuild instead
+        of a wrong answer. With the columnar store no episode is
+        materialized.
+
+        Args:
+            episode_id (str): The identifier, see PodcastEpisode.id.
+
+        Returns:
+            Optional[int]: The position of the episode, None when no
+                episode has that identifier.
+        """
+        positions = self._id_positions
+        if positions is None or self._id_count != self.get_num_items():
+            # not built yet, or the episodes were resized directly
+            positions = self._build_id_positions()
+        position = positions.get(episode_id)
+        if position is not None and not self._has_id_at(position, episode_id):
+            position = self._build_id_positions().get(episode_id)
+        return position
+
+    @staticmethod
+    def _snapshot(episode: PodcastEpisode) -> Tuple:
+        return tuple(getattr(episode, name) for name in MERGE_FIELDS)
+
+    def merge_entries(self, entries: List[Dict[str, Any]]) -> EpisodeMergeResult:
+        """
+        Merge feed entries into the list, keyed by GUID then audio URL.
+
+        Only entries that do not match an existing episode are turned into
+        new PodcastEpisode objects (appended in feed order, so the positions
+        of existing episodes do not shift). Matching episodes are updated
+        in place, which keeps any local state attached to them. Each entry
+        that has been merged before is fingerprinted, so an unchanged entry
+        costs a tuple comparison instead of re-running every setter; a
+        typical refresh is therefore proportional to the number of new or
+        changed items. Episodes missing from the feed are kept, as most
+        feeds only carry the latest part of the back catalogue.
+
+        Args:
+            entries (List[Dict[str, Any]]): Raw episode fields keyed like
+                the PodcastEpisode constructor arguments, as produced by
+                RSSPodcastParser.parse_feed.
+
+        Returns:
+            EpisodeMergeResult: The added / updated / unchanged diff.
+        """
+        result = EpisodeMergeResult()
+        index = self._episode_index()
+
+        for entry in entries:
+            guid = entry.get('guid')
+            audio_url = entry.get('audio_url')
+            key = self._guid_key(guid) or self._url_key(audio_url)
+            if key is None:
+                result.skipped += 1
+                continue
+
+            fingerprint = tuple(entry.get(name) for name in MERGE_FIELDS)
+            episode = self.find_episode(guid, audio_url)
+
+            if episode is None:
+                try:
+                    episode = PodcastEpisode(**entry)
+                except (ValueError, TypeError) as e:
+                    logging.error(f"Error creating episode from entry: {e}")
+                    result.skipped += 1
+                    continue
+                self._episodes.append(episode)
+                self._index_episode(index, episode)
+                self._indexed_count = len(self._episodes)
+                self._fingerprints[key] = fingerprint
+                result.added.append(episode)
+                continue
+
+            if self._fingerprints.get(key) == fingerprint:
+                result.unchanged += 1
+                continue
+
+            # apply the entry through the setters, keeping the episode object
+            before = self._snapshot(episode)
+            try:
+                for name in MERGE_FIELDS:
+                    if name in entry:
+                        setattr(episode, name, entry[name])
+            except (ValueError, TypeError) as e:
+                logging.error(f"Error updating episode from entry: {e}")
+                result.skipped += 1
+                continue
+            self._index_episode(index, episode)
+            self._fingerprints[key] = fingerprint
+
+            if self._snapshot(episode) != before:
+                result.updated.append(episode)
+            else:
+                result.unchanged += 1
+
+        if result.changed:
+            self._revision += 1
+            # entries matched by audio URL may have brought a GUID along
+            self._id_positions = None
+            changed = [len(self._episodes) - len(result.added) + offset for offset in range(len(result.added))]
+            if result.updated:
+                updated = {id(episode) for episode in result.updated}
+                changed += [position for position, episode in enumerate(self._episodes) if id(episode) in updated]
+            self._log_change(tuple(changed))
+        return result
 
     def get_num_items(self) -> int:
+        if self._columns is not None:
+            return len(self._columns)
         return len(self._episodes)
 
     def calculate_duration(self) -> float:
+        if self._columns is not None:
+            return float(self._synced_columns().total_duration())
         total_duration_seconds = 0.0
         for episode in self._episodes:
             total_duration_seconds += episode.duration
@@ -70,19 +473,32 @@ class PodcastEpisodeList:
         return self._format_duration(duration_seconds)
 
     def move_episode_up(self, index: int) -> None:
-        if index > 0 and index < len(self._episodes):
-            self._episodes[index], self._episodes[index - 1] = self._episodes[index - 1], self._episodes[index]
+        episodes = self.episodes
+        self._revision += 1
+        if index > 0 and index < len(episodes):
+            episodes[index], episodes[index - 1] = episodes[index - 1], episodes[index]
 
     def move_episode_down(self, index: int) -> None:
-        if index >= 0 and index < len(self._episodes) - 1:
-            self._episodes[index], self._episodes[index + 1] = self._episodes[index + 1], self._episodes[index]
+        episodes = self.episodes
+        self._revision += 1
+        if index >= 0 and index < len(episodes) - 1:
+            episodes[index], episodes[index + 1] = episodes[index + 1], episodes[index]
 
     def move_episode_to_position(self, current_index: int, new_index: int) -> None:
-        if current_index >= 0 and current_index < len(self._episodes) and new_index >= 0 and new_index < len(self._episodes):
-            episode = self._episodes.pop(current_index)
-            self._episodes.insert(new_index, episode)
+        episodes = self.episodes
+        self._revision += 1
+        if current_index >= 0 and current_index < len(episodes) and new_index >= 0 and new_index < len(episodes):
+            episode = episodes.pop(current_index)
+            episodes.insert(new_index, episode)
 
     def get_all_episode_details(self) -> List[Dict[str, str]]:
+        if self._columns is not None:
+            columns = self._synced_columns()
+            return [{
+                "title": columns.string('title', row),
+                "duration": columns.duration(row),
+                "audio_url": columns.string('audio_url', row)
+            } for row in range(len(columns))]
         episode_details = []
         for episode in self._episodes:
             details = {
@@ -94,9 +510,16 @@ class PodcastEpisodeList:
         return episode_details
 
     def get_episode_details(self, index: int) -> Dict[str, str]:
-        if index < 0 or index >= len(self._episodes):
+        if index < 0 or index >= self.get_num_items():
             return {}
-        episode = self._episodes[index]
+        if self._columns is not None and index not in self._views:
+            columns = self._columns
+            return {
+                "title": columns.string('title', index),
+                "duration": columns.duration(index),
+                "audio_url": columns.string('audio_url', index)
+            }
+        episode = self._view(index) if self._columns is not None else self._episodes[index]
         return {
             "title": episode.title,
             "duration": episode.duration,
@@ -108,15 +531,263 @@ class PodcastEpisodeList:
     """
     def get_episodes(self, indices: List[int] = None) -> List[PodcastEpisode]:
         if indices is None:
-            return self._episodes
+            return self.episodes
         
-        valid_indices = [i for i in indices if isinstance(i, int) and 0 <= i < len(self._episodes)]
+        count = self.get_num_items()
+        valid_indices = [i for i in indices if isinstance(i, int) and 0 <= i < count]
         if len(valid_indices) != len(indices):
             raise ValueError("Invalid indices provided.")
+        if self._columns is not None:
+            return [self._view(i) for i in valid_indices]
         return [self._episodes[i] for i in valid_indices]
 
+    def get_episode(self, index: int) -> PodcastEpisode:
+        """
+        Get a single episode by position.
+
+        With the columnar store only this episode is materialized.
+
+        Args:
+            index (int): The position of the episode; negative positions
+                count from the end like list indexing.
+
+        Returns:
+            PodcastEpisode: The episode at that position.
+
+        Raises:
+            IndexError: If the position is out of range.
+        """
+        if self._columns is None:
+            return self._episodes[index]
+        count = len(self._columns)
+        if index < 0:
+            index += count
+        if index < 0 or index >= count:
+            raise IndexError("episode index out of range")
+        return self._view(index)
+
+    def get_episode_dicts(self, start: int = 0, end: Optional[int] = None) -> List[Dict]:
+        """
+        Serialize a range of episodes.
+
+        With the columnar store the dictionaries are built straight from
+        the columns, without materializing the episodes.
+
+        Args:
+            start (int): Position of the first episode.
+            end (Optional[int]): Position after the last episode, None for
+                the end of the list.
+
+        Returns:
+            List[Dict]: The episode dictionaries, as from PodcastEpisode.to_dict.
+        """
+        if self._columns is None:
+            return [episode.to_dict() for episode in self._episodes[start:end]]
+        columns = self._synced_columns()
+        return [columns.to_dict(row) for row in range(len(columns))[start:end]]
+
+    def get_text_fields(self, positions: Optional[List[int]] = None
+                        ) -> List[Tuple[Optional[str], Optional[str], int]]:
+        """
+        Get the searchable text of the episodes.
+
+        With the columnar store the values are read from the columns,
+        without materializing the episodes.
+
+        Args:
+            positions (Optional[List[int]]): Positions of the episodes to
+                read, None for every episode.
+
+        Returns:
+            List[Tuple[Optional[str], Optional[str], int]]: The title,
+                description and publication date key (see pub_date_key) of
+                each episode, in list order or in the order of positions.
+        """
+        if self._columns is None:
+            episodes = self._episodes if positions is None else [self._episodes[row] for row in positions]
+            return [(episode.title, episode.description, pub_date_key(episode.pub_date))
+                    for episode in episodes]
+        columns = self._synced_columns()
+        rows = range(len(columns)) if positions is None else positions
+        return [(columns.string('title', row), columns.string('description', row), columns.pub_date_key(row))
+                for row in rows]
+
+    def filter_episode_indices(self,
+                               min_duration: Optional[int] = None,
+                               max_duration: Optional[int] = None,
+                               published_after: Optional[date] = None,
+                               published_before: Optional[date] = None) -> List[int]:
+        """
+        Find the episodes matching duration and publication date bounds.
+
+        Publication bounds are compared by calendar day, inclusively, and
+        episodes without a duration never match a duration bound.
+
+        Args:
+            min_duration (Optional[int]): Minimum duration in seconds.
+            max_duration (Optional[int]): Maximum duration in seconds.
+            published_after (Optional[date]): Earliest publication day.
+            published_before (Optional[date]): Latest publication day.
+
+        Returns:
+            List[int]: Positions of the matching episodes; pass them to
+                get_episodes to get the episodes themselves.
+        """
+        if self._columns is not None:
+            return self._synced_columns().filter_rows(min_duration, max_duration, published_after, published_before)
+
+        durations = self.sort_keys('duration')
+        rows = []
+        for row, episode in enumerate(self._episodes):
+            duration = durations[row]
+            if min_duration is not None and (duration == MISSING or duration < min_duration):
+                continue
+            if max_duration is not None and (duration == MISSING or duration > max_duration):
+                continue
+            if published_after is not None or published_before is not None:
+                day = episode.pub_date.toordinal()
+                if published_after is not None and day < published_after.toordinal():
+                    continue
+                if published_before is not None and day > published_before.toordinal():
+                    continue
+            rows.append(row)
+        return rows
+
+    def sorted_episode_indices(self, key: str, reverse: bool = False) -> List[int]:
+        """
+        Order the episodes by a field without reordering the list.
+
+        Args:
+            key (str): "pub_date", "duration", "episode_number", "title",
+                "audio_url", "description", "image_url" or "guid".
+            reverse (bool): Sort in descending order.
+
+        Returns:
+            List[int]: Positions of the episodes in sorted order.
+
+        Raises:
+            ValueError: If key is not a sortable field.
+        """
+        if self._columns is not None:
+            return self._synced_columns().sorted_rows(key, reverse)
+
+        # the same keys as EpisodeColumns.sorted_rows: missing values first
+        if key in ('pub_date', 'duration'):
+            keys = self.sort_keys(key)
+        elif key == 'episode_number':
+            keys = [MISSING if episode.episode_number is None else episode.episode_number
+                    for episode in self._episodes]
+        elif key in STRING_FIELDS:
+            keys = [(value is not None, value or "")
+                    for value in (getattr(episode, key) for episode in self._episodes)]
+        else:
+            raise ValueError(f"Cannot sort episodes by {key}")
+        return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+    def _build_sort_keys(self, key: str) -> List:
+        if self._columns is not None:
+            columns = self._synced_columns()
+            rows = range(len(columns))
+            if key == 'title':
+                return [(columns.string('title', row) or "").casefold() for row in rows]
+            if key == 'duration':
+                return list(columns.durations)
+            return [columns.pub_date_key(row) for row in rows]
+        if key == 'title':
+            return [(episode.title or "").casefold() for episode in self._episodes]
+        if key == 'duration':
+            return [MISSING if episode.duration is None else episode.duration for episode in self._episodes]
+        return [pub_date_key(episode.pub_date) for episode in self._episodes]
+
+    def sort_keys(self, key: str) -> List:
+        """
+        Get the precomputed sort key of every episode for a field.
+
+        Titles are casefolded, durations are seconds (missing durations
+        sort first) and publication dates are pub_date_key values, an epoch
+        count that orders aware datetimes correctly. The keys are computed
+        once and cached until the list's revision changes.
+
+        Args:
+            key (str): One of SORT_KEY_FIELDS.
+
+        Returns:
+            List: The sort keys, in list order. The list is shared with the
+                cache and must not be modified.
+
+        Raises:
+            ValueError: If key is not in SORT_KEY_FIELDS.
+        """
+        if key not in SORT_KEY_FIELDS:
+            raise ValueError(f"Cannot sort episodes by {key}")
+        cache = self._sort_key_cache()
+        keys = cache.get(key)
+        if keys is None:
+            keys = cache[key] = self._build_sort_keys(key)
+        return keys
+
+    def _sort_key_cache(self) -> Dict[str, List]:
+        revision = self.revision
+        if self._sort_keys_revision != revision:
+            self._sort_keys = {}
+            self._sort_keys_revision = revision
+        return self._sort_keys
+
+    def newest_first(self) -> List[int]:
+        """
+        Get the positions of the episodes from the newest to the oldest.
+
+        The order is cached with the sort keys, so while the list does not
+        change it is computed once however often it is read; episodes with
+        the same publication date keep their list order.
+
+        Returns:
+            List[int]: The positions, most recent publication date first.
+                The list is shared with the cache and must not be modified.
+        """
+        cache = self._sort_key_cache()
+        order = cache.get('newest_first')
+        if order is None:
+            keys = self.sort_keys('pub_date')
+            order = cache['newest_first'] = sorted(range(len(keys)), key=keys.__getitem__, reverse=True)
+        return order
+
+    def latest_pub_date(self) -> Optional[date]:
+        """
+        Get the publication date of the most recent episode.
+
+        Returns:
+            Optional[date]: The latest publication date, None when the list
+                is empty.
+        """
+        if self._columns is not None:
+            columns = self._synced_columns()
+            if not len(columns):
+                return None
+            return columns.pub_date(max(range(len(columns)), key=columns.pub_date_key))
+        pub_dates = [episode.pub_date for episode in self._episodes if episode.pub_date]
+        if not pub_dates:
+            return None
+        return max(pub_dates, key=pub_date_key)
+
     @classmethod
-    def from_dict(cls, data: Dict[str, any]) -> 'PodcastEpisodeList':
+    def from_dict(cls, data: Dict[str, any], columnar: bool = False,
+                  trusted: bool = False) -> 'PodcastEpisodeList':
+        """
+        Create an episode list from its dictionary representation.
+
+        Args:
+            data (Dict[str, any]): Dictionary with "name" and "episodes".
+            columnar (bool): Keep the episodes in columnar storage.
+            trusted (bool): The dictionary was written by the persistence
+                layer; see PodcastEpisode.from_dict.
+
+        Returns:
+            PodcastEpisodeList: The episode list.
+
+        Raises:
+            ValueError: If a mandatory key is missing or an episode is invalid.
+        """
         mandatory_keys = ['name', 'episodes']
         for key in mandatory_keys:
             if key not in data:
@@ -128,29 +799,22 @@ class PodcastEpisodeList:
         episodes = []
         for episode_data in episodes_data:
             try:
-                episode = PodcastEpisode(
-                    title=episode_data.get("title"),
-                    audio_url=episode_data.get("audio_url"),
-                    description=episode_data.get("description"),
-                    pub_date=episode_data.get("pub_date"),
-                    duration=episode_data.get("duration"),
-                    episode_number=episode_data.get("episode_number"),
-                    image_url=episode_data.get("image_url"),
-                )
-                episodes.append(episode)
-            except TypeError as e:
+                episodes.append(PodcastEpisode.from_dict(episode_data, trusted=trusted))
+            except (TypeError, AttributeError) as e:
                 raise ValueError(f"Invalid episode data: {e}")
             
-        podcastepisodelist = PodcastEpisodeList(name=name, episodes=episodes)
+        podcastepisodelist = PodcastEpisodeList(name=name, episodes=episodes, columnar=columnar)
         return podcastepisodelist
 
     def to_dict(self) -> Dict:
         podcastepisodelist_dict = {
             "name": self.name,
-            "episodes": [episode.to_dict() for episode in self.episodes]
+            "episodes": self.get_episode_dicts()
         }
         return podcastepisodelist_dict
 
     def retrieve_episodes_from_rss(self, rss_feed_url: str) -> None:
         episodes = RSSPodcastParser.get_episodes(rss_feed_url)
         self.episodes.extend(episodes)
+        self._invalidate_index()
+        self._revision += 1
@@ -1,5 +1,7 @@
+from contextlib import nullcontext
 from dataclasses import dataclass
 from typing import List, Dict
+from zpodcast.core.episode import PodcastEpisode
 from zpodcast.core.playlist import PodcastEpisodeList
 
 
@@ -7,6 +9,7 @@ from zpodcast.core.playlist import PodcastEpisodeList
 class PodcastPlaylist:
     _playlists: List[PodcastEpisodeList]
     _instance = None
+    _journal = None
 
     def __init__(self, playlists):
         self.playlists = playlists
@@ -31,11 +34,73 @@ class PodcastPlaylist:
             
         self._playlists = playlists
 
+    def attach_journal(self, journal) -> None:
+        """
+        Record every change made through the playlists' methods in a journal.
+
+        Args:
+            journal (PodcastJournal): The change journal, None to stop
+                recording.
+        """
+        self._journal = journal
+
+    def _journaled(self, op: str, **fields):
+        if self._journal is None:
+            return nullcontext({})
+        return self._journal.transaction(op, **fields)
+
     def add_playlist(self, playlist: PodcastEpisodeList) -> None:
-        self.playlists.append(playlist)
+        with self._journaled("add_playlist") as record:
+            self.playlists.append(playlist)
+            record["playlist"] = playlist.to_dict()
 
     def remove_playlist(self, index: int) -> None:
-        del self.playlists[index]
+        with self._journaled("remove_playlist", index=index):
+            del self.playlists[index]
+
+    def rename_playlist(self, index: int, name: str) -> None:
+        """
+        Rename a playlist.
+
+        Args:
+            index (int): The position of the playlist.
+            name (str): The new name.
+
+        Raises:
+            IndexError: If there is no playlist at index.
+            ValueError: If the name is invalid.
+        """
+        with self._journaled("rename_playlist", index=index, name=name):
+            self.playlists[index].name = name
+
+    def add_playlist_episode(self, index: int, episode: PodcastEpisode) -> None:
+        """
+        Append an episode to a playlist.
+
+        Args:
+            index (int): The position of the playlist.
+            episode (PodcastEpisode): The episode to add.
+
+        Raises:
+            IndexError: If there is no playlist at index.
+        """
+        with self._journaled("add_playlist_episode", index=index) as record:
+            self.playlists[index].add_podcastepisode(episode)
+            record["episode"] = episode.to_dict()
+
+    def remove_playlist_episode(self, index: int, episode_index: int) -> None:
+        """
+        Remove an episode from a playlist.
+
+        Args:
+            index (int): The position of the playlist.
+            episode_index (int): The position of the episode in the playlist.
+
+        Raises:
+            IndexError: If there is no such playlist or episode.
+        """
+        with self._journaled("remove_playlist_episode", index=index, episode_index=episode_index):
+            self.playlists[index].remove_podcastepisode(episode_index)
 
     def get_playlist(self, index: int) -> PodcastEpisodeList:
         return self.playlists[index]
@@ -49,7 +114,18 @@ class PodcastPlaylist:
         }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, List[Dict]]) -> 'PodcastPlaylist':
+    def from_dict(cls, data: Dict[str, List[Dict]], trusted: bool = False) -> 'PodcastPlaylist':
+        """
+        Create the playlists from their dictionary representation.
+
+        Args:
+            data (Dict[str, List[Dict]]): Dictionary with a "playlists" list.
+            trusted (bool): The dictionary was written by the persistence
+                layer; see PodcastEpisode.from_dict.
+
+        Returns:
+            PodcastPlaylist: The playlists.
+        """
         playlists_data = data.get("playlists", [])
-        playlists = [PodcastEpisodeList.from_dict(playlist_data) for playlist_data in playlists_data]
+        playlists = [PodcastEpisodeList.from_dict(playlist_data, trusted=trusted) for playlist_data in playlists_data]
         return cls(playlists=playlists)
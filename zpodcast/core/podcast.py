@@ -1,8 +1,17 @@
 from dataclasses import dataclass
-import validators
-from typing import Optional, List, Dict
+from datetime import date
+from typing import Optional, List, Dict, Iterable, Tuple
+from zpodcast.core.columns import pub_date_key
+from zpodcast.core.episode import PodcastEpisode
 from zpodcast.core.playlist import PodcastEpisodeList
-from zpodcast.parsers.rss import RSSPodcastParser
+from zpodcast.parsers.rss import RSSPodcastParser, ParsedFeed
+from zpodcast.utils.ids import make_episode_id, make_podcast_id
+from zpodcast.utils.urls import is_url
+
+
+# Fields available in the podcast summary projection
+SUMMARY_FIELDS = ('id', 'title', 'podcast_url', 'host', 'podcast_priority', 'image_url',
+                  'description', 'name_set_manually', 'episode_count', 'latest_episode_date')
 
 
 @dataclass
@@ -19,6 +28,11 @@ class PodcastData:
     _image_url: Optional[str]
     _episodelists: Optional[List[PodcastEpisodeList]]
     _name_set_manually: bool
+    # modification counter behind the revision property
+    _revision = 0
+    # bumped whenever any podcast's URL, and so its id, changes; lets
+    # PodcastList tell whether its id index may be stale
+    _id_generation = 0
 
     def __init__(self, title: str,
                  podcast_url: str,
@@ -27,7 +41,8 @@ class PodcastData:
                  episodelists: List[PodcastEpisodeList] = None,
                  podcast_priority: int = None,
                  image_url: str = None,
-                 name_set_manually: bool = False):
+                 name_set_manually: bool = False,
+                 fetch: bool = True):
         """
         Initializes a new instance of the PodcastData class.
 
@@ -39,6 +54,10 @@ class PodcastData:
             podcast_priority (int): The priority of the podcast.
             image_url (str): The image URL of the podcast.
             name_set_manually (bool): Indicates if the name was set manually.
+            fetch (bool): Fetch the feed during construction. When False the
+                object is only hydrated from the given values, no network
+                access happens and the podcast is marked as pending a
+                refresh (see refresh_pending).
         """
 
         self.title = title
@@ -49,7 +68,9 @@ class PodcastData:
         self.podcast_priority = podcast_priority
         self.image_url = image_url
         self.name_set_manually = name_set_manually
-        self.populate_episodes_from_feed()
+        self._refresh_pending = True
+        if fetch:
+            self.populate_episodes_from_feed()
 
     """
     getter setter for Title variable
@@ -72,6 +93,7 @@ class PodcastData:
         Args:
             value (str): The title to set for the podcast.
         """
+        self._revision += 1
         if value is None or not isinstance(value, str):
             raise ValueError("Invalid title")
         
@@ -101,13 +123,33 @@ class PodcastData:
         Raises:
             ValueError: If the podcast URL is invalid.
         """
+        self._revision += 1
         if value is not None:
-            if not validators.url(value):
+            if not is_url(value):
                 raise ValueError("Invalid podcast URL")
         else:
             raise ValueError("Invalid podcast URL")
         
+        if getattr(self, '_podcast_url', value) != value:
+            PodcastData._id_generation += 1
+            # nothing has been fetched from the new feed yet
+            self._refresh_pending = True
         self._podcast_url = value
+        self._id = make_podcast_id(value)
+
+    @property
+    def id(self) -> str:
+        """
+        Gets the stable identifier of the podcast.
+
+        It is derived from the podcast URL, so unlike the podcast's position
+        in the PodcastList it does not change when other podcasts are added
+        or deleted.
+
+        Returns:
+            str: The identifier, see make_podcast_id.
+        """
+        return self._id
 
     @property
     def episodelists(self):
@@ -127,6 +169,7 @@ class PodcastData:
         Args:
             value: List of episode lists to set.
         """
+        self._revision += 1
         self._episodelists = []
         if isinstance(value, list):
             for item in value:
@@ -156,6 +199,7 @@ class PodcastData:
         Args:
             value (str): The host to set for the podcast.
         """
+        self._revision += 1
         if value is not None:
             if isinstance(value, str):
                 self._host = value
@@ -187,6 +231,7 @@ class PodcastData:
         Args:
             value (str): The description to set for the podcast.
         """
+        self._revision += 1
         if value is not None:
             if not isinstance(value, str):
                 value = ""
@@ -219,6 +264,7 @@ class PodcastData:
         Raises:
             ValueError: If the priority value is not an integer or is out of range.
         """
+        self._revision += 1
         self._podcast_priority = self._clamp_priority(value)
 
     def _clamp_priority(self, value: int) -> int:
@@ -254,6 +300,7 @@ class PodcastData:
         Raises:
             ValueError: If the image URL is invalid.
         """
+        self._revision += 1
         self._image_url = value
 
     @property
@@ -274,33 +321,107 @@ class PodcastData:
         Args:
             value (bool): The value to set.
         """
+        self._revision += 1
         if not isinstance(value, bool):
             raise ValueError("Invalid value for name_set_manually")
         self._name_set_manually = value
  
-    def populate_episodes_from_feed(self) -> None:
+    @property
+    def refresh_pending(self) -> bool:
+        """
+        Whether the podcast has not been refreshed from its feed yet.
+
+        Podcasts hydrated from persisted data (fetch=False) start out
+        pending so a scheduler can refresh them later, outside of start up.
+
+        Returns:
+            bool: True until populate_episodes_from_feed has completed.
+        """
+        return self._refresh_pending
+
+    def populate_episodes_from_feed(self, conditional: Optional[bool] = None,
+                                    timeout: Optional[float] = None) -> ParsedFeed:
         """
         Retrieve episodes from the podcast feed and update podcast metadata.
+
+        The feed is fetched and parsed a single time; the episodes and the
+        channel metadata both come from that one parse.
+
+        Once the podcast holds episodes the feed is requested conditionally
+        with the ETag / Last-Modified validators recorded on the previous
+        fetch. If the server answers 304 Not Modified the existing episode
+        lists and metadata are left untouched.
+
+        Feed entries are merged into the podcast's episode list by GUID
+        (falling back to the audio URL) rather than replacing it, so
+        existing PodcastEpisode objects, their positions and any playlist
+        references to them survive a refresh. The diff is available as
+        merge_result on the returned ParsedFeed.
+
+        Args:
+            conditional (Optional[bool]): Whether to send the stored
+                validators. None (the default) sends them only when the
+                podcast already holds episode lists.
+            timeout (Optional[float]): Socket timeout in seconds for the
+                feed request. None uses the global socket default.
+
+        Returns:
+            ParsedFeed: The result of the feed fetch, which tells whether
+                the feed was updated, unchanged (not_modified) or failed
+                (error).
         """
-        # retrieve the list of episodes from the podcast URL
-        episodes = RSSPodcastParser.get_episodes(self.podcast_url)
+        if conditional is None:
+            # only ask for a conditional fetch when there is something to keep on a 304
+            conditional = bool(self.episodelists)
+
+        parsed = RSSPodcastParser.parse_feed(self.podcast_url, conditional=conditional, timeout=timeout)
+        return self.apply_feed(parsed)
+
+    def apply_feed(self, parsed: ParsedFeed) -> ParsedFeed:
+        """
+        Update the podcast from a feed that was already fetched and parsed.
+
+        This is the merge half of populate_episodes_from_feed, for feeds
+        fetched in bulk by RSSPodcastParser.parse_feeds. A feed that is
+        unchanged (not_modified) leaves the podcast untouched, and so does
+        a feed that failed (error), which also keeps the podcast pending
+        refresh.
+
+        Args:
+            parsed (ParsedFeed): The result of parsing the podcast's feed.
+
+        Returns:
+            ParsedFeed: The same result, with merge_result set when the
+                entries were merged.
+        """
+        if parsed.error is not None:
+            # a failed fetch says nothing about the feed, keep what we have
+            return parsed
+        self._refresh_pending = False
+        if parsed.not_modified:
+            # feed unchanged since the last fetch - nothing to do
+            return parsed
         
         # prepare updating the episode name to match the podcast's title with the suffix "episode list"
         episode_list_name = f"{self.title} episode list"
         
-        # create a podcast episode list that can then be used to determine which of the episodes are new.
-        new_episode_list = PodcastEpisodeList(name=episode_list_name, episodes=episodes)
-        
-        # determine which episodes are new and append the new episodes to the existing list of episodes for this podcast.
-        self.episodelists = [new_episode_list]
+        if self.episodelists:
+            episode_list = self.episodelists[0]
+            episode_list.name = episode_list_name
+        else:
+            episode_list = PodcastEpisodeList(name=episode_list_name, episodes=[])
+            self.episodelists = [episode_list]
+
+        # only new or changed entries touch the existing episodes
+        parsed.merge_result = episode_list.merge_entries(parsed.entries)
         
         self.name_set_manually = False
         
-        # Update podcast metadata
-        feed = RSSPodcastParser.get_rss_metadata(self.podcast_url)
-        self.host = feed.get('author')
-        self.description = feed.get('description')
-        # self.image_url = feed.get('image')
+        # Update podcast metadata from the same parse
+        self.host = parsed.metadata.get('author')
+        self.description = parsed.metadata.get('description')
+        # self.image_url = parsed.metadata.get('image')
+        return parsed
  
     def to_dict(self) -> Dict:
         """
@@ -321,13 +442,100 @@ class PodcastData:
         }
         return podcastdata_dict
 
+    @property
+    def revision(self) -> Tuple:
+        """
+        Get a value that changes whenever the podcast is modified.
+
+        It combines a counter bumped by every setter of the podcast with the
+        revisions of its episode lists, so serializers can tell whether a
+        podcast has to be encoded again.
+
+        Returns:
+            Tuple: The podcast counter followed by the list revisions.
+        """
+        return (self._revision,) + tuple(episodelist.revision for episodelist in self.episodelists)
+
+    def mark_dirty(self) -> None:
+        """Record a change made to the podcast's data directly."""
+        self._revision += 1
+
+    @property
+    def episode_count(self) -> int:
+        """
+        Get the number of episodes across the podcast's episode lists.
+
+        Returns:
+            int: The number of episodes.
+        """
+        return sum(episodelist.get_num_items() for episodelist in self.episodelists)
+
+    @property
+    def latest_episode_date(self) -> Optional[date]:
+        """
+        Get the publication date of the most recent episode.
+
+        Returns:
+            Optional[date]: The latest publication date, None when the
+                podcast has no dated episodes.
+        """
+        pub_dates = [episodelist.latest_pub_date() for episodelist in self.episodelists]
+        pub_dates = [pub_date for pub_date in pub_dates if pub_date is not None]
+        if not pub_dates:
+            return None
+        return max(pub_dates, key=pub_date_key)
+
+    def to_summary_dict(self, fields: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Convert the podcast to its summary projection.
+
+        The summary carries the podcast-level fields plus the episode count
+        and latest episode date, without serializing any episode, so its
+        size does not grow with the back catalogue.
+
+        Args:
+            fields (Optional[Iterable[str]]): Sparse fieldset; only these
+                summary fields are included. None includes all of them.
+
+        Returns:
+            Dict: Dictionary with the selected summary fields
+
+        Raises:
+            ValueError: If a requested field is not a summary field.
+        """
+        if fields is None:
+            fields = SUMMARY_FIELDS
+        else:
+            fields = list(fields)
+            unknown = [name for name in fields if name not in SUMMARY_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown summary fields: {', '.join(unknown)}")
+
+        summary = {}
+        for name in fields:
+            value = getattr(self, name)
+            if name == 'latest_episode_date' and value is not None:
+                value = value.isoformat()
+            summary[name] = value
+        return summary
+
     @classmethod
-    def from_dict(cls, data: Dict):
+    def from_dict(cls, data: Dict, fetch: bool = False, trusted: bool = False):
         """
         Create a PodcastData object from a dictionary.
+
+        By default this is a hydrate-only path: the episode lists stored in
+        the dictionary are kept and no network access happens, so loading a
+        persisted library is pure local I/O. The returned podcast is marked
+        refresh_pending so the feed can be refreshed later.
         
         Args:
             data (Dict): Dictionary containing podcast data
+            fetch (bool): Fetch the feed immediately, replacing the stored
+                episodes with the current feed contents.
+            trusted (bool): The dictionary was written by the persistence
+                layer; episodes are hydrated without validating their URLs
+                again (see PodcastEpisode.from_dict).
             
         Returns:
             PodcastData: A new podcast data object
@@ -340,8 +548,10 @@ class PodcastData:
             description=data.get("description"),
             podcast_priority=data.get("podcast_priority"),
             image_url=data.get("image_url"),
-            episodelists=[PodcastEpisodeList.from_dict(playlist_data) for playlist_data in episodelists],
-            name_set_manually=data.get("name_set_manually", False)
+            episodelists=[PodcastEpisodeList.from_dict(playlist_data, trusted=trusted)
+                          for playlist_data in episodelists],
+            name_set_manually=data.get("name_set_manually", False),
+            fetch=fetch
         )
         return podcastdata
 
@@ -359,20 +569,94 @@ class PodcastData:
             return None
 
         try:
-            return self.episodelists[0].episodes[episode_id]
+            return self.episodelists[0].get_episode(episode_id)
         except (IndexError, ValueError):
             return None
 
-    def get_episodes(self):
+    def find_episode(self, episode_id: str) -> Optional[PodcastEpisode]:
         """
-        Get all episodes from the first episode list.
+        Retrieve an episode by its stable identifier.
+
+        Args:
+            episode_id (str): The identifier, see PodcastEpisode.id.
 
         Returns:
-            dict: A dictionary with an 'episodes' key containing a list of episode dictionaries.
+            Optional[PodcastEpisode]: The episode if found, otherwise None.
         """
-        if not self.episodelists:
-            return {"episodes": []}
-        
+        index = self.find_episode_index(episode_id)
+        return None if index is None else self.episodelists[0].get_episode(index)
+
+    def find_episode_index(self, episode_id: str) -> Optional[int]:
+        """
+        Get the position of an episode from its stable identifier.
+
+        Args:
+            episode_id (str): The identifier, see PodcastEpisode.id.
+
+        Returns:
+            Optional[int]: The position accepted by get_episode, None when
+                no episode has that identifier.
+        """
+        if not self.episodelists or not isinstance(episode_id, str):
+            return None
+        return self.episodelists[0].find_episode_index(episode_id)
+
+    def get_episodes(self, offset: int = 0, limit: Optional[int] = None,
+                     indices: Optional[List[int]] = None) -> Dict:
+        """
+        Get a window of episodes from the first episode list.
+
+        Only the episodes inside the window are serialized, so the cost of
+        a page is proportional to its size rather than to the size of the
+        back catalogue. Episodes keep their positions across feed refreshes
+        (new episodes are appended), so the offset of an episode is stable
+        and doubles as the pagination cursor.
+
+        Args:
+            offset (int): Position of the first episode to return.
+            limit (Optional[int]): Maximum number of episodes to return.
+                None returns every episode from offset onwards.
+            indices (Optional[List[int]]): Positions of the episodes to page
+                through, in this order, for example a filtered and sorted
+                selection from zpodcast.core.sorting. offset and limit then
+                apply to this selection. None pages through every episode
+                in list order.
+
+        Returns:
+            dict: A dictionary with an 'episodes' key containing the list of
+                episode dictionaries in the window, each with the episode's
+                stable 'id' added, 'total' (the number of episodes in the
+                list or selection), 'offset', 'limit' and 'next_cursor' (the
+                cursor of the following page, None on the last page).
+
+        Raises:
+            ValueError: If offset is negative or limit is not positive.
+        """
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError("offset must be a non-negative integer")
+        if limit is not None and (not isinstance(limit, int) or limit < 1):
+            raise ValueError("limit must be a positive integer")
+
+        episodelist = self.episodelists[0] if self.episodelists else None
+        if indices is not None:
+            total = len(indices)
+        else:
+            total = episodelist.get_num_items() if episodelist else 0
+        end = total if limit is None else min(offset + limit, total)
+
+        if not episodelist:
+            episodes = []
+        elif indices is not None:
+            episodes = [episodelist.get_episode_dicts(index, index + 1)[0] for index in indices[offset:end]]
+        else:
+            episodes = episodelist.get_episode_dicts(offset, end)
+        for episode in episodes:
+            episode["id"] = make_episode_id(episode["guid"], episode["audio_url"])
+
         return {
-            "episodes": [episode.to_dict() for episode in self.episodelists[0].episodes]
+            "episodes": episodes,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "next_cursor": str(end) if end < total else None
         }
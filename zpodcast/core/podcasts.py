@@ -1,12 +1,25 @@
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Optional, Iterable
 from zpodcast.core.podcast import PodcastData
+from zpodcast.core.refresh import (FeedRefresher, RefreshReport, DEFAULT_MAX_WORKERS,
+                                   DEFAULT_PER_HOST_LIMIT, DEFAULT_FEED_TIMEOUT)
+from zpodcast.parsers.rss import FeedValidatorStore, RSSPodcastParser
+from zpodcast.utils.urls import is_url
+
+
+# Podcast fields with cached sort keys, see PodcastList.sort_keys
+SORT_KEY_FIELDS = ('title', 'author')
+
+# Podcast fields update_podcast sets from its data as they are
+UPDATABLE_FIELDS = ('title', 'host', 'description', 'podcast_priority', 'image_url')
 
 
 @dataclass
 class PodcastList:
     _podcasts: List[PodcastData]
     _instance = None
+    _journal = None
 
     def __init__(self, podcasts: List[PodcastData] = None) -> None:
         if podcasts is None:
@@ -15,6 +28,9 @@ class PodcastList:
             raise ValueError("Value must be a list")
 
         self._podcasts = podcasts
+        self._positions = None
+        self._sort_keys = {}
+        self._sort_keys_stamp = None
 
     @classmethod
     def get_instance(cls) -> 'PodcastList':
@@ -31,13 +47,105 @@ class PodcastList:
         if not isinstance(podcasts, list):
             raise ValueError("Value must be a list")
         self._podcasts = podcasts
+        self._positions = None
+
+    def attach_journal(self, journal) -> None:
+        """
+        Record every change made through the list's methods in a journal.
+
+        Args:
+            journal (PodcastJournal): The change journal, None to stop
+                recording.
+        """
+        self._journal = journal
+
+    def _journaled(self, op: str, **fields):
+        """
+        Wrap a change so that it is recorded in the attached journal.
+
+        The returned context manager yields the record, which the change
+        may complete; nothing is recorded if the change raises.
+        """
+        if self._journal is None:
+            return nullcontext({})
+        return self._journal.transaction(op, **fields)
+
+    """
+    Stable podcast identifier index
+    """
+    def _positions_stale(self) -> bool:
+        """Whether the index is missing, or the list was resized or a podcast URL changed since it was built."""
+        if self._positions is None:
+            return True
+        return self._positions_count != len(self._podcasts) or self._positions_generation != PodcastData._id_generation
+
+    def _has_id_at(self, position: int, podcast_id: str) -> bool:
+        return position < len(self._podcasts) and self._podcasts[position].id == podcast_id
+
+    def _build_positions(self) -> Dict[str, int]:
+        positions = {}
+        for position, podcast in enumerate(self._podcasts):
+            positions.setdefault(podcast.id, position)
+        self._positions = positions
+        self._positions_count = len(self._podcasts)
+        self._positions_generation = PodcastData._id_generation
+        return positions
+
+    def find_podcast_index(self, podcast_id: str) -> Optional[int]:
+        """
+        Find the position of a podcast by its stable identifier.
+
+        The identifier index is built on first use and kept up to date by
+        the list's methods. It is rebuilt when the list was resized directly
+        or any podcast URL changed, and a hit is checked against the podcast
+        it points to, so podcasts moved directly trigger a rebuild instead
+        of a wrong answer.
+
+        Args:
+            podcast_id (str): The identifier, see PodcastData.id.
+
+        Returns:
+            Optional[int]: The position accepted by get_podcast, None when no
+                podcast has that identifier.
+        """
+        positions = self._positions
+        if self._positions_stale():
+            positions = self._build_positions()
+        position = positions.get(podcast_id)
+        if position is not None and not self._has_id_at(position, podcast_id):
+            position = self._build_positions().get(podcast_id)
+        return position
+
+    def find_podcast(self, podcast_id: str) -> Optional[PodcastData]:
+        """
+        Retrieve a podcast by its stable identifier.
+
+        Args:
+            podcast_id (str): The identifier, see PodcastData.id.
+
+        Returns:
+            Optional[PodcastData]: The podcast if found, otherwise None.
+        """
+        position = self.find_podcast_index(podcast_id)
+        return None if position is None else self._podcasts[position]
 
     def add_podcast(self, podcast: PodcastData) -> PodcastData:
-        self._podcasts.append(podcast)
+        with self._journaled("add_podcast") as record:
+            self._podcasts.append(podcast)
+            record["podcast"] = podcast.to_dict()
+        if self._positions is not None:
+            self._positions.setdefault(podcast.id, len(self._podcasts) - 1)
+            self._positions_count += 1
         return podcast
 
     def remove_podcast(self, podcast: PodcastData) -> None:
-        self._podcasts.remove(podcast)
+        index = self.find_podcast_index(podcast.id)
+        if index is None or self._podcasts[index] is not podcast:
+            # another podcast with the same feed URL
+            index = self._podcasts.index(podcast)
+        with self._journaled("delete_podcast", index=index):
+            del self._podcasts[index]
+        self._positions = None
 
     def get_podcast(self, index: int) -> PodcastData:
         if not isinstance(index, int):
@@ -59,7 +167,9 @@ class PodcastList:
         if index < 0 or index >= len(self._podcasts):
             raise ValueError("Index out of range")
 
-        del self._podcasts[index]
+        with self._journaled("delete_podcast", index=index):
+            del self._podcasts[index]
+        self._positions = None
 
     def update_podcast(self, index: Union[int, str], data: Dict[str, Any]) -> PodcastData:
         """
@@ -73,7 +183,8 @@ class PodcastList:
             PodcastData: The updated podcast
             
         Raises:
-            ValueError: If index is invalid or podcast is not found
+            ValueError: If index is invalid, podcast is not found or the
+                new podcast_url is not a valid URL
         """
         # Convert string index to int if needed
         if isinstance(index, str):
@@ -91,35 +202,205 @@ class PodcastList:
         
         # Check if podcast_url is being updated
         url_update = 'podcast_url' in data and data['podcast_url'] != podcast.podcast_url
-        
-        # Update allowed attributes
-        if 'title' in data:
-            podcast.title = data['title']
-        if 'host' in data:
-            podcast.host = data['host']
-        if 'description' in data:
-            podcast.description = data['description']
-        if 'podcast_priority' in data:
-            podcast.podcast_priority = data['podcast_priority']
-        if 'image_url' in data:
-            podcast.image_url = data['image_url']
+        parsed = None
         if url_update:
-            # Only update URL and re-populate if it's actually changed
-            podcast.podcast_url = data['podcast_url']
-            # Prevent automatic population by setting name_set_manually
-            podcast.name_set_manually = True
-            # Manually trigger episode refresh
-            podcast.populate_episodes_from_feed()
-            
+            # feedparser also reads local paths, so nothing is fetched
+            # until the value is known to be a URL
+            if not is_url(data['podcast_url']):
+                raise ValueError("Invalid podcast URL")
+            # fetched before the change is journaled, so other changes are
+            # not held up by the request; a single parse of the new feed
+            # supplies both episodes and metadata, and it is never
+            # conditional as a 304 would keep the old feed's episodes
+            parsed = RSSPodcastParser.parse_feed(data['podcast_url'], conditional=False)
+
+        fields = {field: data[field] for field in UPDATABLE_FIELDS if field in data}
+        with self._journaled("update_podcast", index=index) as record:
+            # Update allowed attributes
+            for field, value in fields.items():
+                setattr(podcast, field, value)
+            if url_update:
+                # Only update URL and re-populate if it's actually changed
+                podcast.podcast_url = data['podcast_url']
+                # Prevent automatic population by setting name_set_manually
+                podcast.name_set_manually = True
+                # the old feed's episodes must never be merged with the new
+                # ones, so they go even when the new feed cannot be fetched;
+                # the podcast then stays pending until a refresh succeeds
+                podcast.episodelists = []
+                podcast.apply_feed(parsed)
+                # the journal stores the whole podcast, so replaying the
+                # change never has to fetch the new feed again
+                record["podcast"] = podcast.to_dict()
+            else:
+                record["fields"] = fields
+
         return podcast
 
+    def replace_podcast(self, index: int, podcast: PodcastData) -> None:
+        """
+        Replace the podcast at a position.
+
+        Args:
+            index (int): The position of the podcast to replace
+            podcast (PodcastData): The new podcast
+
+        Raises:
+            ValueError: If index is out of range
+        """
+        if not isinstance(index, int) or index < 0 or index >= len(self._podcasts):
+            raise ValueError("Index out of range")
+
+        with self._journaled("update_podcast", index=index) as record:
+            self._podcasts[index] = podcast
+            record["podcast"] = podcast.to_dict()
+        self._positions = None
+
+    def sort_keys(self, key: str) -> List[str]:
+        """
+        Get the precomputed sort key of every podcast for a field.
+
+        The keys are the casefolded titles or authors (hosts), computed once
+        and cached until a podcast is added, removed, replaced or modified.
+
+        Args:
+            key (str): One of SORT_KEY_FIELDS.
+
+        Returns:
+            List[str]: The sort keys, in list order. The list is shared with
+                the cache and must not be modified.
+
+        Raises:
+            ValueError: If key is not in SORT_KEY_FIELDS.
+        """
+        if key not in SORT_KEY_FIELDS:
+            raise ValueError(f"Cannot sort podcasts by {key}")
+        stamp = [(id(podcast), podcast.revision) for podcast in self._podcasts]
+        if self._sort_keys_stamp != stamp:
+            self._sort_keys = {}
+            self._sort_keys_stamp = stamp
+        keys = self._sort_keys.get(key)
+        if keys is None:
+            attribute = 'host' if key == 'author' else key
+            keys = self._sort_keys[key] = [(getattr(podcast, attribute) or "").casefold()
+                                           for podcast in self._podcasts]
+        return keys
+
+    def get_pending_refresh(self) -> List[PodcastData]:
+        """
+        Get the podcasts that have not been refreshed from their feed yet.
+
+        Returns:
+            List[PodcastData]: Podcasts whose refresh_pending flag is set.
+        """
+        return [podcast for podcast in self._podcasts if podcast.refresh_pending]
+
+    def refresh_podcasts(self, pending_only: bool = False) -> List[PodcastData]:
+        """
+        Refresh podcasts from their feeds, one after another.
+
+        This is the explicit, deferred counterpart of the hydrate-only
+        from_dict path: loading the library does no network access and the
+        caller decides when the feeds are fetched.
+
+        Args:
+            pending_only (bool): Only refresh podcasts that have never been
+                refreshed since they were loaded.
+
+        Returns:
+            List[PodcastData]: The podcasts that were refreshed.
+        """
+        podcasts = self.get_pending_refresh() if pending_only else list(self._podcasts)
+        for podcast in podcasts:
+            podcast.populate_episodes_from_feed()
+        FeedValidatorStore.get_instance().flush()
+        return podcasts
+
+    def refresh_all(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                    timeout: Optional[float] = DEFAULT_FEED_TIMEOUT,
+                    pending_only: bool = False, pipelined: bool = False) -> RefreshReport:
+        """
+        Refresh podcasts from their feeds concurrently.
+
+        Feeds are fetched on a bounded thread pool with a per-host
+        concurrency limit and a per-feed socket timeout, so the total time
+        is close to the latency of the slowest feeds rather than the sum of
+        every feed's latency.
+
+        Args:
+            max_workers (int): Maximum number of feeds fetched at once.
+            per_host_limit (int): Maximum concurrent requests to one host.
+            timeout (Optional[float]): Socket timeout in seconds per feed.
+            pending_only (bool): Only refresh podcasts that have never been
+                refreshed since they were loaded.
+            pipelined (bool): Fetch the feeds with the asyncio feed pipeline
+                (FeedRefresher.refresh_pipelined) instead of the thread
+                pool; max_workers then sets the number of parse threads.
+
+        Returns:
+            RefreshReport: Per-feed status (updated / unchanged / failed)
+                and timings.
+
+        Example:
+            >>> report = PodcastList.get_instance().refresh_all(max_workers=16)
+            >>> for result in report.failed:
+            >>>     print(result.podcast_url, result.error)
+        """
+        podcasts = self.get_pending_refresh() if pending_only else list(self._podcasts)
+        refresher = FeedRefresher(max_workers=max_workers, per_host_limit=per_host_limit, timeout=timeout)
+        report = refresher.refresh_pipelined(podcasts) if pipelined else refresher.refresh(podcasts)
+        FeedValidatorStore.get_instance().flush()
+        return report
+
     def to_dict(self):
         return {
             "podcasts": [podcast.to_dict() for podcast in self._podcasts]
         }
 
+    def to_summary_dict(self, fields: Optional[Iterable[str]] = None,
+                        indices: Optional[List[int]] = None) -> Dict:
+        """
+        Convert the podcast list to the podcast summary projection.
+
+        Args:
+            fields (Optional[Iterable[str]]): Sparse fieldset passed on to
+                PodcastData.to_summary_dict. None includes every field.
+            indices (Optional[List[int]]): Positions of the podcasts to
+                include, in this order (see zpodcast.core.sorting). None
+                includes every podcast in list order.
+
+        Returns:
+            Dict: Dictionary with a "podcasts" list of podcast summaries
+
+        Raises:
+            ValueError: If a requested field is not a summary field.
+        """
+        if fields is not None:
+            fields = list(fields)
+        podcasts = self._podcasts if indices is None else [self._podcasts[index] for index in indices]
+        return {
+            "podcasts": [podcast.to_summary_dict(fields) for podcast in podcasts]
+        }
+
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, fetch: bool = False, trusted: bool = False):
+        """
+        Create a PodcastList from a dictionary.
+
+        Podcasts are hydrated from the stored data without fetching their
+        feeds unless fetch is True; use refresh_podcasts to refresh them
+        later.
+
+        Args:
+            data (Dict): Dictionary containing a "podcasts" list
+            fetch (bool): Fetch every feed while loading.
+            trusted (bool): The dictionary was written by the persistence
+                layer; see PodcastData.from_dict.
+
+        Returns:
+            PodcastList: A new podcast list
+        """
         podcasts_data = data.get("podcasts", [])
-        podcasts = [PodcastData.from_dict(podcast_data) for podcast_data in podcasts_data]
+        podcasts = [PodcastData.from_dict(podcast_data, fetch=fetch, trusted=trusted) for podcast_data in podcasts_data]
         return cls(podcasts=podcasts)
@@ -0,0 +1,271 @@
+"""
+Bulk Feed Refresh Module
+
+This module refreshes many podcast feeds concurrently. Feeds are fetched
+on a bounded thread pool, with a limit on how many requests may be in
+flight against the same host at once and a socket timeout applied to
+every feed. Each refresh produces a FeedRefreshResult so callers can see
+which feeds were updated, unchanged or failed and how long each took.
+
+refresh_pipelined does the same work on the asyncio FeedPipeline instead
+of a thread pool, for libraries too large for one thread per feed.
+
+Classes:
+    FeedRefreshResult: Outcome and timing of refreshing a single feed
+    RefreshReport: The per-feed results of a bulk refresh
+    FeedRefresher: The concurrent refresh engine
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Deque, Tuple
+from urllib.parse import urlparse
+import logging
+import time
+
+from zpodcast.core.podcast import PodcastData
+from zpodcast.parsers.rss import ParsedFeed, RSSPodcastParser
+
+
+# Refresh outcomes reported for each feed
+REFRESH_UPDATED = "updated"
+REFRESH_UNCHANGED = "unchanged"
+REFRESH_FAILED = "failed"
+
+# Default number of feeds fetched at the same time
+DEFAULT_MAX_WORKERS = 8
+
+# Default number of concurrent requests sent to a single host
+DEFAULT_PER_HOST_LIMIT = 2
+
+# Default socket timeout for a single feed request in seconds
+DEFAULT_FEED_TIMEOUT = 30
+
+# Default number of feed requests in flight at once in refresh_pipelined
+DEFAULT_FETCH_CONCURRENCY = 64
+
+
+@dataclass
+class FeedRefreshResult:
+    """
+    The outcome of refreshing a single podcast feed.
+
+    Attributes:
+        podcast_url (str): The URL of the feed that was refreshed
+        status (str): One of "updated", "unchanged" or "failed"; a feed is
+            unchanged when the server answered 304 or no episode was added
+            or modified by the merge
+        elapsed (float): Wall clock time spent on the feed in seconds
+        error (Optional[str]): Description of the failure, None otherwise
+    """
+
+    podcast_url: str
+    status: str
+    elapsed: float
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "podcast_url": self.podcast_url,
+            "status": self.status,
+            "elapsed": self.elapsed,
+            "error": self.error
+        }
+
+
+@dataclass
+class RefreshReport:
+    """
+    The per-feed results of a bulk refresh.
+
+    Results are kept in the same order as the podcasts that were passed to
+    the refresh.
+
+    Attributes:
+        results (List[FeedRefreshResult]): One result per refreshed feed
+        elapsed (float): Wall clock time of the whole refresh in seconds
+    """
+
+    results: List[FeedRefreshResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def _with_status(self, status: str) -> List[FeedRefreshResult]:
+        return [result for result in self.results if result.status == status]
+
+    @property
+    def updated(self) -> List[FeedRefreshResult]:
+        return self._with_status(REFRESH_UPDATED)
+
+    @property
+    def unchanged(self) -> List[FeedRefreshResult]:
+        return self._with_status(REFRESH_UNCHANGED)
+
+    @property
+    def failed(self) -> List[FeedRefreshResult]:
+        return self._with_status(REFRESH_FAILED)
+
+    def to_dict(self) -> Dict:
+        return {
+            "elapsed": self.elapsed,
+            "updated": len(self.updated),
+            "unchanged": len(self.unchanged),
+            "failed": len(self.failed),
+            "results": [result.to_dict() for result in self.results]
+        }
+
+
+class FeedRefresher:
+    """
+    Refreshes podcast feeds concurrently on a bounded thread pool.
+
+    Total refresh time becomes roughly the latency of the slowest hosts
+    instead of the sum of every feed's latency. Feeds are grouped by host
+    and only per_host_limit feeds of a host are handed to the pool at any
+    time, so a library with many feeds on one CDN does not hammer it and
+    pool threads are never parked waiting for a host slot.
+
+    Attributes:
+        max_workers (int): Maximum number of feeds fetched at once
+        per_host_limit (int): Maximum concurrent requests to one host
+        timeout (Optional[float]): Socket timeout for each feed request
+
+    Example:
+        >>> refresher = FeedRefresher(max_workers=16, per_host_limit=2)
+        >>> report = refresher.refresh(podcast_list.podcasts)
+        >>> print(len(report.updated), len(report.failed))
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                 timeout: Optional[float] = DEFAULT_FEED_TIMEOUT):
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+        if not isinstance(per_host_limit, int) or per_host_limit < 1:
+            raise ValueError("per_host_limit must be a positive integer")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+
+    @staticmethod
+    def _host_of(podcast: PodcastData) -> str:
+        return urlparse(podcast.podcast_url).netloc.lower()
+
+    def _refresh_one(self, podcast: PodcastData) -> FeedRefreshResult:
+        """
+        Refresh a single podcast and classify the outcome.
+
+        Args:
+            podcast (PodcastData): The podcast to refresh.
+
+        Returns:
+            FeedRefreshResult: The outcome and timing of the refresh.
+        """
+        start = time.perf_counter()
+        try:
+            parsed = podcast.populate_episodes_from_feed(timeout=self.timeout)
+        except Exception as e:
+            # one broken podcast must not abort the whole refresh
+            logging.error(f"Error refreshing {podcast.podcast_url}: {e}")
+            return FeedRefreshResult(podcast.podcast_url, REFRESH_FAILED, time.perf_counter() - start, str(e))
+
+        return self._result(podcast, parsed, time.perf_counter() - start)
+
+    @staticmethod
+    def _result(podcast: PodcastData, parsed: ParsedFeed, elapsed: float) -> FeedRefreshResult:
+        if parsed.error is not None:
+            return FeedRefreshResult(podcast.podcast_url, REFRESH_FAILED, elapsed, parsed.error)
+        # a full response whose entries are all known changed nothing either
+        if parsed.not_modified or (parsed.merge_result is not None and not parsed.merge_result.changed):
+            return FeedRefreshResult(podcast.podcast_url, REFRESH_UNCHANGED, elapsed)
+        return FeedRefreshResult(podcast.podcast_url, REFRESH_UPDATED, elapsed)
+
+    def refresh(self, podcasts: List[PodcastData]) -> RefreshReport:
+        """
+        Refresh the given podcasts concurrently.
+
+        Args:
+            podcasts (List[PodcastData]): The podcasts to refresh.
+
+        Returns:
+            RefreshReport: One result per podcast, in the order given.
+        """
+        start = time.perf_counter()
+        results: List[Optional[FeedRefreshResult]] = [None] * len(podcasts)
+
+        # queue the podcasts of each host, remembering their position
+        pending: Dict[str, Deque[Tuple[int, PodcastData]]] = {}
+        for position, podcast in enumerate(podcasts):
+            pending.setdefault(self._host_of(podcast), deque()).append((position, podcast))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            in_flight = {}
+
+            def submit_next(host: str) -> None:
+                position, podcast = pending[host].popleft()
+                future = pool.submit(self._refresh_one, podcast)
+                in_flight[future] = (host, position)
+
+            # start up to per_host_limit feeds of every host
+            for host, queue in pending.items():
+                for _ in range(min(self.per_host_limit, len(queue))):
+                    submit_next(host)
+
+            # each completed feed frees a slot for the next feed of its host
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, position = in_flight.pop(future)
+                    results[position] = future.result()
+                    if pending[host]:
+                        submit_next(host)
+
+        return RefreshReport(results=results, elapsed=time.perf_counter() - start)
+
+    def refresh_pipelined(self, podcasts: List[PodcastData],
+                          fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+                          parse_workers: Optional[int] = None) -> RefreshReport:
+        """
+        Refresh the given podcasts with the asynchronous feed pipeline.
+
+        Feeds are fetched by RSSPodcastParser.parse_feeds, parsed on
+        parse_workers threads and merged into their podcast one at a time
+        as soon as they are parsed. The per_host_limit and timeout of the
+        refresher apply, and max_workers is the default for parse_workers.
+
+        Args:
+            podcasts (List[PodcastData]): The podcasts to refresh.
+            fetch_concurrency (int): Maximum number of requests in flight.
+            parse_workers (Optional[int]): Maximum number of feeds parsed at
+                once, by default max_workers.
+
+        Returns:
+            RefreshReport: One result per podcast, in the order given. The
+                elapsed time of a feed runs from the start of the refresh to
+                the end of its merge.
+        """
+        start = time.perf_counter()
+        elapsed: List[float] = [0.0] * len(podcasts)
+
+        def merge(position: int, parsed: ParsedFeed) -> None:
+            try:
+                podcasts[position].apply_feed(parsed)
+            finally:
+                elapsed[position] = time.perf_counter() - start
+
+        urls = [podcast.podcast_url for podcast in podcasts]
+        # like populate_episodes_from_feed, only podcasts that already have
+        # episodes may be skipped as unchanged
+        conditional = {podcast.podcast_url for podcast in podcasts if podcast.episodelists}
+        parsed_feeds = RSSPodcastParser.parse_feeds(
+            urls, conditional, merge,
+            fetch_concurrency=fetch_concurrency,
+            per_host_limit=self.per_host_limit,
+            parse_workers=parse_workers or self.max_workers,
+            timeout=self.timeout)
+
+        results = [self._result(podcast, parsed, elapsed[position])
+                   for position, (podcast, parsed) in enumerate(zip(podcasts, parsed_feeds))]
+        return RefreshReport(results=results, elapsed=time.perf_counter() - start)
@@ -0,0 +1,458 @@
+"""
+Download Scheduler Module
+
+This module decides when queued episodes are handed to the DownloadManager.
+Episodes wait in one priority queue per host, ordered by the priority of
+their podcast and then by their position in the podcast or playlist. A
+download is only started while fewer than per_host_limit downloads of the
+same host are running, so hundreds of queued episodes on one CDN do not
+open hundreds of connections to it, and a host at its limit never blocks
+the episodes of other hosts.
+
+The bytes written by all downloads go through one token bucket, which caps
+the total bandwidth, and the scheduler reports its queue depth and recent
+throughput.
+
+Classes:
+    TokenBucket: Thread-safe token bucket rate limiter
+    SchedulerMetrics: Snapshot of the scheduler's queues and throughput
+    DownloadScheduler: Priority and per-host aware download queue
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from functools import partial
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from zpodcast.core.download import (DOWNLOAD_CANCELLED, DOWNLOAD_COMPLETED, DOWNLOAD_ERROR, DownloadManager,
+                                    DownloadState, download_key)
+from zpodcast.core.episode import PodcastEpisode
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.podcast import PodcastData
+
+
+# Default number of downloads running against a single host
+DEFAULT_PER_HOST_LIMIT = 2
+
+# Seconds of history the reported throughput is averaged over
+THROUGHPUT_WINDOW = 5.0
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter shared by several threads.
+
+    Tokens (bytes) accumulate at rate per second up to capacity. consume
+    takes tokens and, when the bucket runs into debt, sleeps until the debt
+    would be paid back, so the long-run rate never exceeds rate however
+    many threads consume at once, while bursts up to capacity pass
+    immediately.
+
+    Attributes:
+        rate (float): Tokens added per second
+        capacity (float): Largest number of tokens the bucket holds
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: float) -> float:
+        """
+        Take tokens from the bucket, waiting until they are available.
+
+        Args:
+            amount (float): Number of tokens to take.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+@dataclass
+class SchedulerMetrics:
+    """
+    Snapshot of a DownloadScheduler.
+
+    Attributes:
+        queued (int): Episodes waiting to be started
+        active (int): Downloads running
+        completed (int): Downloads completed since the scheduler started
+        failed (int): Downloads that ended with an error
+        cancelled (int): Downloads cancelled while queued or running
+        bytes_downloaded (int): Bytes written by the scheduled downloads
+        throughput (float): Bytes per second over the last THROUGHPUT_WINDOW
+        queued_by_host (Dict[str, int]): Queue depth of every host
+        active_by_host (Dict[str, int]): Running downloads of every host
+    """
+
+    queued: int = 0
+    active: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    bytes_downloaded: int = 0
+    throughput: float = 0.0
+    queued_by_host: Dict[str, int] = field(default_factory=dict)
+    active_by_host: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        return {
+            "queued": self.queued,
+            "active": self.active,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "bytes_downloaded": self.bytes_downloaded,
+            "throughput": self.throughput,
+            "queued_by_host": dict(self.queued_by_host),
+            "active_by_host": dict(self.active_by_host)
+        }
+
+
+class DownloadScheduler:
+    """
+    Starts queued downloads by priority within per-host and bandwidth limits.
+
+    Episodes with a higher priority start first; episodes of equal priority
+    start in the order of their position, then in the order they were
+    queued. At most max_active downloads run at once (by default the
+    manager's pool size, so the pool never holds queued work the scheduler
+    could still reorder) and at most per_host_limit of them per host.
+
+    The scheduler installs itself as the manager's throttle: every chunk a
+    worker writes is counted for the throughput and, with a bandwidth cap,
+    taken from the shared token bucket.
+
+    Attributes:
+        manager (DownloadManager): Runs the downloads
+        per_host_limit (int): Maximum concurrent downloads from one host
+        max_active (int): Maximum concurrent downloads overall
+        bucket (Optional[TokenBucket]): The bandwidth cap, None for none
+
+    Example:
+        >>> scheduler = DownloadScheduler(manager, per_host_limit=2, bandwidth=2_000_000)
+        >>> for podcast in podcast_list.podcasts:
+        >>>     scheduler.enqueue_podcast(podcast)
+        >>> print(scheduler.metrics().to_dict())
+    """
+
+    _instance = None
+
+    def __init__(self, manager: DownloadManager,
+                 per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                 max_active: Optional[int] = None,
+                 bandwidth: Optional[float] = None,
+                 burst: Optional[float] = None):
+        """
+        Create a scheduler.
+
+        Args:
+            manager (DownloadManager): Runs the downloads.
+            per_host_limit (int): Maximum concurrent downloads from one host.
+            max_active (Optional[int]): Maximum concurrent downloads, by
+                default manager.max_workers.
+            bandwidth (Optional[float]): Total bytes per second, None for
+                no cap.
+            burst (Optional[float]): Bytes that may pass at once, by default
+                one second worth of bandwidth.
+
+        Raises:
+            ValueError: If a limit is not positive.
+        """
+        if not isinstance(per_host_limit, int) or per_host_limit < 1:
+            raise ValueError("per_host_limit must be a positive integer")
+        if max_active is not None and (not isinstance(max_active, int) or max_active < 1):
+            raise ValueError("max_active must be a positive integer")
+
+        self.manager = manager
+        self.per_host_limit = per_host_limit
+        self.max_active = max_active if max_active is not None else manager.max_workers
+        self.bucket = TokenBucket(bandwidth, burst) if bandwidth is not None else None
+        manager.throttle = self._on_chunk
+
+        # host -> heap of (-priority, position, sequence, download key,
+        # episode, podcast URL)
+        self._queues: Dict[str, List[Tuple[int, int, int, str, PodcastEpisode, Optional[str]]]] = {}
+        # download key -> host, for the queued and the running episodes
+        self._queued: Dict[str, str] = {}
+        self._active: Dict[str, str] = {}
+        self._active_by_host: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._counts = {"completed": 0, "failed": 0, "cancelled": 0}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._dispatching = False
+        self._dispatch_requested = False
+
+        self._bytes = 0
+        self._recent: Deque[Tuple[float, int]] = deque()
+        self._recent_bytes = 0
+        self._started = time.monotonic()
+        self._metrics_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'DownloadScheduler':
+        """
+        Get the scheduler of the shared DownloadManager.
+
+        Returns:
+            DownloadScheduler: The shared instance.
+        """
+        if cls._instance is None:
+            cls._instance = cls(DownloadManager.get_instance())
+        return cls._instance
+
+    @staticmethod
+    def _host_of(episode: PodcastEpisode) -> str:
+        return urlparse(episode.audio_url).netloc.lower()
+
+    def enqueue(self, episode: PodcastEpisode, priority: Optional[int] = None, position: int = 0,
+                podcast_url: Optional[str] = None) -> bool:
+        """
+        Queue an episode for download.
+
+        Args:
+            episode (PodcastEpisode): The episode.
+            priority (Optional[int]): Higher starts first; None counts as 0.
+            position (int): Order among episodes of equal priority, lower
+                starts first.
+            podcast_url (Optional[str]): The feed the episode comes from,
+                passed on to DownloadManager.download.
+
+        Returns:
+            bool: True if the episode was queued, False if it already is
+                queued or downloading.
+        """
+        key = download_key(episode)
+        host = self._host_of(episode)
+        with self._lock:
+            if key in self._queued or key in self._active:
+                return False
+            entry = (-(priority or 0), position, next(self._sequence), key, episode, podcast_url)
+            heapq.heappush(self._queues.setdefault(host, []), entry)
+            self._queued[key] = host
+        self._dispatch()
+        return True
+
+    def enqueue_episodelist(self, episodelist: PodcastEpisodeList, priority: Optional[int] = None,
+                            podcast_url: Optional[str] = None) -> int:
+        """
+        Queue every episode of an episode list or playlist, in list order.
+
+        Args:
+            episodelist (PodcastEpisodeList): The episodes.
+            priority (Optional[int]): Priority of all the episodes.
+            podcast_url (Optional[str]): The feed all the episodes come
+                from, None for a playlist.
+
+        Returns:
+            int: Number of episodes queued.
+        """
+        return sum(self.enqueue(episode, priority, position, podcast_url)
+                   for position, episode in enumerate(episodelist.episodes))
+
+    def enqueue_podcast(self, podcast: PodcastData) -> int:
+        """
+        Queue the episodes of a podcast with the podcast's priority.
+
+        Args:
+            podcast (PodcastData): The podcast.
+
+        Returns:
+            int: Number of episodes queued.
+        """
+        return sum(self.enqueue_episodelist(episodelist, podcast.podcast_priority, podcast.podcast_url)
+                   for episodelist in podcast.episodelists)
+
+    def cancel(self, episode: PodcastEpisode) -> bool:
+        """
+        Remove an episode from the queue, or cancel its running download.
+
+        Args:
+            episode (PodcastEpisode): The episode.
+
+        Returns:
+            bool: True if the episode was queued or downloading.
+        """
+        key = download_key(episode)
+        with self._lock:
+            host = self._queued.pop(key, None)
+            if host is not None:
+                queue = self._queues[host]
+                queue[:] = [entry for entry in queue if entry[3] != key]
+                heapq.heapify(queue)
+                if not queue:
+                    del self._queues[host]
+                self._counts["cancelled"] += 1
+                self._idle.notify_all()
+                return True
+            if key not in self._active:
+                return False
+        return self.manager.cancel(episode)
+
+    def _next_entry(self) -> Optional[Tuple[str, Tuple]]:
+        """Pop the best queued episode whose host has a free slot."""
+        best_host = None
+        for host, queue in self._queues.items():
+            if self._active_by_host.get(host, 0) >= self.per_host_limit:
+                continue
+            if best_host is None or queue[0] < self._queues[best_host][0]:
+                best_host = host
+        if best_host is None:
+            return None
+        queue = self._queues[best_host]
+        entry = heapq.heappop(queue)
+        if not queue:
+            del self._queues[best_host]
+        return best_host, entry
+
+    def _dispatch(self) -> None:
+        """
+        Start queued episodes while slots are free.
+
+        Only one thread dispatches at a time; a dispatch requested while
+        another one runs is carried out by that thread, so a download
+        completing during dispatch neither recurses nor deadlocks. An
+        episode the manager refuses to start counts as failed and frees
+        its slot for the next one.
+        """
+        with self._lock:
+            self._dispatch_requested = True
+            if self._dispatching:
+                return
+            self._dispatching = True
+
+        dispatching = True
+        try:
+            while True:
+                started = []
+                with self._lock:
+                    if not self._dispatch_requested:
+                        self._dispatching = dispatching = False
+                        return
+                    self._dispatch_requested = False
+                    while len(self._active) < self.max_active:
+                        selected = self._next_entry()
+                        if selected is None:
+                            break
+                        host, entry = selected
+                        key = entry[3]
+                        del self._queued[key]
+                        self._active[key] = host
+                        self._active_by_host[host] = self._active_by_host.get(host, 0) + 1
+                        started.append((key, entry[4], entry[5]))
+
+                # the manager is called without the lock: its callback takes it
+                for key, episode, podcast_url in started:
+                    try:
+                        self.manager.download(episode, callback=partial(self._on_finished, key),
+                                              podcast_url=podcast_url)
+                    except Exception as e:
+                        logging.error(f"Error starting the download of {episode.audio_url}: {e}")
+                        with self._lock:
+                            self._release(key, DOWNLOAD_ERROR)
+                            self._dispatch_requested = True
+        finally:
+            if dispatching:
+                with self._lock:
+                    self._dispatching = False
+
+    def _release(self, key: str, status: str) -> None:
+        """Free the slot of an ended download and count it; the lock must be held."""
+        host = self._active.pop(key, None)
+        if host is None:
+            # already released by the manager's callback
+            return
+        self._active_by_host[host] -= 1
+        if not self._active_by_host[host]:
+            del self._active_by_host[host]
+        if status == DOWNLOAD_COMPLETED:
+            self._counts["completed"] += 1
+        elif status == DOWNLOAD_CANCELLED:
+            self._counts["cancelled"] += 1
+        else:
+            self._counts["failed"] += 1
+        self._idle.notify_all()
+
+    def _on_finished(self, key: str, state: DownloadState) -> None:
+        """Free the slot of an ended download and start the next episodes."""
+        with self._lock:
+            self._release(key, state.status)
+        self._dispatch()
+
+    def _on_chunk(self, size: int) -> None:
+        """Count a written chunk and apply the bandwidth cap."""
+        now = time.monotonic()
+        with self._metrics_lock:
+            self._bytes += size
+            self._recent.append((now, size))
+            self._recent_bytes += size
+            self._trim_recent(now)
+        if self.bucket is not None:
+            self.bucket.consume(size)
+
+    def _trim_recent(self, now: float) -> None:
+        while self._recent and self._recent[0][0] < now - THROUGHPUT_WINDOW:
+            self._recent_bytes -= self._recent.popleft()[1]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no episode is queued or downloading.
+
+        Args:
+            timeout (Optional[float]): Longest wait in seconds, None to wait
+                until the queue drains.
+
+        Returns:
+            bool: True if the queue drained, False on timeout.
+        """
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._queued and not self._active, timeout)
+
+    def metrics(self) -> SchedulerMetrics:
+        """
+        Get the queue depth, running downloads and throughput.
+
+        Returns:
+            SchedulerMetrics: A snapshot of the scheduler.
+        """
+        now = time.monotonic()
+        with self._metrics_lock:
+            self._trim_recent(now)
+            window = min(THROUGHPUT_WINDOW, now - self._started)
+            throughput = self._recent_bytes / window if window > 0 else 0.0
+            downloaded = self._bytes
+        with self._lock:
+            return SchedulerMetrics(
+                queued=len(self._queued),
+                active=len(self._active),
+                completed=self._counts["completed"],
+                failed=self._counts["failed"],
+                cancelled=self._counts["cancelled"],
+                bytes_downloaded=downloaded,
+                throughput=round(throughput, 1),
+                queued_by_host={host: len(queue) for host, queue in self._queues.items()},
+                active_by_host=dict(self._active_by_host)
+            )
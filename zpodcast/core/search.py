@@ -0,0 +1,367 @@
+"""
+Episode Search Module
+
+This module provides an in-process inverted index over the titles and
+descriptions of every episode in a PodcastList. Each term maps to the
+episodes containing it, so a query only touches the postings of its own
+terms instead of scanning the library.
+
+The index is kept up to date incrementally: before every search it compares
+the revision of each podcast with the revision it indexed. Episodes added or
+changed by a feed refresh merge are re-indexed one by one, from the episode
+list's record of its merges; podcasts added, removed or changed in any other
+way are re-indexed as a whole.
+
+Classes:
+    SearchHit: One ranked search result
+    SearchResults: A page of ranked search results
+    EpisodeSearchIndex: Inverted index over the episodes of a PodcastList
+
+Functions:
+    tokenize: Split a text into index terms
+"""
+from dataclasses import dataclass, field
+import heapq
+import math
+import re
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.podcast import PodcastData
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.utils.ids import make_episode_id
+
+
+# Default and largest number of results per page
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# A term found in the title counts this many times as much as one found in
+# the description
+TITLE_WEIGHT = 3
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Words too common to tell episodes apart; they are neither indexed nor
+# searched for
+STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'with'
+))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split a text into index terms.
+
+    Args:
+        text (Optional[str]): The text, None for no text.
+
+    Returns:
+        List[str]: The lower-cased words of the text, without stop words.
+    """
+    if not text:
+        return []
+    return [term for term in TOKEN_PATTERN.findall(text.lower()) if term not in STOP_WORDS]
+
+
+@dataclass
+class SearchHit:
+    """
+    One episode matching a search.
+
+    The podcast and the episode are resolved while the index is locked, so
+    they match the positions even if the library changes afterwards.
+
+    Attributes:
+        podcast_id (int): Position of the podcast in the PodcastList
+        episodelist_id (int): Position of the episode list in the podcast
+        episode_id (int): Position of the episode in the episode list
+        score (float): Relevance of the episode, higher is better
+        podcast_stable_id (Optional[str]): Stable identifier of the podcast
+        episode (Dict[str, Any]): The episode's dictionary, with its stable
+            identifier under "id"
+    """
+
+    podcast_id: int
+    episodelist_id: int
+    episode_id: int
+    score: float
+    podcast_stable_id: Optional[str] = None
+    episode: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SearchResults:
+    """
+    A page of ranked search results.
+
+    Attributes:
+        hits (List[SearchHit]): The results of the page, best first
+        total (int): Number of matching episodes across all pages
+        offset (int): Rank of the first result of the page
+        limit (int): Page size
+    """
+
+    hits: List[SearchHit] = field(default_factory=list)
+    total: int = 0
+    offset: int = 0
+    limit: int = DEFAULT_PAGE_SIZE
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        """
+        Get the offset of the following page.
+
+        Returns:
+            Optional[str]: The offset, None on the last page.
+        """
+        end = self.offset + len(self.hits)
+        return str(end) if end < self.total else None
+
+
+@dataclass
+class _IndexedList:
+    ref: weakref.ref
+    revision: Tuple[int, int]
+    # the document of each episode, in list order
+    documents: List[int]
+
+
+@dataclass
+class _IndexedPodcast:
+    ref: weakref.ref
+    revision: Tuple
+    lists: List[_IndexedList]
+
+
+class EpisodeSearchIndex:
+    """
+    Inverted index over episode titles and descriptions.
+
+    Results are ranked by TF-IDF: every query term adds its inverse
+    document frequency times the damped, title weighted number of times the
+    term appears in the episode. An episode must contain every query term;
+    ties are broken by the most recent publication date.
+
+    Example:
+        >>> index = EpisodeSearchIndex.get_instance()
+        >>> results = index.search(PodcastList.get_instance(), "machine learning", limit=10)
+        >>> for hit in results.hits:
+        >>>     print(hit.podcast_id, hit.episode_id, hit.score)
+    """
+
+    _instance = None
+
+    def __init__(self):
+        # term -> {document: damped, title weighted term frequency}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        # document -> (podcast key, episode list position, episode position, terms)
+        self._documents: Dict[int, Tuple[int, int, int, Tuple[str, ...]]] = {}
+        # document -> pub_date key, the tie breaker of equal scores
+        self._recency: Dict[int, int] = {}
+        # id(podcast) -> what was indexed for the podcast
+        self._podcasts: Dict[int, _IndexedPodcast] = {}
+        self._next_document = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'EpisodeSearchIndex':
+        """
+        Get the index shared by the whole application.
+
+        Returns:
+            EpisodeSearchIndex: The shared instance.
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _add_document(self, key: int, list_position: int, position: int,
+                      title: Optional[str], description: Optional[str], recency: int) -> int:
+        weights: Dict[str, int] = {}
+        for term in tokenize(title):
+            weights[term] = weights.get(term, 0) + TITLE_WEIGHT
+        for term in tokenize(description):
+            weights[term] = weights.get(term, 0) + 1
+
+        document = self._next_document
+        self._next_document += 1
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+            postings[document] = 1 + math.log(weight)
+        self._documents[document] = (key, list_position, position, tuple(weights))
+        self._recency[document] = recency
+        return document
+
+    def _remove_document(self, document: int) -> None:
+        del self._recency[document]
+        for term in self._documents.pop(document)[3]:
+            postings = self._postings[term]
+            del postings[document]
+            if not postings:
+                del self._postings[term]
+
+    def _add_podcast(self, key: int, podcast: PodcastData) -> None:
+        lists = []
+        for list_position, episodelist in enumerate(podcast.episodelists):
+            documents = [self._add_document(key, list_position, position, *fields)
+                         for position, fields in enumerate(episodelist.get_text_fields())]
+            lists.append(_IndexedList(weakref.ref(episodelist), episodelist.revision, documents))
+        self._podcasts[key] = _IndexedPodcast(weakref.ref(podcast), podcast.revision, lists)
+
+    def _remove_podcast(self, key: int) -> None:
+        for indexed_list in self._podcasts.pop(key).lists:
+            for document in indexed_list.documents:
+                self._remove_document(document)
+
+    def _update_podcast(self, key: int, podcast: PodcastData) -> bool:
+        """
+        Re-index the episodes merged into a podcast since it was indexed.
+
+        Returns:
+            bool: False, with nothing changed, when the podcast changed in
+                another way and must be re-indexed as a whole.
+        """
+        indexed = self._podcasts[key]
+        episodelists = podcast.episodelists
+        if len(indexed.lists) != len(episodelists):
+            return False
+        changes: List[Tuple[int, _IndexedList, PodcastEpisodeList, List[int]]] = []
+        for list_position, (indexed_list, episodelist) in enumerate(zip(indexed.lists, episodelists)):
+            if indexed_list.ref() is not episodelist:
+                return False
+            if indexed_list.revision != episodelist.revision:
+                changed = episodelist.changes_since(indexed_list.revision)
+                if changed is None:
+                    return False
+                changes.append((list_position, indexed_list, episodelist, changed))
+
+        for list_position, indexed_list, episodelist, changed in changes:
+            documents = indexed_list.documents
+            for position, fields in zip(changed, episodelist.get_text_fields(changed)):
+                document = self._add_document(key, list_position, position, *fields)
+                if position < len(documents):
+                    self._remove_document(documents[position])
+                    documents[position] = document
+                else:
+                    # merges only append, in ascending position order
+                    documents.append(document)
+            indexed_list.revision = episodelist.revision
+        indexed.revision = podcast.revision
+        return True
+
+    def _sync(self, podcast_list: PodcastList) -> Dict[int, int]:
+        """
+        Re-index the podcasts changed since the last sync.
+
+        Returns:
+            Dict[int, int]: The position of every podcast in the list by key.
+        """
+        positions = {}
+        for position, podcast in enumerate(podcast_list.podcasts):
+            key = id(podcast)
+            positions[key] = position
+            indexed = self._podcasts.get(key)
+            if indexed is not None:
+                unchanged = indexed.revision == podcast.revision
+                if indexed.ref() is podcast and (unchanged or self._update_podcast(key, podcast)):
+                    continue
+                self._remove_podcast(key)
+            self._add_podcast(key, podcast)
+
+        for key in [key for key in self._podcasts if key not in positions]:
+            self._remove_podcast(key)
+        return positions
+
+    def update(self, podcast_list: PodcastList) -> None:
+        """
+        Bring the index up to date with a podcast list.
+
+        Only podcasts added, modified or removed since the previous update
+        are (re-)indexed. search calls this itself; calling it after a feed
+        refresh moves the indexing work out of the next search.
+
+        Args:
+            podcast_list (PodcastList): The library to index.
+        """
+        with self._lock:
+            self._sync(podcast_list)
+
+    def clear(self) -> None:
+        """Drop every indexed episode."""
+        with self._lock:
+            self._postings.clear()
+            self._documents.clear()
+            self._recency.clear()
+            self._podcasts.clear()
+
+    def search(self, podcast_list: PodcastList, query: str,
+               offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> SearchResults:
+        """
+        Find the episodes matching every term of a query.
+
+        Args:
+            podcast_list (PodcastList): The library to search; the index is
+                first updated with its changes.
+            query (str): The words to search for.
+            offset (int): Rank of the first result to return.
+            limit (int): Maximum number of results, at most MAX_PAGE_SIZE.
+
+        Returns:
+            SearchResults: The requested page of results, best first.
+
+        Raises:
+            ValueError: If the query has no searchable term, offset is
+                negative or limit is not between 1 and MAX_PAGE_SIZE.
+        """
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError("offset must be a non-negative integer")
+        if not isinstance(limit, int) or not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        terms = set(tokenize(query))
+        if not terms:
+            raise ValueError("query must contain a searchable term")
+
+        with self._lock:
+            positions = self._sync(podcast_list)
+
+            postings = [self._postings.get(term) for term in terms]
+            if not all(postings):
+                return SearchResults(total=0, offset=offset, limit=limit)
+
+            # intersect starting from the rarest term, the set operations run in C
+            postings.sort(key=len)
+            matches = postings[0].keys()
+            for term_postings in postings[1:]:
+                matches = matches & term_postings.keys()
+
+            document_count = len(self._documents)
+            weighted = [(term_postings, math.log(1 + document_count / len(term_postings)))
+                        for term_postings in postings]
+            first, first_idf = weighted[0]
+            scores = {document: first_idf * first[document] for document in matches}
+            for term_postings, idf in weighted[1:]:
+                for document in matches:
+                    scores[document] += idf * term_postings[document]
+
+            # only the requested page is ordered
+            recency = self._recency
+            ranked = heapq.nlargest(offset + limit, scores,
+                                    key=lambda document: (scores[document], recency[document]))[offset:]
+            hits = []
+            for document in ranked:
+                key, list_position, position, _ = self._documents[document]
+                podcast = self._podcasts[key].ref()
+                episode = podcast.episodelists[list_position].get_episode_dicts(position, position + 1)[0]
+                episode["id"] = make_episode_id(episode["guid"], episode["audio_url"])
+                hits.append(SearchHit(positions[key], list_position, position, round(scores[document], 4),
+                                      podcast.id, episode))
+            return SearchResults(hits=hits, total=len(matches), offset=offset, limit=limit)
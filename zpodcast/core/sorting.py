@@ -0,0 +1,190 @@
+"""
+Sort and Filter Module
+
+This module applies SortParameters to podcasts and episodes. Every sort
+option that is set becomes one key of a multi-key ordering; the keys come
+from the precomputed sort key caches of PodcastList and PodcastEpisodeList,
+so repeated requests do not casefold titles or convert dates again until the
+list changes. The orderings are returned as positions, leaving the lists
+themselves untouched.
+
+Functions:
+    sort_parameters_from_query: SortParameters and precedence from a query
+    sort_episodes: Order (a subset of) an episode list
+    sort_podcasts: Order (a subset of) a podcast list
+    filter_podcasts: Find the podcasts matching an author and a priority
+"""
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.utils.sort import SortParameters
+
+
+# Sort option -> (sort key field, {option value: descending})
+EPISODE_SORT_OPTIONS: Dict[str, Tuple[str, Dict[str, bool]]] = {
+    'episode_title': ('title', {'A-Z': False, 'Z-A': True}),
+    'episode_duration': ('duration', {'ShortToLong': False, 'LongToShort': True}),
+    'episode_date': ('pub_date', {'Earliest': False, 'Latest': True}),
+    'episode_rating': ('rating', {'lowest': False, 'highest': True}),
+}
+PODCAST_SORT_OPTIONS: Dict[str, Tuple[str, Dict[str, bool]]] = {
+    'podcast_title': ('title', {'A-Z': False, 'Z-A': True}),
+    'podcast_author': ('author', {'A-Z': False, 'Z-A': True}),
+}
+
+
+def sort_parameters_from_query(query: Mapping[str, str],
+                               options: Dict[str, Tuple[str, Dict[str, bool]]]
+                               ) -> Tuple[SortParameters, List[str]]:
+    """
+    Read sort options from query parameters.
+
+    The query parameters are named like the SortParameters options (for
+    example episode_date=Latest); their order in the query sets their
+    precedence.
+
+    Args:
+        query (Mapping[str, str]): The query parameters, in request order.
+        options (Dict): EPISODE_SORT_OPTIONS or PODCAST_SORT_OPTIONS; other
+            parameters are ignored.
+
+    Returns:
+        Tuple[SortParameters, List[str]]: The parameters and the option
+            names in precedence order, for the order argument of
+            sort_episodes / sort_podcasts.
+
+    Raises:
+        ValueError: If an option value is invalid.
+    """
+    given = {name: value for name, value in query.items() if name in options}
+    return SortParameters.from_options(**given), list(given)
+
+
+def _sort_keys(params: SortParameters, options: Dict[str, Tuple[str, Dict[str, bool]]],
+               order: Optional[Sequence[str]]) -> List[Tuple[str, bool]]:
+    """
+    Turn the options set in params into (field, descending) sort keys.
+
+    Args:
+        params (SortParameters): The sort parameters.
+        options (Dict): EPISODE_SORT_OPTIONS or PODCAST_SORT_OPTIONS.
+        order (Optional[Sequence[str]]): Option names from the most to the
+            least significant key. Options set but not named follow in
+            declaration order.
+
+    Returns:
+        List[Tuple[str, bool]]: The sort keys, most significant first.
+
+    Raises:
+        ValueError: If order names an unknown option.
+    """
+    names = list(order or [])
+    unknown = [name for name in names if name not in options]
+    if unknown:
+        raise ValueError(f"Unknown sort options: {', '.join(unknown)}")
+    names += [name for name in options if name not in names]
+
+    keys = []
+    for name in names:
+        value = getattr(params, name)
+        if value is None:
+            continue
+        field, directions = options[name]
+        if value not in directions:
+            raise ValueError(f"Invalid sort option for {name}: {value}")
+        keys.append((field, directions[value]))
+    return keys
+
+
+def _order(positions: List[int], keys: List[Tuple[List, bool]]) -> List[int]:
+    # one stable sort per key from the least significant one, so every key
+    # keeps its own direction
+    for values, descending in reversed(keys):
+        positions.sort(key=values.__getitem__, reverse=descending)
+    return positions
+
+
+def sort_episodes(episodelist: PodcastEpisodeList, params: SortParameters,
+                  order: Optional[Sequence[str]] = None,
+                  indices: Optional[List[int]] = None) -> List[int]:
+    """
+    Order the episodes of an episode list by the episode sort options.
+
+    Args:
+        episodelist (PodcastEpisodeList): The episodes.
+        params (SortParameters): episode_title, episode_duration and
+            episode_date are applied; podcast options are ignored.
+        order (Optional[Sequence[str]]): Precedence of the options, see
+            _sort_keys. By default title, duration, then date.
+        indices (Optional[List[int]]): Positions to order, for example the
+            result of PodcastEpisodeList.filter_episode_indices. None orders
+            every episode.
+
+    Returns:
+        List[int]: The positions in sorted order; episodes comparing equal
+            keep their list order.
+
+    Raises:
+        ValueError: If an option is invalid, or episode_rating is set:
+            episodes carry no rating to sort by.
+    """
+    keys = _sort_keys(params, EPISODE_SORT_OPTIONS, order)
+    if any(field == 'rating' for field, _ in keys):
+        raise ValueError("Episodes have no rating to sort by")
+    positions = list(range(episodelist.get_num_items())) if indices is None else list(indices)
+    return _order(positions, [(episodelist.sort_keys(field), descending) for field, descending in keys])
+
+
+def sort_podcasts(podcast_list: PodcastList, params: SortParameters,
+                  order: Optional[Sequence[str]] = None,
+                  indices: Optional[List[int]] = None) -> List[int]:
+    """
+    Order the podcasts of a podcast list by the podcast sort options.
+
+    Args:
+        podcast_list (PodcastList): The podcasts.
+        params (SortParameters): podcast_title and podcast_author are
+            applied; episode options are ignored.
+        order (Optional[Sequence[str]]): Precedence of the options, see
+            _sort_keys. By default title, then author.
+        indices (Optional[List[int]]): Positions to order, for example the
+            result of filter_podcasts. None orders every podcast.
+
+    Returns:
+        List[int]: The positions in sorted order; podcasts comparing equal
+            keep their list order.
+
+    Raises:
+        ValueError: If an option is invalid.
+    """
+    keys = _sort_keys(params, PODCAST_SORT_OPTIONS, order)
+    positions = list(range(len(podcast_list.podcasts))) if indices is None else list(indices)
+    return _order(positions, [(podcast_list.sort_keys(field), descending) for field, descending in keys])
+
+
+def filter_podcasts(podcast_list: PodcastList, author: Optional[str] = None,
+                    min_priority: Optional[int] = None) -> List[int]:
+    """
+    Find the podcasts matching an author and a minimum priority.
+
+    Args:
+        podcast_list (PodcastList): The podcasts.
+        author (Optional[str]): Text the author (host) must contain,
+            ignoring case.
+        min_priority (Optional[int]): Lowest podcast_priority; podcasts
+            without a priority never match.
+
+    Returns:
+        List[int]: Positions of the matching podcasts, in list order.
+    """
+    positions = range(len(podcast_list.podcasts))
+    if author is not None:
+        needle = author.casefold()
+        authors = podcast_list.sort_keys('author')
+        positions = [position for position in positions if needle in authors[position]]
+    if min_priority is not None:
+        priorities = [podcast.podcast_priority for podcast in podcast_list.podcasts]
+        positions = [position for position in positions
+                     if priorities[position] is not None and priorities[position] >= min_priority]
+    return list(positions)
@@ -0,0 +1,305 @@
+"""
+Binary Snapshot Module
+
+This module saves the podcast library and the playlists in a compact
+binary format. Unlike the PodcastJSON files, values are stored the way the
+objects hold them after validation: publication dates as integers,
+durations as integers and URLs that already passed validation, and
+repeated strings are stored once. Loading unpacks fixed size records with
+struct and builds the episodes with PodcastEpisode.from_normalized, so no
+URL validation, date or duration parsing happens.
+
+A snapshot is about 40% smaller than the PodcastJSON file holding the
+same data, and a snapshot of 100,000 episodes loads about 1.1 to 1.7 times
+as fast, depending on the machine. benchmarks/snapshot_load.py measures
+the load times of both formats.
+
+File layout (little endian):
+    header        magic b"ZPOD", format version (uint16), kind (uint8)
+    string table  count (uint32), character lengths (uint32 each), byte
+                  size (uint32) and UTF-8 text of all strings; every string
+                  field refers to it by index, so repeated values are
+                  stored once
+    body          the podcasts or playlists, made of the PODCAST, LIST and
+                  EPISODE records below
+
+Classes:
+    PodcastBinary: Reads and writes binary PodcastList / PodcastPlaylist snapshots
+"""
+from array import array
+import struct
+import sys
+from typing import Any, Callable, List, Optional, Tuple
+
+from zpodcast.core.columns import MISSING, StringPool, encode_pub_date, decode_pub_date
+from zpodcast.core.episode import PodcastEpisode
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.playlists import PodcastPlaylist
+from zpodcast.core.podcast import PodcastData
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.parsers.json import _atomic_write
+
+
+MAGIC = b"ZPOD"
+FORMAT_VERSION = 1
+
+# Kind of document stored in a snapshot
+KIND_PODCAST_LIST = 1
+KIND_PODCAST_PLAYLIST = 2
+
+# String reference of a None value
+NO_STRING = 0xFFFFFFFF
+
+# Stored podcast priority of a podcast without priority
+NO_PRIORITY = -(2 ** 63)
+
+HEADER = struct.Struct('<4sHB')
+COUNT = struct.Struct('<I')
+# title, podcast_url, host, description and image_url references, priority,
+# name_set_manually and the number of episode lists
+PODCAST = struct.Struct('<5IqBI')
+# name reference and number of episodes
+LIST = struct.Struct('<2I')
+# title, audio_url, description, image_url and guid references, publication
+# date ordinal and microseconds into the day in UTC, duration and episode
+# number
+EPISODE = struct.Struct('<5Iiqqq')
+
+# Largest value of the signed 64 bit fields
+INT64_MAX = 2 ** 63 - 1
+
+
+def _int64(field: str, value: Optional[int]) -> int:
+    """
+    Get the stored value of an optional, non-negative 64 bit field.
+
+    Raises:
+        ValueError: If the value does not fit the field.
+    """
+    if value is None:
+        return MISSING
+    if value > INT64_MAX:
+        raise ValueError(f"{field} {value} is too large for a snapshot")
+    return value
+
+
+class _Writer:
+    """Collects the body of a snapshot and the strings it refers to."""
+
+    def __init__(self):
+        self.strings = StringPool()
+        self.body: List[bytes] = []
+
+    def ref(self, value: Optional[str]) -> int:
+        offset = self.strings.add(value)
+        return NO_STRING if offset == MISSING else offset
+
+    def episode_list(self, episode_list: PodcastEpisodeList) -> None:
+        episodes = episode_list.episodes
+        self.body.append(LIST.pack(self.ref(episode_list.name), len(episodes)))
+        ref = self.ref
+        pack = EPISODE.pack
+        self.body.append(b"".join(
+            pack(ref(episode.title), ref(episode.audio_url), ref(episode.description),
+                 ref(episode.image_url), ref(episode.guid),
+                 *encode_pub_date(episode.pub_date),
+                 _int64("duration", episode.duration),
+                 _int64("episode_number", episode.episode_number))
+            for episode in episodes
+        ))
+
+    def podcast(self, podcast: PodcastData) -> None:
+        priority = NO_PRIORITY if podcast.podcast_priority is None else podcast.podcast_priority
+        self.body.append(PODCAST.pack(self.ref(podcast.title), self.ref(podcast.podcast_url),
+                                      self.ref(podcast.host), self.ref(podcast.description),
+                                      self.ref(podcast.image_url), priority,
+                                      1 if podcast.name_set_manually else 0, len(podcast.episodelists)))
+        for episode_list in podcast.episodelists:
+            self.episode_list(episode_list)
+
+    def document(self, kind: int, count: int) -> bytes:
+        strings = list(self.strings)
+        lengths = array('I', (len(value) for value in strings))
+        if sys.byteorder != 'little':
+            lengths.byteswap()
+        text = "".join(strings).encode('utf-8')
+        return b"".join([HEADER.pack(MAGIC, FORMAT_VERSION, kind), COUNT.pack(len(strings)),
+                         lengths.tobytes(), COUNT.pack(len(text)), text,
+                         COUNT.pack(count)] + self.body)
+
+
+class _Reader:
+    """Unpacks the records of a snapshot."""
+
+    def __init__(self, data: bytes, kind: int):
+        self.data = memoryview(data)
+        self.offset = 0
+
+        magic, version, stored_kind = self.unpack(HEADER)
+        if magic != MAGIC:
+            raise ValueError("Not a zpodcast binary snapshot")
+        if version != FORMAT_VERSION:
+            raise ValueError("Unsupported version")
+        if stored_kind != kind:
+            raise ValueError("Snapshot holds a different kind of document")
+
+        (count,) = self.unpack(COUNT)
+        lengths = array('I')
+        lengths.frombytes(self.take(count * lengths.itemsize))
+        if sys.byteorder != 'little':
+            lengths.byteswap()
+        (size,) = self.unpack(COUNT)
+        text = str(self.take(size), 'utf-8')
+        strings = []
+        position = 0
+        for length in lengths:
+            strings.append(text[position:position + length])
+            position += length
+        self.strings = strings
+
+    def take(self, size: int) -> memoryview:
+        if self.offset + size > len(self.data):
+            raise ValueError("Truncated snapshot")
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return chunk
+
+    def unpack(self, record: struct.Struct) -> Tuple:
+        return record.unpack(self.take(record.size))
+
+    def string(self, ref: int) -> Optional[str]:
+        return None if ref == NO_STRING else self.strings[ref]
+
+    def episode_list(self) -> PodcastEpisodeList:
+        name_ref, count = self.unpack(LIST)
+        strings = self.strings
+        from_normalized = PodcastEpisode.from_normalized
+        episodes = []
+        for (title, audio_url, description, image_url, guid, ordinal, micros,
+             duration, episode_number) in EPISODE.iter_unpack(self.take(count * EPISODE.size)):
+            episodes.append(from_normalized(
+                title=strings[title] if title != NO_STRING else None,
+                audio_url=strings[audio_url],
+                description=strings[description] if description != NO_STRING else "",
+                pub_date=decode_pub_date(ordinal, micros),
+                duration=None if duration == MISSING else duration,
+                episode_number=None if episode_number == MISSING else episode_number,
+                image_url=strings[image_url] if image_url != NO_STRING else None,
+                guid=strings[guid] if guid != NO_STRING else None
+            ))
+        return PodcastEpisodeList(name=self.string(name_ref), episodes=episodes)
+
+    def podcast(self) -> PodcastData:
+        title, podcast_url, host, description, image_url, priority, name_set_manually, lists = self.unpack(PODCAST)
+        return PodcastData(
+            title=self.string(title),
+            podcast_url=self.string(podcast_url),
+            host=self.string(host),
+            description=self.string(description),
+            episodelists=[self.episode_list() for _ in range(lists)],
+            podcast_priority=None if priority == NO_PRIORITY else priority,
+            image_url=self.string(image_url),
+            name_set_manually=bool(name_set_manually),
+            fetch=False
+        )
+
+
+def _load(filename: str, kind: int, read: Callable[['_Reader'], Any]) -> List:
+    """Read the header, string table and the count items of a snapshot."""
+    with open(filename, 'rb') as f:
+        reader = _Reader(f.read(), kind)
+    try:
+        (count,) = reader.unpack(COUNT)
+        return [read(reader) for _ in range(count)]
+    except (IndexError, OverflowError) as e:
+        # a string reference or date outside the stored range
+        raise ValueError(f"Corrupt snapshot: {e}") from e
+
+
+class PodcastBinary:
+    """
+    Binary snapshots of the podcast library and the playlists.
+
+    The snapshots hold the same data as the PodcastJSON files and are
+    written atomically the same way, in about two thirds of the space.
+
+    Example:
+        >>> PodcastBinary.export_podcast_list(podcast_list, "library.zpod")
+        >>> podcast_list = PodcastBinary.import_podcast_list("library.zpod")
+    """
+
+    VERSION = FORMAT_VERSION
+
+    @staticmethod
+    def export_podcast_list(podcast_list: PodcastList, filename: str = None) -> None:
+        """
+        Save a podcast list.
+
+        Args:
+            podcast_list (PodcastList): The podcast list to save.
+            filename (str): Target file, PodcastList-<VERSION>.zpod by default.
+
+        Raises:
+            ValueError: If a duration or episode number is too large to be
+                stored.
+        """
+        if filename is None:
+            filename = f"PodcastList-{PodcastBinary.VERSION}.zpod"
+        writer = _Writer()
+        for podcast in podcast_list.podcasts:
+            writer.podcast(podcast)
+        _atomic_write(filename, writer.document(KIND_PODCAST_LIST, len(podcast_list.podcasts)))
+
+    @staticmethod
+    def import_podcast_list(filename: str) -> PodcastList:
+        """
+        Load a podcast list. Podcasts are hydrated, their feeds are not fetched.
+
+        Args:
+            filename (str): Path of the snapshot.
+
+        Returns:
+            PodcastList: The podcast list.
+
+        Raises:
+            ValueError: If the file is not a podcast list snapshot of a
+                supported version, or is truncated or corrupt.
+        """
+        return PodcastList(_load(filename, KIND_PODCAST_LIST, _Reader.podcast))
+
+    @staticmethod
+    def export_podcast_playlist(podcast_playlist: PodcastPlaylist, filename: str = None) -> None:
+        """
+        Save the playlists.
+
+        Args:
+            podcast_playlist (PodcastPlaylist): The playlists to save.
+            filename (str): Target file, PodcastPlaylist-<VERSION>.zpod by default.
+
+        Raises:
+            ValueError: If a duration or episode number is too large to be
+                stored.
+        """
+        if filename is None:
+            filename = f"PodcastPlaylist-{PodcastBinary.VERSION}.zpod"
+        writer = _Writer()
+        for playlist in podcast_playlist.playlists:
+            writer.episode_list(playlist)
+        _atomic_write(filename, writer.document(KIND_PODCAST_PLAYLIST, len(podcast_playlist.playlists)))
+
+    @staticmethod
+    def import_podcast_playlist(filename: str) -> PodcastPlaylist:
+        """
+        Load the playlists.
+
+        Args:
+            filename (str): Path of the snapshot.
+
+        Returns:
+            PodcastPlaylist: The playlists.
+
+        Raises:
+            ValueError: If the file is not a playlist snapshot of a
+                supported version, or is truncated or corrupt.
+        """
+        return PodcastPlaylist(playlists=_load(filename, KIND_PODCAST_PLAYLIST, _Reader.episode_list))
@@ -0,0 +1,416 @@
+"""
+Change Journal Module
+
+This module makes changes to the podcast library and the playlists durable
+without rewriting the PodcastJSON files on every change. Each change made
+through PodcastList / PodcastPlaylist is appended to a journal file as one
+small JSON line and synced to disk, so a write costs the size of the
+change instead of the size of the library; only a podcast whose feed URL
+changed is recorded whole, with the episodes of its new feed. At start up the journal is
+replayed over the last snapshot, and once enough records have accumulated
+a background compaction writes fresh snapshots and drops the records they
+contain.
+
+Every record carries a sequence number. Each snapshot stores the sequence
+number of the last record it includes, written with the snapshot in one
+atomic replace, so a compaction interrupted at any point never applies a
+change twice or loses one. The readers of PodcastJSON skip the extra key,
+so the snapshots stay plain PodcastJSON files.
+
+Classes:
+    PodcastJournal: Journals changes and replays them over the snapshots
+"""
+from contextlib import contextmanager
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+
+from zpodcast.core.episode import PodcastEpisode
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.playlists import PodcastPlaylist
+from zpodcast.core.podcast import PodcastData
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.parsers.json import INDENT, PodcastJSON, _JSONStream, _atomic_write
+
+
+# Default file names inside the journal's directory, the snapshot names are
+# the ones the API loads its data from
+PODCAST_LIST_FILE = "podcast_list.json"
+PODCAST_PLAYLIST_FILE = "podcast_playlist.json"
+JOURNAL_FILE = "journal.jsonl"
+# Snapshots written before they stored their own sequence number have it
+# in this file instead
+CHECKPOINT_FILE = "journal.checkpoint"
+
+# Key of the snapshot documents holding the sequence number they include
+SEQUENCE_KEY = "journal_sequence"
+
+# Default number of journal records that triggers a background compaction
+DEFAULT_COMPACT_THRESHOLD = 1000
+
+# Journaled operations and the snapshot each one changes
+PODCAST_LIST_OPERATIONS = ("add_podcast", "update_podcast", "delete_podcast")
+PODCAST_PLAYLIST_OPERATIONS = ("add_playlist", "rename_playlist", "remove_playlist",
+                               "add_playlist_episode", "remove_playlist_episode")
+
+
+class PodcastJournal:
+    """
+    Append-only journal of library and playlist changes.
+
+    Load the library with load(); it replays the journal over the snapshots
+    and attaches the journal to the returned PodcastList and
+    PodcastPlaylist, whose changing methods then record themselves. Changes
+    made by other means (for example episodes merged by a feed refresh) are
+    saved by the next compaction.
+
+    Attributes:
+        directory (str): Directory holding the snapshots and the journal
+        compact_threshold (Optional[int]): Records that trigger a background
+            compaction, None to only compact when asked
+        sync (bool): fsync the journal after every record
+        podcast_list (Optional[PodcastList]): The loaded podcast list
+        podcast_playlist (Optional[PodcastPlaylist]): The loaded playlists
+
+    Example:
+        >>> journal = PodcastJournal("data")
+        >>> podcast_list, podcast_playlist = journal.load()
+        >>> podcast_list.add_podcast(podcast)  # one line appended to the journal
+        >>> journal.close()
+    """
+
+    def __init__(self, directory: str, compact_threshold: Optional[int] = DEFAULT_COMPACT_THRESHOLD,
+                 sync: bool = True):
+        if compact_threshold is not None and (not isinstance(compact_threshold, int) or compact_threshold < 1):
+            raise ValueError("compact_threshold must be a positive integer or None")
+
+        self.directory = directory
+        self.compact_threshold = compact_threshold
+        self.sync = sync
+        self.podcast_list: Optional[PodcastList] = None
+        self.podcast_playlist: Optional[PodcastPlaylist] = None
+
+        self.podcast_list_file = os.path.join(directory, PODCAST_LIST_FILE)
+        self.podcast_playlist_file = os.path.join(directory, PODCAST_PLAYLIST_FILE)
+        self.journal_file = os.path.join(directory, JOURNAL_FILE)
+        self.checkpoint_file = os.path.join(directory, CHECKPOINT_FILE)
+
+        # guards the journal file, the sequence number and the in-memory
+        # library while a change is applied and recorded
+        self._lock = threading.RLock()
+        # only one compaction runs at a time
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._file = None
+        self._sequence = 0
+        self._checkpoint = {"podcast_list": 0, "podcast_playlist": 0}
+        self._record_count = 0
+
+    def __enter__(self) -> 'PodcastJournal':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def record_count(self) -> int:
+        """Number of records in the journal file."""
+        return self._record_count
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the last recorded change."""
+        return self._sequence
+
+    def _read_checkpoint(self) -> Dict[str, int]:
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {"podcast_list": 0, "podcast_playlist": 0}
+        return {"podcast_list": int(data.get("podcast_list", 0)),
+                "podcast_playlist": int(data.get("podcast_playlist", 0))}
+
+    @staticmethod
+    def _read_snapshot_sequence(filename: str) -> Optional[int]:
+        """
+        Read the sequence number stored in a snapshot.
+
+        The number is the first key of the document, so only the start of
+        the file is read.
+
+        Returns:
+            Optional[int]: The sequence number, None for a missing snapshot
+                or one written without it.
+        """
+        try:
+            f = open(filename, 'r')
+        except FileNotFoundError:
+            return None
+        with f:
+            stream = _JSONStream(f)
+            for key in stream.object_keys():
+                if key == SEQUENCE_KEY:
+                    return int(stream.value())
+                return None
+        return None
+
+    @staticmethod
+    def _stamp_snapshot(text: str, sequence: int) -> str:
+        """
+        Add the sequence number a snapshot includes as its first key.
+        """
+        return text.replace("{\n", f'{{\n{" " * INDENT}"{SEQUENCE_KEY}": {sequence},\n', 1)
+
+    def _read_records(self) -> Iterator[Dict]:
+        """
+        Read the records of the journal file.
+
+        A last line without its newline is the remains of a crash during an
+        append; the change was never acknowledged, so it is ignored and cut
+        off the file.
+
+        Yields:
+            Dict: The records, in the order they were written.
+
+        Raises:
+            ValueError: If a complete line of the journal is corrupt.
+        """
+        try:
+            f = open(self.journal_file, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            offset = 0
+            for number, line in enumerate(f, start=1):
+                if not line.endswith(b"\n"):
+                    logging.warning(f"Dropping incomplete last record of {self.journal_file}")
+                    f.close()
+                    with open(self.journal_file, 'r+b') as truncate:
+                        truncate.truncate(offset)
+                    return
+                offset += len(line)
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    raise ValueError(f"Corrupt journal record on line {number} of {self.journal_file}")
+
+    @staticmethod
+    def _apply(podcast_list: PodcastList, podcast_playlist: PodcastPlaylist, record: Dict) -> None:
+        """
+        Apply a journal record to the library.
+
+        Raises:
+            ValueError: If the record has an unknown operation.
+        """
+        op = record.get("op")
+        if op == "add_podcast":
+            podcast_list.add_podcast(PodcastData.from_dict(record["podcast"], trusted=True))
+        elif op == "update_podcast":
+            if "podcast" in record:
+                podcast_list.replace_podcast(record["index"], PodcastData.from_dict(record["podcast"], trusted=True))
+            else:
+                podcast_list.update_podcast(record["index"], record["fields"])
+        elif op == "delete_podcast":
+            podcast_list.delete_podcast(record["index"])
+        elif op == "add_playlist":
+            podcast_playlist.add_playlist(PodcastEpisodeList.from_dict(record["playlist"], trusted=True))
+        elif op == "rename_playlist":
+            podcast_playlist.rename_playlist(record["index"], record["name"])
+        elif op == "remove_playlist":
+            podcast_playlist.remove_playlist(record["index"])
+        elif op == "add_playlist_episode":
+            podcast_playlist.add_playlist_episode(record["index"], PodcastEpisode.from_dict(record["episode"], trusted=True))
+        elif op == "remove_playlist_episode":
+            podcast_playlist.remove_playlist_episode(record["index"], record["episode_index"])
+        else:
+            raise ValueError(f"Unknown journal operation: {op}")
+
+    def load(self) -> Tuple[PodcastList, PodcastPlaylist]:
+        """
+        Load the library: read the snapshots and replay the journal.
+
+        Missing snapshot files load as an empty library. Podcasts are only
+        hydrated, their feeds are not fetched.
+
+        Returns:
+            Tuple[PodcastList, PodcastPlaylist]: The library, with this
+                journal attached.
+
+        Raises:
+            ValueError: If the journal is corrupt or the journal was
+                already loaded.
+        """
+        if self._file is not None:
+            raise ValueError("Journal already loaded")
+
+        if os.path.exists(self.podcast_list_file):
+            podcast_list = PodcastJSON.import_podcast_list(self.podcast_list_file)
+        else:
+            podcast_list = PodcastList()
+        if os.path.exists(self.podcast_playlist_file):
+            podcast_playlist = PodcastJSON.import_podcast_playlist(self.podcast_playlist_file)
+        else:
+            podcast_playlist = PodcastPlaylist(playlists=[])
+
+        self._checkpoint = self._read_checkpoint()
+        # the number stored in a snapshot is the one that describes it
+        for name, filename in (("podcast_list", self.podcast_list_file),
+                               ("podcast_playlist", self.podcast_playlist_file)):
+            sequence = self._read_snapshot_sequence(filename)
+            if sequence is not None:
+                self._checkpoint[name] = sequence
+        self._sequence = max(self._checkpoint.values())
+        self._record_count = 0
+        for record in self._read_records():
+            sequence = record["seq"]
+            self._sequence = max(self._sequence, sequence)
+            self._record_count += 1
+            # records already contained in a snapshot are skipped
+            if record["op"] in PODCAST_LIST_OPERATIONS:
+                if sequence <= self._checkpoint["podcast_list"]:
+                    continue
+            elif sequence <= self._checkpoint["podcast_playlist"]:
+                continue
+            self._apply(podcast_list, podcast_playlist, record)
+
+        self._file = open(self.journal_file, 'ab')
+        self.podcast_list = podcast_list
+        self.podcast_playlist = podcast_playlist
+        podcast_list.attach_journal(self)
+        podcast_playlist.attach_journal(self)
+        return podcast_list, podcast_playlist
+
+    @contextmanager
+    def transaction(self, op: str, **fields):
+        """
+        Apply a change and record it.
+
+        The body of the with statement applies the change to the library
+        and may add fields to the yielded record. The record is appended
+        once the body completes; a body that raises records nothing.
+
+        Args:
+            op (str): The journaled operation.
+            **fields: Fields of the record known before the change.
+
+        Yields:
+            Dict: The record to complete.
+
+        Raises:
+            ValueError: If op is not a journaled operation or the journal
+                is not loaded.
+        """
+        if op not in PODCAST_LIST_OPERATIONS and op not in PODCAST_PLAYLIST_OPERATIONS:
+            raise ValueError(f"Unknown journal operation: {op}")
+        if self._file is None:
+            raise ValueError("Journal is not loaded")
+
+        with self._lock:
+            record = dict(fields)
+            yield record
+            self._append(op, record)
+
+    def _append(self, op: str, record: Dict) -> None:
+        self._sequence += 1
+        line = json.dumps({"seq": self._sequence, "op": op, **record}, separators=(',', ':'))
+        self._file.write(line.encode('utf-8') + b"\n")
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+        self._record_count += 1
+
+        if self.compact_threshold is not None and self._record_count >= self.compact_threshold:
+            self.compact_in_background()
+
+    def compact(self) -> None:
+        """
+        Write fresh snapshots and drop the journal records they contain.
+
+        The snapshots are encoded while changes are blocked, then written
+        atomically while changes continue; records appended meanwhile stay
+        in the journal.
+
+        Raises:
+            ValueError: If the journal is not loaded.
+        """
+        if self._file is None:
+            raise ValueError("Journal is not loaded")
+
+        with self._compaction_lock:
+            with self._lock:
+                sequence = self._sequence
+                offset = self._file.tell()
+                count = self._record_count
+                podcast_list_text = PodcastJSON.encode_podcast_list(self.podcast_list)
+                podcast_playlist_text = PodcastJSON.encode_podcast_playlist(self.podcast_playlist)
+
+            # each snapshot carries its sequence number, so a crash between
+            # the writes replays exactly the records a snapshot is missing
+            _atomic_write(self.podcast_list_file, self._stamp_snapshot(podcast_list_text, sequence))
+            _atomic_write(self.podcast_playlist_file, self._stamp_snapshot(podcast_playlist_text, sequence))
+            self._checkpoint = {"podcast_list": sequence, "podcast_playlist": sequence}
+            # both snapshots now describe themselves
+            try:
+                os.remove(self.checkpoint_file)
+            except FileNotFoundError:
+                pass
+
+            with self._lock:
+                # keep the records appended since the snapshots were encoded
+                self._file.close()
+                with open(self.journal_file, 'rb') as f:
+                    f.seek(offset)
+                    tail = f.read()
+                temp_name = self.journal_file + ".tmp"
+                with open(temp_name, 'wb') as f:
+                    f.write(tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_name, self.journal_file)
+                self._file = open(self.journal_file, 'ab')
+                self._record_count -= count
+
+    def _compact_logging_errors(self) -> None:
+        try:
+            self.compact()
+        except Exception as e:
+            # the journal still holds every change, a later compaction retries
+            logging.error(f"Error compacting journal {self.journal_file}: {e}")
+
+    def compact_in_background(self) -> Optional[threading.Thread]:
+        """
+        Start a compaction on a background thread.
+
+        Returns:
+            Optional[threading.Thread]: The compaction thread, None if a
+                compaction is already running.
+        """
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return None
+        self._compaction_thread = threading.Thread(target=self._compact_logging_errors,
+                                                   name="zpodcast-journal-compaction", daemon=True)
+        self._compaction_thread.start()
+        return self._compaction_thread
+
+    def close(self) -> None:
+        """
+        Wait for a running compaction and close the journal file.
+
+        The library is detached from the journal; later changes are no
+        longer recorded.
+        """
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+            self._compaction_thread = None
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self.podcast_list is not None:
+            self.podcast_list.attach_journal(None)
+        if self.podcast_playlist is not None:
+            self.podcast_playlist.attach_journal(None)
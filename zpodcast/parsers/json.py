@@ -1,33 +1,358 @@
 import json
+import os
+import tempfile
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+from zpodcast.core.podcast import PodcastData
 from zpodcast.core.podcasts import PodcastList
 from zpodcast.core.playlists import PodcastPlaylist
 
 
+# Number of characters read from the file at a time while streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Indentation of the readable (non-compact) output
+INDENT = 4
+
+# Separators of the compact output
+COMPACT_SEPARATORS = (',', ':')
+
+
+def _atomic_write(filename: str, text: Union[str, bytes]) -> None:
+    """
+    Replace a file with new contents atomically.
+
+    The text is written to a temporary file in the same directory, flushed
+    to disk and renamed over the target, so readers (and a crash) only ever
+    see the complete old or the complete new file.
+
+    Args:
+        filename (str): The file to replace.
+        text (Union[str, bytes]): The new contents, bytes are written
+            as they are.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(filename)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(text, bytes) else 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file private to the user; keep the target's mode
+        try:
+            mode = os.stat(filename).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(temp_name, mode)
+        os.replace(temp_name, filename)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+class _FragmentCache:
+    """
+    Encoded JSON of podcasts and playlists, reused while they are unchanged.
+
+    Each object is re-encoded only when its revision differs from the one
+    it was encoded at. Entries are dropped when the object is garbage
+    collected.
+
+    Attributes:
+        hits (int): Number of fragments served from the cache
+        misses (int): Number of fragments that had to be encoded
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[weakref.ref, Any, bool, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, obj: Any, compact: bool) -> str:
+        """
+        Get the JSON of an object as an item of the document's top list.
+
+        Args:
+            obj (Any): A PodcastData or PodcastEpisodeList.
+            compact (bool): Encode without whitespace.
+
+        Returns:
+            str: The encoded object, indented for its place in the
+                readable document unless compact.
+        """
+        key = id(obj)
+        revision = obj.revision
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is obj and entry[1] == revision and entry[2] == compact:
+            self.hits += 1
+            return entry[3]
+
+        self.misses += 1
+        if compact:
+            text = json.dumps(obj.to_dict(), separators=COMPACT_SEPARATORS)
+        else:
+            # items of the top list sit three levels deep in the document
+            text = json.dumps(obj.to_dict(), indent=INDENT).replace("\n", "\n" + " " * (3 * INDENT))
+        entries = self._entries
+        self._entries[key] = (weakref.ref(obj, lambda _, key=key: entries.pop(key, None)), revision, compact, text)
+        return text
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _encode_document(version: str, root_key: str, list_key: str, fragments: List[str], compact: bool) -> str:
+    """
+    Splice encoded fragments into a versioned document.
+
+    The result is identical to json.dumps of the whole document with the
+    same formatting options.
+    """
+    if compact:
+        items = ",".join(fragments)
+        return f'{{"version":{json.dumps(version)},"{root_key}":{{"{list_key}":[{items}]}}}}'
+
+    pad = " " * INDENT
+    items = "[]"
+    if fragments:
+        items = "[\n" + ",\n".join(pad * 3 + fragment for fragment in fragments) + "\n" + pad * 2 + "]"
+    return (f'{{\n{pad}"version": {json.dumps(version)},\n{pad}"{root_key}": {{\n'
+            f'{pad * 2}"{list_key}": {items}\n{pad}}}\n}}')
+
+
+class _JSONStream:
+    """
+    Incremental reader for one JSON document.
+
+    Only the part of the document that has not been consumed yet is kept in
+    memory, so values can be decoded one at a time from files much larger
+    than any single value.
+    """
+
+    def __init__(self, f: TextIO, chunk_size: Optional[int] = None):
+        self._file = f
+        self._chunk_size = chunk_size or STREAM_CHUNK_SIZE
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        # drop the consumed part before growing the buffer
+        chunk = self._file.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._fill(self._chunk_size):
+                return
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            raise ValueError("Unexpected end of JSON document")
+        return self._buffer[self._pos]
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        if self.peek() != char:
+            raise ValueError(f"Invalid JSON document: expected '{char}' at offset {self._pos}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """
+        Decode the next complete JSON value.
+
+        The buffer grows geometrically until the value is complete, so a
+        large value is decoded a logarithmic number of times.
+        """
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill(max(self._chunk_size, len(self._buffer) - self._pos))
+
+    def object_keys(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the object starting at the current position.
+
+        After each key the reader is positioned on its value, which the
+        caller must consume (with value or a nested iteration).
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def array_items(self) -> Iterator[Any]:
+        """Decode the items of the array starting at the current position one at a time."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("]")
+            return
+
+
 class PodcastJSON:
     VERSION = "0.1"
 
+    # encoded podcasts and playlists shared by all exports
+    fragment_cache = _FragmentCache()
+
     @staticmethod
-    def export_podcast_list(podcast_list: PodcastList, filename: str = None) -> None:
+    def export_podcast_list(podcast_list: PodcastList, filename: str = None, compact: bool = False) -> None:
+        """
+        Save a podcast list.
+
+        Only podcasts changed since the previous export are encoded again;
+        the encoded JSON of unchanged podcasts is reused from the fragment
+        cache. The file is replaced atomically.
+
+        Args:
+            podcast_list (PodcastList): The podcast list to save.
+            filename (str): Target file, PodcastList-<VERSION>.json by default.
+            compact (bool): Write without indentation or spaces.
+        """
         if filename is None:
             filename = f"PodcastList-{PodcastJSON.VERSION}.json"
-        with open(filename, 'w') as f:
-            json.dump({"version": PodcastJSON.VERSION, "podcastlist": podcast_list.to_dict()}, f, indent=4)
+        _atomic_write(filename, PodcastJSON.encode_podcast_list(podcast_list, compact))
+
+    @staticmethod
+    def encode_podcast_list(podcast_list: PodcastList, compact: bool = False) -> str:
+        """
+        Encode a podcast list as the contents of a podcast list file.
+
+        Args:
+            podcast_list (PodcastList): The podcast list to encode.
+            compact (bool): Encode without indentation or spaces.
+
+        Returns:
+            str: The JSON document written by export_podcast_list.
+        """
+        fragments = [PodcastJSON.fragment_cache.encode(podcast, compact) for podcast in podcast_list.podcasts]
+        return _encode_document(PodcastJSON.VERSION, "podcastlist", "podcasts", fragments, compact)
 
     @staticmethod
-    def import_podcast_list(filename: str) -> PodcastList:
+    def iter_podcasts(filename: str, fetch: bool = False) -> Iterator[PodcastData]:
+        """
+        Stream the podcasts of a podcast list file one at a time.
+
+        The file is read incrementally and each podcast is built from its
+        own part of the document, so memory use is bounded by the largest
+        single podcast rather than by the whole library.
+
+        Args:
+            filename (str): Path of the podcast list file.
+            fetch (bool): Fetch every feed while loading; by default the
+                podcasts are only hydrated.
+
+        Yields:
+            PodcastData: The podcasts, in file order.
+
+        Raises:
+            ValueError: If the file has an unsupported version or is not a
+                podcast list document.
+        """
         with open(filename, 'r') as f:
-            data = json.load(f)
-            print("Reading podcast_list.json:", data)  # Debugging
-            if data.get("version") != PodcastJSON.VERSION:
+            stream = _JSONStream(f)
+            version: Optional[str] = None
+            # podcasts read before the version is known (the writer puts the
+            # version first, so this stays empty for files we wrote)
+            pending = []
+            for key in stream.object_keys():
+                if key == "version":
+                    version = stream.value()
+                    if version != PodcastJSON.VERSION:
+                        raise ValueError("Unsupported version")
+                elif key == "podcastlist":
+                    for list_key in stream.object_keys():
+                        if list_key != "podcasts":
+                            stream.value()
+                            continue
+                        for podcast_data in stream.array_items():
+                            podcast = PodcastData.from_dict(podcast_data, fetch=fetch, trusted=True)
+                            if version is None:
+                                pending.append(podcast)
+                            else:
+                                yield podcast
+                else:
+                    stream.value()
+            if version != PodcastJSON.VERSION:
                 raise ValueError("Unsupported version")
-            return PodcastList.from_dict(data.get("podcastlist"))
+            yield from pending
+
+    @staticmethod
+    def import_podcast_list(filename: str, fetch: bool = False) -> PodcastList:
+        # hydrate only by default, feeds are refreshed separately
+        return PodcastList(list(PodcastJSON.iter_podcasts(filename, fetch=fetch)))
 
     @staticmethod
-    def export_podcast_playlist(podcast_playlist: PodcastPlaylist, filename: str = None) -> None:
+    def export_podcast_playlist(podcast_playlist: PodcastPlaylist, filename: str = None,
+                                compact: bool = False) -> None:
+        """
+        Save the playlists.
+
+        Like export_podcast_list, unchanged playlists are not encoded again
+        and the file is replaced atomically.
+
+        Args:
+            podcast_playlist (PodcastPlaylist): The playlists to save.
+            filename (str): Target file, PodcastPlaylist-<VERSION>.json by default.
+            compact (bool): Write without indentation or spaces.
+        """
         if filename is None:
             filename = f"PodcastPlaylist-{PodcastJSON.VERSION}.json"
-        with open(filename, 'w') as f:
-            json.dump({"version": PodcastJSON.VERSION, "podcastplaylist": podcast_playlist.to_dict()}, f, indent=4)
+        _atomic_write(filename, PodcastJSON.encode_podcast_playlist(podcast_playlist, compact))
+
+    @staticmethod
+    def encode_podcast_playlist(podcast_playlist: PodcastPlaylist, compact: bool = False) -> str:
+        """
+        Encode playlists as the contents of a playlist file.
+
+        Args:
+            podcast_playlist (PodcastPlaylist): The playlists to encode.
+            compact (bool): Encode without indentation or spaces.
+
+        Returns:
+            str: The JSON document written by export_podcast_playlist.
+        """
+        fragments = [PodcastJSON.fragment_cache.encode(playlist, compact) for playlist in podcast_playlist.playlists]
+        return _encode_document(PodcastJSON.VERSION, "podcastplaylist", "playlists", fragments, compact)
 
     @staticmethod
     def import_podcast_playlist(filename: str) -> PodcastPlaylist:
@@ -35,4 +360,4 @@ class PodcastJSON:
             data = json.load(f)
             if data.get("version") != PodcastJSON.VERSION:
                 raise ValueError("Unsupported version")
-            return PodcastPlaylist.from_dict(data.get("podcastplaylist"))
+            return PodcastPlaylist.from_dict(data.get("podcastplaylist"), trusted=True)
@@ -0,0 +1,539 @@
+"""
+Asynchronous Feed Pipeline Module
+
+This module fetches and parses many podcast feeds with asyncio. It is the
+engine behind RSSPodcastParser.parse_feeds and is made of three stages
+connected by bounded queues:
+
+    fetch: up to fetch_concurrency coroutines download feeds with a small
+        HTTP/1.1 client built on asyncio streams, so thousands of requests
+        in flight cost sockets rather than threads. Like urllib it goes
+        through the proxies of the http_proxy / https_proxy environment
+        variables
+    parse: parse_workers coroutines hand each downloaded document to an
+        executor, where RSSPodcastParser.parse_document runs feedparser off
+        the event loop
+    merge: a single coroutine passes every ParsedFeed to the caller's merge
+        callback, so merges never run concurrently with each other
+
+When parsing or merging falls behind, the queues fill up and the fetchers
+wait instead of piling up downloaded documents in memory.
+
+The standard library has no asynchronous HTTP client, and running urllib on
+an executor would tie up one thread per request in flight for as long as a
+slow server keeps it waiting, which is what the fetch stage is meant to
+avoid. The client therefore covers only what feed fetching needs: GET with
+conditional headers, redirects, chunked and compressed bodies, and proxies.
+
+Classes:
+    FetchedFeed: The HTTP response to one feed request
+    FeedPipeline: The fetch, parse and merge pipeline
+
+Functions:
+    parse_fetched: Parse stage of one fetched feed
+"""
+import asyncio
+import base64
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import logging
+import socket
+import ssl
+import time
+from typing import Callable, Collection, Deque, Dict, List, Optional, Tuple, Union
+from urllib.parse import SplitResult, unquote, urljoin, urlsplit
+import urllib.request
+import zlib
+
+from zpodcast.parsers.rss import (FeedValidatorStore, HTTP_ERROR_STATUS, HTTP_NOT_MODIFIED, ParsedFeed,
+                                  RSSPodcastParser)
+
+
+# Default number of feed requests in flight at once
+DEFAULT_FETCH_CONCURRENCY = 32
+
+# Default number of concurrent requests sent to a single host
+DEFAULT_PER_HOST_LIMIT = 2
+
+# Default number of feeds parsed at once
+DEFAULT_PARSE_WORKERS = 4
+
+# Default capacity of the queues between the stages
+DEFAULT_QUEUE_SIZE = 16
+
+# Default time limit in seconds for a single feed request
+DEFAULT_FEED_TIMEOUT = 30
+
+# Default largest feed accepted, in bytes, before and after decompression
+DEFAULT_MAX_FEED_SIZE = 32 * 1024 * 1024
+
+# Bytes read at a time from a response without a length
+READ_CHUNK_SIZE = 64 * 1024
+
+# Redirects followed before a request fails
+MAX_REDIRECTS = 5
+
+REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
+
+USER_AGENT = "zpodcast"
+
+ACCEPT = "application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.9, */*;q=0.1"
+
+
+@dataclass
+class FetchedFeed:
+    """
+    The HTTP response to one feed request.
+
+    Attributes:
+        url (str): The URL of the feed as requested
+        status (Optional[int]): The HTTP status, None if the request failed
+        headers (Dict[str, str]): The response headers, names lower-cased
+        body (bytes): The decompressed response body
+        error (Optional[str]): Description of the failure, None otherwise
+    """
+
+    url: str
+    status: Optional[int] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    error: Optional[str] = None
+
+
+def parse_fetched(fetched: FetchedFeed) -> ParsedFeed:
+    """
+    Parse stage of one fetched feed.
+
+    A module level function of picklable arguments, so the parse stage can
+    run on a process pool as well as on threads.
+
+    Args:
+        fetched (FetchedFeed): The response to the feed request.
+
+    Returns:
+        ParsedFeed: The parsed feed, not_modified for a 304 response, or the
+            error of a failed request.
+    """
+    if fetched.error is not None:
+        return ParsedFeed(url=fetched.url, error=fetched.error)
+    if fetched.status == HTTP_NOT_MODIFIED:
+        return ParsedFeed(url=fetched.url, not_modified=True)
+    if fetched.status >= HTTP_ERROR_STATUS:
+        logging.error(f"HTTP error {fetched.status} fetching {fetched.url}")
+        return ParsedFeed(url=fetched.url, error=f"HTTP error {fetched.status}")
+    return RSSPodcastParser.parse_document(fetched.url, fetched.body, fetched.headers)
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode('latin-1').partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+def _too_large(limit: int) -> ValueError:
+    return ValueError(f"Feed larger than {limit} bytes")
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str], limit: int) -> bytes:
+    """
+    Read a response body of at most limit bytes.
+
+    Raises:
+        ValueError: If the body is larger than limit.
+    """
+    chunks = []
+    size = 0
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        while True:
+            chunk_size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if chunk_size == 0:
+                await _read_headers(reader)  # trailers
+                return b"".join(chunks)
+            size += chunk_size
+            if size > limit:
+                raise _too_large(limit)
+            chunks.append(await reader.readexactly(chunk_size))
+            await reader.readexactly(2)
+    length = headers.get('content-length')
+    if length is not None and length.isdigit():
+        if int(length) > limit:
+            raise _too_large(limit)
+        return await reader.readexactly(int(length))
+    # no length: the body ends when the server closes the connection
+    while True:
+        chunk = await reader.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return b"".join(chunks)
+        size += len(chunk)
+        if size > limit:
+            raise _too_large(limit)
+        chunks.append(chunk)
+
+
+def _inflate(body: bytes, wbits: int, limit: int) -> bytes:
+    decompressed = zlib.decompressobj(wbits).decompress(body, limit + 1)
+    if len(decompressed) > limit:
+        raise _too_large(limit)
+    return decompressed
+
+
+def _decode_body(body: bytes, headers: Dict[str, str], limit: int) -> bytes:
+    """
+    Undo the content encoding of a body, decompressing at most limit bytes.
+
+    Raises:
+        ValueError: If the decompressed body is larger than limit.
+        zlib.error: If the body is not validly compressed.
+    """
+    encoding = headers.get('content-encoding', '').lower()
+    if encoding in ('gzip', 'x-gzip'):
+        return _inflate(body, 16 + zlib.MAX_WBITS, limit)
+    if encoding == 'deflate':
+        try:
+            return _inflate(body, zlib.MAX_WBITS, limit)
+        except zlib.error:
+            # some servers send raw deflate data without the zlib header
+            return _inflate(body, -zlib.MAX_WBITS, limit)
+    return body
+
+
+def _bracketed(hostname: str) -> str:
+    # IPv6 literals are written in brackets next to a port
+    return f"[{hostname}]" if ':' in hostname else hostname
+
+
+def _host_header(parts: SplitResult) -> str:
+    """The Host header of a URL: its host and port, without any user info."""
+    host = _bracketed(parts.hostname)
+    return host if parts.port is None else f"{host}:{parts.port}"
+
+
+def _proxy_authorization(proxy: SplitResult) -> Optional[str]:
+    if proxy.username is None:
+        return None
+    credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+    return "Basic " + base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+
+
+class FeedPipeline:
+    """
+    Fetches, parses and merges feeds in bounded asyncio stages.
+
+    Attributes:
+        fetch_concurrency (int): Maximum number of requests in flight
+        per_host_limit (int): Maximum concurrent requests to one host
+        parse_workers (int): Maximum number of feeds parsed at once
+        queue_size (int): Capacity of the queues between the stages
+        timeout (Optional[float]): Time limit for each request, including
+            redirects, None for no limit
+        executor (Optional[Executor]): Runs the parse stage; by default a
+            thread pool of parse_workers threads created for each run
+        max_size (int): Largest feed accepted in bytes, before and after
+            decompression
+        proxies (Dict[str, str]): Proxy URL of each URL scheme, by default
+            read from the environment like urllib does; only http:// proxies
+            are supported
+
+    Example:
+        >>> pipeline = FeedPipeline(fetch_concurrency=100, parse_workers=4)
+        >>> results = asyncio.run(pipeline.run(urls))
+    """
+
+    def __init__(self, fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+                 per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                 parse_workers: int = DEFAULT_PARSE_WORKERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 timeout: Optional[float] = DEFAULT_FEED_TIMEOUT,
+                 executor: Optional[Executor] = None,
+                 max_size: int = DEFAULT_MAX_FEED_SIZE,
+                 proxies: Optional[Dict[str, str]] = None):
+        for name, value in (('fetch_concurrency', fetch_concurrency), ('per_host_limit', per_host_limit),
+                            ('parse_workers', parse_workers), ('queue_size', queue_size),
+                            ('max_size', max_size)):
+            if not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be a positive integer")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+        self.fetch_concurrency = fetch_concurrency
+        self.per_host_limit = per_host_limit
+        self.parse_workers = parse_workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.executor = executor
+        self.max_size = max_size
+        self.proxies = urllib.request.getproxies() if proxies is None else proxies
+        # loading the CA certificates is slow, do it once for all requests
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    @property
+    def ssl_context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    def _proxy_for(self, parts: SplitResult) -> Optional[SplitResult]:
+        proxy = self.proxies.get(parts.scheme)
+        if not proxy or urllib.request.proxy_bypass(parts.hostname):
+            return None
+        proxy_parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        if proxy_parts.scheme != 'http' or not proxy_parts.hostname:
+            raise ValueError(f"Unsupported proxy URL {proxy}")
+        return proxy_parts
+
+    async def _tunnel(self, proxy: SplitResult, parts: SplitResult, port: int) -> socket.socket:
+        """Open a connection to a host through a proxy with the CONNECT method."""
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(proxy.hostname, proxy.port or 80, type=socket.SOCK_STREAM)
+        family, kind, protocol, _, address = infos[0]
+        sock = socket.socket(family, kind, protocol)
+        try:
+            sock.setblocking(False)
+            await loop.sock_connect(sock, address)
+            target = f"{_bracketed(parts.hostname)}:{port}"
+            lines = [f"CONNECT {target} HTTP/1.1", f"Host: {target}", f"User-Agent: {USER_AGENT}"]
+            authorization = _proxy_authorization(proxy)
+            if authorization:
+                lines.append(f"Proxy-Authorization: {authorization}")
+            await loop.sock_sendall(sock, ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+            # read byte by byte so nothing of the TLS handshake is consumed
+            response = b""
+            while not response.endswith(b"\r\n\r\n"):
+                byte = await loop.sock_recv(sock, 1)
+                if not byte or len(response) > 65536:
+                    raise ValueError(f"Malformed CONNECT response from proxy {proxy.hostname}")
+                response += byte
+            status_line = response.split(b"\r\n", 1)[0].decode('latin-1').split()
+            if len(status_line) < 2 or status_line[1] != "200":
+                raise ValueError(f"Proxy {proxy.hostname} refused to connect to {target}: "
+                                 f"{' '.join(status_line[1:]) or 'no status'}")
+            return sock
+        except BaseException:
+            sock.close()
+            raise
+
+    async def _connect(self, parts: SplitResult
+                       ) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, str, Dict[str, str]]:
+        """
+        Open a connection for a URL, directly or through its proxy.
+
+        Returns:
+            Tuple[asyncio.StreamReader, asyncio.StreamWriter, str, Dict[str, str]]:
+                The streams, the request target and the proxy headers to send.
+        """
+        secure = parts.scheme == 'https'
+        port = parts.port or (443 if secure else 80)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        proxy_headers = {}
+        proxy = self._proxy_for(parts)
+        if proxy is None:
+            reader, writer = await asyncio.open_connection(
+                parts.hostname, port, ssl=self.ssl_context if secure else None)
+        elif secure:
+            sock = await self._tunnel(proxy, parts, port)
+            reader, writer = await asyncio.open_connection(
+                sock=sock, ssl=self.ssl_context, server_hostname=parts.hostname)
+        else:
+            reader, writer = await asyncio.open_connection(proxy.hostname, proxy.port or 80)
+            # a plain HTTP proxy is sent the absolute URL
+            target = f"http://{_host_header(parts)}{target}"
+            authorization = _proxy_authorization(proxy)
+            if authorization:
+                proxy_headers["Proxy-Authorization"] = authorization
+        return reader, writer, target, proxy_headers
+
+    async def _request(self, url: str, headers: Dict[str, str]) -> FetchedFeed:
+        """
+        Send a GET request, following redirects.
+
+        The request goes through the proxy of the URL's scheme unless the
+        host is excluded by no_proxy.
+
+        Raises:
+            OSError: If the connection failed.
+            ValueError: If the URL or the response is not usable HTTP.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ('http', 'https') or not parts.hostname:
+                raise ValueError(f"Unsupported feed URL {url}")
+            reader, writer, target, proxy_headers = await self._connect(parts)
+            try:
+                lines = [f"GET {target} HTTP/1.1", f"Host: {_host_header(parts)}", f"User-Agent: {USER_AGENT}",
+                         f"Accept: {ACCEPT}", "Accept-Encoding: gzip, deflate", "Connection: close"]
+                lines += [f"{name}: {value}" for name, value in {**proxy_headers, **headers}.items()]
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+                await writer.drain()
+
+                status_line = (await reader.readline()).decode('latin-1').split()
+                if len(status_line) < 2 or not status_line[1].isdigit():
+                    raise ValueError(f"Malformed HTTP response from {parts.hostname}")
+                status = int(status_line[1])
+                response_headers = await _read_headers(reader)
+                if status in REDIRECT_STATUSES and 'location' in response_headers:
+                    url = urljoin(url, response_headers['location'])
+                    continue
+                body = b""
+                if status not in (204, HTTP_NOT_MODIFIED):
+                    body = await _read_body(reader, response_headers, self.max_size)
+                return FetchedFeed(url=url, status=status, headers=response_headers,
+                                   body=_decode_body(body, response_headers, self.max_size))
+            finally:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+        raise ValueError(f"Too many redirects fetching {url}")
+
+    async def fetch(self, url: str, conditional: bool = False) -> FetchedFeed:
+        """
+        Download one feed.
+
+        Args:
+            url (str): The URL of the feed.
+            conditional (bool): Send the validators stored for the feed in
+                the FeedValidatorStore.
+
+        Returns:
+            FetchedFeed: The response, or the error of a failed request.
+        """
+        headers = {}
+        if conditional:
+            etag, modified = FeedValidatorStore.get_instance().get(url)
+            if etag:
+                headers['If-None-Match'] = etag
+            if modified:
+                headers['If-Modified-Since'] = modified
+        try:
+            fetched = await asyncio.wait_for(self._request(url, headers), self.timeout)
+        except asyncio.TimeoutError:
+            logging.error(f"Timeout fetching {url}")
+            return FetchedFeed(url=url, error=f"Timed out after {self.timeout} seconds")
+        except (OSError, ValueError, EOFError, zlib.error) as e:
+            logging.error(f"Error fetching {url}: {e}")
+            return FetchedFeed(url=url, error=str(e) or type(e).__name__)
+        # results are keyed by the URL that was asked for, not a redirect target
+        fetched.url = url
+        return fetched
+
+    async def run(self, urls: List[str], conditional: Union[bool, Collection[str]] = False,
+                  merge: Optional[Callable[[int, ParsedFeed], None]] = None) -> List[ParsedFeed]:
+        """
+        Fetch, parse and merge feeds.
+
+        Args:
+            urls (List[str]): The URLs of the feeds.
+            conditional (Union[bool, Collection[str]]): Send the stored
+                validators for every feed, or only for the feeds in the
+                collection.
+            merge (Optional[Callable[[int, ParsedFeed], None]]): Called on
+                the event loop thread with the position of each feed in
+                urls and its result, one feed at a time. An exception it
+                raises is logged and recorded as the feed's error.
+
+        Returns:
+            List[ParsedFeed]: One result per URL, in the order given.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.parse_workers,
+                                                       thread_name_prefix="feed-parse")
+        results: List[Optional[ParsedFeed]] = [None] * len(urls)
+        # the feeds of each host, and the hosts below their request limit
+        # that have feeds left, taken in turn
+        pending: Dict[str, Deque[Tuple[int, str]]] = {}
+        for position, url in enumerate(urls):
+            pending.setdefault(urlsplit(url).netloc.lower(), deque()).append((position, url))
+        active = {host: 0 for host in pending}
+        ready = deque(pending)
+        remaining = len(urls)
+        slot_freed = asyncio.Condition()
+        parse_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        merge_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        store = FeedValidatorStore.get_instance()
+
+        async def next_feed() -> Optional[Tuple[str, int, str]]:
+            nonlocal remaining
+            async with slot_freed:
+                # a fetcher never waits on a busy host while others have work
+                while not ready:
+                    if not remaining:
+                        return None
+                    await slot_freed.wait()
+                host = ready.popleft()
+                position, url = pending[host].popleft()
+                remaining -= 1
+                active[host] += 1
+                if pending[host] and active[host] < self.per_host_limit:
+                    ready.append(host)
+                return host, position, url
+
+        async def release(host: str) -> None:
+            async with slot_freed:
+                active[host] -= 1
+                if pending[host] and active[host] == self.per_host_limit - 1:
+                    ready.append(host)
+                slot_freed.notify_all()
+
+        async def fetcher() -> None:
+            while True:
+                selected = await next_feed()
+                if selected is None:
+                    return
+                host, position, url = selected
+                send_validators = conditional if isinstance(conditional, bool) else url in conditional
+                try:
+                    fetched = await self.fetch(url, send_validators)
+                finally:
+                    await release(host)
+                # waits while the parse stage is behind
+                await parse_queue.put((position, fetched))
+
+        async def parser() -> None:
+            while True:
+                item = await parse_queue.get()
+                if item is None:
+                    return
+                position, fetched = item
+                parsed = await loop.run_in_executor(executor, parse_fetched, fetched)
+                if parsed.ok and not parsed.not_modified:
+                    store.update(fetched.url, fetched.headers.get('etag'), fetched.headers.get('last-modified'))
+                await merge_queue.put((position, parsed))
+
+        async def merger() -> None:
+            while True:
+                item = await merge_queue.get()
+                if item is None:
+                    return
+                position, parsed = item
+                if merge is not None:
+                    try:
+                        merge(position, parsed)
+                    except Exception as e:
+                        logging.error(f"Error merging feed {parsed.url}: {e}")
+                        parsed.error = str(e)
+                results[position] = parsed
+
+        start = time.perf_counter()
+        merging = asyncio.ensure_future(merger())
+        parsing = [asyncio.ensure_future(parser()) for _ in range(self.parse_workers)]
+        fetching = [asyncio.ensure_future(fetcher()) for _ in range(min(self.fetch_concurrency, len(urls)))]
+        try:
+            await asyncio.gather(*fetching)
+            for _ in parsing:
+                await parse_queue.put(None)
+            await asyncio.gather(*parsing)
+            await merge_queue.put(None)
+            await merging
+        finally:
+            for task in fetching + parsing + [merging]:
+                task.cancel()
+            if self.executor is None:
+                executor.shutdown(wait=False)
+        logging.debug(f"Fetched {len(urls)} feeds in {time.perf_counter() - start:.2f} s")
+        return results
@@ -1,41 +1,523 @@
 import feedparser
 from zpodcast.parsers.opml import parse_opml_file
 from zpodcast.core.episode import PodcastEpisode
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+import asyncio
+import atexit
+import json
 import logging
+import threading
+import urllib.request
+
+if TYPE_CHECKING:
+    from zpodcast.core.playlist import EpisodeMergeResult
+
+
+# HTTP status code returned by a server when the conditional request
+# validators (ETag / Last-Modified) still match the current feed
+HTTP_NOT_MODIFIED = 304
+
+# Lowest HTTP status code that indicates a failed feed request
+HTTP_ERROR_STATUS = 400
+
+# File of the data directory the feed validators are persisted to
+VALIDATORS_FILE = "feed_validators.json"
+
+
+class FeedValidatorStore:
+    """
+    Records the HTTP cache validators returned for each podcast feed.
+
+    Every time a feed is fetched the server may return an ETag and/or a
+    Last-Modified header. Sending them back on the next request lets the
+    server answer with a bodiless 304 Not Modified when the feed has not
+    changed, so an unchanged feed costs one round trip and no parse.
+
+    The store is keyed by podcast_url and is safe to use from several
+    threads at once. Once attached to a file it is loaded from it, and
+    flush writes the validators back, so the first refresh after a restart
+    can be conditional too.
+
+    Attributes:
+        path (Optional[str]): The file the validators are persisted to,
+            None when they are only kept in memory
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+    _exit_flush_registered = False
+
+    def __init__(self, validators: Dict[str, Dict[str, str]] = None):
+        self._validators = dict(validators) if validators else {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.path: Optional[str] = None
+
+    @classmethod
+    def get_instance(cls) -> 'FeedValidatorStore':
+        """
+        Get the process wide validator store used by RSSPodcastParser.
+
+        Returns:
+            FeedValidatorStore: The shared validator store.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                # another thread may have created it while we waited
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def get(self, podcast_url: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the stored validators for a feed.
+
+        Args:
+            podcast_url (str): The URL of the podcast feed.
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: The (etag, modified) pair,
+                with None for any validator the server never supplied.
+        """
+        with self._lock:
+            entry = self._validators.get(podcast_url, {})
+            return entry.get('etag'), entry.get('modified')
+
+    def update(self, podcast_url: str, etag: Optional[str], modified: Optional[str]) -> None:
+        """
+        Record the validators returned by the server for a feed.
+
+        Values that are not strings are ignored, and a feed that returned
+        no validators at all has any previously stored entry removed so
+        the next request is unconditional.
+
+        Args:
+            podcast_url (str): The URL of the podcast feed.
+            etag (Optional[str]): The ETag header value.
+            modified (Optional[str]): The Last-Modified header value.
+        """
+        entry = {}
+        if isinstance(etag, str) and etag:
+            entry['etag'] = etag
+        if isinstance(modified, str) and modified:
+            entry['modified'] = modified
+
+        with self._lock:
+            if self._validators.get(podcast_url, {}) == entry:
+                return
+            if entry:
+                self._validators[podcast_url] = entry
+            else:
+                self._validators.pop(podcast_url, None)
+            self._dirty = True
+
+    def clear(self, podcast_url: str = None) -> None:
+        """
+        Forget the validators for one feed, or for every feed.
+
+        Args:
+            podcast_url (str): The feed to forget. When None the whole store
+                is cleared.
+        """
+        with self._lock:
+            if podcast_url is None:
+                self._dirty = self._dirty or bool(self._validators)
+                self._validators.clear()
+            elif self._validators.pop(podcast_url, None) is not None:
+                self._dirty = True
+
+    def to_dict(self) -> Dict[str, Dict[str, str]]:
+        """
+        Get a copy of every stored validator.
+
+        Returns:
+            Dict[str, Dict[str, str]]: Mapping of feed URL to its 'etag'
+                and 'modified' values.
+        """
+        with self._lock:
+            return {url: dict(entry) for url, entry in self._validators.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, str]]) -> 'FeedValidatorStore':
+        """
+        Create a store holding the validators returned by to_dict.
+
+        Args:
+            data (Dict[str, Dict[str, str]]): Mapping of feed URL to its
+                'etag' and 'modified' values.
+
+        Returns:
+            FeedValidatorStore: The new store.
+        """
+        return cls(validators={url: dict(entry) for url, entry in data.items()
+                               if isinstance(entry, dict)})
+
+    def attach(self, path: str) -> None:
+        """
+        Persist the validators to a file.
+
+        Validators already in the file are loaded; those recorded since
+        take precedence. An unreadable file is ignored. A store that was
+        attached to another file is flushed to it first and then holds
+        only the validators of the new file, so neither file receives the
+        other's feeds.
+
+        The shared store is flushed at interpreter exit, whatever file it
+        is attached to by then.
+
+        Args:
+            path (str): The JSON file to read from and flush to.
+        """
+        with self._lock:
+            previous = self.path
+        if previous is not None and previous != path:
+            self.flush()
+        try:
+            with open(path) as f:
+                loaded = self.from_dict(json.load(f)).to_dict()
+        except FileNotFoundError:
+            loaded = {}
+        except (OSError, ValueError, AttributeError) as e:
+            logging.error(f"Ignoring unreadable feed validators {path}: {e}")
+            loaded = {}
+        with self._lock:
+            if previous is None or previous == path:
+                self._validators = {**loaded, **self._validators}
+            else:
+                self._validators = loaded
+                self._dirty = False
+            self.path = path
+        with FeedValidatorStore._instance_lock:
+            if not FeedValidatorStore._exit_flush_registered:
+                atexit.register(FeedValidatorStore._flush_shared)
+                FeedValidatorStore._exit_flush_registered = True
+
+    @classmethod
+    def _flush_shared(cls) -> None:
+        """
+        Flush the shared store, if there is one.
+        """
+        if cls._instance is not None:
+            cls._instance.flush()
+
+    def flush(self) -> None:
+        """
+        Write the validators to the attached file if they changed.
+
+        Does nothing when the store is not attached to a file.
+        """
+        # imported here: the JSON module builds on the core modules, which
+        # import this one
+        from zpodcast.parsers.json import _atomic_write
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            _atomic_write(self.path, json.dumps(self._validators, separators=(',', ':')))
+            self._dirty = False
+
+
+@dataclass
+class ParsedFeed:
+    """
+    The result of fetching and parsing a podcast feed a single time.
+
+    Holds both the episode entries and the channel metadata of the feed so
+    callers that need both do not have to download and parse the feed
+    twice. Entries are plain dictionaries keyed like the PodcastEpisode
+    constructor arguments; PodcastEpisode objects are only built when the
+    episodes property is read, so an incremental merge can skip building
+    objects for episodes it already holds.
+
+    Attributes:
+        url (str): The URL of the feed that was fetched
+        entries (List[Dict[str, Any]]): The raw episode fields of every
+            usable feed entry, in feed order
+        metadata (Dict[str, Optional[str]]): The title, description, author
+            and image of the podcast
+        not_modified (bool): True when the server answered 304 Not Modified
+        error (Optional[str]): Description of the failure when the feed could
+            not be fetched or parsed, None on success
+        merge_result (Optional[EpisodeMergeResult]): The diff produced when
+            the entries were merged into a podcast's episode list
+    """
+
+    url: str
+    entries: List[Dict[str, Any]] = field(default_factory=list)
+    metadata: Dict[str, Optional[str]] = field(default_factory=dict)
+    not_modified: bool = False
+    error: Optional[str] = None
+    merge_result: Optional['EpisodeMergeResult'] = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the feed was fetched and parsed successfully.
+
+        Returns:
+            bool: True when the feed was parsed or was reported unchanged.
+        """
+        return self.error is None
+
+    @property
+    def episodes(self) -> List[PodcastEpisode]:
+        """
+        Build PodcastEpisode objects for every entry of the feed.
+
+        Returns:
+            List[PodcastEpisode]: The valid episodes of the feed.
+        """
+        return RSSPodcastParser.build_episodes(self.entries)
+
+
+class FeedTimeoutHandler(urllib.request.BaseHandler):
+    """
+    urllib handler that applies a socket timeout to feed requests.
+
+    feedparser.parse has no timeout argument but accepts extra urllib
+    handlers. Request pre-processors run after urllib has set the default
+    timeout on the request, so overriding it here bounds every socket
+    operation of a single feed fetch without touching the global socket
+    default used by other threads.
+    """
+
+    # run before the other handlers so redirects inherit the timeout
+    handler_order = 100
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+
+    def http_request(self, request):
+        request.timeout = self.timeout
+        return request
+
+    https_request = http_request
 
 
 class RSSPodcastParser:
     @staticmethod
-    def get_episodes(rss_feed_url: str) -> List[PodcastEpisode]:
+    def _fetch_feed(rss_feed_url: str, conditional: bool = False, timeout: Optional[float] = None):
+        """
+        Fetch and parse a feed, optionally as a conditional request.
+
+        When conditional is True the ETag / Last-Modified validators stored
+        for the feed are sent to the server. The validators returned with a
+        successfully parsed feed are recorded so a later conditional request
+        can use them; those of an error response never are.
+
+        Args:
+            rss_feed_url (str): The URL of the RSS feed.
+            conditional (bool): Whether to send the stored validators.
+            timeout (Optional[float]): Socket timeout in seconds for the
+                request. None uses the global socket default.
+
+        Returns:
+            feedparser.FeedParserDict: The parsed feed.
+        """
+        store = FeedValidatorStore.get_instance()
+        etag, modified = store.get(rss_feed_url) if conditional else (None, None)
+
+        kwargs = {}
+        if etag or modified:
+            kwargs['etag'] = etag
+            kwargs['modified'] = modified
+        if timeout is not None:
+            kwargs['handlers'] = [FeedTimeoutHandler(timeout)]
+        feed = feedparser.parse(rss_feed_url, **kwargs)
+
+        # A 304 carries no body, keep whatever validators we already had;
+        # feedparser does not flag HTTP errors as bozo, and the validators
+        # of an error page do not describe the feed
+        status = getattr(feed, 'status', None)
+        failed = isinstance(status, int) and status >= HTTP_ERROR_STATUS
+        if not RSSPodcastParser.is_not_modified(feed) and not feed.bozo and not failed:
+            store.update(rss_feed_url, getattr(feed, 'etag', None), getattr(feed, 'modified', None))
+        return feed
+
+    @staticmethod
+    def is_not_modified(feed) -> bool:
+        """
+        Check whether a parsed feed is a 304 Not Modified response.
+
+        Args:
+            feed: The result of feedparser.parse.
+
+        Returns:
+            bool: True when the server reported that the feed is unchanged.
+        """
+        return getattr(feed, 'status', None) == HTTP_NOT_MODIFIED
+
+    @staticmethod
+    def parse_feed(rss_feed_url: str, conditional: bool = False, timeout: Optional[float] = None) -> 'ParsedFeed':
+        """
+        Fetch and parse an RSS feed once, returning episodes and metadata.
+
+        get_episodes and get_rss_metadata each download and parse the feed
+        on their own. Callers that need both should use this method so the
+        feed costs a single request and a single XML parse.
+
+        Args:
+            rss_feed_url (str): The URL of the RSS feed.
+            conditional (bool): Send the stored ETag / Last-Modified
+                validators so an unchanged feed is not downloaded again.
+            timeout (Optional[float]): Socket timeout in seconds for the
+                request. None uses the global socket default.
+
+        Returns:
+            ParsedFeed: The episodes and channel metadata of the feed. When
+                the server answered 304 Not Modified not_modified is True
+                and both are empty; when the feed could not be fetched or
+                parsed error holds a description of the failure.
+
+        Example:
+            >>> parsed = RSSPodcastParser.parse_feed("https://example.com/feed.rss")
+            >>> print(parsed.metadata.get('title'), len(parsed.episodes))
+        """
+        try:
+            feed = RSSPodcastParser._fetch_feed(rss_feed_url, conditional, timeout)
+            return RSSPodcastParser._parsed_feed(rss_feed_url, feed)
+        except Exception as e:
+            logging.error(f"Error parsing RSS feed {rss_feed_url}: {e}")
+            return ParsedFeed(url=rss_feed_url, error=str(e))
+
+    @staticmethod
+    def parse_document(rss_feed_url: str, document: bytes,
+                       headers: Optional[Dict[str, str]] = None) -> 'ParsedFeed':
+        """
+        Parse a feed document that was already downloaded.
+
+        This is the CPU bound half of parse_feed, for callers that fetch
+        feeds themselves such as the asynchronous FeedPipeline. It does no
+        network access and only depends on its arguments, so it can run on
+        any executor, including a process pool.
+
+        Args:
+            rss_feed_url (str): The URL the document was fetched from.
+            document (bytes): The body of the feed response.
+            headers (Optional[Dict[str, str]]): The response headers, used
+                to detect the character encoding.
+
+        Returns:
+            ParsedFeed: The episodes and channel metadata of the feed, or
+                the parse error.
+        """
+        try:
+            feed = feedparser.parse(document, response_headers=headers or {})
+            return RSSPodcastParser._parsed_feed(rss_feed_url, feed)
+        except Exception as e:
+            logging.error(f"Error parsing RSS feed {rss_feed_url}: {e}")
+            return ParsedFeed(url=rss_feed_url, error=str(e))
+
+    @staticmethod
+    def _parsed_feed(rss_feed_url: str, feed) -> 'ParsedFeed':
+        """
+        Turn the result of feedparser.parse into a ParsedFeed.
+
+        Args:
+            rss_feed_url (str): The URL of the feed.
+            feed: The result of feedparser.parse.
+
+        Returns:
+            ParsedFeed: The feed's entries and metadata, not_modified for a
+                304 response, or the error for a malformed feed or an HTTP
+                error.
+        """
+        if RSSPodcastParser.is_not_modified(feed):
+            return ParsedFeed(url=rss_feed_url, not_modified=True)
+
+        if feed.bozo:  # feedparser error
+            logging.error(f"Feed parsing error for {rss_feed_url}: {feed.bozo_exception}")
+            return ParsedFeed(url=rss_feed_url, error=str(feed.bozo_exception))
+
+        # an HTTP error page is not an empty feed, report it as a failure
+        status = getattr(feed, 'status', None)
+        if isinstance(status, int) and status >= HTTP_ERROR_STATUS:
+            logging.error(f"HTTP error {status} fetching {rss_feed_url}")
+            return ParsedFeed(url=rss_feed_url, error=f"HTTP error {status}")
+
+        return ParsedFeed(url=rss_feed_url,
+                          entries=RSSPodcastParser._extract_entries(feed),
+                          metadata=RSSPodcastParser._extract_metadata(feed))
+
+    @staticmethod
+    def parse_feeds(rss_feed_urls: List[str], conditional: Union[bool, Collection[str]] = False,
+                    merge: Optional[Callable[[int, 'ParsedFeed'], None]] = None,
+                    **options) -> List['ParsedFeed']:
+        """
+        Fetch and parse many feeds with the asynchronous FeedPipeline.
+
+        This is the bulk alternative to calling parse_feed once per feed:
+        the requests are made concurrently by an asyncio event loop, so
+        thousands of feeds need a handful of threads rather than one thread
+        per feed in flight. It starts its own event loop; code already
+        running in one should await parse_feeds_async instead.
+
+        Args:
+            rss_feed_urls (List[str]): The URLs of the feeds.
+            conditional (Union[bool, Collection[str]]): Send the stored
+                ETag / Last-Modified validators for every feed, or only for
+                the feeds in the collection.
+            merge (Optional[Callable[[int, ParsedFeed], None]]): Called on
+                the event loop thread with the position of every feed in
+                rss_feed_urls and its ParsedFeed as soon as it is parsed,
+                one feed at a time.
+            **options: FeedPipeline options (fetch_concurrency,
+                per_host_limit, parse_workers, queue_size, timeout,
+                executor).
+
+        Returns:
+            List[ParsedFeed]: One result per URL, in the order given.
+
+        Example:
+            >>> results = RSSPodcastParser.parse_feeds(urls, fetch_concurrency=100)
+            >>> print(sum(parsed.ok for parsed in results))
+        """
+        return asyncio.run(RSSPodcastParser.parse_feeds_async(rss_feed_urls, conditional, merge, **options))
+
+    @staticmethod
+    async def parse_feeds_async(rss_feed_urls: List[str], conditional: Union[bool, Collection[str]] = False,
+                                merge: Optional[Callable[[int, 'ParsedFeed'], None]] = None,
+                                **options) -> List['ParsedFeed']:
+        """
+        Fetch and parse many feeds on the running event loop.
+
+        Takes the same arguments as parse_feeds.
+
+        Returns:
+            List[ParsedFeed]: One result per URL, in the order given.
+        """
+        # imported here: the pipeline module builds on this one
+        from zpodcast.parsers.pipeline import FeedPipeline
+        return await FeedPipeline(**options).run(rss_feed_urls, conditional, merge)
+
+    @staticmethod
+    def get_episodes(rss_feed_url: str, conditional: bool = False) -> Optional[List[PodcastEpisode]]:
+        """
+        Retrieve and parse the episodes of an RSS feed.
+
+        Args:
+            rss_feed_url (str): The URL of the RSS feed.
+            conditional (bool): Send the stored ETag / Last-Modified
+                validators so an unchanged feed is not downloaded again.
+
+        Returns:
+            Optional[List[PodcastEpisode]]: The episodes of the feed, an
+                empty list if the feed could not be parsed, or None when
+                conditional is True and the server answered 304 Not
+                Modified.
+        """
         try:
             # Parse the RSS feed using feedparser library
-            feed = feedparser.parse(rss_feed_url)
-            
+            feed = RSSPodcastParser._fetch_feed(rss_feed_url, conditional)
+
+            if RSSPodcastParser.is_not_modified(feed):
+                return None
+
             if feed.bozo:  # feedparser error
                 logging.error(f"Feed parsing error for {rss_feed_url}: {feed.bozo_exception}")
                 return []
 
-            episodes = []
-            for entry in feed.entries:
-                try:
-                    # Extract relevant information for each episode
-                    episode = PodcastEpisode(
-                        title=entry['title'],  # Episode title
-                        audio_url=entry['enclosures'][0]['href'] if entry.get('enclosures') else None,  # Episode audio URL
-                        description=entry['description'],  # Episode description
-                        pub_date=entry['published'],  # Episode published date
-                        duration=entry.get('itunes_duration'),  # Episode duration
-                        episode_number=entry.get('itunes_episode'),  # Episode number
-                        image_url=entry.get('image', {}).get('href'),  # Episode image URL
-                        guid=entry.get('guid')  # Episode GUID
-                    )
-                    episodes.append(episode)
-                except Exception as e:
-                    logging.error(f"Error creating episode from entry: {e}")
-                    continue
-
-            return episodes
+            return RSSPodcastParser.build_episodes(RSSPodcastParser._extract_entries(feed))
         except Exception as e:
             logging.error(f"Error parsing RSS feed {rss_feed_url}: {e}")
             return []
@@ -45,25 +527,98 @@ class RSSPodcastParser:
     def get_rss_metadata(rss_feed_url: str) -> dict:
         try:
             # Parse the RSS feed using feedparser library
-            feed = feedparser.parse(rss_feed_url)
+            feed = RSSPodcastParser._fetch_feed(rss_feed_url)
             
             if feed.bozo:  # feedparser error
                 logging.error(f"Feed parsing error for {rss_feed_url}: {feed.bozo_exception}")
                 return {}
 
-            # Get feed metadata
-            feed_data = feed.feed
-            podcast_meta = {
-                'title': feed_data.get('title'),
-                'description': feed_data.get('description'),
-                'author': feed_data.get('author'),
-                'image': feed_data.get('image', {}).get('href')
-            }
-            return podcast_meta
+            return RSSPodcastParser._extract_metadata(feed)
         except Exception as e:
             logging.error(f"Error getting RSS metadata for {rss_feed_url}: {e}")
             return {}
 
+    @staticmethod
+    def _extract_entries(feed) -> List[Dict[str, Any]]:
+        """
+        Extract the raw episode fields from the entries of a parsed feed.
+
+        No validation happens here beyond skipping entries that lack the
+        fields every episode needs; the values are validated when a
+        PodcastEpisode is built from the entry.
+
+        Args:
+            feed: The result of feedparser.parse.
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary of PodcastEpisode
+                constructor arguments per usable entry, in feed order.
+        """
+        entries = []
+        for entry in feed.entries:
+            try:
+                # Extract relevant information for each episode
+                entries.append({
+                    'title': entry['title'],  # Episode title
+                    'audio_url': entry['enclosures'][0]['href'] if entry.get('enclosures') else None,  # Episode audio URL
+                    'description': entry['description'],  # Episode description
+                    # feedparser's parsed date saves parsing the string again
+                    'pub_date': entry.get('published_parsed') or entry['published'],  # Episode published date
+                    'duration': entry.get('itunes_duration'),  # Episode duration
+                    'episode_number': entry.get('itunes_episode'),  # Episode number
+                    'image_url': entry.get('image', {}).get('href'),  # Episode image URL
+                    'guid': entry.get('guid')  # Episode GUID
+                })
+            except Exception as e:
+                logging.error(f"Error reading feed entry: {e}")
+                continue
+
+        return entries
+
+    @staticmethod
+    def build_episodes(entries: List[Dict[str, Any]]) -> List[PodcastEpisode]:
+        """
+        Build PodcastEpisode objects from raw feed entries.
+
+        Entries that cannot be turned into a valid episode are logged and
+        skipped so one bad entry does not prevent loading the others.
+
+        Args:
+            entries (List[Dict[str, Any]]): Entries from _extract_entries.
+
+        Returns:
+            List[PodcastEpisode]: The episodes of the feed.
+        """
+        episodes = []
+        for entry in entries:
+            try:
+                episodes.append(PodcastEpisode(**entry))
+            except Exception as e:
+                logging.error(f"Error creating episode from entry: {e}")
+                continue
+
+        return episodes
+
+    @staticmethod
+    def _extract_metadata(feed) -> dict:
+        """
+        Extract the channel level metadata of a parsed feed.
+
+        Args:
+            feed: The result of feedparser.parse.
+
+        Returns:
+            dict: The title, description, author and image of the podcast.
+        """
+        feed_data = feed.feed
+        podcast_meta = {
+            'title': feed_data.get('title'),
+            'description': feed_data.get('description'),
+            'author': feed_data.get('author'),
+            'image': feed_data.get('image', {}).get('href')
+        }
+        return podcast_meta
+
     @staticmethod
     def _convert_duration_to_seconds(duration):
         if duration is None:
@@ -0,0 +1,580 @@
+"""
+SQLite Persistence Module
+
+This module stores the podcast library and the user's playlists in a SQLite
+database, as an alternative to the PodcastJSON files. Podcasts, their
+episode lists, episodes and playlist membership live in indexed tables, so
+saving one podcast or one playlist only touches that podcast's or
+playlist's rows inside a single transaction instead of rewriting the whole
+library, and loading does not have to parse one large document.
+
+Playlist entries reference the stored episodes: an episode of a playlist
+that also belongs to a podcast is stored once, matched when both its GUID
+and its audio URL agree. GUIDs are only unique within a feed, so a GUID
+alone could pick another podcast's episode.
+
+The store remembers which row each podcast it loaded or saved was stored
+in, so a podcast whose feed URL changed is saved over its old row and
+podcasts sharing a feed URL keep a row each.
+
+Classes:
+    PodcastSQLite: Reads and writes PodcastList / PodcastPlaylist objects
+
+Functions:
+    migrate_json_to_sqlite: Imports PodcastJSON files into a database
+
+Usage:
+    python -m zpodcast.parsers.sqlite podcast_list.json podcast_playlist.json zpodcast.db
+"""
+import argparse
+import sqlite3
+import weakref
+from typing import Dict, List, Optional, Set, Tuple
+
+from zpodcast.core.episode import PodcastEpisode
+from zpodcast.core.playlist import PodcastEpisodeList
+from zpodcast.core.playlists import PodcastPlaylist
+from zpodcast.core.podcast import PodcastData
+from zpodcast.core.podcasts import PodcastList
+from zpodcast.parsers.json import PodcastJSON
+
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS podcasts (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    podcast_url TEXT NOT NULL,
+    host TEXT,
+    description TEXT,
+    podcast_priority INTEGER,
+    image_url TEXT,
+    name_set_manually INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_podcasts_position ON podcasts (position);
+CREATE INDEX IF NOT EXISTS idx_podcasts_url ON podcasts (podcast_url);
+
+CREATE TABLE IF NOT EXISTS episode_lists (
+    id INTEGER PRIMARY KEY,
+    podcast_id INTEGER NOT NULL REFERENCES podcasts (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_episode_lists_podcast ON episode_lists (podcast_id, position);
+
+CREATE TABLE IF NOT EXISTS episodes (
+    id INTEGER PRIMARY KEY,
+    list_id INTEGER REFERENCES episode_lists (id) ON DELETE SET NULL,
+    position INTEGER NOT NULL DEFAULT 0,
+    title TEXT,
+    audio_url TEXT,
+    description TEXT,
+    pub_date TEXT,
+    duration INTEGER,
+    episode_number INTEGER,
+    image_url TEXT,
+    guid TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_episodes_list ON episodes (list_id, position);
+CREATE INDEX IF NOT EXISTS idx_episodes_guid ON episodes (guid);
+CREATE INDEX IF NOT EXISTS idx_episodes_audio_url ON episodes (audio_url);
+
+CREATE TABLE IF NOT EXISTS playlists (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL UNIQUE,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS playlist_episodes (
+    playlist_id INTEGER NOT NULL REFERENCES playlists (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    episode_id INTEGER NOT NULL REFERENCES episodes (id),
+    PRIMARY KEY (playlist_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_playlist_episodes_episode ON playlist_episodes (episode_id);
+"""
+
+# Episode columns in the order used by the queries below
+EPISODE_COLUMNS = ('title', 'audio_url', 'description', 'pub_date', 'duration',
+                   'episode_number', 'image_url', 'guid')
+
+# Removes episodes that belong neither to a podcast nor to a playlist
+DELETE_ORPHAN_EPISODES = """
+DELETE FROM episodes
+WHERE list_id IS NULL
+  AND id NOT IN (SELECT episode_id FROM playlist_episodes)
+"""
+
+
+class PodcastSQLite:
+    """
+    SQLite storage for the podcast library and playlists.
+
+    Every public method runs in its own transaction: either all of its
+    changes are stored or none are.
+
+    Attributes:
+        filename (str): Path of the database file (":memory:" for an in
+            memory database)
+
+    Example:
+        >>> with PodcastSQLite("zpodcast.db") as store:
+        ...     store.save_podcast(podcast)
+        ...     podcast_list = store.import_podcast_list()
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        # id(podcast) -> (podcast, its row id), see _podcast_row
+        self._rows: Dict[int, Tuple[weakref.ref, int]] = {}
+        self._create_schema()
+
+    def __enter__(self) -> 'PodcastSQLite':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _create_schema(self) -> None:
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise ValueError("Unsupported version")
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    """
+    Row conversion
+    """
+    @staticmethod
+    def _episode_row(episode: PodcastEpisode) -> Tuple:
+        episode_dict = episode.to_dict()
+        return tuple(episode_dict[name] for name in EPISODE_COLUMNS)
+
+    @staticmethod
+    def _episode_from_row(row: Tuple) -> PodcastEpisode:
+        # rows are written from validated episodes
+        return PodcastEpisode.from_dict(dict(zip(EPISODE_COLUMNS, row)), trusted=True)
+
+    def _find_episode_id(self, cursor: sqlite3.Cursor, episode: PodcastEpisode) -> Optional[int]:
+        """
+        Find a stored episode with the same GUID and audio URL.
+
+        Playlist episodes do not record their feed, and a GUID is only
+        unique within one feed; the audio URL belongs to the episode's own
+        feed, so requiring both never matches another feed's episode.
+        Episodes that belong to a podcast are preferred over episodes that
+        are only referenced by playlists.
+        """
+        row = cursor.execute(
+            "SELECT id FROM episodes WHERE audio_url = ? AND guid IS ? ORDER BY list_id IS NULL LIMIT 1",
+            (episode.audio_url, episode.guid)).fetchone()
+        return row[0] if row else None
+
+    """
+    Podcasts
+    """
+    def _save_episode_list(self, cursor: sqlite3.Cursor, list_id: int,
+                           episodes: List[PodcastEpisode]) -> None:
+        # match the stored rows of the list by GUID, then audio URL, so only
+        # new or changed episodes are written
+        stored = cursor.execute(
+            f"SELECT id, position, {', '.join(EPISODE_COLUMNS)} FROM episodes WHERE list_id = ?",
+            (list_id,)).fetchall()
+        by_guid = {row[9]: row for row in stored if row[9]}
+        by_url = {row[3]: row for row in stored}
+
+        kept = set()
+        for position, episode in enumerate(episodes):
+            values = self._episode_row(episode)
+            row = by_guid.get(episode.guid) if episode.guid else None
+            if row is None:
+                row = by_url.get(episode.audio_url)
+            if row is None or row[0] in kept:
+                cursor.execute(
+                    f"INSERT INTO episodes (list_id, position, {', '.join(EPISODE_COLUMNS)}) "
+                    f"VALUES (?, ?, {', '.join('?' * len(EPISODE_COLUMNS))})",
+                    (list_id, position) + values)
+                kept.add(cursor.lastrowid)
+                continue
+            kept.add(row[0])
+            if row[1] != position or tuple(row[2:]) != values:
+                cursor.execute(
+                    f"UPDATE episodes SET position = ?, {', '.join(f'{name} = ?' for name in EPISODE_COLUMNS)} "
+                    f"WHERE id = ?",
+                    (position,) + values + (row[0],))
+
+        removed = [(row[0],) for row in stored if row[0] not in kept]
+        cursor.executemany("UPDATE episodes SET list_id = NULL WHERE id = ?", removed)
+
+    def _track(self, podcast: PodcastData, podcast_id: int) -> None:
+        self._rows[id(podcast)] = (weakref.ref(podcast), podcast_id)
+
+    def _podcast_row(self, cursor: sqlite3.Cursor, podcast: PodcastData,
+                     used: Set[int] = frozenset()) -> Optional[Tuple[int, int]]:
+        """
+        Find the stored row of a podcast.
+
+        A podcast this store loaded or saved keeps its row even if its feed
+        URL changed; any other podcast takes the first row with its feed URL
+        that is neither in used nor the row of another live podcast.
+
+        Returns:
+            Optional[Tuple[int, int]]: The id and position of the row, None
+                for a new podcast.
+        """
+        tracked = self._rows.get(id(podcast))
+        if tracked is not None and tracked[0]() is podcast and tracked[1] not in used:
+            row = cursor.execute("SELECT id, position FROM podcasts WHERE id = ?", (tracked[1],)).fetchone()
+            if row:
+                return row
+        claimed = set(used)
+        for ref, podcast_id in self._rows.values():
+            other = ref()
+            if other is not None and other is not podcast:
+                claimed.add(podcast_id)
+        for row in cursor.execute("SELECT id, position FROM podcasts WHERE podcast_url = ? ORDER BY position",
+                                  (podcast.podcast_url,)).fetchall():
+            if row[0] not in claimed:
+                return row
+        return None
+
+    def _save_podcast(self, cursor: sqlite3.Cursor, podcast: PodcastData,
+                      position: Optional[int] = None, used: Set[int] = frozenset()) -> int:
+        row = self._podcast_row(cursor, podcast, used)
+        if position is None:
+            if row:
+                position = row[1]
+            else:
+                position = cursor.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM podcasts").fetchone()[0]
+        values = (position, podcast.title, podcast.podcast_url, podcast.host, podcast.description,
+                  podcast.podcast_priority, podcast.image_url, int(podcast.name_set_manually))
+        if row:
+            podcast_id = row[0]
+            cursor.execute(
+                "UPDATE podcasts SET position = ?, title = ?, podcast_url = ?, host = ?, description = ?, "
+                "podcast_priority = ?, image_url = ?, name_set_manually = ? WHERE id = ?",
+                values + (podcast_id,))
+        else:
+            cursor.execute(
+                "INSERT INTO podcasts (position, title, podcast_url, host, description, "
+                "podcast_priority, image_url, name_set_manually) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                values)
+            podcast_id = cursor.lastrowid
+        self._track(podcast, podcast_id)
+
+        list_ids = [list_row[0] for list_row in cursor.execute(
+            "SELECT id FROM episode_lists WHERE podcast_id = ? ORDER BY position", (podcast_id,))]
+        for list_position, episodelist in enumerate(podcast.episodelists):
+            if list_position < len(list_ids):
+                list_id = list_ids[list_position]
+                cursor.execute("UPDATE episode_lists SET name = ? WHERE id = ?", (episodelist.name, list_id))
+            else:
+                cursor.execute("INSERT INTO episode_lists (podcast_id, position, name) VALUES (?, ?, ?)",
+                               (podcast_id, list_position, episodelist.name))
+                list_id = cursor.lastrowid
+            self._save_episode_list(cursor, list_id, episodelist.episodes)
+        cursor.executemany("DELETE FROM episode_lists WHERE id = ?",
+                           [(list_id,) for list_id in list_ids[len(podcast.episodelists):]])
+        cursor.execute(DELETE_ORPHAN_EPISODES)
+        return podcast_id
+
+    def save_podcast(self, podcast: PodcastData) -> int:
+        """
+        Insert or update a single podcast and its episodes.
+
+        A podcast loaded or saved by this store updates its own row, even
+        after its feed URL changed; another podcast is identified by its
+        feed URL. A new podcast is added at the end of the library. Only
+        episode rows that are new or changed are written.
+
+        Args:
+            podcast (PodcastData): The podcast to store.
+
+        Returns:
+            int: The database id of the podcast.
+        """
+        with self._connection:
+            return self._save_podcast(self._connection.cursor(), podcast)
+
+    def delete_podcast(self, podcast_url: str) -> bool:
+        """
+        Delete a podcast and its episodes.
+
+        Episodes that are also in a playlist are kept for that playlist.
+        When several podcasts share the feed URL the first one is deleted.
+
+        Args:
+            podcast_url (str): The feed URL of the podcast.
+
+        Returns:
+            bool: True if the podcast was stored, False otherwise.
+        """
+        with self._connection:
+            cursor = self._connection.cursor()
+            row = cursor.execute("SELECT id, position FROM podcasts WHERE podcast_url = ? ORDER BY position",
+                                 (podcast_url,)).fetchone()
+            if row is None:
+                return False
+            cursor.execute("DELETE FROM podcasts WHERE id = ?", (row[0],))
+            cursor.execute("UPDATE podcasts SET position = position - 1 WHERE position > ?", (row[1],))
+            cursor.execute(DELETE_ORPHAN_EPISODES)
+            return True
+
+    def save_episode(self, podcast_url: str, episode: PodcastEpisode) -> int:
+        """
+        Insert or update a single episode of a podcast.
+
+        The episode is matched against the podcast's first episode list by
+        GUID, then audio URL; a new episode is appended to that list.
+
+        Args:
+            podcast_url (str): The feed URL of the podcast.
+            episode (PodcastEpisode): The episode to store.
+
+        Returns:
+            int: The database id of the episode.
+
+        Raises:
+            ValueError: If the podcast is not stored.
+        """
+        with self._connection:
+            cursor = self._connection.cursor()
+            row = cursor.execute(
+                "SELECT podcasts.id, episode_lists.id FROM podcasts "
+                "LEFT JOIN episode_lists ON episode_lists.podcast_id = podcasts.id AND episode_lists.position = 0 "
+                "WHERE podcasts.podcast_url = ? ORDER BY podcasts.position", (podcast_url,)).fetchone()
+            if row is None:
+                raise ValueError("Podcast not found")
+            podcast_id, list_id = row
+            if list_id is None:
+                title = cursor.execute("SELECT title FROM podcasts WHERE id = ?", (podcast_id,)).fetchone()[0]
+                cursor.execute("INSERT INTO episode_lists (podcast_id, position, name) VALUES (?, 0, ?)",
+                               (podcast_id, f"{title} episode list"))
+                list_id = cursor.lastrowid
+
+            values = self._episode_row(episode)
+            existing = None
+            if episode.guid:
+                existing = cursor.execute("SELECT id FROM episodes WHERE list_id = ? AND guid = ?",
+                                          (list_id, episode.guid)).fetchone()
+            if existing is None:
+                existing = cursor.execute("SELECT id FROM episodes WHERE list_id = ? AND audio_url = ?",
+                                          (list_id, episode.audio_url)).fetchone()
+            if existing:
+                cursor.execute(
+                    f"UPDATE episodes SET {', '.join(f'{name} = ?' for name in EPISODE_COLUMNS)} WHERE id = ?",
+                    values + (existing[0],))
+                return existing[0]
+
+            position = cursor.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM episodes WHERE list_id = ?",
+                                      (list_id,)).fetchone()[0]
+            cursor.execute(
+                f"INSERT INTO episodes (list_id, position, {', '.join(EPISODE_COLUMNS)}) "
+                f"VALUES (?, ?, {', '.join('?' * len(EPISODE_COLUMNS))})",
+                (list_id, position) + values)
+            return cursor.lastrowid
+
+    def export_podcast_list(self, podcast_list: PodcastList) -> None:
+        """
+        Store a whole podcast library, replacing the stored podcasts.
+
+        Podcasts that are already stored are updated row by row, each in
+        its own row even when several share a feed URL; podcasts missing
+        from the list are deleted.
+
+        Args:
+            podcast_list (PodcastList): The library to store.
+        """
+        with self._connection:
+            cursor = self._connection.cursor()
+            used: Set[int] = set()
+            for position, podcast in enumerate(podcast_list.podcasts):
+                used.add(self._save_podcast(cursor, podcast, position, used))
+            stale = [(row[0],) for row in cursor.execute("SELECT id FROM podcasts").fetchall() if row[0] not in used]
+            cursor.executemany("DELETE FROM podcasts WHERE id = ?", stale)
+            cursor.execute(DELETE_ORPHAN_EPISODES)
+
+    def _load_episode_lists(self, podcast_ids: List[int]) -> Dict[int, List[PodcastEpisodeList]]:
+        episodes_by_list: Dict[int, List[PodcastEpisode]] = {}
+        for row in self._connection.execute(
+                f"SELECT list_id, {', '.join(EPISODE_COLUMNS)} FROM episodes "
+                f"WHERE list_id IS NOT NULL ORDER BY list_id, position"):
+            episodes_by_list.setdefault(row[0], []).append(self._episode_from_row(row[1:]))
+
+        lists: Dict[int, List[PodcastEpisodeList]] = {podcast_id: [] for podcast_id in podcast_ids}
+        for list_id, podcast_id, name in self._connection.execute(
+                "SELECT id, podcast_id, name FROM episode_lists ORDER BY podcast_id, position"):
+            lists.setdefault(podcast_id, []).append(
+                PodcastEpisodeList(name=name, episodes=episodes_by_list.get(list_id, [])))
+        return lists
+
+    def import_podcast_list(self, fetch: bool = False) -> PodcastList:
+        """
+        Load the podcast library.
+
+        Args:
+            fetch (bool): Fetch every feed while loading; by default the
+                podcasts are only hydrated and left refresh_pending.
+
+        Returns:
+            PodcastList: The stored library, in library order.
+        """
+        rows = self._connection.execute(
+            "SELECT id, title, podcast_url, host, description, podcast_priority, image_url, name_set_manually "
+            "FROM podcasts ORDER BY position").fetchall()
+        lists = self._load_episode_lists([row[0] for row in rows])
+        # forget the podcasts of earlier loads that are gone
+        self._rows = {key: tracked for key, tracked in self._rows.items() if tracked[0]() is not None}
+
+        podcasts = []
+        for podcast_id, title, podcast_url, host, description, priority, image_url, name_set_manually in rows:
+            podcast = PodcastData(
+                title=title,
+                podcast_url=podcast_url,
+                host=host,
+                description=description,
+                episodelists=lists[podcast_id],
+                podcast_priority=priority,
+                image_url=image_url,
+                name_set_manually=bool(name_set_manually),
+                fetch=fetch
+            )
+            self._track(podcast, podcast_id)
+            podcasts.append(podcast)
+        return PodcastList(podcasts)
+
+    """
+    Playlists
+    """
+    def _save_playlist(self, cursor: sqlite3.Cursor, position: int, playlist: PodcastEpisodeList) -> int:
+        row = cursor.execute("SELECT id FROM playlists WHERE position = ?", (position,)).fetchone()
+        if row:
+            playlist_id = row[0]
+            cursor.execute("UPDATE playlists SET name = ? WHERE id = ?", (playlist.name, playlist_id))
+        else:
+            cursor.execute("INSERT INTO playlists (position, name) VALUES (?, ?)", (position, playlist.name))
+            playlist_id = cursor.lastrowid
+
+        # only the member rows whose episode changed are written
+        stored = dict(cursor.execute("SELECT position, episode_id FROM playlist_episodes WHERE playlist_id = ?",
+                                     (playlist_id,)).fetchall())
+        episodes = playlist.episodes
+        for episode_position, episode in enumerate(episodes):
+            episode_id = self._find_episode_id(cursor, episode)
+            if episode_id is None:
+                cursor.execute(
+                    f"INSERT INTO episodes (list_id, {', '.join(EPISODE_COLUMNS)}) "
+                    f"VALUES (NULL, {', '.join('?' * len(EPISODE_COLUMNS))})",
+                    self._episode_row(episode))
+                episode_id = cursor.lastrowid
+            if episode_position not in stored:
+                cursor.execute("INSERT INTO playlist_episodes (playlist_id, position, episode_id) VALUES (?, ?, ?)",
+                               (playlist_id, episode_position, episode_id))
+            elif stored[episode_position] != episode_id:
+                cursor.execute("UPDATE playlist_episodes SET episode_id = ? WHERE playlist_id = ? AND position = ?",
+                               (episode_id, playlist_id, episode_position))
+        cursor.execute("DELETE FROM playlist_episodes WHERE playlist_id = ? AND position >= ?",
+                       (playlist_id, len(episodes)))
+        return playlist_id
+
+    def save_playlist(self, position: int, playlist: PodcastEpisodeList) -> int:
+        """
+        Insert or replace the playlist at a position.
+
+        Args:
+            position (int): The index of the playlist in PodcastPlaylist.
+            playlist (PodcastEpisodeList): The playlist to store.
+
+        Returns:
+            int: The database id of the playlist.
+        """
+        with self._connection:
+            cursor = self._connection.cursor()
+            playlist_id = self._save_playlist(cursor, position, playlist)
+            cursor.execute(DELETE_ORPHAN_EPISODES)
+            return playlist_id
+
+    def export_podcast_playlist(self, podcast_playlist: PodcastPlaylist) -> None:
+        """
+        Store all playlists, replacing the stored playlists.
+
+        Args:
+            podcast_playlist (PodcastPlaylist): The playlists to store.
+        """
+        with self._connection:
+            cursor = self._connection.cursor()
+            for position, playlist in enumerate(podcast_playlist.playlists):
+                self._save_playlist(cursor, position, playlist)
+            cursor.execute("DELETE FROM playlists WHERE position >= ?", (len(podcast_playlist.playlists),))
+            cursor.execute(DELETE_ORPHAN_EPISODES)
+
+    def import_podcast_playlist(self) -> PodcastPlaylist:
+        """
+        Load the playlists.
+
+        Returns:
+            PodcastPlaylist: The stored playlists, in order.
+        """
+        episodes_by_playlist: Dict[int, List[PodcastEpisode]] = {}
+        for row in self._connection.execute(
+                f"SELECT playlist_episodes.playlist_id, "
+                f"{', '.join(f'episodes.{name}' for name in EPISODE_COLUMNS)} "
+                f"FROM playlist_episodes JOIN episodes ON episodes.id = playlist_episodes.episode_id "
+                f"ORDER BY playlist_episodes.playlist_id, playlist_episodes.position"):
+            episodes_by_playlist.setdefault(row[0], []).append(self._episode_from_row(row[1:]))
+
+        playlists = [
+            PodcastEpisodeList(name=name, episodes=episodes_by_playlist.get(playlist_id, []))
+            for playlist_id, name in self._connection.execute("SELECT id, name FROM playlists ORDER BY position")
+        ]
+        return PodcastPlaylist(playlists=playlists)
+
+
+def migrate_json_to_sqlite(podcast_list_file: Optional[str], podcast_playlist_file: Optional[str],
+                           database_file: str) -> PodcastSQLite:
+    """
+    Import PodcastJSON files into a SQLite database.
+
+    Feeds are not fetched; the podcasts are stored exactly as found in the
+    JSON file.
+
+    Args:
+        podcast_list_file (Optional[str]): Path of podcast_list.json, or None.
+        podcast_playlist_file (Optional[str]): Path of podcast_playlist.json,
+            or None.
+        database_file (str): Path of the database to create or update.
+
+    Returns:
+        PodcastSQLite: The open store holding the imported data.
+    """
+    store = PodcastSQLite(database_file)
+    if podcast_list_file:
+        store.export_podcast_list(PodcastJSON.import_podcast_list(podcast_list_file))
+    if podcast_playlist_file:
+        store.export_podcast_playlist(PodcastJSON.import_podcast_playlist(podcast_playlist_file))
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import PodcastJSON files into a SQLite database")
+    parser.add_argument("podcast_list", help="path of podcast_list.json")
+    parser.add_argument("podcast_playlist", help="path of podcast_playlist.json")
+    parser.add_argument("database", help="path of the SQLite database")
+    args = parser.parse_args()
+
+    with migrate_json_to_sqlite(args.podcast_list, args.podcast_playlist, args.database) as store:
+        podcast_count = len(store.import_podcast_list().podcasts)
+        playlist_count = len(store.import_podcast_playlist().playlists)
+    print(f"Imported {podcast_count} podcasts and {playlist_count} playlists into {args.database}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Publication Date Module
+
+This module turns the many shapes a publication date arrives in into the
+single type episodes store: a timezone-aware datetime in UTC. Feed entries
+carry feedparser's already parsed published_parsed struct, which is used
+directly; date strings are parsed once and the result is cached, as the
+same strings repeat across feed refreshes and stored libraries. Because
+every episode holds the same type, sorting and comparing publication dates
+never mixes dates with naive or aware datetimes.
+
+Functions:
+    normalize_pub_date: Canonical publication date for any supported value
+    parse_pub_date: Cached parse of an RFC 822 or ISO 8601 date string
+    pub_date_cache_stats: Hit / miss counters of the string parse cache
+"""
+from datetime import date, datetime, time, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+import logging
+from typing import Any, Dict, Optional
+
+
+# Number of date strings whose parse result is remembered
+PUB_DATE_CACHE_SIZE = 8192
+
+
+def _utc(value: datetime) -> datetime:
+    """Make a datetime aware in UTC; naive values are taken to be UTC."""
+    if value.utcoffset() is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=PUB_DATE_CACHE_SIZE)
+def parse_pub_date(value: str) -> Optional[datetime]:
+    """
+    Parse a date string as found in feeds or written by to_dict.
+
+    RFC 822 dates (the RSS format) are tried first, then ISO 8601. Results
+    are cached, including failures.
+
+    Args:
+        value (str): The date string.
+
+    Returns:
+        Optional[datetime]: The date as an aware datetime in UTC, None when
+            the string is not a date.
+    """
+    try:
+        return _utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        if len(value) == 10:
+            return datetime.combine(date.fromisoformat(value), time(), timezone.utc)
+        if value[-1:] in ('Z', 'z'):
+            # fromisoformat only accepts the UTC designator from Python 3.11
+            value = value[:-1] + '+00:00'
+        return _utc(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+def _today() -> datetime:
+    return datetime.combine(date.today(), time(), timezone.utc)
+
+
+def normalize_pub_date(value: Any) -> datetime:
+    """
+    Convert a publication date to the canonical form stored by episodes.
+
+    Args:
+        value (Any): An aware or naive datetime (naive values are taken to
+            be UTC), a date (midnight UTC), a time.struct_time in UTC such
+            as feedparser's published_parsed, or a date string.
+
+    Returns:
+        datetime: The publication date as an aware datetime in UTC. Missing
+            or unparsable values give midnight UTC of the current day.
+    """
+    if isinstance(value, datetime):
+        return _utc(value)
+    if isinstance(value, date):
+        return datetime.combine(value, time(), timezone.utc)
+    if isinstance(value, str):
+        parsed = parse_pub_date(value.strip())
+        if parsed is not None:
+            return parsed
+        logging.debug(f"Unparsable publication date {value!r}, using today")
+        return _today()
+    if isinstance(value, tuple) and len(value) >= 6:
+        # time.struct_time (a tuple subclass) as produced by feedparser
+        try:
+            return datetime(*value[:6], tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            pass
+    return _today()
+
+
+def pub_date_cache_stats() -> Dict[str, int]:
+    """
+    Get the counters of the date string parse cache.
+
+    Returns:
+        Dict[str, int]: hits, misses, size and maxsize.
+    """
+    info = parse_pub_date.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
@@ -0,0 +1,59 @@
+"""
+Stable Identifier Module
+
+This module derives the identifiers the API uses for podcasts and episodes.
+Unlike list positions they do not change when other podcasts or episodes
+are added, deleted or reordered, so clients can cache them: a podcast is
+identified by a hash of its feed URL and an episode by a hash of its GUID
+(or of its audio URL when the feed gives no GUID). Hashing keeps the
+identifiers short and safe to use in a URL path whatever the GUID contains.
+
+Functions:
+    make_podcast_id: Stable identifier of a podcast
+    make_episode_id: Stable identifier of an episode
+"""
+import hashlib
+from typing import Optional
+
+
+# Number of hexadecimal digits of an identifier (64 bits)
+ID_LENGTH = 16
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()[:ID_LENGTH]
+
+
+def make_podcast_id(podcast_url: str) -> str:
+    """
+    Get the stable identifier of a podcast.
+
+    Args:
+        podcast_url (str): The feed URL of the podcast.
+
+    Returns:
+        str: The identifier, ID_LENGTH hexadecimal digits.
+    """
+    return _digest(f"feed:{podcast_url}")
+
+
+def make_episode_id(guid: Optional[str], audio_url: Optional[str]) -> Optional[str]:
+    """
+    Get the stable identifier of an episode.
+
+    The GUID is used when the episode has one, as feeds keep it when an
+    episode's audio file moves; the audio URL is the fallback.
+
+    Args:
+        guid (Optional[str]): The GUID of the episode.
+        audio_url (Optional[str]): The audio URL of the episode.
+
+    Returns:
+        Optional[str]: The identifier, ID_LENGTH hexadecimal digits; None
+            when the episode has neither a GUID nor an audio URL.
+    """
+    if guid:
+        return _digest(f"guid:{guid}")
+    if audio_url:
+        return _digest(f"url:{audio_url}")
+    return None
@@ -2,6 +2,11 @@ from dataclasses import dataclass
 from typing import List, Optional
 
 
+# Sort options accepted by SortParameters.from_options
+SORT_OPTIONS = ('episode_title', 'episode_duration', 'episode_date', 'episode_rating',
+                'podcast_title', 'podcast_author')
+
+
 @dataclass
 class SortParameters:
     _episode_title: Optional[str]
@@ -11,6 +16,29 @@ class SortParameters:
     _podcast_title: Optional[str]
     _podcast_author: Optional[str]
 
+    @classmethod
+    def from_options(cls, **options: Optional[str]) -> 'SortParameters':
+        """
+        Create sort parameters, validating every option through its setter.
+
+        Args:
+            **options (Optional[str]): Sort options by name (see
+                SORT_OPTIONS), e.g. episode_date="Latest". Options not
+                given are None.
+
+        Returns:
+            SortParameters: The sort parameters.
+
+        Raises:
+            ValueError: If an option name or value is invalid.
+        """
+        params = cls(None, None, None, None, None, None)
+        for name, value in options.items():
+            if name not in SORT_OPTIONS:
+                raise ValueError(f"Unknown sort option {name}")
+            setattr(params, name, value)
+        return params
+
     @property
     def episode_title(self) -> Optional[str]:
         return self._episode_title
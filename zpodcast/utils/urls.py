@@ -0,0 +1,145 @@
+"""
+URL Validation Module
+
+This module is the single place where zpodcast validates URLs. Episodes,
+podcasts and the API validators all call URLValidator, which puts a cheap
+precompiled pattern in front of validators.url and remembers the results of
+recent URLs in a bounded LRU cache. A feed typically repeats the same cover
+image URL on every episode, so most validations become a dictionary lookup.
+
+Classes:
+    URLValidator: Memoized URL validation with hit / miss counters
+
+Functions:
+    is_url: Validate a URL with the shared URLValidator
+"""
+from collections import OrderedDict
+import re
+import threading
+from typing import Any, Dict
+
+import validators
+
+
+# Default number of URLs whose validation result is remembered
+DEFAULT_CACHE_SIZE = 4096
+
+# Anything validators.url can accept has a scheme, "://" and no whitespace;
+# strings failing this pattern are rejected without running the full check
+PLAUSIBLE_URL = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*://\S+\Z')
+
+
+class URLValidator:
+    """
+    Validates URLs with validators.url, remembering recent results.
+
+    Attributes:
+        maxsize (int): Maximum number of cached results
+        hits (int): Validations answered from the cache
+        misses (int): Validations that ran validators.url
+        rejected (int): Validations rejected by the pattern pre-check
+
+    Example:
+        >>> validator = URLValidator.get_instance()
+        >>> validator.is_valid("https://example.com/cover.jpg")
+        True
+        >>> validator.stats()["hits"]
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[str, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    @classmethod
+    def get_instance(cls) -> 'URLValidator':
+        """
+        Get the validator shared by the whole application.
+
+        Returns:
+            URLValidator: The shared instance.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                # another thread may have created it while we waited
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def is_valid(self, url: Any) -> bool:
+        """
+        Check whether a value is a valid URL.
+
+        Args:
+            url (Any): The value to check; anything but a string is invalid.
+
+        Returns:
+            bool: True if validators.url accepts the URL.
+        """
+        if not isinstance(url, str) or not PLAUSIBLE_URL.match(url):
+            with self._lock:
+                self.rejected += 1
+            return False
+
+        with self._lock:
+            valid = self._cache.get(url)
+            if valid is not None:
+                self._cache.move_to_end(url)
+                self.hits += 1
+                return valid
+            self.misses += 1
+
+        # validators.url returns True or a falsy ValidationError
+        valid = bool(validators.url(url))
+        with self._lock:
+            self._cache[url] = valid
+            self._cache.move_to_end(url)
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return valid
+
+    def clear(self) -> None:
+        """Forget the cached results and reset the counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+            self.rejected = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dict[str, int]: hits, misses, rejected, the number of cached
+                URLs (size) and maxsize.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "rejected": self.rejected,
+                "size": len(self._cache),
+                "maxsize": self.maxsize
+            }
+
+
+def is_url(url: Any) -> bool:
+    """
+    Validate a URL with the shared URLValidator.
+
+    Args:
+        url (Any): The value to check.
+
+    Returns:
+        bool: True if the value is a valid URL.
+    """
+    return URLValidator.get_instance().is_valid(url)